@@ -0,0 +1,400 @@
+"""
+Fixtures for the serving latency benchmarks.
+
+Everything the serving path reads is built locally, so a benchmark run never
+touches the network:
+
+- `build_fixture_db` writes a synthetic SQLite DB (serving schema from
+  `prediction.db.init_db`) with a few seasons of results per league plus a round
+  of upcoming fixtures inside the next week.
+- `build_runtime_assets` writes V4/V5 runtime meta + seed checkpoints in the
+  layout `storage_loader` downloads. Weights are random (seeded): latency does
+  not depend on their values, only on the architecture and config.
+- `stub_providers` swaps the Cloud Storage loaders and the odds client for
+  local stubs (with optional simulated round-trip latency) for the duration of a
+  `with` block.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import pickle
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+SERVING_ROOT = ROOT / "rugby-ai-predictor"
+# Benchmarks exercise the deployed package, not the training copy at the repo root.
+if str(SERVING_ROOT) not in sys.path:
+    sys.path.insert(0, str(SERVING_ROOT))
+
+from prediction.db import init_db  # noqa: E402
+
+DEFAULT_LEAGUES: Dict[int, str] = {
+    4446: "United Rugby Championship",
+    4430: "French Top 14",
+}
+STUB_BUCKET = "benchmark-stub-bucket"
+
+# Architecture configs of the production trainers (scripts/incremental_retrain.py PROD_TRAIN_ARGS).
+RUNTIME_CONFIGS: Dict[str, Dict[str, Any]] = {
+    "v4": {"seq_len": 10, "emb_dim": 32, "hidden_dim": 64, "seq_dim": 7},
+    "v5": {
+        "seq_len": 10,
+        "emb_dim": 32,
+        "hidden_dim": 80,
+        "seq_dim": 11,
+        "n_experts": 4,
+        "adapter_dim": 24,
+        "cross_heads": 4,
+    },
+}
+
+
+@dataclass
+class ServingFixture:
+    """Synthetic DB, per-league runtime assets and the upcoming round of each league."""
+
+    db_path: str
+    assets: Dict[Tuple[str, int], Dict[str, Any]]
+    upcoming: Dict[int, List[Dict[str, Any]]]
+    matches: int
+    workdir: str
+    info: Dict[str, Any] = field(default_factory=dict)
+
+
+def _team_names(league_id: int, n_teams: int) -> List[Tuple[int, str]]:
+    base = league_id * 100
+    return [(base + i, f"{DEFAULT_LEAGUES.get(league_id, league_id)} Club {i:02d}") for i in range(1, n_teams + 1)]
+
+
+def build_fixture_db(
+    db_path: str,
+    leagues: Optional[Dict[int, str]] = None,
+    seasons: int = 4,
+    n_teams: int = 16,
+    matches_per_round: int = 8,
+    rounds_per_season: int = 22,
+    seed: int = 7,
+) -> Dict[str, Any]:
+    """
+    Write a synthetic league history ending last week and one upcoming round per
+    league (dated from today, so "next 7 days" queries and warm-ups find it).
+    """
+    leagues = dict(leagues or DEFAULT_LEAGUES)
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    try:
+        init_db(conn)
+        event_id = 1
+        completed = 0
+        upcoming: Dict[int, List[Dict[str, Any]]] = {}
+        today = date.today()
+        for league_id, league_name in leagues.items():
+            conn.execute("INSERT OR REPLACE INTO league (id, name) VALUES (?, ?)", (league_id, league_name))
+            teams = _team_names(league_id, n_teams)
+            conn.executemany(
+                "INSERT OR REPLACE INTO team (id, league_id, name) VALUES (?, ?, ?)",
+                [(tid, league_id, name) for tid, name in teams],
+            )
+            strength = {tid: rng.gauss(0.0, 6.0) for tid, _ in teams}
+            ids = [tid for tid, _ in teams]
+            total_rounds = seasons * rounds_per_season
+            day = today - timedelta(days=7 * total_rounds)
+            for rnd in range(total_rounds):
+                season = str(today.year - seasons + rnd // rounds_per_season + 1)
+                rng.shuffle(ids)
+                for k in range(min(matches_per_round, len(ids) // 2)):
+                    h, a = ids[2 * k], ids[2 * k + 1]
+                    hs = max(0, int(rng.gauss(24 + strength[h] - strength[a] + 3, 9)))
+                    aw = max(0, int(rng.gauss(22 + strength[a] - strength[h], 9)))
+                    conn.execute(
+                        "INSERT INTO event (id, league_id, season, date_event, home_team_id, away_team_id, "
+                        "home_score, away_score, status) VALUES (?,?,?,?,?,?,?,?,?)",
+                        (event_id, league_id, season, day.isoformat(), h, a, hs, aw, "Match Finished"),
+                    )
+                    event_id += 1
+                    completed += 1
+                day += timedelta(days=7)
+
+            kickoff = (today + timedelta(days=2)).isoformat()
+            names = dict(teams)
+            rng.shuffle(ids)
+            fixtures = []
+            for k in range(min(matches_per_round, len(ids) // 2)):
+                h, a = ids[2 * k], ids[2 * k + 1]
+                conn.execute(
+                    "INSERT INTO event (id, league_id, season, date_event, home_team_id, away_team_id, status) "
+                    "VALUES (?,?,?,?,?,?,?)",
+                    (event_id, league_id, str(today.year), kickoff, h, a, "Not Started"),
+                )
+                fixtures.append(
+                    {"event_id": event_id, "home_team": names[h], "away_team": names[a], "match_date": kickoff}
+                )
+                event_id += 1
+            upcoming[league_id] = fixtures
+        conn.commit()
+    finally:
+        conn.close()
+    return {"completed_matches": completed, "upcoming": upcoming, "leagues": leagues}
+
+
+def build_runtime_assets(
+    family: str,
+    league_id: int,
+    db_path: str,
+    out_dir: str,
+    seeds: Sequence[int] = (42, 1337, 9001),
+) -> Dict[str, Any]:
+    """
+    Write `league_<id>_model_maz_maxed_<family>_meta.pkl` and one seed `.pt` per
+    seed, shaped like the production artifacts; returns the asset dict
+    `load_<family>_assets_from_storage` would return.
+    """
+    import torch
+
+    if family == "v5":
+        from prediction.v5_runtime import V5Model as model_cls
+    else:
+        from prediction.v4_runtime import V4Model as model_cls
+
+    conn = sqlite3.connect(db_path)
+    try:
+        team_ids = [int(r[0]) for r in conn.execute("SELECT id FROM team WHERE league_id = ? ORDER BY id", (league_id,))]
+        league_name = (conn.execute("SELECT name FROM league WHERE id = ?", (league_id,)).fetchone() or [""])[0]
+    finally:
+        conn.close()
+
+    cfg = dict(RUNTIME_CONFIGS[family])
+    cfg.update({"rating_k": 0.06, "rating_home_adv": 2.0, "rating_scale": 7.0})
+    meta = {
+        "league_id": int(league_id),
+        "league_name": league_name or f"League {league_id}",
+        "architecture": family,
+        "team_to_idx": {tid: i for i, tid in enumerate(team_ids)},
+        "league_to_idx": {int(league_id): 0},
+        "league_score_stats_train": {int(league_id): (23.0, 9.0)},
+        "league_env_stats_train": {
+            int(league_id): {"home_prob": 0.58, "home_strength": 1.0, "rating_home_adv": 2.0}
+        },
+        "config": cfg,
+        "normalization_stats": {"mean": [0.0] * cfg["seq_dim"], "std": [1.0] * cfg["seq_dim"]},
+        "calibrator": None,
+        "probability_blender": None,
+    }
+    stem = f"league_{league_id}_model_maz_maxed_{family}"
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    meta_path = out / f"{stem}_meta.pkl"
+    with open(meta_path, "wb") as f:
+        pickle.dump(meta, f)
+
+    model_kwargs = {k: cfg[k] for k in ("emb_dim", "seq_dim", "hidden_dim")}
+    if family == "v5":
+        model_kwargs.update({k: cfg[k] for k in ("n_experts", "adapter_dim", "cross_heads")})
+    seed_paths = []
+    for seed in seeds:
+        torch.manual_seed(int(seed))
+        model = model_cls(n_teams=max(1, len(team_ids)), n_leagues=1, **model_kwargs)
+        path = out / f"{stem}_seed_{int(seed)}.pt"
+        torch.save(model.state_dict(), path)
+        seed_paths.append(str(path))
+    return {
+        "league_id": int(league_id),
+        "meta_path": str(meta_path),
+        "seed_model_paths": seed_paths,
+        "bucket_name": STUB_BUCKET,
+        "model_family": family,
+    }
+
+
+def build_serving_fixture(
+    workdir: Optional[str] = None,
+    db_path: Optional[str] = None,
+    leagues: Optional[Dict[int, str]] = None,
+    families: Sequence[str] = ("v4", "v5"),
+    seeds: Sequence[int] = (42, 1337, 9001),
+    seed: int = 7,
+) -> ServingFixture:
+    """Synthetic DB (or an existing `db_path` fixture) plus runtime assets for every league/family."""
+    workdir = workdir or tempfile.mkdtemp(prefix="serving_bench_")
+    Path(workdir).mkdir(parents=True, exist_ok=True)
+    leagues = dict(leagues or DEFAULT_LEAGUES)
+    if db_path is None:
+        db_path = str(Path(workdir) / "fixture.sqlite")
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        built = build_fixture_db(db_path, leagues=leagues, seed=seed)
+        upcoming, matches = built["upcoming"], built["completed_matches"]
+    else:
+        upcoming, matches = _upcoming_from_db(db_path, leagues), _completed_count(db_path)
+
+    assets = {
+        (family, league_id): build_runtime_assets(
+            family, league_id, db_path, str(Path(workdir) / "models"), seeds=seeds
+        )
+        for family in families
+        for league_id in leagues
+    }
+    return ServingFixture(
+        db_path=db_path,
+        assets=assets,
+        upcoming=upcoming,
+        matches=matches,
+        workdir=workdir,
+        info={"leagues": sorted(leagues), "families": list(families), "seeds": list(seeds)},
+    )
+
+
+def _completed_count(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return int(conn.execute("SELECT COUNT(*) FROM event WHERE home_score IS NOT NULL").fetchone()[0])
+    finally:
+        conn.close()
+
+
+def _upcoming_from_db(db_path: str, leagues: Dict[int, str], limit: int = 8) -> Dict[int, List[Dict[str, Any]]]:
+    """Next round of an existing fixture DB; falls back to the latest played pairings."""
+    conn = sqlite3.connect(db_path)
+    try:
+        out: Dict[int, List[Dict[str, Any]]] = {}
+        for league_id in leagues:
+            rows = conn.execute(
+                """
+                SELECT e.id, ht.name, at.name, substr(e.date_event, 1, 10)
+                FROM event e
+                JOIN team ht ON ht.id = e.home_team_id
+                JOIN team at ON at.id = e.away_team_id
+                WHERE e.league_id = ? AND e.home_score IS NULL
+                ORDER BY e.date_event ASC, e.id ASC LIMIT ?
+                """,
+                (league_id, limit),
+            ).fetchall()
+            if not rows:
+                rows = conn.execute(
+                    """
+                    SELECT e.id, ht.name, at.name, date('now', '+2 days')
+                    FROM event e
+                    JOIN team ht ON ht.id = e.home_team_id
+                    JOIN team at ON at.id = e.away_team_id
+                    WHERE e.league_id = ?
+                    ORDER BY e.date_event DESC, e.id DESC LIMIT ?
+                    """,
+                    (league_id, limit),
+                ).fetchall()
+            out[league_id] = [
+                {"event_id": int(r[0]), "home_team": r[1], "away_team": r[2], "match_date": r[3]} for r in rows
+            ]
+        return out
+    finally:
+        conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Provider stubs
+# ---------------------------------------------------------------------------
+
+
+def _sleep_ms(ms: float) -> None:
+    if ms > 0:
+        time.sleep(ms / 1000.0)
+
+
+class StubOddsClient:
+    """
+    Drop-in for `SportDevsClient` on the prediction path: `get_match_odds`
+    returns a fixed three-bookmaker consensus after `latency_ms`, so the hybrid
+    AI + odds blend runs without any HTTP.
+    """
+
+    latency_ms: float = 0.0
+
+    def __init__(self, api_key: str = "", base_url: str = "", db_path: Optional[str] = None, **_: Any):
+        self.api_key = api_key
+        self.db_path = db_path
+
+    def get_match_odds(self, match_id=None, league_id=None, match_date=None, home_team=None, away_team=None):
+        _sleep_ms(self.latency_ms)
+        return {
+            "periods": [
+                {
+                    "period_type": "Full Time",
+                    "odds": [
+                        {"home": 1.80, "draw": 21.0, "away": 2.05},
+                        {"home": 1.83, "draw": 23.0, "away": 2.00},
+                        {"home": 1.78, "draw": 21.0, "away": 2.10},
+                    ],
+                }
+            ]
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        # News / team endpoints: an empty payload, like the real client on an API error.
+        def _empty(*args: Any, **kwargs: Any) -> Any:
+            _sleep_ms(self.latency_ms)
+            return None
+
+        return _empty
+
+
+@contextlib.contextmanager
+def stub_providers(
+    fixture: ServingFixture,
+    storage_latency_ms: float = 0.0,
+    odds_latency_ms: float = 0.0,
+) -> Iterator[None]:
+    """
+    Serve runtime assets from `fixture` instead of Cloud Storage and odds from
+    `StubOddsClient` while the block runs. Asset "downloads" copy the files to a
+    fresh temp dir, as `storage_loader` does.
+    """
+    from prediction import hybrid_predictor, sportdevs_client, storage_loader, v4_runtime, v5_runtime
+
+    def _download(league_id: int, family: str) -> Optional[Dict[str, Any]]:
+        src = fixture.assets.get((family, int(league_id)))
+        _sleep_ms(storage_latency_ms)
+        if src is None:
+            return None
+        temp_dir = tempfile.mkdtemp(prefix=f"{family}_assets_league_{league_id}_", dir=fixture.workdir)
+        copied = dict(src)
+        copied["meta_path"] = shutil.copy(src["meta_path"], temp_dir)
+        copied["seed_model_paths"] = [shutil.copy(p, temp_dir) for p in src["seed_model_paths"]]
+        return copied
+
+    def _exists(league_id: int, bucket_name: str, preferred_family: Optional[str] = None, **_: Any) -> bool:
+        _sleep_ms(storage_latency_ms)
+        families = [preferred_family] if preferred_family else ["v4", "v5"]
+        return any((f, int(league_id)) in fixture.assets for f in families)
+
+    def _no_legacy_model(league_id: int, bucket_name: str, *args: Any, **kwargs: Any) -> Optional[str]:
+        raise FileNotFoundError(f"No legacy model for league {league_id} in benchmark fixture")
+
+    odds_client = type("StubOddsClient", (StubOddsClient,), {"latency_ms": float(odds_latency_ms)})
+    patches = [
+        (storage_loader, "load_v4_assets_from_storage", lambda league_id, bucket_name: _download(league_id, "v4")),
+        (storage_loader, "load_v5_assets_from_storage", lambda league_id, bucket_name: _download(league_id, "v5")),
+        (storage_loader, "model_exists_in_storage", _exists),
+        (storage_loader, "load_model_from_storage", _no_legacy_model),
+        (sportdevs_client, "SportDevsClient", odds_client),
+        (v4_runtime, "SportDevsClient", odds_client),
+        (v5_runtime, "SportDevsClient", odds_client),
+        (hybrid_predictor, "SportDevsClient", odds_client),
+    ]
+    saved = [(module, name, getattr(module, name)) for module, name, _ in patches]
+    for module, name, value in patches:
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for module, name, value in saved:
+            setattr(module, name, value)
@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+Cold/warm latency of the prediction serving hot paths.
+
+Runs against a synthetic SQLite DB (or `--db-path` fixture) with runtime assets
+and odds served by local stubs (see serving_fixtures.py), so numbers reflect
+our code rather than Cloud Storage or bookmaker APIs. Simulated provider
+round trips can be added with `--storage-latency-ms` / `--odds-latency-ms`.
+
+Each stage times one call:
+
+  cold  first call on a freshly constructed object (empty per-instance caches:
+        model load, team-name lookup, team histories), repeated `--cold-runs`
+        times with a new object each time
+  warm  `--warm-runs` further calls on the same object, cycling through the
+        league's upcoming round (what later requests of a warm instance pay)
+
+The first cold sample of a process also pays one-time costs (imports, torch
+kernel init); keep `--cold-runs` >= 3 so the p50 used for comparisons is not
+decided by which stage happened to run first.
+
+Stages:
+
+  features.build_feature_table       full legacy feature table build
+  features.cached_feature_table      same through DatasetCache (cold = empty cache dir)
+  <fam>.load                         V4/V5RuntimePredictor construction (cold only)
+  <fam>.build_team_histories         `_build_team_histories` league replay
+  <fam>.predict_match                runtime predict_match incl. stubbed odds
+  multi_league.predict_match[<fam>]  MultiLeaguePredictor routing + asset fetch + runtime
+  http.predict_matches_batch[<fam>]  main.predict_matches_batch_http for one round
+                                     (Firestore unavailable -> live compute path)
+  news.get_news_feed                 NewsService feed with the live predictor, no external clients
+
+The JSON report holds p50/p95/mean/min/max per stage and phase. With
+`--baseline <previous report>` every p50 is checked against the thresholds
+(`latency_thresholds.json`, overridable with `--thresholds`): a stage regresses
+when it is both `max_ratio` times and `min_delta_ms` slower than the baseline.
+`--fail-on-regression` turns regressions into exit code 1 for CI.
+
+Usage:
+  python benchmarks/serving_latency.py
+  python benchmarks/serving_latency.py --output artifacts/serving_latency_latest.json
+  python benchmarks/serving_latency.py --baseline artifacts/serving_latency_prev.json --fail-on-regression
+  python benchmarks/serving_latency.py --stage v4.predict_match --stage http --warm-runs 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from serving_fixtures import ROOT, STUB_BUCKET, ServingFixture, build_serving_fixture, stub_providers  # noqa: E402
+
+REPORT_FORMAT = 1
+DEFAULT_THRESHOLDS_PATH = BENCH_DIR / "latency_thresholds.json"
+FALLBACK_THRESHOLDS: Dict[str, Any] = {"default": {"max_ratio": 1.25, "min_delta_ms": 5.0}, "stages": {}}
+
+
+@dataclass
+class Stage:
+    """
+    One timed operation. `setup()` builds fresh state (untimed); `call(state, i)`
+    is the timed request, `i` counting calls on that state (0 = cold).
+    """
+
+    name: str
+    description: str
+    setup: Callable[[], Any]
+    call: Callable[[Any, int], Any]
+    warm: bool = True
+    teardown: Optional[Callable[[Any], None]] = None
+
+
+class _FakeRequest:
+    """Minimal flask-style request for calling an `https_fn.on_request` handler in-process."""
+
+    method = "POST"
+
+    def __init__(self, payload: Dict[str, Any]):
+        self._payload = payload
+        self.headers: Dict[str, str] = {"Content-Type": "application/json"}
+        self.args: Dict[str, str] = {}
+
+    def get_json(self, silent: bool = False, force: bool = False) -> Dict[str, Any]:
+        return dict(self._payload)
+
+
+def _summary(samples_ms: Sequence[float]) -> Dict[str, Any]:
+    if not samples_ms:
+        return {"n": 0}
+    ordered = sorted(samples_ms)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "n": len(ordered),
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[p95_index], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "min_ms": round(ordered[0], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def run_stage(stage: Stage, cold_runs: int, warm_runs: int) -> Dict[str, Any]:
+    cold: List[float] = []
+    warm: List[float] = []
+    for run in range(max(1, cold_runs)):
+        state = stage.setup()
+        try:
+            t0 = time.perf_counter()
+            stage.call(state, 0)
+            cold.append((time.perf_counter() - t0) * 1000.0)
+            # Warm samples come from the last cold instance only.
+            if stage.warm and run == max(1, cold_runs) - 1:
+                for i in range(1, warm_runs + 1):
+                    t0 = time.perf_counter()
+                    stage.call(state, i)
+                    warm.append((time.perf_counter() - t0) * 1000.0)
+        finally:
+            if stage.teardown is not None:
+                stage.teardown(state)
+    out: Dict[str, Any] = {"status": "ok", "description": stage.description, "cold": _summary(cold)}
+    if stage.warm:
+        out["warm"] = _summary(warm)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Stage definitions
+# ---------------------------------------------------------------------------
+
+
+def _fixture_for(fixture: ServingFixture, league_id: int, i: int) -> Dict[str, Any]:
+    round_ = fixture.upcoming[league_id]
+    return round_[i % len(round_)]
+
+
+def feature_stages(fixture: ServingFixture) -> List[Stage]:
+    import tempfile
+
+    from prediction.dataset_cache import DatasetCache, cached_feature_table
+    from prediction.features import FeatureConfig, build_feature_table
+
+    # Same config HybridPredictor uses on the legacy path.
+    config = FeatureConfig(elo_priors=None, elo_k=24.0)
+
+    def _conn() -> sqlite3.Connection:
+        return sqlite3.connect(fixture.db_path)
+
+    def _cache_state() -> Dict[str, Any]:
+        return {
+            "conn": _conn(),
+            "cache": DatasetCache(Path(tempfile.mkdtemp(prefix="dataset_cache_", dir=fixture.workdir))),
+        }
+
+    return [
+        Stage(
+            "features.build_feature_table",
+            "build_feature_table on the whole fixture DB",
+            _conn,
+            lambda conn, i: build_feature_table(conn, config),
+            teardown=lambda conn: conn.close(),
+        ),
+        Stage(
+            "features.cached_feature_table",
+            "cached_feature_table; cold = empty cache directory, warm = cache hit",
+            _cache_state,
+            lambda st, i: cached_feature_table(st["conn"], config, st["cache"]),
+            teardown=lambda st: st["conn"].close(),
+        ),
+    ]
+
+
+def runtime_stages(fixture: ServingFixture, family: str, league_id: int) -> List[Stage]:
+    if family == "v5":
+        from prediction.v5_runtime import V5RuntimePredictor
+
+        def _make() -> Any:
+            return V5RuntimePredictor(v5_assets=fixture.assets[("v5", league_id)], db_path=fixture.db_path)
+
+    else:
+        from prediction.v4_runtime import V4RuntimePredictor
+
+        def _make() -> Any:
+            return V4RuntimePredictor(v4_assets=fixture.assets[("v4", league_id)], db_path=fixture.db_path)
+
+    match_date = fixture.upcoming[league_id][0]["match_date"]
+
+    def _histories_state() -> Dict[str, Any]:
+        return {"predictor": _make(), "conn": sqlite3.connect(fixture.db_path)}
+
+    def _predict(predictor: Any, i: int) -> Any:
+        item = _fixture_for(fixture, league_id, i)
+        return predictor.predict_match(
+            item["home_team"], item["away_team"], league_id, item["match_date"], match_id=item["event_id"]
+        )
+
+    return [
+        Stage(f"{family}.load", f"{family.upper()}RuntimePredictor construction from local seed checkpoints",
+              lambda: None, lambda _, i: _make(), warm=False),
+        Stage(
+            f"{family}.build_team_histories",
+            "_build_team_histories league replay up to the upcoming round (uncached)",
+            _histories_state,
+            lambda st, i: st["predictor"]._build_team_histories(st["conn"], match_date),
+            teardown=lambda st: st["conn"].close(),
+        ),
+        Stage(
+            f"{family}.predict_match",
+            f"{family.upper()}RuntimePredictor.predict_match over the upcoming round, stubbed odds",
+            _make,
+            _predict,
+        ),
+    ]
+
+
+def _multi_league_predictor(fixture: ServingFixture, family: str) -> Any:
+    from prediction.hybrid_predictor import MultiLeaguePredictor
+
+    os.environ["LIVE_MODEL_FAMILY"] = family
+    return MultiLeaguePredictor(db_path=fixture.db_path, storage_bucket=STUB_BUCKET)
+
+
+def multi_league_stage(fixture: ServingFixture, family: str, league_id: int) -> Stage:
+    def _predict(predictor: Any, i: int) -> Any:
+        item = _fixture_for(fixture, league_id, i)
+        return predictor.predict_match(
+            item["home_team"], item["away_team"], league_id, item["match_date"], match_id=item["event_id"]
+        )
+
+    return Stage(
+        f"multi_league.predict_match[{family}]",
+        "MultiLeaguePredictor.predict_match; cold includes stubbed asset fetch and model load",
+        lambda: _multi_league_predictor(fixture, family),
+        _predict,
+    )
+
+
+def http_batch_stage(fixture: ServingFixture, family: str, league_id: int) -> Stage:
+    """Raises ImportError when the Cloud Functions runtime (firebase_functions) is not installed."""
+    import main
+
+    def _no_firestore() -> Any:
+        raise RuntimeError("Firestore disabled in serving benchmark")
+
+    def _setup() -> Dict[str, Any]:
+        os.environ["DB_PATH"] = fixture.db_path
+        os.environ["MODEL_STORAGE_BUCKET"] = STUB_BUCKET
+        os.environ["LIVE_MODEL_FAMILY"] = family
+        saved = main.get_firestore_client
+        main.get_firestore_client = _no_firestore
+        main._predictor = None
+        return {"saved_firestore": saved}
+
+    def _call(state: Dict[str, Any], i: int) -> Any:
+        payload = {"league_id": league_id, "matches": fixture.upcoming[league_id], "force_refresh": True}
+        response = main.predict_matches_batch_http(_FakeRequest(payload))
+        status = getattr(response, "status_code", 200)
+        if status != 200:
+            raise RuntimeError(f"predict_matches_batch_http returned HTTP {status}")
+        return response
+
+    def _teardown(state: Dict[str, Any]) -> None:
+        main.get_firestore_client = state["saved_firestore"]
+        main._predictor = None
+
+    return Stage(
+        f"http.predict_matches_batch[{family}]",
+        f"predict_matches_batch_http for a {len(fixture.upcoming[league_id])}-fixture round; "
+        "cold = first request of a fresh instance",
+        _setup,
+        _call,
+        teardown=_teardown,
+    )
+
+
+def news_stage(fixture: ServingFixture, family: str) -> Stage:
+    from prediction.news_service import NewsService
+
+    def _setup() -> Any:
+        return NewsService(db_path=fixture.db_path, predictor=_multi_league_predictor(fixture, family))
+
+    return Stage(
+        "news.get_news_feed",
+        "NewsService.get_news_feed across leagues (match previews), no external clients",
+        _setup,
+        lambda service, i: service.get_news_feed(limit=50, include_external=False),
+    )
+
+
+def build_stages(fixture: ServingFixture, families: Sequence[str], league_id: int) -> Dict[str, Callable[[], Stage]]:
+    """Stage name -> factory; factories import lazily so a missing optional runtime only skips its stage."""
+    factories: Dict[str, Callable[[], Stage]] = {}
+    for stage in feature_stages(fixture):
+        factories[stage.name] = (lambda s=stage: s)
+    for family in families:
+        for name in ("load", "build_team_histories", "predict_match"):
+            factories[f"{family}.{name}"] = (
+                lambda family=family, name=name: next(
+                    s for s in runtime_stages(fixture, family, league_id) if s.name == f"{family}.{name}"
+                )
+            )
+        factories[f"multi_league.predict_match[{family}]"] = (
+            lambda family=family: multi_league_stage(fixture, family, league_id)
+        )
+        factories[f"http.predict_matches_batch[{family}]"] = (
+            lambda family=family: http_batch_stage(fixture, family, league_id)
+        )
+    factories["news.get_news_feed"] = lambda: news_stage(fixture, families[0])
+    return factories
+
+
+# ---------------------------------------------------------------------------
+# Thresholds / comparison
+# ---------------------------------------------------------------------------
+
+
+def load_thresholds(path: Optional[str]) -> Dict[str, Any]:
+    target = Path(path) if path else DEFAULT_THRESHOLDS_PATH
+    if not target.exists():
+        return FALLBACK_THRESHOLDS
+    raw = json.loads(target.read_text(encoding="utf-8"))
+    return {"default": raw.get("default", FALLBACK_THRESHOLDS["default"]), "stages": raw.get("stages", {})}
+
+
+def _threshold_for(thresholds: Dict[str, Any], stage: str, phase: str) -> Dict[str, float]:
+    """
+    Default, then `<stage prefix>`, `<stage base>`, `<stage>`, `<stage base>:<phase>`,
+    `<stage>:<phase>` overrides (later wins). The base drops a `[family]` suffix,
+    so "multi_league.predict_match:warm" covers every family.
+    """
+    merged = dict(thresholds["default"])
+    overrides = thresholds.get("stages", {})
+    base = stage.split("[")[0]
+    for key in (stage.split(".")[0], base, stage, f"{base}:{phase}", f"{stage}:{phase}"):
+        merged.update(overrides.get(key, {}))
+    return merged
+
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any], thresholds: Dict[str, Any]) -> Dict[str, Any]:
+    regressions: List[Dict[str, Any]] = []
+    improvements: List[Dict[str, Any]] = []
+    checked = 0
+    for stage, result in current["stages"].items():
+        base = baseline.get("stages", {}).get(stage)
+        if result.get("status") != "ok" or not base or base.get("status") != "ok":
+            continue
+        for phase in ("cold", "warm"):
+            now_p50 = (result.get(phase) or {}).get("p50_ms")
+            was_p50 = (base.get(phase) or {}).get("p50_ms")
+            if now_p50 is None or was_p50 is None:
+                continue
+            checked += 1
+            limit = _threshold_for(thresholds, stage, phase)
+            delta = now_p50 - was_p50
+            ratio = now_p50 / was_p50 if was_p50 > 0 else float("inf")
+            row = {
+                "stage": stage,
+                "phase": phase,
+                "baseline_p50_ms": was_p50,
+                "p50_ms": now_p50,
+                "ratio": round(ratio, 3),
+                "delta_ms": round(delta, 3),
+                "max_ratio": limit["max_ratio"],
+                "min_delta_ms": limit["min_delta_ms"],
+            }
+            if ratio > limit["max_ratio"] and delta > limit["min_delta_ms"]:
+                regressions.append(row)
+            elif ratio < 1.0 / limit["max_ratio"] and -delta > limit["min_delta_ms"]:
+                improvements.append(row)
+    # Timings are only comparable under the same run config and fixture size.
+    mismatch = {
+        key: {"baseline": baseline.get(section, {}).get(key), "current": current[section].get(key)}
+        for section, keys in (("config", current["config"]), ("fixture", ("completed_matches", "round_size", "seeds")))
+        for key in keys
+        if baseline.get(section, {}).get(key) != current[section].get(key)
+    }
+    return {"checked": checked, "config_mismatch": mismatch, "regressions": regressions, "improvements": improvements}
+
+
+def _environment() -> Dict[str, Any]:
+    env: Dict[str, Any] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+    for module in ("numpy", "pandas", "torch", "xgboost"):
+        try:
+            env[module] = __import__(module).__version__
+        except Exception:
+            env[module] = None
+    try:
+        env["git_commit"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=str(ROOT), capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        env["git_commit"] = None
+    return env
+
+
+def _print_table(report: Dict[str, Any]) -> None:
+    print(f"{'stage':44s} {'cold p50':>10s} {'cold max':>10s} {'warm p50':>10s} {'warm p95':>10s}  status")
+    print("-" * 100)
+    for name, result in report["stages"].items():
+        cold = result.get("cold") or {}
+        warm = result.get("warm") or {}
+
+        def _fmt(v: Any) -> str:
+            return f"{v:10.2f}" if isinstance(v, (int, float)) else f"{'-':>10s}"
+
+        print(
+            f"{name[:44]:44s} {_fmt(cold.get('p50_ms'))} {_fmt(cold.get('max_ms'))} "
+            f"{_fmt(warm.get('p50_ms'))} {_fmt(warm.get('p95_ms'))}  {result['status']}"
+            + (f" ({result.get('reason')})" if result.get("reason") else "")
+        )
+    comparison = report.get("comparison")
+    if comparison:
+        print(
+            f"\nvs baseline {comparison['baseline']}: {comparison['checked']} checks, "
+            f"{len(comparison['regressions'])} regression(s), {len(comparison['improvements'])} improvement(s)"
+        )
+        if comparison["config_mismatch"]:
+            print(f"  WARNING: baseline ran with different settings: {comparison['config_mismatch']}")
+        for row in comparison["regressions"]:
+            print(
+                f"  REGRESSION {row['stage']} [{row['phase']}]: {row['baseline_p50_ms']:.2f} -> "
+                f"{row['p50_ms']:.2f} ms (x{row['ratio']:.2f}, limit x{row['max_ratio']:.2f})"
+            )
+        for row in comparison["improvements"]:
+            print(
+                f"  improved   {row['stage']} [{row['phase']}]: {row['baseline_p50_ms']:.2f} -> "
+                f"{row['p50_ms']:.2f} ms (x{row['ratio']:.2f})"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cold/warm latency benchmark of the prediction serving path.")
+    parser.add_argument("--db-path", default=None, help="Fixture SQLite DB (default: synthetic DB in --workdir).")
+    parser.add_argument("--workdir", default=None, help="Directory for the fixture DB, assets and caches (default: temp).")
+    parser.add_argument("--league-id", type=int, default=4446, help="League the per-league stages predict for.")
+    parser.add_argument("--family", action="append", choices=["v4", "v5"], help="Runtime families (default: v4 and v5).")
+    parser.add_argument(
+        "--stage",
+        action="append",
+        default=None,
+        help="Run only stages whose name starts with this prefix (repeatable), e.g. v4 or http.",
+    )
+    parser.add_argument("--cold-runs", type=int, default=3, help="Fresh instances per stage.")
+    parser.add_argument("--warm-runs", type=int, default=20, help="Calls on the warm instance per stage.")
+    parser.add_argument("--storage-latency-ms", type=float, default=0.0, help="Simulated Cloud Storage round trip.")
+    parser.add_argument("--odds-latency-ms", type=float, default=0.0, help="Simulated odds API round trip.")
+    parser.add_argument("--seed", type=int, default=7, help="Synthetic DB seed.")
+    parser.add_argument("--output", default=None, help="Write the JSON report here (default: stdout only).")
+    parser.add_argument("--baseline", default=None, help="Previous JSON report to compare against.")
+    parser.add_argument("--thresholds", default=None, help=f"Thresholds JSON (default: {DEFAULT_THRESHOLDS_PATH.name}).")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 when a stage regresses vs --baseline.")
+    parser.add_argument("--log-level", default="WARNING", help="Logging level of the serving code.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.WARNING))
+    logging.getLogger().setLevel(getattr(logging, args.log_level.upper(), logging.WARNING))
+    families = args.family or ["v4", "v5"]
+
+    t0 = time.perf_counter()
+    fixture = build_serving_fixture(workdir=args.workdir, db_path=args.db_path, families=families, seed=args.seed)
+    if args.league_id not in fixture.upcoming or not fixture.upcoming[args.league_id]:
+        print(f"League {args.league_id} has no fixtures in {fixture.db_path}")
+        return 2
+    fixture_s = time.perf_counter() - t0
+    # Keep the serving caches inside the workdir, never in the repo's artifacts/.
+    os.environ.setdefault("RUGBY_DATASET_CACHE_DIR", str(Path(fixture.workdir) / "dataset_cache"))
+
+    thresholds = load_thresholds(args.thresholds)
+    stages: Dict[str, Any] = {}
+    with stub_providers(fixture, args.storage_latency_ms, args.odds_latency_ms):
+        for name, factory in build_stages(fixture, families, args.league_id).items():
+            if args.stage and not any(name.startswith(prefix) for prefix in args.stage):
+                continue
+            try:
+                stage = factory()
+            except ImportError as e:
+                stages[name] = {"status": "skipped", "reason": f"import failed: {e}"}
+                continue
+            try:
+                stages[name] = run_stage(stage, args.cold_runs, args.warm_runs)
+            except Exception as e:
+                logging.getLogger(__name__).exception("Stage %s failed", name)
+                stages[name] = {"status": "error", "reason": f"{type(e).__name__}: {e}"}
+
+    report: Dict[str, Any] = {
+        "suite": "serving_latency",
+        "format": REPORT_FORMAT,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": _environment(),
+        "fixture": {
+            "db_path": fixture.db_path,
+            "synthetic": args.db_path is None,
+            "completed_matches": fixture.matches,
+            "league_id": args.league_id,
+            "round_size": len(fixture.upcoming[args.league_id]),
+            "build_s": round(fixture_s, 3),
+            **fixture.info,
+        },
+        "config": {
+            "cold_runs": args.cold_runs,
+            "warm_runs": args.warm_runs,
+            "storage_latency_ms": args.storage_latency_ms,
+            "odds_latency_ms": args.odds_latency_ms,
+        },
+        "thresholds": thresholds,
+        "stages": stages,
+    }
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        report["comparison"] = {"baseline": args.baseline, **compare_reports(report, baseline, thresholds)}
+
+    _print_table(report)
+    if args.output:
+        out = Path(args.output)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nReport written: {out}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.fail_on_regression and report.get("comparison", {}).get("regressions"):
+        return 1
+    if any(s.get("status") == "error" for s in stages.values()):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
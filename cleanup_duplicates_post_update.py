@@ -21,7 +21,7 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(ROOT / "rugby-ai-predictor"))
 
-from prediction.db import ensure_configured_leagues
+from prediction.db import ensure_configured_leagues, ensure_fixture_key, refresh_league_summary
 
 # Canonical configured leagues. Mirrors rugby-ai-predictor/prediction/config.py
 # (LEAGUE_MAPPINGS). Imported from config when its deps are available, otherwise
@@ -65,25 +65,28 @@ def cleanup_database(db_path: str = "data.sqlite") -> int:
     ensured = ensure_configured_leagues(conn, league_names)
     print(f"Ensured {ensured} configured league rows exist")
 
-    # 2. Remove duplicate events (same league, date, teams) - keep the lowest id.
+    # 2. Remove duplicate events (same league, date, teams). Each fixture's
+    #    canonical row carries the unique `fixture_key`; duplicates are the
+    #    unkeyed rows whose computed key resolves to it through the index.
+    backfilled = ensure_fixture_key(conn)
+    if backfilled:
+        print(f"Backfilled fixture keys for {backfilled} events")
     cursor.execute(
         """
-        SELECT league_id, DATE(date_event), home_team_id, away_team_id,
-               COUNT(*) AS count, GROUP_CONCAT(id) AS ids
-        FROM event
-        GROUP BY league_id, DATE(date_event), home_team_id, away_team_id
-        HAVING COUNT(*) > 1
+        SELECT d.id, k.id
+        FROM event d
+        JOIN event k
+          ON k.fixture_key = d.league_id || '|' || DATE(d.date_event) || '|' || d.home_team_id || '|' || d.away_team_id
+        WHERE d.fixture_key IS NULL AND k.id != d.id
         """
     )
     duplicates = cursor.fetchall()
     dup_deleted = 0
-    for dup in duplicates:
-        ids = sorted(int(x) for x in str(dup[5]).split(","))
-        for del_id in ids[1:]:
-            cursor.execute("DELETE FROM event WHERE id = ?", (del_id,))
-            dup_deleted += 1
+    if duplicates:
+        cursor.executemany("DELETE FROM event WHERE id = ?", [(dup_id,) for dup_id, _keeper in duplicates])
+        dup_deleted = len(duplicates)
     if dup_deleted:
-        print(f"Removed {dup_deleted} duplicate events (from {len(duplicates)} groups)")
+        print(f"Removed {dup_deleted} duplicate events (from {len({keeper for _d, keeper in duplicates})} groups)")
     else:
         print("No duplicate events found")
 
@@ -121,6 +124,11 @@ def cleanup_database(db_path: str = "data.sqlite") -> int:
 
     conn.commit()
 
+    # 5. Rebuild the per-league counts `get_leagues` serves, now that the
+    #    event table is final for this run.
+    summarised = refresh_league_summary(conn)
+    print(f"Refreshed league summary for {summarised} leagues")
+
     # Final integrity report.
     cursor.execute("PRAGMA quick_check")
     check = cursor.fetchone()
@@ -0,0 +1,232 @@
+"""
+On-disk cache for built training datasets (feature tables, sequence tensors).
+
+Entries are directories of `.npy` files loaded with `mmap_mode="c"`, so a warm
+load maps the arrays instead of re-running feature engineering; callers get
+copy-on-write views and cannot corrupt the cache. Keys hash everything the
+build depends on: the event rows (`events_fingerprint`), the feature config,
+and the source of the feature module itself, so any DB change or feature-code
+edit lands on a new entry. The least recently used entries of each kind are
+pruned on write.
+
+`RUGBY_DATASET_CACHE_DIR` overrides the default `artifacts/dataset_cache`;
+set it to `off` to disable caching.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DATASET_CACHE_ENV = "RUGBY_DATASET_CACHE_DIR"
+DEFAULT_DATASET_CACHE_DIR = Path("artifacts") / "dataset_cache"
+# Bump when the on-disk layout changes.
+DATASET_CACHE_FORMAT = 1
+_EVENT_COLUMNS_SQL = """
+SELECT id, league_id, season, date_event, timestamp, home_team_id, away_team_id, home_score, away_score
+FROM event
+ORDER BY id
+"""
+_SOURCE_HASHES: Dict[str, str] = {}
+
+
+def _canonical(obj: Any) -> Any:
+    """JSON-safe, order-stable form of configs (dataclasses, tuple-keyed dicts, arrays)."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: _canonical(getattr(obj, f.name)) for f in dataclasses.fields(obj)}
+    if isinstance(obj, dict):
+        return sorted(([_canonical(k), _canonical(v)] for k, v in obj.items()), key=repr)
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return obj
+
+
+def fingerprint(*parts: Any) -> str:
+    """Short stable hash of arbitrary config parts."""
+    payload = json.dumps(_canonical(list(parts)), sort_keys=True, default=repr)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20]
+
+
+def source_fingerprint(module_file: str) -> str:
+    """Hash of a module's source, so editing the feature code invalidates its entries."""
+    cached = _SOURCE_HASHES.get(module_file)
+    if cached is None:
+        cached = hashlib.sha1(Path(module_file).read_bytes()).hexdigest()[:20]
+        _SOURCE_HASHES[module_file] = cached
+    return cached
+
+
+def events_fingerprint(conn: sqlite3.Connection) -> str:
+    """Hash of every `event` row the feature builders read."""
+    h = hashlib.sha1()
+    cur = conn.execute(_EVENT_COLUMNS_SQL)
+    while True:
+        rows = cur.fetchmany(5000)
+        if not rows:
+            break
+        h.update(repr(rows).encode("utf-8"))
+    return h.hexdigest()[:20]
+
+
+def frame_fingerprint(df: pd.DataFrame, columns: Any = None) -> str:
+    """Hash of a frame's values (and row order) over `columns`."""
+    view = df if columns is None else df[list(columns)]
+    hashed = pd.util.hash_pandas_object(view, index=False).to_numpy()
+    h = hashlib.sha1(hashed.tobytes())
+    h.update(repr(list(view.columns)).encode("utf-8"))
+    return h.hexdigest()[:20]
+
+
+def _is_plain_array_dtype(dtype: Any) -> bool:
+    return isinstance(dtype, np.dtype) and dtype.kind in "biufcmM"
+
+
+class DatasetCache:
+    """Directory of cached dataset entries, one sub-directory per (kind, key)."""
+
+    def __init__(self, root: Path, keep_per_kind: int = 6):
+        self.root = Path(root)
+        self.keep_per_kind = max(1, int(keep_per_kind))
+
+    def _entry(self, kind: str, key: str) -> Path:
+        return self.root / f"{kind}-{key}"
+
+    def _touch(self, path: Path) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _publish(self, kind: str, key: str, write: Callable[[Path], None]) -> None:
+        """Write into a private temp dir, then rename into place (safe under concurrent runs)."""
+        final = self._entry(kind, key)
+        tmp = self.root / f".tmp-{kind}-{key}-{uuid.uuid4().hex[:8]}"
+        try:
+            tmp.mkdir(parents=True)
+            write(tmp)
+            os.rename(tmp, final)
+        except OSError as exc:
+            # Another process published the same entry first, or the cache dir is read-only.
+            logger.debug("dataset cache write skipped for %s-%s: %s", kind, key, exc)
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        self._prune(kind)
+
+    def _prune(self, kind: str) -> None:
+        entries = sorted(self.root.glob(f"{kind}-*"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in entries[self.keep_per_kind :]:
+            shutil.rmtree(stale, ignore_errors=True)
+
+    def arrays(self, kind: str, key: str, build: Callable[[], Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """Cached dict of numpy arrays; a hit returns copy-on-write memory maps."""
+        entry = self._entry(kind, key)
+        meta_path = entry / "meta.json"
+        if meta_path.exists():
+            try:
+                names = json.loads(meta_path.read_text(encoding="utf-8"))["arrays"]
+                out = {name: np.load(entry / f"{i}.npy", mmap_mode="c") for i, name in enumerate(names)}
+                self._touch(entry)
+                return out
+            except (OSError, ValueError, KeyError) as exc:
+                logger.warning("dataset cache entry %s unreadable (%s); rebuilding", entry.name, exc)
+        built = build()
+
+        def write(tmp: Path) -> None:
+            names = list(built)
+            for i, name in enumerate(names):
+                np.save(tmp / f"{i}.npy", np.ascontiguousarray(built[name]), allow_pickle=False)
+            (tmp / "meta.json").write_text(json.dumps({"format": DATASET_CACHE_FORMAT, "arrays": names}), encoding="utf-8")
+
+        self._publish(kind, key, write)
+        return built
+
+    def frame(self, kind: str, key: str, build: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Cached DataFrame. Numeric and datetime columns (and the index) are stored
+        as `.npy`; anything else (strings, mixed objects) is pickled alongside.
+        """
+        entry = self._entry(kind, key)
+        meta_path = entry / "meta.json"
+        if meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                data = {col: np.load(entry / f"{i}.npy", mmap_mode="c") for i, col in meta["array_columns"]}
+                index = pd.Index(np.load(entry / "index.npy", mmap_mode="c"))
+                df = pd.DataFrame(data, index=index)
+                if meta["object_columns"]:
+                    objects = pd.read_pickle(entry / "objects.pkl")
+                    objects.index = df.index
+                    for col in meta["object_columns"]:
+                        df[col] = objects[col]
+                self._touch(entry)
+                return df[meta["columns"]]
+            except (OSError, ValueError, KeyError) as exc:
+                logger.warning("dataset cache entry %s unreadable (%s); rebuilding", entry.name, exc)
+        built = build()
+        if not _is_plain_array_dtype(built.index.dtype) or not built.columns.is_unique:
+            return built
+
+        def write(tmp: Path) -> None:
+            array_columns = []
+            object_columns = []
+            for i, col in enumerate(built.columns):
+                if _is_plain_array_dtype(built[col].dtype):
+                    np.save(tmp / f"{i}.npy", built[col].to_numpy(), allow_pickle=False)
+                    array_columns.append([i, col])
+                else:
+                    object_columns.append(col)
+            np.save(tmp / "index.npy", built.index.to_numpy(), allow_pickle=False)
+            if object_columns:
+                built[object_columns].reset_index(drop=True).to_pickle(tmp / "objects.pkl")
+            meta = {
+                "format": DATASET_CACHE_FORMAT,
+                "columns": list(built.columns),
+                "array_columns": array_columns,
+                "object_columns": object_columns,
+            }
+            (tmp / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+        self._publish(kind, key, write)
+        return built
+
+
+def default_dataset_cache() -> Optional[DatasetCache]:
+    """Cache at `$RUGBY_DATASET_CACHE_DIR` (default `artifacts/dataset_cache`), or None when set to `off`."""
+    raw = os.getenv(DATASET_CACHE_ENV, "").strip()
+    if raw.lower() in ("off", "0", "none", "false"):
+        return None
+    return DatasetCache(Path(raw) if raw else DEFAULT_DATASET_CACHE_DIR)
+
+
+def cached_feature_table(
+    conn: sqlite3.Connection,
+    config: Any,
+    cache: Optional[DatasetCache] = None,
+) -> pd.DataFrame:
+    """
+    `build_feature_table(conn, config)`, served from `cache` when the events are
+    unchanged. `cache=None` builds directly; pass `default_dataset_cache()`.
+    """
+    from prediction import features
+
+    if cache is None:
+        return features.build_feature_table(conn, config)
+    key = fingerprint(events_fingerprint(conn), config, source_fingerprint(features.__file__), DATASET_CACHE_FORMAT)
+    return cache.frame("features", key, lambda: features.build_feature_table(conn, config))
@@ -388,8 +388,8 @@ class NewsService:
             
             if self.predictor:
                 try:
-                    prediction = self.predictor.predict(
-                        home_team, away_team, league_id, match_date
+                    prediction = self.predictor.predict_match(
+                        home_team, away_team, league_id, match_date, match_id=match_id
                     )
                     if prediction:
                         home_prob = prediction.get('home_win_prob', 0.5)
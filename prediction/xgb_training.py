@@ -0,0 +1,185 @@
+"""
+Shared XGBoost training for the winner / home-score / away-score model triplet.
+
+`TripletTrainer` builds one `QuantileDMatrix` for a feature matrix and trains
+every head on it with the native `xgb.train`, relabelling the matrix between
+targets instead of letting each `fit` re-sketch the same X. Boosters are
+loaded back into the configured `XGBClassifier` / `XGBRegressor`, so callers
+and pickled artifacts keep the sklearn API; each head predicts exactly what
+`estimator.fit` on the same rows and parameters would.
+
+With `multi_output_scores=True` home and away scores are fitted as one
+two-target regressor (`multi_strategy="multi_output_tree"`: one tree set whose
+leaves hold both scores) and returned as `ScoreColumn` views in the
+`reg_home` / `reg_away` slots. The views are for in-process evaluation only:
+they refuse to pickle, so saved model artifacts keep plain estimators.
+
+`map_leagues` runs per-league jobs on a thread pool with an `nthread` budget:
+each job gets `total_threads // workers` XGBoost threads so concurrent leagues
+do not oversubscribe the CPU (XGBoost releases the GIL while training).
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+import xgboost as xgb
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Hyperparameters of the production XGBoost triplet (train_xgboost_models.py).
+DEFAULT_TRIPLET_PARAMS: Dict[str, Any] = {
+    "n_estimators": 200,
+    "max_depth": 6,
+    "learning_rate": 0.1,
+    "subsample": 0.8,
+    "colsample_bytree": 0.8,
+}
+
+
+class ScoreColumn:
+    """One target of a multi-output score regressor behind the single-target `predict` API."""
+
+    def __init__(self, regressor: Any, column: int):
+        self.regressor = regressor
+        self.column = int(column)
+
+    def predict(self, X: Any) -> np.ndarray:
+        return np.asarray(self.regressor.predict(X))[:, self.column]
+
+    def __reduce__(self):
+        raise TypeError("ScoreColumn is an in-process view; save plain single-target regressors instead")
+
+
+class TripletTrainer:
+    """
+    Fits triplet heads on one shared training matrix.
+
+    `params` are sklearn-estimator keyword arguments (defaults:
+    `DEFAULT_TRIPLET_PARAMS`); `nthread=0` leaves XGBoost on all cores. Heads
+    are fitted by relabelling the matrix, so one trainer (and the trainers
+    sharing its matrix via `with_params`) must not be used from two threads.
+    """
+
+    def __init__(
+        self,
+        X: Any,
+        params: Optional[Mapping[str, Any]] = None,
+        nthread: int = 0,
+        seed: int = 42,
+    ):
+        self.params = dict(DEFAULT_TRIPLET_PARAMS if params is None else params)
+        self.nthread = max(0, int(nthread))
+        self.seed = int(seed)
+        self.X = X
+        self.dtrain = xgb.QuantileDMatrix(
+            np.asarray(X),
+            max_bin=self.params.get("max_bin"),
+            nthread=self.nthread or None,
+        )
+
+    def with_params(self, params: Mapping[str, Any]) -> "TripletTrainer":
+        """A trainer for other hyperparameters on the same rows, reusing this matrix when the binning matches."""
+        params = dict(params)
+        if params.get("max_bin") != self.params.get("max_bin"):
+            return TripletTrainer(self.X, params=params, nthread=self.nthread, seed=self.seed)
+        trainer = copy.copy(self)
+        trainer.params = params
+        return trainer
+
+    def _estimator(self, cls: Any, eval_metric: str, **extra: Any) -> Any:
+        return cls(
+            **self.params,
+            random_state=self.seed,
+            eval_metric=eval_metric,
+            n_jobs=self.nthread or None,
+            **extra,
+        )
+
+    def _fit(self, estimator: Any, label: np.ndarray) -> Any:
+        self.dtrain.set_label(label)
+        booster = xgb.train(
+            estimator.get_xgb_params(),
+            self.dtrain,
+            num_boost_round=estimator.get_num_boosting_rounds(),
+        )
+        estimator.load_model(bytearray(booster.save_raw("json")))
+        return estimator
+
+    def winner(self, y_winner: Any) -> Any:
+        y_winner = np.asarray(y_winner)
+        # xgb.train does not validate labels; keep XGBClassifier.fit's error for single-class folds.
+        classes = np.unique(y_winner)
+        if len(classes) < 2:
+            raise ValueError(
+                f"Invalid classes inferred from unique values of `y`. Expected at least 2 classes, got {classes}"
+            )
+        return self._fit(self._estimator(xgb.XGBClassifier, "logloss"), y_winner)
+
+    def score(self, y_score: Any) -> Any:
+        return self._fit(self._estimator(xgb.XGBRegressor, "mae"), np.asarray(y_score))
+
+    def scores(self, y_home: Any, y_away: Any, multi_output: bool = False) -> Tuple[Any, Any]:
+        if not multi_output:
+            return self.score(y_home), self.score(y_away)
+        reg = self._fit(
+            self._estimator(xgb.XGBRegressor, "mae", multi_strategy="multi_output_tree"),
+            np.column_stack([np.asarray(y_home), np.asarray(y_away)]),
+        )
+        return ScoreColumn(reg, 0), ScoreColumn(reg, 1)
+
+    def triplet(
+        self,
+        y_winner: Any,
+        y_home: Any,
+        y_away: Any,
+        multi_output_scores: bool = False,
+    ) -> Tuple[Any, Any, Any]:
+        clf = self.winner(y_winner)
+        reg_home, reg_away = self.scores(y_home, y_away, multi_output=multi_output_scores)
+        return clf, reg_home, reg_away
+
+
+def train_triplet(
+    X: Any,
+    y_winner: Any,
+    y_home: Any,
+    y_away: Any,
+    params: Optional[Mapping[str, Any]] = None,
+    nthread: int = 0,
+    multi_output_scores: bool = False,
+    seed: int = 42,
+) -> Tuple[Any, Any, Any]:
+    """(clf, reg_home, reg_away) trained on one shared matrix of `X`."""
+    trainer = TripletTrainer(X, params=params, nthread=nthread, seed=seed)
+    return trainer.triplet(y_winner, y_home, y_away, multi_output_scores=multi_output_scores)
+
+
+def threads_per_worker(workers: int, total_threads: int = 0) -> int:
+    """XGBoost `nthread` for each of `workers` concurrent jobs sharing `total_threads` (0 = all cores)."""
+    total = int(total_threads) if int(total_threads) > 0 else (os.cpu_count() or 1)
+    return max(1, total // max(1, int(workers)))
+
+
+def map_leagues(
+    fn: Callable[[T, int], R],
+    items: Sequence[T],
+    workers: int = 1,
+    total_threads: int = 0,
+) -> List[R]:
+    """
+    `[fn(item, nthread) for item in items]`, run on up to `workers` threads.
+    Results keep input order; a single worker runs inline with the whole budget.
+    """
+    items = list(items)
+    workers = max(1, min(int(workers), len(items)))
+    if workers == 1:
+        return [fn(item, max(0, int(total_threads))) for item in items]
+    nthread = threads_per_worker(workers, total_threads)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda item: fn(item, nthread), items))
@@ -985,7 +985,7 @@ function App() {
     const seenEventIds = new Set();
 
     // Import predict helpers dynamically
-    const { predictMatch, predictMatchesBatch } = await import('./firebase');
+    const { predictMatch, predictMatchesBatchStream } = await import('./firebase');
 
     // Precompute unique match tasks (so we don't waste time on duplicates)
     const tasks = [];
@@ -1015,12 +1015,280 @@ function App() {
       tasks.push({ match, matchDate, matchupKey, odds });
     }
 
+    // Turn one backend prediction into the card shown for a task's fixture.
+    const buildDisplayPrediction = ({ match, matchDate, odds }, pred) => {
+      const kickoffAt = getKickoffAtFromMatch(match, selectedLeague);
+      const modelAvailable = pred.model_available !== false && pred.show_scores !== false;
+      const bookmakerHomeWinProb = pred.bookmaker_home_win_prob ?? null;
+      const bookmakerCount = pred.bookmaker_count ?? 0;
+
+      if (!modelAvailable) {
+        let homeWinProb = pred.home_win_prob ?? bookmakerHomeWinProb ?? 0.5;
+        let predictionType = pred.prediction_type || 'Bookmaker Odds Only';
+
+        if (odds && odds.home > 0 && odds.away > 0) {
+          const homeDecimal = parseFloat(odds.home);
+          const awayDecimal = parseFloat(odds.away);
+          if (homeDecimal > 0 && awayDecimal > 0) {
+            const homeProbRaw = 1.0 / homeDecimal;
+            const awayProbRaw = 1.0 / awayDecimal;
+            const totalProb = homeProbRaw + awayProbRaw;
+            homeWinProb = homeProbRaw / totalProb;
+            predictionType = 'Bookmaker Odds Only';
+          }
+        }
+
+        let winner;
+        let finalConfidence;
+        const apiWinner = pred.predicted_winner || pred.winner;
+        if (apiWinner === 'Draw' || apiWinner === 'draw') {
+          winner = 'Draw';
+          finalConfidence = 0.5;
+        } else if (apiWinner === 'Home' || apiWinner === match.home_team) {
+          winner = match.home_team;
+          finalConfidence = homeWinProb > 0.5 ? homeWinProb : 1 - homeWinProb;
+        } else if (apiWinner === 'Away' || apiWinner === match.away_team) {
+          winner = match.away_team;
+          finalConfidence = homeWinProb < 0.5 ? 1 - homeWinProb : homeWinProb;
+        } else if (homeWinProb > 0.5) {
+          winner = match.home_team;
+          finalConfidence = homeWinProb;
+        } else if (homeWinProb < 0.5) {
+          winner = match.away_team;
+          finalConfidence = 1 - homeWinProb;
+        } else {
+          winner = 'Draw';
+          finalConfidence = 0.5;
+        }
+
+        let confidenceLevel = 'Close Match Expected';
+        if (finalConfidence >= 0.8) {
+          confidenceLevel = 'High Confidence';
+        } else if (finalConfidence >= 0.65) {
+          confidenceLevel = 'Moderate Confidence';
+        }
+
+        return {
+          home_team: match.home_team,
+          away_team: match.away_team,
+          date: matchDate,
+          kickoff_at: kickoffAt,
+          winner,
+          predicted_winner: winner,
+          confidence: `${(finalConfidence * 100).toFixed(1)}%`,
+          home_score: null,
+          away_score: null,
+          show_scores: false,
+          model_available: false,
+          home_win_prob: homeWinProb,
+          league_id: selectedLeague,
+          intensity: 'Odds-based pick (no AI score yet)',
+          confidence_level: confidenceLevel,
+          score_diff: null,
+          prediction_type: predictionType,
+          ai_probability: null,
+          hybrid_probability: homeWinProb,
+          bookmaker_probability: bookmakerHomeWinProb ?? homeWinProb,
+          bookmaker_count: bookmakerCount,
+          confidence_boost: 0,
+          home_team_id: match.home_team_id,
+          away_team_id: match.away_team_id,
+          live_odds_available: bookmakerCount > 0 || !!(odds && odds.home > 0 && odds.away > 0),
+          manual_odds: odds,
+        };
+      }
+
+      // Extract AI prediction values (matching Streamlit make_expert_prediction)
+      const aiHomeWinProb = pred.ai_home_win_prob ?? pred.home_win_prob ?? 0.5;
+      const backendHybridProb = pred.hybrid_home_win_prob ?? pred.home_win_prob ?? aiHomeWinProb;
+      const predictedHomeScore = parseFloat(pred.predicted_home_score || 0);
+      const predictedAwayScore = parseFloat(pred.predicted_away_score || 0);
+      const displayHomeScore = Math.round(predictedHomeScore);
+      const displayAwayScore = Math.round(predictedAwayScore);
+      const isDisplayedDraw = displayHomeScore === displayAwayScore;
+
+      // Start from backend output (can already be Hybrid AI + Live Odds).
+      let homeWinProb = backendHybridProb;
+      let predictionType = pred.prediction_type || (bookmakerCount > 0 ? 'Hybrid AI + Live Odds' : 'AI Only (No Odds)');
+
+      if (odds && odds.home > 0 && odds.away > 0) {
+        try {
+          const homeDecimal = parseFloat(odds.home);
+          const awayDecimal = parseFloat(odds.away);
+
+          if (homeDecimal > 0 && awayDecimal > 0) {
+            const homeProbRaw = 1.0 / homeDecimal;
+            const awayProbRaw = 1.0 / awayDecimal;
+            const totalProb = homeProbRaw + awayProbRaw;
+            const oddsHomeWinProb = homeProbRaw / totalProb;
+
+            const aiWeight = 0.4;
+            const oddsWeight = 0.6;
+            homeWinProb = aiWeight * aiHomeWinProb + oddsWeight * oddsHomeWinProb;
+
+            predictionType = 'Hybrid AI + Manual Odds';
+          }
+        } catch (e) {
+          predictionType = 'AI Only (Invalid Manual Odds)';
+        }
+      }
+
+      let winner;
+      let finalConfidence;
+      // Use predicted_winner from API when available; otherwise derive from scores (allow Draw)
+      const apiWinner = pred.predicted_winner || pred.winner;
+      if (apiWinner === 'Draw' || apiWinner === 'draw') {
+        winner = 'Draw';
+        finalConfidence = 0.5;
+      } else if (apiWinner === 'Home' || apiWinner === match.home_team) {
+        winner = match.home_team;
+        finalConfidence = homeWinProb > 0.5 ? homeWinProb : 1 - homeWinProb;
+      } else if (apiWinner === 'Away' || apiWinner === match.away_team) {
+        winner = match.away_team;
+        finalConfidence = homeWinProb < 0.5 ? 1 - homeWinProb : homeWinProb;
+      } else if (isDisplayedDraw || predictedHomeScore === predictedAwayScore) {
+        winner = 'Draw';
+        finalConfidence = 0.5;
+      } else if (homeWinProb > 0.5) {
+        winner = match.home_team;
+        finalConfidence = homeWinProb;
+      } else if (homeWinProb < 0.5) {
+        winner = match.away_team;
+        finalConfidence = 1 - homeWinProb;
+      } else {
+        winner = 'Draw';
+        finalConfidence = 0.5;
+      }
+
+      // Keep displayed scores consistent with final winner after odds blending.
+      let alignedHomeScore = displayHomeScore;
+      let alignedAwayScore = displayAwayScore;
+      if (winner === match.away_team && alignedHomeScore >= alignedAwayScore) {
+        [alignedHomeScore, alignedAwayScore] = [alignedAwayScore, alignedHomeScore];
+      } else if (winner === match.home_team && alignedAwayScore >= alignedHomeScore) {
+        [alignedHomeScore, alignedAwayScore] = [alignedAwayScore, alignedHomeScore];
+      } else if (winner === 'Draw' && alignedHomeScore !== alignedAwayScore) {
+        const avg = Math.round((alignedHomeScore + alignedAwayScore) / 2);
+        alignedHomeScore = avg;
+        alignedAwayScore = avg;
+      }
+
+      const scoreDiff = Math.abs(alignedHomeScore - alignedAwayScore);
+      let intensity = 'Tight Margin (3-5 pts)';
+      if (scoreDiff <= 2) {
+        intensity = 'Narrow Margin (0-2 pts)';
+      } else if (scoreDiff <= 5) {
+        intensity = 'Tight Margin (3-5 pts)';
+      } else if (scoreDiff <= 10) {
+        intensity = 'Solid Margin (6-10 pts)';
+      } else {
+        intensity = 'Wide Margin (11+ pts)';
+      }
+
+      let confidenceLevel = 'Close Match Expected';
+      if (finalConfidence >= 0.8) {
+        confidenceLevel = 'High Confidence';
+      } else if (finalConfidence >= 0.65) {
+        confidenceLevel = 'Moderate Confidence';
+      }
+
+      const finalPrediction = {
+        home_team: match.home_team,
+        away_team: match.away_team,
+        date: matchDate,
+        kickoff_at: kickoffAt,
+        winner: winner,
+        predicted_winner: winner,
+        confidence: `${(finalConfidence * 100).toFixed(1)}%`,
+        home_score: alignedHomeScore.toString(),
+        away_score: alignedAwayScore.toString(),
+        home_win_prob: homeWinProb,
+        league_id: selectedLeague,
+        intensity: intensity,
+        confidence_level: confidenceLevel,
+        score_diff: alignedHomeScore - alignedAwayScore,
+        prediction_type: predictionType,
+        ai_probability: aiHomeWinProb,
+        hybrid_probability: homeWinProb,
+        bookmaker_probability: bookmakerHomeWinProb,
+        bookmaker_count: bookmakerCount,
+        confidence_boost: finalConfidence - Math.max(aiHomeWinProb, 1 - aiHomeWinProb),
+        home_team_id: match.home_team_id,
+        away_team_id: match.away_team_id,
+        live_odds_available: bookmakerCount > 0 || !!(odds && odds.home > 0 && odds.away > 0),
+        manual_odds: odds,
+        show_scores: true,
+        model_available: true,
+      };
+
+      return finalPrediction;
+    };
+
+    const publishPredictions = (list) => {
+      const dedupedPredictions = dedupeUpcomingMatches(
+        list.map((p) => ({
+          ...p,
+          date_event: p.date,
+          home_team: p.home_team,
+          away_team: p.away_team,
+          kickoff_at: p.kickoff_at,
+        })),
+        selectedLeague
+      ).map((p) => ({
+        ...p,
+        date: p.date_event || p.date,
+      }));
+      setPredictions(dedupedPredictions);
+    };
+
     // Fast path: ask the backend for the whole round in a single request.
     // It serves cached / snapshot predictions and computes only the misses,
     // so we avoid firing one Cloud Function call per match. We still fall back
     // to per-match calls below for anything the batch didn't return.
     const batchByEventId = new Map();
     const batchByNameKey = new Map();
+    // Render streamed predictions as each NDJSON line arrives, in task order,
+    // instead of waiting for the slowest fixture of the round.
+    const taskIndexByEventId = new Map();
+    const taskIndexByNameKey = new Map();
+    tasks.forEach(({ match, matchDate }, index) => {
+      const eid = String(match.id || match.event_id || '');
+      if (eid) {
+        taskIndexByEventId.set(eid, index);
+      }
+      taskIndexByNameKey.set(
+        `${canonicalTeamNameForPrediction(match.home_team)}::${canonicalTeamNameForPrediction(match.away_team)}::${matchDate}`,
+        index
+      );
+    });
+    const streamed = new Map();
+    const handleStreamedPrediction = (p) => {
+      if (!p || p.error) {
+        return;
+      }
+      if (p.event_id !== null && p.event_id !== undefined) {
+        batchByEventId.set(String(p.event_id), p);
+      }
+      batchByNameKey.set(`${p.home_team}::${p.away_team}::${p.match_date}`, p);
+      const index =
+        (p.event_id !== null && p.event_id !== undefined
+          ? taskIndexByEventId.get(String(p.event_id))
+          : undefined) ?? taskIndexByNameKey.get(`${p.home_team}::${p.away_team}::${p.match_date}`);
+      if (index === undefined) {
+        return;
+      }
+      try {
+        streamed.set(index, buildDisplayPrediction(tasks[index], p));
+      } catch (err) {
+        console.error('Exception rendering streamed prediction:', err);
+        return;
+      }
+      publishPredictions(
+        Array.from(streamed.keys())
+          .sort((a, b) => a - b)
+          .map((i) => streamed.get(i))
+      );
+    };
     try {
       const batchMatches = tasks.map(({ match, matchDate }) => ({
         event_id: match.id || match.event_id || null,
@@ -1028,19 +1296,15 @@ function App() {
         away_team: canonicalTeamNameForPrediction(match.away_team),
         match_date: matchDate,
       }));
-      const batchResult = await predictMatchesBatch({
-        league_id: selectedLeague,
-        matches: batchMatches,
-      });
-      const preds = batchResult?.data?.predictions || [];
-      for (const p of preds) {
-        if (p && !p.error) {
-          if (p.event_id !== null && p.event_id !== undefined) {
-            batchByEventId.set(String(p.event_id), p);
-          }
-          batchByNameKey.set(`${p.home_team}::${p.away_team}::${p.match_date}`, p);
-        }
-      }
+      // predictMatchesBatchStream reports every prediction through the callback,
+      // including when the backend answers with a plain JSON body.
+      await predictMatchesBatchStream(
+        {
+          league_id: selectedLeague,
+          matches: batchMatches,
+        },
+        handleStreamedPrediction
+      );
     } catch (batchErr) {
       console.warn('Batch prediction unavailable, using per-match fallback:', batchErr?.message);
     }
@@ -1077,8 +1341,7 @@ function App() {
     const runTask = async () => {
       while (taskIndex < tasks.length) {
         const currentIndex = taskIndex++;
-        const { match, matchDate, odds } = tasks[currentIndex];
-        const kickoffAt = getKickoffAtFromMatch(match, selectedLeague);
+        const { match, matchDate } = tasks[currentIndex];
 
         try {
           const result = await retryWithBackoff(async () => {
@@ -1101,212 +1364,7 @@ function App() {
           });
 
           if (result && result.data && !result.data.error) {
-            const pred = result.data;
-            const modelAvailable = pred.model_available !== false && pred.show_scores !== false;
-            const bookmakerHomeWinProb = pred.bookmaker_home_win_prob ?? null;
-            const bookmakerCount = pred.bookmaker_count ?? 0;
-
-            if (!modelAvailable) {
-              let homeWinProb = pred.home_win_prob ?? bookmakerHomeWinProb ?? 0.5;
-              let predictionType = pred.prediction_type || 'Bookmaker Odds Only';
-
-              if (odds && odds.home > 0 && odds.away > 0) {
-                const homeDecimal = parseFloat(odds.home);
-                const awayDecimal = parseFloat(odds.away);
-                if (homeDecimal > 0 && awayDecimal > 0) {
-                  const homeProbRaw = 1.0 / homeDecimal;
-                  const awayProbRaw = 1.0 / awayDecimal;
-                  const totalProb = homeProbRaw + awayProbRaw;
-                  homeWinProb = homeProbRaw / totalProb;
-                  predictionType = 'Bookmaker Odds Only';
-                }
-              }
-
-              let winner;
-              let finalConfidence;
-              const apiWinner = pred.predicted_winner || pred.winner;
-              if (apiWinner === 'Draw' || apiWinner === 'draw') {
-                winner = 'Draw';
-                finalConfidence = 0.5;
-              } else if (apiWinner === 'Home' || apiWinner === match.home_team) {
-                winner = match.home_team;
-                finalConfidence = homeWinProb > 0.5 ? homeWinProb : 1 - homeWinProb;
-              } else if (apiWinner === 'Away' || apiWinner === match.away_team) {
-                winner = match.away_team;
-                finalConfidence = homeWinProb < 0.5 ? 1 - homeWinProb : homeWinProb;
-              } else if (homeWinProb > 0.5) {
-                winner = match.home_team;
-                finalConfidence = homeWinProb;
-              } else if (homeWinProb < 0.5) {
-                winner = match.away_team;
-                finalConfidence = 1 - homeWinProb;
-              } else {
-                winner = 'Draw';
-                finalConfidence = 0.5;
-              }
-
-              let confidenceLevel = 'Close Match Expected';
-              if (finalConfidence >= 0.8) {
-                confidenceLevel = 'High Confidence';
-              } else if (finalConfidence >= 0.65) {
-                confidenceLevel = 'Moderate Confidence';
-              }
-
-              newPredictions.push({
-                home_team: match.home_team,
-                away_team: match.away_team,
-                date: matchDate,
-                kickoff_at: kickoffAt,
-                winner,
-                predicted_winner: winner,
-                confidence: `${(finalConfidence * 100).toFixed(1)}%`,
-                home_score: null,
-                away_score: null,
-                show_scores: false,
-                model_available: false,
-                home_win_prob: homeWinProb,
-                league_id: selectedLeague,
-                intensity: 'Odds-based pick (no AI score yet)',
-                confidence_level: confidenceLevel,
-                score_diff: null,
-                prediction_type: predictionType,
-                ai_probability: null,
-                hybrid_probability: homeWinProb,
-                bookmaker_probability: bookmakerHomeWinProb ?? homeWinProb,
-                bookmaker_count: bookmakerCount,
-                confidence_boost: 0,
-                home_team_id: match.home_team_id,
-                away_team_id: match.away_team_id,
-                live_odds_available: bookmakerCount > 0 || !!(odds && odds.home > 0 && odds.away > 0),
-                manual_odds: odds,
-              });
-              continue;
-            }
-
-            // Extract AI prediction values (matching Streamlit make_expert_prediction)
-            const aiHomeWinProb = pred.ai_home_win_prob ?? pred.home_win_prob ?? 0.5;
-            const backendHybridProb = pred.hybrid_home_win_prob ?? pred.home_win_prob ?? aiHomeWinProb;
-            const predictedHomeScore = parseFloat(pred.predicted_home_score || 0);
-            const predictedAwayScore = parseFloat(pred.predicted_away_score || 0);
-            const displayHomeScore = Math.round(predictedHomeScore);
-            const displayAwayScore = Math.round(predictedAwayScore);
-            const isDisplayedDraw = displayHomeScore === displayAwayScore;
-
-            // Start from backend output (can already be Hybrid AI + Live Odds).
-            let homeWinProb = backendHybridProb;
-            let predictionType = pred.prediction_type || (bookmakerCount > 0 ? 'Hybrid AI + Live Odds' : 'AI Only (No Odds)');
-
-            if (odds && odds.home > 0 && odds.away > 0) {
-              try {
-                const homeDecimal = parseFloat(odds.home);
-                const awayDecimal = parseFloat(odds.away);
-
-                if (homeDecimal > 0 && awayDecimal > 0) {
-                  const homeProbRaw = 1.0 / homeDecimal;
-                  const awayProbRaw = 1.0 / awayDecimal;
-                  const totalProb = homeProbRaw + awayProbRaw;
-                  const oddsHomeWinProb = homeProbRaw / totalProb;
-
-                  const aiWeight = 0.4;
-                  const oddsWeight = 0.6;
-                  homeWinProb = aiWeight * aiHomeWinProb + oddsWeight * oddsHomeWinProb;
-
-                  predictionType = 'Hybrid AI + Manual Odds';
-                }
-              } catch (e) {
-                predictionType = 'AI Only (Invalid Manual Odds)';
-              }
-            }
-
-            let winner;
-            let finalConfidence;
-            // Use predicted_winner from API when available; otherwise derive from scores (allow Draw)
-            const apiWinner = pred.predicted_winner || pred.winner;
-            if (apiWinner === 'Draw' || apiWinner === 'draw') {
-              winner = 'Draw';
-              finalConfidence = 0.5;
-            } else if (apiWinner === 'Home' || apiWinner === match.home_team) {
-              winner = match.home_team;
-              finalConfidence = homeWinProb > 0.5 ? homeWinProb : 1 - homeWinProb;
-            } else if (apiWinner === 'Away' || apiWinner === match.away_team) {
-              winner = match.away_team;
-              finalConfidence = homeWinProb < 0.5 ? 1 - homeWinProb : homeWinProb;
-            } else if (isDisplayedDraw || predictedHomeScore === predictedAwayScore) {
-              winner = 'Draw';
-              finalConfidence = 0.5;
-            } else if (homeWinProb > 0.5) {
-              winner = match.home_team;
-              finalConfidence = homeWinProb;
-            } else if (homeWinProb < 0.5) {
-              winner = match.away_team;
-              finalConfidence = 1 - homeWinProb;
-            } else {
-              winner = 'Draw';
-              finalConfidence = 0.5;
-            }
-
-            // Keep displayed scores consistent with final winner after odds blending.
-            let alignedHomeScore = displayHomeScore;
-            let alignedAwayScore = displayAwayScore;
-            if (winner === match.away_team && alignedHomeScore >= alignedAwayScore) {
-              [alignedHomeScore, alignedAwayScore] = [alignedAwayScore, alignedHomeScore];
-            } else if (winner === match.home_team && alignedAwayScore >= alignedHomeScore) {
-              [alignedHomeScore, alignedAwayScore] = [alignedAwayScore, alignedHomeScore];
-            } else if (winner === 'Draw' && alignedHomeScore !== alignedAwayScore) {
-              const avg = Math.round((alignedHomeScore + alignedAwayScore) / 2);
-              alignedHomeScore = avg;
-              alignedAwayScore = avg;
-            }
-
-            const scoreDiff = Math.abs(alignedHomeScore - alignedAwayScore);
-            let intensity = 'Tight Margin (3-5 pts)';
-            if (scoreDiff <= 2) {
-              intensity = 'Narrow Margin (0-2 pts)';
-            } else if (scoreDiff <= 5) {
-              intensity = 'Tight Margin (3-5 pts)';
-            } else if (scoreDiff <= 10) {
-              intensity = 'Solid Margin (6-10 pts)';
-            } else {
-              intensity = 'Wide Margin (11+ pts)';
-            }
-
-            let confidenceLevel = 'Close Match Expected';
-            if (finalConfidence >= 0.8) {
-              confidenceLevel = 'High Confidence';
-            } else if (finalConfidence >= 0.65) {
-              confidenceLevel = 'Moderate Confidence';
-            }
-
-            const finalPrediction = {
-              home_team: match.home_team,
-              away_team: match.away_team,
-              date: matchDate,
-              kickoff_at: kickoffAt,
-              winner: winner,
-              predicted_winner: winner,
-              confidence: `${(finalConfidence * 100).toFixed(1)}%`,
-              home_score: alignedHomeScore.toString(),
-              away_score: alignedAwayScore.toString(),
-              home_win_prob: homeWinProb,
-              league_id: selectedLeague,
-              intensity: intensity,
-              confidence_level: confidenceLevel,
-              score_diff: alignedHomeScore - alignedAwayScore,
-              prediction_type: predictionType,
-              ai_probability: aiHomeWinProb,
-              hybrid_probability: homeWinProb,
-              bookmaker_probability: bookmakerHomeWinProb,
-              bookmaker_count: bookmakerCount,
-              confidence_boost: finalConfidence - Math.max(aiHomeWinProb, 1 - aiHomeWinProb),
-              home_team_id: match.home_team_id,
-              away_team_id: match.away_team_id,
-              live_odds_available: bookmakerCount > 0 || !!(odds && odds.home > 0 && odds.away > 0),
-              manual_odds: odds,
-              show_scores: true,
-              model_available: true,
-            };
-
-            newPredictions.push(finalPrediction);
+            newPredictions.push(buildDisplayPrediction(tasks[currentIndex], result.data));
           } else {
             if (result?.data?.error) {
               console.error('Prediction error:', result.data.error);
@@ -1320,20 +1378,7 @@ function App() {
 
     await Promise.all(Array.from({ length: concurrency }, () => runTask()));
 
-    const dedupedPredictions = dedupeUpcomingMatches(
-      newPredictions.map((p) => ({
-        ...p,
-        date_event: p.date,
-        home_team: p.home_team,
-        away_team: p.away_team,
-        kickoff_at: p.kickoff_at,
-      })),
-      selectedLeague
-    ).map((p) => ({
-      ...p,
-      date: p.date_event || p.date,
-    }));
-    setPredictions(dedupedPredictions);
+    publishPredictions(newPredictions);
     setGenerating(false);
   };
 
@@ -237,10 +237,13 @@ const HistoricalPredictions = ({ leagueId, leagueName }) => {
         });
       } else {
         let offset = 0;
+        let cursor = null;
         let pagesFetched = 0;
         let mergedData = null;
         while (pagesFetched < HISTORY_MAX_PAGES) {
-          const pagePayload = { ...payload, limit: HISTORY_BATCH_SIZE, offset };
+          const pagePayload = cursor
+            ? { ...payload, limit: HISTORY_BATCH_SIZE, cursor }
+            : { ...payload, limit: HISTORY_BATCH_SIZE, offset };
           const pageStart = performance.now();
           const page = await getHistoricalPredictions(pagePayload);
           const pageData = page?.data || {};
@@ -248,6 +251,7 @@ const HistoricalPredictions = ({ leagueId, leagueName }) => {
             requestId: page?.requestId || null,
             page: pagesFetched + 1,
             offset,
+            cursor,
             limit: HISTORY_BATCH_SIZE,
             returnedRows: pageData?.pagination?.returned_rows ?? null,
             totalRows: pageData?.pagination?.total_rows ?? null,
@@ -263,6 +267,11 @@ const HistoricalPredictions = ({ leagueId, leagueName }) => {
           }
           pagesFetched += 1;
           const hasMore = Boolean(pageData?.pagination?.has_more);
+          const nextCursor = pageData?.pagination?.next_cursor || null;
+          if (hasMore && nextCursor) {
+            cursor = nextCursor;
+            continue;
+          }
           const nextOffset = Number(pageData?.pagination?.next_offset ?? 0);
           if (!hasMore || !Number.isFinite(nextOffset) || nextOffset <= offset) break;
           offset = nextOffset;
@@ -78,6 +78,71 @@ export const predictMatchesBatch = async (data) => {
   return { data: json };
 };
 
+// Streaming variant of predictMatchesBatch. The backend emits NDJSON: cached /
+// snapshot predictions first, then live computations as each finishes, so
+// `onPrediction` can render most of a round before the slowest fixture is done.
+// Resolves with the same `{ data: { predictions, model_version, counts } }`
+// shape as predictMatchesBatch.
+export const predictMatchesBatchStream = async (data, onPrediction) => {
+  const url = 'https://us-central1-rugby-ai-61fd0.cloudfunctions.net/predict_matches_batch_http';
+
+  const response = await fetch(url, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      Accept: 'application/x-ndjson',
+    },
+    body: JSON.stringify({ ...(data || {}), stream: true }),
+  });
+
+  const contentType = response.headers.get('Content-Type') || '';
+  if (!response.ok || !contentType.includes('ndjson') || !response.body) {
+    const json = await response.json().catch(() => ({}));
+    if (!response.ok) {
+      throw new Error(json?.error || `HTTP error! status: ${response.status}`);
+    }
+    (json.predictions || []).forEach((p) => p && onPrediction?.(p));
+    return { data: json };
+  }
+
+  const predictions = [];
+  let summary = {};
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = '';
+
+  const handleLine = (line) => {
+    if (!line.trim()) return;
+    const message = JSON.parse(line);
+    if (message.type === 'prediction') {
+      predictions[message.index] = message.prediction;
+      onPrediction?.(message.prediction);
+    } else if (message.type === 'done') {
+      summary = message;
+    } else if (message.type === 'error') {
+      throw new Error(message.error || 'Batch prediction stream failed');
+    }
+  };
+
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffered += decoder.decode(value, { stream: true });
+    const lines = buffered.split('\n');
+    buffered = lines.pop();
+    lines.forEach(handleLine);
+  }
+  handleLine(buffered);
+
+  return {
+    data: {
+      predictions: predictions.filter(Boolean),
+      model_version: summary.model_version,
+      counts: summary.counts,
+    },
+  };
+};
+
 export const getLiveMatches = async (data) => {
   // Use explicit HTTP endpoint with CORS headers to avoid browser CORS issues
   const url = 'https://us-central1-rugby-ai-61fd0.cloudfunctions.net/get_live_matches_http';
@@ -95,14 +160,51 @@ export const getLiveMatches = async (data) => {
   return { data: json };
 };
 
-export const getLeagues = () => {
+const LEAGUES_CACHE_STORAGE_KEY = 'rugby_ai_leagues_cache';
+
+export const getLeagues = async () => {
   const callable = httpsCallable(functionsRegion, 'get_leagues');
-  return callable({});
+  let cached = null;
+  try {
+    cached = JSON.parse(localStorage.getItem(LEAGUES_CACHE_STORAGE_KEY) || 'null');
+  } catch (_) {
+    cached = null;
+  }
+
+  // Send the last ETag so an unchanged league list comes back as a tiny not_modified reply.
+  const etag = cached && cached.etag && cached.data ? cached.etag : null;
+  const result = await callable(etag ? { etag } : {});
+  if (result?.data?.not_modified && etag) {
+    return { data: cached.data };
+  }
+  if (result?.data?.etag && Array.isArray(result.data.leagues)) {
+    try {
+      localStorage.setItem(
+        LEAGUES_CACHE_STORAGE_KEY,
+        JSON.stringify({ etag: result.data.etag, data: result.data })
+      );
+    } catch (_) {
+      // Storage full or unavailable; the next load just refetches.
+    }
+  }
+  return result;
 };
 
-export const getLeagueMetrics = (data) => {
+// Last metrics response per league; the server answers not_modified while its etag still matches.
+const leagueMetricsCache = new Map();
+
+export const getLeagueMetrics = async (data) => {
   const callable = httpsCallable(functionsRegion, 'get_league_metrics');
-  return callable(data);
+  const cacheKey = String(data?.league_id ?? '');
+  const cached = leagueMetricsCache.get(cacheKey);
+  const result = await callable(cached ? { ...data, etag: cached.etag } : data);
+  if (result?.data?.not_modified && cached) {
+    return { data: cached.data };
+  }
+  if (result?.data?.etag && !result.data.error) {
+    leagueMetricsCache.set(cacheKey, { etag: result.data.etag, data: result.data });
+  }
+  return result;
 };
 
 export const verifyLicenseKey = async (data) => {
@@ -413,9 +515,16 @@ const parseJsonSafely = (text) => {
   }
 };
 
+// Last body + ETag per history request, replayed when the server answers 304.
+const historyResponseCache = new Map();
+const HISTORY_RESPONSE_CACHE_MAX = 50;
+
 const postHistoryEndpoint = async ({ url, data, label, requestPrefix }) => {
   const requestId = data?.client_request_id || createHistoryRequestId(requestPrefix);
   const payload = { ...(data || {}), client_request_id: requestId };
+  const { client_request_id: _ignored, ...cacheParams } = payload;
+  const cacheKey = `${url}|${JSON.stringify(cacheParams)}`;
+  const cached = historyResponseCache.get(cacheKey);
   const startedAt = performance.now();
 
   console.log(`[${label}] HTTP request start`, {
@@ -431,6 +540,7 @@ const postHistoryEndpoint = async ({ url, data, label, requestPrefix }) => {
       headers: {
         'Content-Type': 'application/json',
         'X-Client-Request-Id': requestId,
+        ...(cached ? { 'If-None-Match': cached.etag } : {}),
       },
       body: JSON.stringify(payload),
     });
@@ -448,6 +558,16 @@ const postHistoryEndpoint = async ({ url, data, label, requestPrefix }) => {
 
   const durationMs = Number((performance.now() - startedAt).toFixed(1));
   const responseHeaders = headersToObject(response.headers);
+
+  if (response.status === 304 && cached) {
+    console.log(`[${label}] HTTP response not modified`, { requestId, url, durationMs });
+    return {
+      data: cached.data,
+      requestId,
+      responseHeaders,
+      status: response.status,
+    };
+  }
   const rawText = await response.text().catch(() => '');
   const parsedJson = parseJsonSafely(rawText);
   const bodyPreview = previewResponseBody(rawText);
@@ -485,6 +605,15 @@ const postHistoryEndpoint = async ({ url, data, label, requestPrefix }) => {
     throw error;
   }
 
+  const etag = response.headers.get('ETag');
+  if (etag && parsedJson) {
+    historyResponseCache.delete(cacheKey);
+    historyResponseCache.set(cacheKey, { etag, data: parsedJson });
+    if (historyResponseCache.size > HISTORY_RESPONSE_CACHE_MAX) {
+      historyResponseCache.delete(historyResponseCache.keys().next().value);
+    }
+  }
+
   return {
     data: parsedJson ?? {},
     requestId,
@@ -5,30 +5,63 @@ Handles callable functions for predictions, matches, and data
 
 from firebase_functions import https_fn
 from firebase_functions.options import set_global_options
-from firebase_admin import initialize_app, firestore
-from collections import Counter
+from collections import Counter, OrderedDict
+import base64
 import hashlib
 from html import unescape
+import importlib
 import logging
+import math
 import os
 import json
 import re
-import requests
 import secrets
 import string
+import threading
 import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, TYPE_CHECKING
+from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
 
-# Import Firestore Timestamp for type checking
-try:
-    from google.cloud.firestore_v1 import Timestamp as FirestoreTimestamp  # type: ignore
-except ImportError:
-    FirestoreTimestamp = None
+
+class _LazyModule:
+    """
+    Module proxy that defers the real import until the first attribute access.
+
+    Every function in this file shares one cold start, so module-level imports
+    are paid by every endpoint. Heavy clients (Firestore/gRPC) go through this
+    proxy so that endpoints which never touch them (e.g. the video proxy) do not
+    import them at all.
+    """
+
+    def __init__(self, module_name: str):
+        self._module_name = module_name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._module_name)
+        return self._module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+
+# `firebase_admin.firestore` imports google-cloud-firestore (grpc + protobuf) eagerly.
+firestore = _LazyModule("firebase_admin.firestore")
 
 
 _TRANSLATABLE_NEWS_TYPES = {"social_media", "external_news"}
-_TRANSLATION_CACHE: Dict[str, Dict[str, str]] = {}
+# Translations are keyed by sha256(source text). The in-memory tier is an LRU
+# bounded by TRANSLATION_CACHE_MAX; misses fall through to the shared Firestore
+# collection and only then to (batched) Google Translate calls.
+_TRANSLATION_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_TRANSLATION_CACHE_MAX = int(os.getenv("TRANSLATION_CACHE_MAX", "5000"))
+_TRANSLATION_CACHE_LOCK = threading.Lock()
+_TRANSLATION_CACHE_COLLECTION = "translation_cache_v1"
+# Google Translate v2 accepts at most 128 segments per request; keep payloads
+# well under the request size limit as well.
+_TRANSLATE_BATCH_MAX_ITEMS = 128
+_TRANSLATE_BATCH_MAX_CHARS = 25000
 _TRANSLATION_CLIENT = None
 _TRANSLATION_CLIENT_READY = False
 _EMOJI_JOINER_CHARS = {"\u200d", "\ufe0f", "\ufe0e", "\u20e3"}
@@ -133,60 +166,174 @@ def _normalize_text_for_compare(value: Any) -> str:
     return re.sub(r"\s+", " ", str(value or "").strip()).lower()
 
 
-def _translate_text_to_english(value: Any) -> str:
-    """Translate arbitrary post text to English with a small process cache."""
-    text = str(value or "").strip()
-    if not _should_attempt_translation(text):
-        return text
+def _translation_cache_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
-    cache_key = hashlib.sha256(text.encode("utf-8")).hexdigest()
-    cached = _TRANSLATION_CACHE.get(cache_key)
-    if cached:
-        return cached.get("text", text)
 
-    client = _get_translation_client()
-    if client is None:
-        return text
+def _translation_cache_get(cache_key: str) -> Optional[str]:
+    with _TRANSLATION_CACHE_LOCK:
+        translated = _TRANSLATION_CACHE.get(cache_key)
+        if translated is not None:
+            _TRANSLATION_CACHE.move_to_end(cache_key)
+        return translated
+
 
+def _translation_cache_put(cache_key: str, translated: str) -> None:
+    with _TRANSLATION_CACHE_LOCK:
+        _TRANSLATION_CACHE[cache_key] = translated
+        _TRANSLATION_CACHE.move_to_end(cache_key)
+        while len(_TRANSLATION_CACHE) > _TRANSLATION_CACHE_MAX:
+            _TRANSLATION_CACHE.popitem(last=False)
+
+
+def _load_persisted_translations(cache_keys: List[str]) -> Dict[str, str]:
+    """Read translations shared across instances; failures just mean more API calls."""
+    if not cache_keys:
+        return {}
+    found: Dict[str, str] = {}
     try:
-        result = client.translate(text, target_language="en", format_="text")
-        translated = unescape(str(result.get("translatedText") or text)).strip() or text
-        translated = _restore_missing_emojis(text, translated)
-        _TRANSLATION_CACHE[cache_key] = {"text": translated}
-        return translated
+        db = get_firestore_client()
+        col = db.collection(_TRANSLATION_CACHE_COLLECTION)
+        for snap in db.get_all([col.document(key) for key in cache_keys]):
+            if not snap.exists:
+                continue
+            translated = (snap.to_dict() or {}).get("text")
+            if isinstance(translated, str):
+                found[snap.id] = translated
     except Exception as exc:
-        logging.getLogger(__name__).warning("News translation failed: %s", exc)
-        return text
+        logging.getLogger(__name__).warning("Translation cache read failed: %s", exc)
+    return found
+
+
+def _persist_translations(translations: Dict[str, str]) -> None:
+    if not translations:
+        return
+    try:
+        db = get_firestore_client()
+        col = db.collection(_TRANSLATION_CACHE_COLLECTION)
+        items = list(translations.items())
+        for start in range(0, len(items), 400):
+            batch = db.batch()
+            for cache_key, translated in items[start:start + 400]:
+                batch.set(col.document(cache_key), {"text": translated, "target": "en"})
+            batch.commit()
+    except Exception as exc:
+        logging.getLogger(__name__).warning("Translation cache write failed: %s", exc)
+
+
+def _chunk_translation_requests(texts: List[str]) -> List[List[str]]:
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    current_chars = 0
+    for text in texts:
+        if current and (
+            len(current) >= _TRANSLATE_BATCH_MAX_ITEMS or current_chars + len(text) > _TRANSLATE_BATCH_MAX_CHARS
+        ):
+            chunks.append(current)
+            current, current_chars = [], 0
+        current.append(text)
+        current_chars += len(text)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _translate_texts_to_english(values: List[Any]) -> Dict[str, str]:
+    """
+    Translate many strings to English at once.
+
+    Returns a mapping of stripped source text -> English text (sources that need
+    no translation, or whose translation failed, map to themselves).
+    """
+    results: Dict[str, str] = {}
+    pending: Dict[str, str] = {}
+    seen: set = set()
+    for value in values:
+        text = str(value or "").strip()
+        if text in seen:
+            continue
+        seen.add(text)
+        if not _should_attempt_translation(text):
+            results[text] = text
+            continue
+        cache_key = _translation_cache_key(text)
+        cached = _translation_cache_get(cache_key)
+        if cached is not None:
+            results[text] = cached
+        else:
+            pending[cache_key] = text
+
+    if pending:
+        for cache_key, translated in _load_persisted_translations(list(pending)).items():
+            _translation_cache_put(cache_key, translated)
+            results[pending.pop(cache_key)] = translated
+
+    if not pending:
+        return results
+
+    client = _get_translation_client()
+    if client is None:
+        for text in pending.values():
+            results[text] = text
+        return results
+
+    fresh: Dict[str, str] = {}
+    key_by_text = {text: cache_key for cache_key, text in pending.items()}
+    for chunk in _chunk_translation_requests(list(pending.values())):
+        try:
+            response = client.translate(chunk, target_language="en", format_="text")
+        except Exception as exc:
+            logging.getLogger(__name__).warning("News translation failed: %s", exc)
+            for text in chunk:
+                results[text] = text
+            continue
+        for text, item in zip(chunk, response):
+            translated = unescape(str((item or {}).get("translatedText") or text)).strip() or text
+            translated = _restore_missing_emojis(text, translated)
+            results[text] = translated
+            fresh[key_by_text[text]] = translated
+            _translation_cache_put(key_by_text[text], translated)
+
+    _persist_translations(fresh)
+    return results
+
+
+def _translate_text_to_english(value: Any) -> str:
+    """Translate arbitrary post text to English (see `_translate_texts_to_english`)."""
+    text = str(value or "").strip()
+    return _translate_texts_to_english([text]).get(text, text)
 
 
 def _translate_news_items_to_english(news_items: Any) -> int:
     """
     Force third-party news items into English before the UI renders them.
+    All titles/contents of the feed are translated in one batched pass.
     Returns the number of fields updated.
     """
     if not isinstance(news_items, list):
         return 0
 
-    translated_fields = 0
+    targets: List[tuple] = []
     for item in news_items:
         if not isinstance(item, dict):
             continue
         if str(item.get("type") or "").strip() not in _TRANSLATABLE_NEWS_TYPES:
             continue
+        for field in ("title", "content"):
+            original = str(item.get(field) or "").strip()
+            if original:
+                targets.append((item, field, original))
 
-        original_title = str(item.get("title") or "").strip()
-        if original_title:
-            translated_title = _translate_text_to_english(original_title)
-            if translated_title != original_title:
-                item["title"] = translated_title
-                translated_fields += 1
+    if not targets:
+        return 0
 
-        original_content = str(item.get("content") or "").strip()
-        if original_content:
-            translated_content = _translate_text_to_english(original_content)
-            if translated_content != original_content:
-                item["content"] = translated_content
-                translated_fields += 1
+    translations = _translate_texts_to_english([original for _, _, original in targets])
+    translated_fields = 0
+    for item, field, original in targets:
+        translated = translations.get(original, original)
+        if translated != original:
+            item[field] = translated
+            translated_fields += 1
 
     return translated_fields
 
@@ -744,6 +891,8 @@ def get_firestore_client():
     """Lazy initialization of Firestore client"""
     global _app_initialized
     if not _app_initialized:
+        from firebase_admin import initialize_app
+
         try:
             initialize_app()
         except ValueError:
@@ -763,6 +912,7 @@ def _get_league_mappings():
 
 # Initialize predictors (lazy loading - will be imported when needed)
 _predictor = None
+_predictor_lock = threading.Lock()
 _enhanced_predictor = None
 LIVE_MODEL_FAMILY = os.getenv("LIVE_MODEL_FAMILY", "v4")
 LIVE_MODEL_CHANNEL = os.getenv("LIVE_MODEL_CHANNEL", "prod_100")
@@ -791,43 +941,46 @@ def get_predictor():
     
     global _predictor
     if _predictor is None:
-        try:
-            from prediction.hybrid_predictor import MultiLeaguePredictor as MLP
+        with _predictor_lock:
+            if _predictor is not None:
+                return _predictor
+            try:
+                from prediction.hybrid_predictor import MultiLeaguePredictor as MLP
 
-            # Resolve database path – prefer explicit env var, otherwise local file
-            db_path = os.getenv("DB_PATH")
-            if not db_path:
-                # Default to a bundled SQLite file in the same directory as this module
-                db_path = os.path.join(os.path.dirname(__file__), "data.sqlite")
-            logger.info(f"Initializing MultiLeaguePredictor with db_path={db_path!r}")
+                # Resolve database path – prefer explicit env var, otherwise local file
+                db_path = os.getenv("DB_PATH")
+                if not db_path:
+                    # Default to a bundled SQLite file in the same directory as this module
+                    db_path = os.path.join(os.path.dirname(__file__), "data.sqlite")
+                logger.info(f"Initializing MultiLeaguePredictor with db_path={db_path!r}")
 
-            # Models will be loaded from Cloud Storage
-            storage_bucket = os.getenv("MODEL_STORAGE_BUCKET", "rugby-ai-61fd0.firebasestorage.app")
-            logger.info(f"Using storage bucket: {storage_bucket}")
-            sportdevs_api_key = os.getenv("SPORTDEVS_API_KEY", "")
+                # Models will be loaded from Cloud Storage
+                storage_bucket = os.getenv("MODEL_STORAGE_BUCKET", "rugby-ai-61fd0.firebasestorage.app")
+                logger.info(f"Using storage bucket: {storage_bucket}")
+                sportdevs_api_key = os.getenv("SPORTDEVS_API_KEY", "")
             
-            # Pass all parameters explicitly to match the signature
-            try:
-                _predictor = MLP(
-                    db_path=db_path,
-                    sportdevs_api_key=sportdevs_api_key,
-                    artifacts_dir="artifacts",
-                    storage_bucket=storage_bucket,
-                )
-                logger.info("MultiLeaguePredictor initialized successfully")
-            except TypeError as e:
-                # Fallback: try without storage_bucket (for older versions)
-                logger.warning(f"Failed with storage_bucket, trying without: {e}")
-                _predictor = MLP(
-                    db_path=db_path,
-                    sportdevs_api_key=sportdevs_api_key,
-                    artifacts_dir="artifacts",
-                )
-                logger.info("MultiLeaguePredictor initialized without storage_bucket")
-        except ImportError as e:
-            raise ImportError(f"Could not import MultiLeaguePredictor: {e}")
-        except Exception as e:
-            raise Exception(f"Could not initialize MultiLeaguePredictor: {e}")
+                # Pass all parameters explicitly to match the signature
+                try:
+                    _predictor = MLP(
+                        db_path=db_path,
+                        sportdevs_api_key=sportdevs_api_key,
+                        artifacts_dir="artifacts",
+                        storage_bucket=storage_bucket,
+                    )
+                    logger.info("MultiLeaguePredictor initialized successfully")
+                except TypeError as e:
+                    # Fallback: try without storage_bucket (for older versions)
+                    logger.warning(f"Failed with storage_bucket, trying without: {e}")
+                    _predictor = MLP(
+                        db_path=db_path,
+                        sportdevs_api_key=sportdevs_api_key,
+                        artifacts_dir="artifacts",
+                    )
+                    logger.info("MultiLeaguePredictor initialized without storage_bucket")
+            except ImportError as e:
+                raise ImportError(f"Could not import MultiLeaguePredictor: {e}")
+            except Exception as e:
+                raise Exception(f"Could not initialize MultiLeaguePredictor: {e}")
     return _predictor
 
 
@@ -1044,6 +1197,11 @@ def predict_match(req: https_fn.CallableRequest) -> Dict[str, Any]:
         "match_date": "2025-11-22",
         "enhanced": false
     }
+
+    Standard (non-enhanced) predictions follow the same cache policy as
+    predict_matches_batch_http: a fresh `upcoming_prediction_cache_v1` doc for
+    the live model version is returned as is (pass "force_refresh": true to
+    skip it), and computed predictions are written back to that collection.
     """
     import logging
     logger = logging.getLogger(__name__)
@@ -1114,7 +1272,9 @@ def predict_match(req: https_fn.CallableRequest) -> Dict[str, Any]:
                 logger.info("Using standard predictor...")
                 predictor = get_predictor()
                 logger.info("Predictor obtained, calling predict_match...")
-                prediction = _run_standard_prediction(
+                # Served from / written to the shared upcoming-prediction cache,
+                # computed at most once across concurrent requests.
+                prediction, prediction_source = _shared_fixture_prediction(
                     predictor,
                     data,
                     league_id_int,
@@ -1122,7 +1282,7 @@ def predict_match(req: https_fn.CallableRequest) -> Dict[str, Any]:
                     str(away_team),
                     str(match_date),
                 )
-                logger.info(f"Prediction received: {prediction}")
+                logger.info(f"Prediction received ({prediction_source}): {prediction}")
             except FileNotFoundError as fnf:
                 import traceback
                 error_trace = traceback.format_exc()
@@ -1253,6 +1413,7 @@ def predict_match_http(req: https_fn.Request) -> https_fn.Response:
     """
     HTTP endpoint for match prediction with explicit CORS support
     Supports both GET and POST requests
+    Uses the same prediction cache and request coalescing as predict_match
     """
     import logging
     logger = logging.getLogger(__name__)
@@ -1268,6 +1429,10 @@ def predict_match_http(req: https_fn.Request) -> https_fn.Response:
         }
         return https_fn.Response('', status=204, headers=headers)
     
+    warm_up_response = _warm_up_ping_response(req, {"Access-Control-Allow-Origin": "*", "Content-Type": "application/json"})
+    if warm_up_response is not None:
+        return warm_up_response
+
     try:
         logger.info("=== predict_match_http called ===")
         
@@ -1336,7 +1501,7 @@ def predict_match_http(req: https_fn.Request) -> https_fn.Response:
                 logger.info("Using standard predictor...")
                 predictor = get_predictor()
                 logger.info("Predictor obtained, calling predict_match...")
-                prediction = _run_standard_prediction(
+                prediction, prediction_source = _shared_fixture_prediction(
                     predictor,
                     data,
                     league_id_int,
@@ -1344,7 +1509,7 @@ def predict_match_http(req: https_fn.Request) -> https_fn.Response:
                     str(away_team),
                     str(match_date),
                 )
-                logger.info(f"Prediction received: {prediction}")
+                logger.info(f"Prediction received ({prediction_source}): {prediction}")
             except Exception as e:
                 import traceback
                 error_trace = traceback.format_exc()
@@ -1470,6 +1635,117 @@ def predict_match_http(req: https_fn.Request) -> https_fn.Response:
 _UPCOMING_PRED_CACHE_COLLECTION = "upcoming_prediction_cache_v1"
 _UPCOMING_PRED_CACHE_TTL_SECONDS = 1800  # 30 minutes
 _UPCOMING_PRED_BATCH_MAX = 40
+# Live computations run concurrently only in streaming mode, where results are
+# emitted as each finishes.
+_UPCOMING_PRED_STREAM_WORKERS = int(os.getenv("UPCOMING_PRED_STREAM_WORKERS", "4"))
+# Cache write-backs are committed as chunked Firestore WriteBatches on a
+# background executor (Firestore caps a batch at 500 writes); responses never
+# wait for them.
+_PRED_CACHE_WRITE_ATTEMPTS = 3
+_PRED_CACHE_WRITE_CHUNK = 400
+_PRED_CACHE_WRITER = None
+_PRED_CACHE_WRITER_LOCK = threading.Lock()
+
+
+def _wants_ndjson_stream(req: Any, data: Dict[str, Any]) -> bool:
+    """True when the client asked for the NDJSON streaming response."""
+    if str(data.get("stream", "")).strip().lower() in {"1", "true", "yes", "ndjson"}:
+        return True
+    try:
+        return "application/x-ndjson" in str(req.headers.get("Accept", ""))
+    except Exception:
+        return False
+
+
+def _prediction_cache_doc(
+    pred: Dict[str, Any], item: Dict[str, Any], league_id_int: int, model_version: str
+) -> Dict[str, Any]:
+    """Firestore cache doc for a computed fixture prediction."""
+    return {
+        "event_id": item.get("event_id"),
+        "league_id": league_id_int,
+        "model_version": model_version,
+        "home_team": item.get("home_team"),
+        "away_team": item.get("away_team"),
+        "match_date": item.get("match_date"),
+        "prediction": pred,
+        "cached_at": firestore.SERVER_TIMESTAMP,
+        "cached_at_ms": int(time.time() * 1000),
+    }
+
+
+def _prediction_cache_writer() -> Any:
+    """Shared background executor for prediction cache write-backs."""
+    global _PRED_CACHE_WRITER
+    with _PRED_CACHE_WRITER_LOCK:
+        if _PRED_CACHE_WRITER is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            _PRED_CACHE_WRITER = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pred-cache-write")
+    return _PRED_CACHE_WRITER
+
+
+class _PredictionCacheWriteBack:
+    """
+    Fire-and-forget write-back of a request's computed predictions.
+
+    `add` queues the doc and makes sure a drain task is running on the shared
+    writer; the drain commits everything queued so far as one WriteBatch per
+    _PRED_CACHE_WRITE_CHUNK docs and repeats until the queue is empty. Docs
+    computed while a commit is in flight go out together in the next batch,
+    and the first fixture's lease is released without waiting for the rest of
+    the request. Nothing on the response path waits for a commit; failed
+    batches are retried a bounded number of times, then logged and dropped.
+
+    Trade-off: Cloud Run throttles CPU once the response is sent, so commits
+    still queued at that point run slowly (or are lost if the instance is
+    scaled in). That only costs a cache miss and lets lease waiters on other
+    instances time out after _PRED_LEASE_WAIT_SECONDS and compute themselves;
+    it never delays or fails a user response.
+    """
+
+    def __init__(self, db: Any, cache_col: Any):
+        self._db = db
+        self._cache_col = cache_col
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        self._draining = False
+        self._lock = threading.Lock()
+
+    def add(self, cache_key: str, doc: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pending.append((cache_key, doc))
+            if self._draining:
+                return
+            self._draining = True
+        _prediction_cache_writer().submit(self._drain)
+
+    def _drain(self) -> None:
+        while True:
+            with self._lock:
+                chunk = self._pending[:_PRED_CACHE_WRITE_CHUNK]
+                del self._pending[:_PRED_CACHE_WRITE_CHUNK]
+                if not chunk:
+                    self._draining = False
+                    return
+            self._commit(chunk)
+
+    def _commit(self, chunk: List[Tuple[str, Dict[str, Any]]]) -> None:
+        logger = logging.getLogger(__name__)
+        for attempt in range(_PRED_CACHE_WRITE_ATTEMPTS):
+            try:
+                batch = self._db.batch()
+                for cache_key, doc in chunk:
+                    batch.set(self._cache_col.document(cache_key), doc)
+                batch.commit()
+                return
+            except Exception as write_err:
+                if attempt + 1 >= _PRED_CACHE_WRITE_ATTEMPTS:
+                    logger.warning(
+                        f"Prediction cache write-back dropped {len(chunk)} docs after "
+                        f"{_PRED_CACHE_WRITE_ATTEMPTS} attempts: {write_err}"
+                    )
+                    return
+                time.sleep(0.25 * (2 ** attempt))
 
 
 def _batch_cache_key(event_id: Any, home_team: str, away_team: str, match_date: str) -> str:
@@ -1480,6 +1756,298 @@ def _batch_cache_key(event_id: Any, home_team: str, away_team: str, match_date:
     return "k_" + re.sub(r"[^a-z0-9]+", "_", raw).strip("_")[:200]
 
 
+# Request coalescing. Identical fixtures requested concurrently (a league round
+# opened by many users at once) share one computation: in-process through a
+# single-flight map, across instances through a short lease written onto the
+# fixture's cache doc. Lease holders are expected to finish well inside
+# _PRED_LEASE_SECONDS; waiters give up after _PRED_LEASE_WAIT_SECONDS and compute.
+_PRED_LEASE_SECONDS = 45
+_PRED_LEASE_WAIT_SECONDS = 8.0
+_PRED_LEASE_POLL_SECONDS = 0.5
+_INSTANCE_ID = f"{os.getenv('K_REVISION', 'local')}:{os.getpid()}:{secrets.token_hex(4)}"
+
+
+class _SingleFlight:
+    """Run one computation per key at a time; concurrent callers share its result."""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result: Any = None
+            self.error: Optional[BaseException] = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, "_SingleFlight._Call"] = {}
+
+    def do(self, key: str, fn) -> tuple:
+        """Return (result, shared). `shared` is True when another caller computed it."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._Call()
+                self._calls[key] = call
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+_prediction_flights = _SingleFlight()
+
+
+def _try_acquire_prediction_lease(db: Any, doc_ref: Any, model_version: str) -> bool:
+    """Mark a fixture's cache doc as "computing" unless another instance holds a live lease."""
+    now_ms = int(time.time() * 1000)
+
+    @firestore.transactional
+    def _acquire(transaction) -> bool:
+        snap = doc_ref.get(transaction=transaction)
+        doc = (snap.to_dict() or {}) if snap.exists else {}
+        holder = doc.get("lease_owner")
+        if (
+            holder
+            and holder != _INSTANCE_ID
+            and doc.get("lease_model_version") == model_version
+            and int(doc.get("lease_expires_ms") or 0) > now_ms
+        ):
+            return False
+        transaction.set(
+            doc_ref,
+            {
+                "lease_owner": _INSTANCE_ID,
+                "lease_model_version": model_version,
+                "lease_expires_ms": now_ms + _PRED_LEASE_SECONDS * 1000,
+            },
+            merge=True,
+        )
+        return True
+
+    return bool(_acquire(db.transaction()))
+
+
+def _release_prediction_lease(doc_ref: Any) -> None:
+    """Drop our lease without touching the cached prediction (best effort)."""
+    try:
+        doc_ref.update(
+            {
+                "lease_owner": firestore.DELETE_FIELD,
+                "lease_model_version": firestore.DELETE_FIELD,
+                "lease_expires_ms": firestore.DELETE_FIELD,
+            }
+        )
+    except Exception:
+        pass
+
+
+def _wait_for_leased_prediction(doc_ref: Any, model_version: str) -> Optional[Dict[str, Any]]:
+    """
+    Poll a leased cache doc until its holder writes a prediction, the lease lapses, or we time out.
+
+    The holder's write-back replaces the whole doc, so "lease fields gone" means
+    the prediction on the doc is the fresh one.
+    """
+    deadline = time.monotonic() + _PRED_LEASE_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(_PRED_LEASE_POLL_SECONDS)
+        snap = doc_ref.get()
+        if not snap.exists:
+            return None
+        doc = snap.to_dict() or {}
+        if not doc.get("lease_owner"):
+            pred = doc.get("prediction")
+            if isinstance(pred, dict) and doc.get("model_version") == model_version:
+                return pred
+            return None
+        if int(doc.get("lease_expires_ms") or 0) <= int(time.time() * 1000):
+            return None
+    return None
+
+
+def _coalesced_prediction(
+    cache_key: str,
+    model_version: str,
+    compute,
+    db: Any = None,
+    cache_col: Any = None,
+) -> tuple:
+    """
+    Compute a fixture prediction at most once across concurrent requests.
+
+    `compute` must return the prediction and, when it succeeds, write it to the
+    fixture's cache doc (which also clears the lease). Returns (prediction, source)
+    where source is "computed", "coalesced" (shared in-process) or "lease"
+    (computed by another instance while we waited).
+    """
+
+    def _lead() -> tuple:
+        if db is None or cache_col is None:
+            return compute(), "computed"
+        doc_ref = cache_col.document(cache_key)
+        try:
+            acquired = _try_acquire_prediction_lease(db, doc_ref, model_version)
+        except Exception as lease_err:
+            logging.getLogger(__name__).debug(f"Prediction lease unavailable for {cache_key}: {lease_err}")
+            return compute(), "computed"
+        if not acquired:
+            waited = _wait_for_leased_prediction(doc_ref, model_version)
+            if waited is not None:
+                return waited, "lease"
+        try:
+            return compute(), "computed"
+        except Exception:
+            _release_prediction_lease(doc_ref)
+            raise
+
+    (pred, source), shared = _prediction_flights.do(f"{cache_key}|{model_version}", _lead)
+    return pred, ("coalesced" if shared else source)
+
+
+def _compute_fixture_prediction(
+    predictor: Any,
+    request_data: Dict[str, Any],
+    league_id_int: int,
+    home_team: str,
+    away_team: str,
+    match_date: str,
+    write_back: Optional[_PredictionCacheWriteBack] = None,
+    cache_key: Optional[str] = None,
+    model_version: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run the standard prediction for one fixture and write it to the shared cache."""
+    pred = _run_standard_prediction(
+        predictor, request_data, league_id_int, home_team, away_team, match_date
+    )
+    pred.setdefault("model_type", LIVE_MODEL_FAMILY)
+    pred.setdefault("model_family", LIVE_MODEL_FAMILY)
+    pred.setdefault("model_channel", LIVE_MODEL_CHANNEL)
+    # Queue the write-back right away (best effort, never awaited). The full
+    # `set` also drops any "computing" lease fields, which is what releases
+    # waiting instances.
+    if write_back is not None and cache_key:
+        write_back.add(
+            cache_key,
+            _prediction_cache_doc(
+                pred,
+                {
+                    "event_id": request_data.get("event_id"),
+                    "home_team": home_team,
+                    "away_team": away_team,
+                    "match_date": match_date,
+                },
+                league_id_int,
+                model_version or _get_live_model_version(),
+            ),
+        )
+    return pred
+
+
+def _cache_ttl_seconds(data: Dict[str, Any]) -> int:
+    """Requested cache TTL (`ttl_seconds`), clamped to [60s, 6h]."""
+    try:
+        ttl_seconds = int(data.get("ttl_seconds", _UPCOMING_PRED_CACHE_TTL_SECONDS))
+    except (TypeError, ValueError):
+        ttl_seconds = _UPCOMING_PRED_CACHE_TTL_SECONDS
+    return max(60, min(ttl_seconds, 6 * 3600))
+
+
+def _force_refresh_requested(data: Dict[str, Any]) -> bool:
+    """`force_refresh` from a JSON body (bool) or a query string ("1"/"true"/"yes")."""
+    return str(data.get("force_refresh", "")).strip().lower() in {"1", "true", "yes"}
+
+
+def _fresh_cached_prediction(
+    doc: Dict[str, Any], model_version: str, ttl_seconds: int, now_ms: int
+) -> Optional[Dict[str, Any]]:
+    """The prediction on a cache doc when it was computed by `model_version` inside the TTL."""
+    if doc.get("model_version") != model_version:
+        return None
+    if now_ms - int(doc.get("cached_at_ms") or 0) > ttl_seconds * 1000:
+        return None
+    pred = doc.get("prediction")
+    return pred if isinstance(pred, dict) else None
+
+
+def _shared_fixture_prediction(
+    predictor: Any,
+    data: Dict[str, Any],
+    league_id_int: int,
+    home_team: str,
+    away_team: str,
+    match_date: str,
+) -> tuple:
+    """
+    Standard prediction for one fixture under the batch endpoint's cache policy.
+
+    Used by `predict_match` and `predict_match_http`, so a fixture requested
+    through any endpoint shares the `upcoming_prediction_cache_v1` doc of
+    `predict_matches_batch_http`: a doc written by the live model version inside
+    the TTL is served as is (unless `force_refresh`), otherwise the prediction is
+    computed once across concurrent requests and written back to that doc.
+    Odds-only requests are coalesced in-process but never read or write the
+    cache. Returns (prediction, source) with a per-caller copy of the prediction.
+    """
+    logger = logging.getLogger(__name__)
+    odds_only = bool(data.get("odds_only", False))
+    cache_key = _batch_cache_key(_parse_match_id_from_request(data), home_team, away_team, match_date)
+    model_version = _get_live_model_version()
+    db = None
+    cache_col = None
+    if odds_only:
+        cache_key += "|odds_only"
+    else:
+        try:
+            db = get_firestore_client()
+            cache_col = db.collection(_UPCOMING_PRED_CACHE_COLLECTION)
+        except Exception as fs_err:
+            logger.debug(f"Prediction cache unavailable: {fs_err}")
+
+    if cache_col is not None and not _force_refresh_requested(data):
+        try:
+            snap = cache_col.document(cache_key).get()
+            if snap.exists:
+                cached = _fresh_cached_prediction(
+                    snap.to_dict() or {}, model_version, _cache_ttl_seconds(data), int(time.time() * 1000)
+                )
+                if cached is not None:
+                    return dict(cached), "cache"
+        except Exception as read_err:
+            logger.warning(f"Prediction cache read failed for {cache_key}: {read_err}")
+
+    write_back = _PredictionCacheWriteBack(db, cache_col) if cache_col is not None else None
+    prediction, source = _coalesced_prediction(
+        cache_key,
+        model_version,
+        lambda: _compute_fixture_prediction(
+            predictor,
+            data,
+            league_id_int,
+            home_team,
+            away_team,
+            match_date,
+            write_back=write_back,
+            cache_key=cache_key,
+            model_version=model_version,
+        ),
+        db=db,
+        cache_col=cache_col,
+    )
+    # Shared results are per-caller copies; the response path mutates them.
+    return dict(prediction), source
+
+
 def _load_pre_kickoff_snapshot(
     db_path: str, match_id: Any, model_version: str
 ) -> Optional[Dict[str, Any]]:
@@ -1550,6 +2118,12 @@ def predict_matches_batch_http(req: https_fn.Request) -> https_fn.Response:
     Response JSON:
         {"predictions": [<raw prediction dict + event_id/home_team/away_team/match_date>],
          "model_version": "...", "counts": {...}}
+
+    Streaming mode (``"stream": true`` or ``Accept: application/x-ndjson``)
+    returns NDJSON instead: one ``{"type": "prediction", "index": i,
+    "prediction": {...}}`` line per fixture as soon as it is ready (cache and
+    snapshot hits first, then live computations as each finishes), followed by
+    ``{"type": "done", "model_version": ..., "counts": ..., "elapsed_ms": ...}``.
     """
     import logging
 
@@ -1568,6 +2142,10 @@ def predict_matches_batch_http(req: https_fn.Request) -> https_fn.Response:
             },
         )
 
+    warm_up_response = _warm_up_ping_response(req, cors_headers)
+    if warm_up_response is not None:
+        return warm_up_response
+
     try:
         data = req.get_json(silent=True) or {}
         league_id_raw = data.get("league_id")
@@ -1589,12 +2167,8 @@ def predict_matches_batch_http(req: https_fn.Request) -> https_fn.Response:
 
         matches = matches[:_UPCOMING_PRED_BATCH_MAX]
         model_version = str(data.get("model_version") or _get_live_model_version())
-        try:
-            ttl_seconds = int(data.get("ttl_seconds", _UPCOMING_PRED_CACHE_TTL_SECONDS))
-        except (TypeError, ValueError):
-            ttl_seconds = _UPCOMING_PRED_CACHE_TTL_SECONDS
-        ttl_seconds = max(60, min(ttl_seconds, 6 * 3600))
-        force_refresh = bool(data.get("force_refresh", False))
+        ttl_seconds = _cache_ttl_seconds(data)
+        force_refresh = _force_refresh_requested(data)
 
         db_path = os.getenv("DB_PATH") or os.path.join(os.path.dirname(__file__), "data.sqlite")
         now_ms = int(time.time() * 1000)
@@ -1641,91 +2215,122 @@ def predict_matches_batch_http(req: https_fn.Request) -> https_fn.Response:
                 for snap in db.get_all(refs):
                     if not snap.exists:
                         continue
-                    doc = snap.to_dict() or {}
-                    if doc.get("model_version") != model_version:
-                        continue
-                    cached_ms = doc.get("cached_at_ms") or 0
-                    if now_ms - int(cached_ms) > ttl_seconds * 1000:
-                        continue
-                    pred = doc.get("prediction")
-                    if isinstance(pred, dict):
+                    pred = _fresh_cached_prediction(snap.to_dict() or {}, model_version, ttl_seconds, now_ms)
+                    if pred is not None:
                         cached_by_key[snap.id] = pred
             except Exception as read_err:
                 logger.warning(f"Batch predict: cache read failed: {read_err}")
 
-        predictor = None
-        results: List[Dict[str, Any]] = []
-        counts = {"cache": 0, "snapshot": 0, "computed": 0, "failed": 0}
-
-        for item in normalized:
-            key = item["cache_key"]
-            home, away = item["home_team"], item["away_team"]
-            match_date, event_id = item["match_date"], item["event_id"]
+        counts = {"cache": 0, "snapshot": 0, "computed": 0, "coalesced": 0, "lease": 0, "failed": 0}
+        stream = _wants_ndjson_stream(req, data)
+        predictor_box: Dict[str, Any] = {}
+        write_back = _PredictionCacheWriteBack(db, cache_col) if cache_col is not None else None
 
-            pred: Optional[Dict[str, Any]] = None
-            source = "computed"
+        def _enrich(pred: Dict[str, Any], item: Dict[str, Any], source: str) -> Dict[str, Any]:
+            enriched = dict(pred)
+            enriched["event_id"] = item["event_id"]
+            enriched["home_team"] = item["home_team"]
+            enriched["away_team"] = item["away_team"]
+            enriched["match_date"] = item["match_date"]
+            enriched.setdefault("_source", source)
+            return enriched
+
+        def _compute(item: Dict[str, Any]) -> tuple:
+            if "predictor" not in predictor_box:
+                predictor_box["predictor"] = get_predictor()
+            key, event_id = item["cache_key"], item["event_id"]
+            pred, source = _coalesced_prediction(
+                key,
+                model_version,
+                lambda: _compute_fixture_prediction(
+                    predictor_box["predictor"],
+                    {"event_id": event_id, "match_id": event_id},
+                    league_id_int,
+                    item["home_team"],
+                    item["away_team"],
+                    item["match_date"],
+                    write_back=write_back,
+                    cache_key=key,
+                    model_version=model_version,
+                ),
+                db=db,
+                cache_col=cache_col,
+            )
+            return pred, source
 
-            cached = cached_by_key.get(key)
-            if cached is not None:
-                pred = cached
+        def _fixture_events():
+            """Yield (index, enriched prediction): cache/snapshot hits first, then computed ones."""
+            pending = []
+            for index, item in enumerate(normalized):
                 source = "cache"
-                counts["cache"] += 1
-
-            if pred is None:
-                snap_pred = _load_pre_kickoff_snapshot(db_path, event_id, model_version)
-                if snap_pred is not None:
-                    pred = snap_pred
+                pred = cached_by_key.get(item["cache_key"])
+                if pred is None:
                     source = "snapshot"
-                    counts["snapshot"] += 1
+                    pred = _load_pre_kickoff_snapshot(db_path, item["event_id"], model_version)
+                if pred is None:
+                    pending.append((index, item))
+                    continue
+                counts[source] += 1
+                yield index, _enrich(pred, item, source)
 
-            if pred is None:
+            def _finish(item: Dict[str, Any], compute_call) -> Dict[str, Any]:
                 try:
-                    if predictor is None:
-                        predictor = get_predictor()
-                    pred = _run_standard_prediction(
-                        predictor,
-                        {"event_id": event_id, "match_id": event_id},
-                        league_id_int,
-                        home,
-                        away,
-                        match_date,
-                    )
-                    pred.setdefault("model_type", LIVE_MODEL_FAMILY)
-                    pred.setdefault("model_family", LIVE_MODEL_FAMILY)
-                    pred.setdefault("model_channel", LIVE_MODEL_CHANNEL)
-                    counts["computed"] += 1
-                    # Write back to the shared cache (best effort).
-                    if cache_col is not None:
-                        try:
-                            cache_col.document(key).set(
-                                {
-                                    "event_id": event_id,
-                                    "league_id": league_id_int,
-                                    "model_version": model_version,
-                                    "home_team": home,
-                                    "away_team": away,
-                                    "match_date": match_date,
-                                    "prediction": pred,
-                                    "cached_at": firestore.SERVER_TIMESTAMP,
-                                    "cached_at_ms": now_ms,
-                                }
-                            )
-                        except Exception as write_err:
-                            logger.debug(f"Batch predict: cache write failed for {key}: {write_err}")
+                    pred, source = compute_call()
+                    counts[source] += 1
                 except Exception as compute_err:
                     counts["failed"] += 1
                     logger.warning(
-                        f"Batch predict failed for {home} vs {away}: {compute_err}"
+                        f"Batch predict failed for {item['home_team']} vs {item['away_team']}: {compute_err}"
                     )
-                    pred = {"error": str(compute_err)}
+                    pred, source = {"error": str(compute_err)}, "computed"
+                return _enrich(pred, item, source)
 
-            enriched = dict(pred)
-            enriched["event_id"] = event_id
-            enriched["home_team"] = home
-            enriched["away_team"] = away
-            enriched["match_date"] = match_date
-            enriched.setdefault("_source", source)
-            results.append(enriched)
+            if not stream or len(pending) <= 1:
+                for index, item in pending:
+                    yield index, _finish(item, lambda: _compute(item))
+                return
+
+            from concurrent.futures import ThreadPoolExecutor, as_completed
+
+            with ThreadPoolExecutor(max_workers=min(_UPCOMING_PRED_STREAM_WORKERS, len(pending))) as pool:
+                futures = {pool.submit(_compute, item): (index, item) for index, item in pending}
+                for future in as_completed(futures):
+                    index, item = futures[future]
+                    yield index, _finish(item, future.result)
+
+        if stream:
+            started = time.perf_counter()
+
+            def _ndjson():
+                try:
+                    for index, enriched in _fixture_events():
+                        yield json.dumps({"type": "prediction", "index": index, "prediction": enriched}) + "\n"
+                    yield json.dumps(
+                        {
+                            "type": "done",
+                            "model_version": model_version,
+                            "counts": counts,
+                            "elapsed_ms": int((time.perf_counter() - started) * 1000),
+                        }
+                    ) + "\n"
+                except Exception as stream_err:
+                    logger.error(f"predict_matches_batch_http stream error: {stream_err}")
+                    yield json.dumps({"type": "error", "error": str(stream_err)}) + "\n"
+
+            return https_fn.Response(
+                _ndjson(),
+                status=200,
+                headers={
+                    "Access-Control-Allow-Origin": "*",
+                    "Content-Type": "application/x-ndjson",
+                    "Cache-Control": "no-cache",
+                    "X-Accel-Buffering": "no",
+                },
+            )
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(normalized)
+        for index, enriched in _fixture_events():
+            results[index] = enriched
 
         return https_fn.Response(
             json.dumps(
@@ -1749,6 +2354,148 @@ def predict_matches_batch_http(req: https_fn.Request) -> https_fn.Response:
         )
 
 
+# Warm-up: preload champion models and prime the team-name / team-history
+# caches so the first user request after a scale-out is served at warm latency.
+_WARMUP_BUDGET_SECONDS = float(os.getenv("WARMUP_BUDGET_SECONDS", "90"))
+_WARMUP_HORIZON_DAYS = int(os.getenv("WARMUP_HORIZON_DAYS", "14"))
+# Only prediction instances warm themselves on start (FUNCTION_TARGET names the
+# function a given instance serves); licensing/news instances stay ML-free.
+_WARMUP_ON_START_TARGETS = {"predict_match", "predict_match_http", "predict_matches_batch_http"}
+_warm_up_state: Dict[str, Any] = {"started": False, "report": None}
+
+
+def _warm_up_league_ids() -> List[int]:
+    """WARMUP_LEAGUE_IDS (comma separated), else the champion map, else all configured leagues."""
+    raw = os.getenv("WARMUP_LEAGUE_IDS", "").strip()
+    if raw:
+        return [league_id for league_id in (_coerce_int(part) for part in raw.split(",")) if league_id]
+    try:
+        from prediction.hybrid_predictor import MultiLeaguePredictor
+
+        champion_map = MultiLeaguePredictor._load_champion_map()
+    except Exception:
+        champion_map = {}
+    if champion_map:
+        return sorted(int(league_id) for league_id in champion_map)
+    return sorted(int(league_id) for league_id in _get_league_mappings())
+
+
+def run_prediction_warm_up(
+    league_ids: Optional[List[int]] = None,
+    budget_seconds: Optional[float] = None,
+    horizon_days: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Preload models for `league_ids` within `budget_seconds` and return per-stage timings."""
+    started = time.perf_counter()
+    predictor = get_predictor()
+    predictor_init_s = round(time.perf_counter() - started, 4)
+    budget = _WARMUP_BUDGET_SECONDS if budget_seconds is None else float(budget_seconds)
+    report = predictor.warm_up(
+        league_ids if league_ids is not None else _warm_up_league_ids(),
+        budget_seconds=max(0.0, budget - predictor_init_s),
+        horizon_days=_WARMUP_HORIZON_DAYS if horizon_days is None else int(horizon_days),
+    )
+    report["predictor_init_s"] = predictor_init_s
+    report["elapsed_s"] = round(time.perf_counter() - started, 4)
+    _warm_up_state["report"] = report
+    return report
+
+
+def _start_background_warm_up() -> bool:
+    """Kick off a one-shot warm-up thread for this instance. Returns False if already started."""
+    if _warm_up_state["started"]:
+        return False
+    _warm_up_state["started"] = True
+
+    def _run() -> None:
+        try:
+            report = run_prediction_warm_up()
+            logging.getLogger(__name__).info("Startup warm-up finished: %s", json.dumps(report))
+        except Exception as warm_error:
+            logging.getLogger(__name__).warning("Startup warm-up failed: %s", warm_error)
+
+    threading.Thread(target=_run, name="prediction-warm-up", daemon=True).start()
+    return True
+
+
+_WARMUP_TRUTHY = {"1", "true", "yes"}
+
+
+def _warm_up_ping_response(req: https_fn.Request, cors_headers: Dict[str, str]) -> Optional[https_fn.Response]:
+    """Serve a scheduler warm-up ping on a prediction endpoint, or None for a normal request.
+
+    Each gen2 function is its own Cloud Run service, so only a ping to the
+    prediction endpoints themselves loads models into the instances that serve
+    users; the warm-up runs inside the request, where Cloud Run allocates CPU.
+
+    A ping is ``X-Warmup: 1`` or ``"warmup": true`` (JSON body or query).
+    Optional params:
+        league_ids: "4446,4986" or [4446, 4986] - defaults to WARMUP_LEAGUE_IDS / champions
+        budget_seconds: wall-clock budget, default WARMUP_BUDGET_SECONDS
+        horizon_days: upcoming-fixture window used to prime caches, default 14
+
+    Response JSON: the warm-up report with per-league stage timings.
+    """
+    data = req.get_json(silent=True) or {}
+    if not isinstance(data, dict) or not data:
+        data = dict(req.args)
+    flag = req.headers.get("X-Warmup") or data.get("warmup") or req.args.get("warmup")
+    if str(flag).strip().lower() not in _WARMUP_TRUTHY:
+        return None
+
+    import logging
+
+    logger = logging.getLogger(__name__)
+    try:
+        league_ids = None
+        raw_leagues = data.get("league_ids")
+        if isinstance(raw_leagues, list):
+            league_ids = [lid for lid in (_coerce_int(v) for v in raw_leagues) if lid]
+        elif raw_leagues:
+            league_ids = [lid for lid in (_coerce_int(v) for v in str(raw_leagues).split(",")) if lid]
+
+        budget_seconds = None
+        if data.get("budget_seconds") not in (None, ""):
+            try:
+                budget_seconds = float(data.get("budget_seconds"))
+            except (TypeError, ValueError):
+                budget_seconds = float("nan")
+            if not math.isfinite(budget_seconds):
+                return https_fn.Response(
+                    json.dumps({"error": "budget_seconds must be a number of seconds"}),
+                    status=400,
+                    headers=cors_headers,
+                )
+            budget_seconds = max(1.0, min(budget_seconds, 100.0))
+        horizon_days = _coerce_int(data.get("horizon_days"))
+
+        report = run_prediction_warm_up(league_ids, budget_seconds, horizon_days)
+        _warm_up_state["started"] = True
+        logger.info("Warm-up ping report (%s): %s", os.getenv("FUNCTION_TARGET", ""), json.dumps(report))
+        return https_fn.Response(json.dumps(report), status=200, headers=cors_headers)
+    except Exception as e:
+        import traceback
+
+        logger.error(f"Warm-up ping error: {e}")
+        return https_fn.Response(
+            json.dumps({"error": str(e), "traceback": traceback.format_exc()}),
+            status=500,
+            headers=cors_headers,
+        )
+
+
+# On by default for the prediction targets. The thread only makes progress
+# while the instance has CPU: with the default request-based CPU allocation
+# Cloud Run throttles it between requests, so deploy these services with
+# min-instances >= 1 and CPU always allocated (--no-cpu-throttling), or rely
+# on the scheduler's warm-up pings, which run inside a request.
+if (
+    os.getenv("WARMUP_ON_START", "1").strip().lower() in _WARMUP_TRUTHY
+    and os.getenv("FUNCTION_TARGET", "") in _WARMUP_ON_START_TARGETS
+):
+    _start_background_warm_up()
+
+
 @https_fn.on_call()
 def get_upcoming_matches(req: https_fn.CallableRequest) -> Dict[str, Any]:
     """
@@ -2187,78 +2934,430 @@ def get_live_matches_http(req: https_fn.Request) -> https_fn.Response:
         }
         return https_fn.Response(json.dumps(response_data), status=500, headers=headers)
 
+# Shared response cache for read endpoints whose output only changes when the
+# ingestion or training pipelines run. Keys fold in the SQLite data version and
+# the Firestore serving stamps (prediction.serving_version), so a pipeline bump
+# invalidates entries on every instance; repeat views are answered from memory
+# or with 304 when the client's If-None-Match still matches.
+_RESPONSE_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_RESPONSE_CACHE_MAX = int(os.getenv("RESPONSE_CACHE_MAX", "256"))
+_RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+_RESPONSE_CACHE_LOCK = threading.Lock()
+_RESPONSE_CACHE_STATE: Dict[str, Any] = {"bytes": 0}
+# Request fields that never change the response body.
+_RESPONSE_CACHE_IGNORED_PARAMS = {"client_request_id", "license_key", "cache_ttl_seconds", "refresh", "force_refresh"}
+# Standings also come from SportRadar, so their entries expire independently of the stamps.
+_STANDINGS_RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("STANDINGS_RESPONSE_CACHE_TTL_SECONDS", "900"))
+_SERVING_VERSION_TTL_SECONDS = float(os.getenv("SERVING_VERSION_TTL_SECONDS", "60"))
+_SERVING_VERSION_LOCK = threading.Lock()
+_SERVING_VERSION_STATE: Dict[str, Any] = {"stamp": "unknown", "checked_at": None}
+_SQLITE_VERSION_STAMPS: Dict[str, tuple] = {}
+
+
+def _resolve_functions_db_path() -> str:
+    """DB path resolution shared by the history endpoints (env, package dir, repo root)."""
+    db_path = os.getenv("DB_PATH")
+    if db_path:
+        return db_path
+    db_path = os.path.join(os.path.dirname(__file__), "data.sqlite")
+    if not os.path.exists(db_path):
+        db_path = os.path.join(os.path.dirname(__file__), "..", "data.sqlite")
+    return db_path
+
+
+def _sqlite_version_stamp(db_path: str) -> tuple:
+    """
+    (path, mtime, size, events data_version) for `db_path`.
+
+    The data version is read once per file identity, so a cache hit costs a
+    stat() rather than a SQLite connection.
+    """
+    abs_path = os.path.abspath(db_path)
+    try:
+        stat = os.stat(abs_path)
+    except OSError:
+        return (abs_path, None, None, None)
+    identity = (abs_path, stat.st_mtime_ns, stat.st_size)
+    cached = _SQLITE_VERSION_STAMPS.get(abs_path)
+    if cached is not None and cached[:3] == identity:
+        return cached
+    import sqlite3
+    from prediction.db import read_data_version
+
+    data_version = None
+    try:
+        conn = sqlite3.connect(abs_path)
+        try:
+            data_version = read_data_version(conn)
+        finally:
+            conn.close()
+    except Exception:
+        data_version = None
+    stamp = identity + (data_version,)
+    _SQLITE_VERSION_STAMPS[abs_path] = stamp
+    return stamp
+
+
+def _serving_version_stamp() -> str:
+    """Firestore serving stamp, re-read at most every SERVING_VERSION_TTL_SECONDS."""
+    now = time.monotonic()
+    with _SERVING_VERSION_LOCK:
+        checked_at = _SERVING_VERSION_STATE["checked_at"]
+        if checked_at is not None and now - checked_at < _SERVING_VERSION_TTL_SECONDS:
+            return _SERVING_VERSION_STATE["stamp"]
+        # Claim the refresh so concurrent requests keep using the previous stamp.
+        _SERVING_VERSION_STATE["checked_at"] = now
+    try:
+        from prediction.serving_version import read_serving_versions, serving_version_stamp
+
+        stamp = serving_version_stamp(read_serving_versions(get_firestore_client()))
+    except Exception as exc:
+        logging.getLogger(__name__).warning(f"Serving version read failed (keeping previous stamp): {exc}")
+        return _SERVING_VERSION_STATE["stamp"]
+    with _SERVING_VERSION_LOCK:
+        _SERVING_VERSION_STATE["stamp"] = stamp
+    return stamp
+
+
+def _normalize_cache_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop volatile fields and stringify scalars so `4414` and `"4414"` share an entry."""
+    normalized: Dict[str, Any] = {}
+    for key, value in (params or {}).items():
+        if key in _RESPONSE_CACHE_IGNORED_PARAMS or value is None or value == "":
+            continue
+        normalized[str(key)] = value if isinstance(value, (dict, list)) else str(value)
+    return normalized
+
+
+def _response_cache_key(endpoint: str, params: Dict[str, Any], db_path: Optional[str] = None) -> str:
+    parts = [
+        endpoint,
+        _normalize_cache_params(params),
+        list(_sqlite_version_stamp(db_path or _resolve_functions_db_path())),
+        _serving_version_stamp(),
+        _get_live_model_version(),
+        # Queries compare against date('now'), so entries also roll over daily.
+        datetime.utcnow().date().isoformat(),
+    ]
+    raw = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _payload_etag(payload: Any) -> str:
+    """Strong ETag over the payload, ignoring the per-request `request_id`."""
+    if isinstance(payload, dict) and "request_id" in payload:
+        payload = {k: v for k, v in payload.items() if k != "request_id"}
+    raw = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def _response_cache_get(key: str) -> Optional[Dict[str, Any]]:
+    with _RESPONSE_CACHE_LOCK:
+        entry = _RESPONSE_CACHE.get(key)
+        if entry is None:
+            return None
+        if entry["expires_at"] is not None and entry["expires_at"] <= time.monotonic():
+            _RESPONSE_CACHE.pop(key, None)
+            _RESPONSE_CACHE_STATE["bytes"] -= entry["size"]
+            return None
+        _RESPONSE_CACHE.move_to_end(key)
+        return entry
+
+
+def _response_cache_put(
+    key: str,
+    payload: Any,
+    body: Optional[bytes] = None,
+    ttl_seconds: Optional[float] = None,
+    with_request_id: bool = False,
+) -> Dict[str, Any]:
+    """
+    Store a payload (and its serialized body for HTTP endpoints); returns the entry.
+
+    `with_request_id` marks a body stored without its per-request `request_id`,
+    which `_with_request_id` adds back for each request served from the entry.
+    """
+    size = len(body) if body is not None else len(json.dumps(payload, default=str))
+    entry = {
+        "payload": payload if body is None else None,
+        "body": body,
+        "with_request_id": with_request_id,
+        "etag": _payload_etag(payload),
+        "size": size,
+        "expires_at": (time.monotonic() + ttl_seconds) if ttl_seconds else None,
+    }
+    if size > _RESPONSE_CACHE_MAX_BYTES // 4:
+        return entry
+    with _RESPONSE_CACHE_LOCK:
+        previous = _RESPONSE_CACHE.pop(key, None)
+        if previous is not None:
+            _RESPONSE_CACHE_STATE["bytes"] -= previous["size"]
+        _RESPONSE_CACHE[key] = entry
+        _RESPONSE_CACHE_STATE["bytes"] += size
+        while _RESPONSE_CACHE and (
+            len(_RESPONSE_CACHE) > _RESPONSE_CACHE_MAX or _RESPONSE_CACHE_STATE["bytes"] > _RESPONSE_CACHE_MAX_BYTES
+        ):
+            _, evicted = _RESPONSE_CACHE.popitem(last=False)
+            _RESPONSE_CACHE_STATE["bytes"] -= evicted["size"]
+    return entry
+
+
+def _with_request_id(body: bytes, request_id: str) -> bytes:
+    """A cached JSON object body with the current request's `request_id` as its first field."""
+    rest = body.lstrip()[1:].lstrip()
+    prefix = b'{"request_id": ' + json.dumps(request_id).encode("utf-8")
+    return prefix + (rest if rest.startswith(b"}") else b", " + rest)
+
+
+def _if_none_match(req: Any, etag: str) -> bool:
+    header = str(req.headers.get("If-None-Match") or "").strip()
+    if not header:
+        return False
+    if header == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def _http_response_cached(endpoint: str, ttl_seconds: Optional[float] = None):
+    """
+    Serve an `on_request` JSON endpoint through the shared response cache.
+
+    Successful 200 responses are stored under `_response_cache_key`; hits are
+    returned from memory (or as 304 when If-None-Match matches) without calling
+    the endpoint. `refresh` / `force_refresh` skip the lookup but still
+    repopulate the entry. A payload's `request_id` is not cached: entries hold
+    the body without it and each hit carries the current request's id.
+    """
+    import functools
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(req: https_fn.Request) -> https_fn.Response:
+            if req.method == "OPTIONS":
+                return func(req)
+            data = req.get_json(silent=True) or {}
+            if not isinstance(data, dict):
+                return func(req)
+            try:
+                key = _response_cache_key(endpoint, data)
+            except Exception as exc:
+                logging.getLogger(__name__).warning(f"[{endpoint}] response cache key failed: {exc}")
+                return func(req)
+
+            headers = {
+                "Access-Control-Allow-Origin": "*",
+                "Content-Type": "application/json",
+                "Access-Control-Expose-Headers": "ETag, X-Response-Cache, X-History-Request-Id",
+                "Cache-Control": "no-cache",
+            }
+            request_id = data.get("client_request_id") or req.headers.get("X-Client-Request-Id")
+            if request_id:
+                headers["X-History-Request-Id"] = str(request_id)
+            bypass = bool(data.get("refresh") or data.get("force_refresh"))
+            entry = None if bypass else _response_cache_get(key)
+            if entry is not None:
+                headers["ETag"] = entry["etag"]
+                headers["X-Response-Cache"] = "hit"
+                body = entry["body"]
+                if entry.get("with_request_id"):
+                    request_id = str(request_id or f"hist-{secrets.token_hex(6)}")
+                    headers["X-History-Request-Id"] = request_id
+                    body = _with_request_id(body, request_id)
+                if _if_none_match(req, entry["etag"]):
+                    return https_fn.Response("", status=304, headers=headers)
+                return https_fn.Response(body, status=200, headers=headers)
+
+            response = func(req)
+            if response.status_code != 200:
+                return response
+            body = response.get_data()
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                return response
+            # Error payloads sometimes ship with 200; never pin them in the cache.
+            if isinstance(payload, dict) and payload.get("error"):
+                return response
+            with_request_id = isinstance(payload, dict) and "request_id" in payload
+            if with_request_id:
+                body = json.dumps({k: v for k, v in payload.items() if k != "request_id"}).encode("utf-8")
+            entry = _response_cache_put(
+                key, payload, body=body, ttl_seconds=ttl_seconds, with_request_id=with_request_id
+            )
+            response.headers["ETag"] = entry["etag"]
+            response.headers["X-Response-Cache"] = "miss"
+            response.headers["Cache-Control"] = "no-cache"
+            response.headers["Access-Control-Expose-Headers"] = headers["Access-Control-Expose-Headers"]
+            if _if_none_match(req, entry["etag"]):
+                return https_fn.Response("", status=304, headers={**headers, "ETag": entry["etag"], "X-Response-Cache": "miss"})
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+# get_leagues payloads memoized per (db file identity, UTC day); the deployed
+# DB only changes on redeploy so this is effectively one build per instance/day.
+_LEAGUES_RESPONSE_CACHE: Dict[str, Any] = {}
+_LEAGUES_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def _league_counts_from_summary(cursor, today: str, data_version: Optional[int]) -> Optional[Dict[int, Dict[str, Any]]]:
+    """
+    Per-league counts from the `league_summary` tables maintained by ingestion.
+
+    Returns None when the summary is missing or was built for an older
+    `data_version` so the caller can fall back to scanning `event`.
+    """
+    if data_version is None:
+        return None
+    try:
+        cursor.execute(
+            """
+            SELECT s.league_id, s.total_events, s.completed_events, s.last_completed_date,
+                   s.last_completed_event_id, s.data_version,
+                   COALESCE(SUM(CASE WHEN d.day >= ? AND d.day <= date(?, '+7 days') THEN d.fixtures END), 0),
+                   COALESCE(SUM(CASE WHEN d.day < ? THEN d.completed END), 0),
+                   MIN(CASE WHEN d.day >= ? AND d.fixtures > d.completed THEN d.day END)
+            FROM league_summary s
+            LEFT JOIN league_day_summary d
+              ON d.league_id = s.league_id AND d.day >= date(?, '-7 days')
+            GROUP BY s.league_id
+            """,
+            (today, today, today, today, today),
+        )
+        rows = cursor.fetchall()
+    except Exception:
+        return None
+    if not rows or any(int(row[5]) != int(data_version) for row in rows):
+        return None
+    return {
+        row[0]: {
+            'upcoming_matches': int(row[6] or 0),
+            'recent_matches': int(row[7] or 0),
+            'total_events': int(row[1] or 0),
+            'completed_events': int(row[2] or 0),
+            'last_completed_date': row[3],
+            'last_completed_event_id': row[4],
+            'next_fixture_date': row[8],
+        }
+        for row in rows
+    }
+
+
+def _league_counts_from_events(cursor) -> Dict[int, Dict[str, Any]]:
+    counts: Dict[int, Dict[str, Any]] = {}
+    # Count upcoming matches (next 7 days)
+    cursor.execute("""
+        SELECT e.league_id, COUNT(*) as match_count
+        FROM event e
+        WHERE date(e.date_event) >= date('now')
+        AND date(e.date_event) <= date('now', '+7 days')
+        AND e.home_team_id IS NOT NULL
+        AND e.away_team_id IS NOT NULL
+        GROUP BY e.league_id
+    """)
+    for league_id, count in cursor.fetchall():
+        counts.setdefault(league_id, {})['upcoming_matches'] = count
+
+    # Count recent completed matches (last 7 days)
+    cursor.execute("""
+        SELECT e.league_id, COUNT(*) as match_count
+        FROM event e
+        WHERE date(e.date_event) >= date('now', '-7 days')
+        AND date(e.date_event) < date('now')
+        AND e.home_score IS NOT NULL
+        AND e.away_score IS NOT NULL
+        AND e.home_team_id IS NOT NULL
+        AND e.away_team_id IS NOT NULL
+        GROUP BY e.league_id
+    """)
+    for league_id, count in cursor.fetchall():
+        counts.setdefault(league_id, {})['recent_matches'] = count
+    return counts
+
+
+def _build_leagues_payload(db_path: str, today: str) -> Dict[str, Any]:
+    import sqlite3
+    from prediction.db import read_data_version
+
+    league_mappings = _get_league_mappings()
+    counts: Dict[int, Dict[str, Any]] = {}
+    data_version = None
+    source = 'none'
+    if os.path.exists(db_path):
+        conn = sqlite3.connect(db_path)
+        try:
+            cursor = conn.cursor()
+            data_version = read_data_version(conn)
+            summary = _league_counts_from_summary(cursor, today, data_version)
+            if summary is not None:
+                counts, source = summary, 'league_summary'
+            else:
+                counts, source = _league_counts_from_events(cursor), 'event_scan'
+        finally:
+            conn.close()
+
+    leagues = []
+    for league_id, name in league_mappings.items():
+        league_counts = counts.get(league_id, {})
+        upcoming = league_counts.get('upcoming_matches', 0)
+        recent = league_counts.get('recent_matches', 0)
+        entry = {
+            'id': league_id,
+            'name': name,
+            'upcoming_matches': upcoming,
+            'recent_matches': recent,
+            'has_news': upcoming > 0 or recent > 0,
+            'total_news': upcoming + recent,
+        }
+        for key in ('total_events', 'last_completed_date', 'next_fixture_date'):
+            if key in league_counts:
+                entry[key] = league_counts[key]
+        leagues.append(entry)
+
+    etag = hashlib.sha256(json.dumps(leagues, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:32]
+    return {'leagues': leagues, 'etag': etag, 'data_version': data_version, 'source': source}
+
+
 @https_fn.on_call()
 def get_leagues(req: https_fn.CallableRequest) -> Dict[str, Any]:
     """
-    Callable Cloud Function to get available leagues with match counts
+    Callable Cloud Function to get available leagues with match counts.
+
+    Counts come from the precomputed `league_summary` tables when they match the
+    DB's data version. Pass the previous response's `etag` to receive
+    `{'not_modified': True}` when nothing changed.
     """
-    import sqlite3
     try:
-        league_mappings = _get_league_mappings()
-        
+        data = req.data if isinstance(getattr(req, 'data', None), dict) else {}
+
         # Get database path
         db_path = os.getenv("DB_PATH")
         if not db_path:
             db_path = os.path.join(os.path.dirname(__file__), "..", "data.sqlite")
-        
-        # Get upcoming match counts for each league
-        upcoming_counts = {}
-        recent_counts = {}
-        
-        if os.path.exists(db_path):
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Count upcoming matches (next 7 days)
-            cursor.execute("""
-                SELECT e.league_id, COUNT(*) as match_count
-                FROM event e
-                WHERE date(e.date_event) >= date('now')
-                AND date(e.date_event) <= date('now', '+7 days')
-                AND e.home_team_id IS NOT NULL
-                AND e.away_team_id IS NOT NULL
-                GROUP BY e.league_id
-            """)
-            
-            for row in cursor.fetchall():
-                league_id, count = row
-                upcoming_counts[league_id] = count
-            
-            # Count recent completed matches (last 7 days)
-            cursor.execute("""
-                SELECT e.league_id, COUNT(*) as match_count
-                FROM event e
-                WHERE date(e.date_event) >= date('now', '-7 days')
-                AND date(e.date_event) < date('now')
-                AND e.home_score IS NOT NULL
-                AND e.away_score IS NOT NULL
-                AND e.home_team_id IS NOT NULL
-                AND e.away_team_id IS NOT NULL
-                GROUP BY e.league_id
-            """)
-            
-            for row in cursor.fetchall():
-                league_id, count = row
-                recent_counts[league_id] = count
-            
-            conn.close()
-        
-        leagues = []
-        for league_id, name in league_mappings.items():
-            upcoming = upcoming_counts.get(league_id, 0)
-            recent = recent_counts.get(league_id, 0)
-            has_news = upcoming > 0 or recent > 0
-            
-            leagues.append({
-                'id': league_id,
-                'name': name,
-                'upcoming_matches': upcoming,
-                'recent_matches': recent,
-                'has_news': has_news,
-                'total_news': upcoming + recent
-            })
-        
-        return {'leagues': leagues}
+
+        today = datetime.utcnow().date().isoformat()
+        try:
+            stat = os.stat(db_path)
+            db_identity = (os.path.abspath(db_path), stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            db_identity = (os.path.abspath(db_path), None, None)
+        cache_key = f"{db_identity}|{today}"
+
+        with _LEAGUES_RESPONSE_CACHE_LOCK:
+            payload = _LEAGUES_RESPONSE_CACHE.get(cache_key)
+        if payload is None:
+            payload = _build_leagues_payload(db_path, today)
+            with _LEAGUES_RESPONSE_CACHE_LOCK:
+                _LEAGUES_RESPONSE_CACHE.clear()
+                _LEAGUES_RESPONSE_CACHE[cache_key] = payload
+
+        if data.get('etag') and data.get('etag') == payload['etag']:
+            return {'not_modified': True, 'etag': payload['etag']}
+        return {'leagues': payload['leagues'], 'etag': payload['etag'], 'data_version': payload['data_version']}
         
     except Exception as e:
         print(f"Error in get_leagues: {e}")
@@ -2392,9 +3491,34 @@ def get_league_metrics(req: https_fn.CallableRequest) -> Dict[str, Any]:
     
     Request data:
     {
-        "league_id": 4414  # required
+        "league_id": 4414,  # required
+        "etag": "..."       # optional, previous response's etag
     }
+
+    Results are served from the shared response cache until the training
+    pipeline bumps the `models` serving stamp; a matching `etag` returns
+    `{'not_modified': True}`.
     """
+    data = req.data if isinstance(getattr(req, 'data', None), dict) else {}
+    client_etag = data.get('etag')
+    key = None
+    try:
+        key = _response_cache_key('get_league_metrics', {'league_id': data.get('league_id')})
+    except Exception as exc:
+        logging.getLogger(__name__).warning(f"[get_league_metrics] response cache key failed: {exc}")
+    entry = _response_cache_get(key) if key else None
+    if entry is None:
+        result = _load_league_metrics(req)
+        if key is None or not isinstance(result, dict) or result.get('error'):
+            return result
+        entry = _response_cache_put(key, result)
+    if client_etag and client_etag == entry['etag']:
+        return {'not_modified': True, 'etag': entry['etag']}
+    return {**entry['payload'], 'etag': entry['etag']}
+
+
+def _load_league_metrics(req: https_fn.CallableRequest) -> Dict[str, Any]:
+    """Resolve league metrics from Firestore, the XGBoost registry or local registry files."""
     import logging
     logger = logging.getLogger(__name__)
     logger.setLevel(logging.DEBUG)
@@ -2714,8 +3838,24 @@ def get_league_metrics(req: https_fn.CallableRequest) -> Dict[str, Any]:
         return {'error': str(e)}
 
 
+def _normalize_license_key(license_key: str) -> str:
+    """Canonical license key form stored in `license_key_normalized` (upper-case, no dashes/spaces)."""
+    return (license_key or '').strip().upper().replace('-', '').replace(' ', '')
+
+
+# Keys created before `license_key_normalized` existed are still found via the
+# legacy format queries (and backfilled on first hit) until the migration has
+# run everywhere; set LICENSE_LEGACY_LOOKUP=0 afterwards.
+_LICENSE_LEGACY_LOOKUP = os.getenv('LICENSE_LEGACY_LOOKUP', '1').strip().lower() not in {'0', 'false', 'no'}
+
+
 def _find_subscription_by_license_key(subscriptions_ref, license_key: str, license_key_normalized: str):
-    """Look up a subscription document by license key (multiple stored formats)."""
+    """Look up a subscription document by license key (single query on the normalized field)."""
+    query = subscriptions_ref.where('license_key_normalized', '==', license_key_normalized).limit(1)
+    docs = list(query.stream())
+    if docs or not _LICENSE_LEGACY_LOOKUP:
+        return docs
+
     query = subscriptions_ref.where('license_key', '==', license_key).limit(1)
     docs = list(query.stream())
     if not docs and len(license_key_normalized) == 16:
@@ -2728,9 +3868,74 @@ def _find_subscription_by_license_key(subscriptions_ref, license_key: str, licen
     if not docs:
         query = subscriptions_ref.where('license_key', '==', license_key_normalized).limit(1)
         docs = list(query.stream())
+    if docs:
+        try:
+            subscriptions_ref.document(docs[0].id).update({'license_key_normalized': license_key_normalized})
+        except Exception:
+            pass
     return docs
 
 
+# Short-lived per-instance cache of successful verifications so repeated app
+# opens from the same device skip the Firestore lookup and binding write.
+# Keyed by normalized key + device id + fingerprint hash; any binding change
+# made by this instance drops the subscription's entries, and the TTL bounds
+# staleness for changes made elsewhere (admin approvals, other instances).
+_LICENSE_VERIFY_CACHE_TTL_SECONDS = float(os.getenv('LICENSE_VERIFY_CACHE_TTL_SECONDS', '60'))
+_LICENSE_VERIFY_CACHE_MAX = 2048
+_license_verify_cache: Dict[str, Dict[str, Any]] = {}
+_license_verify_cache_by_sub: Dict[str, set] = {}
+_license_verify_cache_lock = threading.Lock()
+
+
+def _license_verify_cache_key(license_key_normalized: str, device_id: str, device_fingerprint: str) -> str:
+    fingerprint_hash = hashlib.sha256((device_fingerprint or '').strip().encode()).hexdigest()
+    return hashlib.sha256(
+        f'{license_key_normalized}|{(device_id or "").strip()}|{fingerprint_hash}'.encode()
+    ).hexdigest()
+
+
+def _license_verify_cache_get(cache_key: str) -> Optional[Dict[str, Any]]:
+    if _LICENSE_VERIFY_CACHE_TTL_SECONDS <= 0:
+        return None
+    now = time.time()
+    with _license_verify_cache_lock:
+        entry = _license_verify_cache.get(cache_key)
+        if entry is None:
+            return None
+        expires_ts = entry['result'].get('expires_at')
+        if entry['cached_at'] + _LICENSE_VERIFY_CACHE_TTL_SECONDS < now or (expires_ts and expires_ts < now):
+            _license_verify_cache.pop(cache_key, None)
+            return None
+        return dict(entry['result'])
+
+
+def _license_verify_cache_put(cache_key: str, subscription_id: str, result: Dict[str, Any]) -> None:
+    if _LICENSE_VERIFY_CACHE_TTL_SECONDS <= 0 or not result.get('valid'):
+        return
+    cached = dict(result)
+    # Binding notifications are one-shot; later hits report the steady state.
+    cached['device_newly_bound'] = False
+    cached['device_rebound'] = False
+    with _license_verify_cache_lock:
+        if len(_license_verify_cache) >= _LICENSE_VERIFY_CACHE_MAX:
+            _license_verify_cache.clear()
+            _license_verify_cache_by_sub.clear()
+        _license_verify_cache[cache_key] = {
+            'result': cached,
+            'subscription_id': subscription_id,
+            'cached_at': time.time(),
+        }
+        _license_verify_cache_by_sub.setdefault(subscription_id, set()).add(cache_key)
+
+
+def _invalidate_license_verify_cache(subscription_id: str) -> None:
+    """Drop cached verifications for a subscription (called on any binding change)."""
+    with _license_verify_cache_lock:
+        for cache_key in _license_verify_cache_by_sub.pop(subscription_id, set()):
+            _license_verify_cache.pop(cache_key, None)
+
+
 def _expires_datetime(expires_at):
     if not expires_at:
         return None
@@ -3303,6 +4508,7 @@ def _verify_subscription_record(
                 f"Device profile change pending approval for subscription {subscription_id} "
                 f"(similarity={similarity}, reason={reason}, attempt={attempt_count})"
             )
+            _invalidate_license_verify_cache(subscription_id)
             subscriptions_ref.document(subscription_id).update(update_fields)
             return {
                 'valid': False,
@@ -3310,6 +4516,7 @@ def _verify_subscription_record(
                 'error': ERROR_DEVICE_REBIND_PENDING,
             }
         else:
+            _invalidate_license_verify_cache(subscription_id)
             logger.warning(
                 f"Device profile blocked for subscription {subscription_id}: "
                 f"bound={bound_device_id[:8]}... attempted={device_id[:8]}... "
@@ -3334,6 +4541,8 @@ def _verify_subscription_record(
         update_fields['used'] = True
         update_fields['used_at'] = firestore.SERVER_TIMESTAMP
 
+    if 'bound_device_id' in update_fields or 'bound_device_fingerprint' in update_fields:
+        _invalidate_license_verify_cache(subscription_id)
     subscriptions_ref.document(subscription_id).update(update_fields)
 
     expires_ts = expires_at.timestamp() if hasattr(expires_at, 'timestamp') else None
@@ -3372,13 +4581,19 @@ def verify_license_key(req: https_fn.CallableRequest) -> Dict[str, Any]:
         device_fingerprint_profile = req.data.get('device_fingerprint_profile', {})
         device_fingerprint_profile_json = req.data.get('device_fingerprint_profile_json', '')
         
-        license_key_normalized = license_key.replace('-', '').replace(' ', '')
+        license_key_normalized = _normalize_license_key(license_key)
         
         logger.info(f"Verifying license key: {license_key[:8]}... device={str(device_id)[:8]}...")
         
         if not license_key_normalized:
             return {'valid': False, 'error': 'License key is required'}
         
+        verify_cache_key = _license_verify_cache_key(license_key_normalized, device_id, device_fingerprint)
+        cached_result = _license_verify_cache_get(verify_cache_key)
+        if cached_result is not None:
+            logger.info(f"Valid license key verified (cached): {license_key[:8]}...")
+            return cached_result
+        
         subscriptions_ref = db.collection('subscriptions')
         docs = _find_subscription_by_license_key(subscriptions_ref, license_key, license_key_normalized)
         
@@ -3398,6 +4613,7 @@ def verify_license_key(req: https_fn.CallableRequest) -> Dict[str, Any]:
         )
         if result.get('valid'):
             logger.info(f"Valid license key verified: {license_key[:8]}...")
+            _license_verify_cache_put(verify_cache_key, subscription_id, result)
         return result
         
     except Exception as e:
@@ -3443,7 +4659,7 @@ def verify_license_key_http(req: https_fn.Request) -> https_fn.Response:
         device_fingerprint_profile = data.get('device_fingerprint_profile', {})
         device_fingerprint_profile_json = data.get('device_fingerprint_profile_json', '')
 
-        license_key_normalized = license_key.replace('-', '').replace(' ', '')
+        license_key_normalized = _normalize_license_key(license_key)
         
         if not license_key_normalized:
             headers = {"Access-Control-Allow-Origin": "*", "Content-Type": "application/json"}
@@ -3453,6 +4669,16 @@ def verify_license_key_http(req: https_fn.Request) -> https_fn.Response:
                 headers=headers
             )
         
+        verify_cache_key = _license_verify_cache_key(license_key_normalized, device_id, device_fingerprint)
+        cached_result = _license_verify_cache_get(verify_cache_key)
+        if cached_result is not None:
+            logger.info(f"Valid license key verified (cached): {license_key[:8]}...")
+            return https_fn.Response(
+                json.dumps(cached_result),
+                status=200,
+                headers={"Access-Control-Allow-Origin": "*", "Content-Type": "application/json"}
+            )
+        
         db = get_firestore_client()
         subscriptions_ref = db.collection('subscriptions')
         docs = _find_subscription_by_license_key(subscriptions_ref, license_key, license_key_normalized)
@@ -3477,6 +4703,7 @@ def verify_license_key_http(req: https_fn.Request) -> https_fn.Response:
         
         if result.get('valid'):
             logger.info(f"Valid license key verified: {license_key[:8]}...")
+            _license_verify_cache_put(verify_cache_key, subscription_id, result)
         
         headers = {"Access-Control-Allow-Origin": "*", "Content-Type": "application/json"}
         return https_fn.Response(
@@ -3861,6 +5088,7 @@ def generate_license_key(req: https_fn.CallableRequest) -> Dict[str, Any]:
         # Store in Firestore
         subscription_data = {
             'license_key': license_key,
+            'license_key_normalized': _normalize_license_key(license_key),
             'email': email,
             'subscription_type': subscription_type,
             'created_at': firestore.SERVER_TIMESTAMP,
@@ -3954,6 +5182,7 @@ def generate_license_key_with_email(req: https_fn.CallableRequest) -> Dict[str,
         # Store in Firestore
         subscription_data = {
             'license_key': license_key,
+            'license_key_normalized': _normalize_license_key(license_key),
             'email': email,
             'name': name,
             'subscription_type': subscription_type,
@@ -5260,6 +6489,7 @@ def get_trending_topics_http(req: https_fn.Request) -> https_fn.Response:
 
 
 @https_fn.on_request(timeout_sec=60, memory=512, secrets=["SPORTRADAR_API_KEY", "APISPORTS_RUGBY_KEY"])
+@_http_response_cached("get_league_standings_http", ttl_seconds=_STANDINGS_RESPONSE_CACHE_TTL_SECONDS)
 def get_league_standings_http(req: https_fn.Request) -> https_fn.Response:
     """
     Get league standings from SportRadar (team logos via API-Sports).
@@ -5284,7 +6514,7 @@ def get_league_standings_http(req: https_fn.Request) -> https_fn.Response:
     headers = {
         "Access-Control-Allow-Origin": "*",
         "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type, Authorization",
+        "Access-Control-Allow-Headers": "Content-Type, Authorization, If-None-Match",
         "Content-Type": "application/json",
     }
     
@@ -6413,7 +7643,50 @@ def apisports_rugby_webhook_http(req: https_fn.Request) -> https_fn.Response:
         )
 
 
+# History metadata (year summary, per-filter counts and week buckets) only
+# changes when the DB does, so it is memoized per DB identity + data version.
+_HISTORY_META_CACHE: "OrderedDict[Any, Any]" = OrderedDict()
+_HISTORY_META_CACHE_MAX = 256
+_HISTORY_META_CACHE_LOCK = threading.Lock()
+_HISTORY_INDEXED_DBS: set = set()
+
+# ISO-8601 week in SQL (SQLite 3.40 has no %V): the Thursday of a date's ISO
+# week determines both its ISO year and week number.
+_ISO_THURSDAY_SQL = "date(substr(e.date_event, 1, 10), '-3 days', 'weekday 4')"
+_ISO_WEEK_SQL = f"((CAST(strftime('%j', {_ISO_THURSDAY_SQL}) AS INTEGER) - 1) / 7 + 1)"
+_ISO_YEAR_WEEK_SQL = f"(strftime('%Y', {_ISO_THURSDAY_SQL}) || '-W' || printf('%02d', {_ISO_WEEK_SQL}))"
+
+
+def _history_meta_cached(key: Any, build):
+    with _HISTORY_META_CACHE_LOCK:
+        if key in _HISTORY_META_CACHE:
+            _HISTORY_META_CACHE.move_to_end(key)
+            return _HISTORY_META_CACHE[key]
+    value = build()
+    with _HISTORY_META_CACHE_LOCK:
+        _HISTORY_META_CACHE[key] = value
+        while len(_HISTORY_META_CACHE) > _HISTORY_META_CACHE_MAX:
+            _HISTORY_META_CACHE.popitem(last=False)
+    return value
+
+
+def _encode_history_cursor(date_event: str, match_id: int) -> str:
+    raw = json.dumps([str(date_event), int(match_id)], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_history_cursor(cursor: str) -> tuple:
+    """Inverse of `_encode_history_cursor`; raises ValueError on malformed input."""
+    try:
+        padded = str(cursor) + "=" * (-len(str(cursor)) % 4)
+        date_event, match_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return str(date_event), int(match_id)
+    except Exception as exc:
+        raise ValueError(f"invalid cursor: {exc}") from exc
+
+
 @https_fn.on_request(timeout_sec=120, memory=1024)
+@_http_response_cached("get_historical_predictions_http")
 def get_historical_predictions_http(req: https_fn.Request) -> https_fn.Response:
     """
     HTTP endpoint for historical predictions with explicit CORS support.
@@ -6423,8 +7696,12 @@ def get_historical_predictions_http(req: https_fn.Request) -> https_fn.Response:
     {
         "league_id": 4986,  # optional, filter by league
         "year": "2026",     # optional, fetch a single calendar year (recommended)
-        "limit": 100        # optional, limit number of matches
+        "limit": 100,       # optional, limit number of matches
+        "cursor": "..."     # optional, `pagination.next_cursor` of the previous page
     }
+
+    Pages are keyset-paginated on (date_event, id); `offset` is still accepted
+    for older clients.
     """
     import logging
     import sys
@@ -6448,7 +7725,7 @@ def get_historical_predictions_http(req: https_fn.Request) -> https_fn.Response:
         preflight_headers = {
             "Access-Control-Allow-Origin": "*",
             "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-            "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Client-Request-Id",
+            "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Client-Request-Id, If-None-Match",
             "Access-Control-Max-Age": "3600",
             "Access-Control-Expose-Headers": "X-History-Request-Id",
         }
@@ -6484,6 +7761,18 @@ def get_historical_predictions_http(req: https_fn.Request) -> https_fn.Response:
             offset = 0
         limit = max(1, min(limit, 1000))
         offset = max(0, offset)
+        page_cursor = data.get('cursor') or None
+        cursor_key = None
+        if page_cursor:
+            try:
+                cursor_key = _decode_history_cursor(page_cursor)
+            except ValueError as cursor_err:
+                return https_fn.Response(
+                    json.dumps({'request_id': request_id, 'error': str(cursor_err)}),
+                    status=400,
+                    headers=response_headers,
+                )
+            offset = 0
         
         logger.info(
             f"[hist][{request_id}] request metadata: "
@@ -6523,26 +7812,8 @@ def get_historical_predictions_http(req: https_fn.Request) -> https_fn.Response:
             }
             return https_fn.Response(json.dumps(response_data), status=404, headers=response_headers)
         
-        # Inline function to get historical matches with predictions
-        def get_week_number(date_str: str) -> int:
-            """Get ISO week number from date string (YYYY-MM-DD)"""
-            try:
-                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                return date_obj.isocalendar()[1]
-            except:
-                return 0
-
-        def get_year_week_key(date_str: str) -> str:
-            """Get year-week key for grouping (e.g., '2024-W01')"""
-            try:
-                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                year, week, _ = date_obj.isocalendar()
-                return f"{year}-W{week:02d}"
-            except:
-                return "Unknown"
-        
         # Import needed modules
-        from prediction.db import connect
+        from prediction.db import connect, ensure_history_indexes, read_data_version
         predictor = None
         
         # Connect to database
@@ -6550,39 +7821,31 @@ def get_historical_predictions_http(req: https_fn.Request) -> https_fn.Response:
         conn = connect(db_path)
         cursor = conn.cursor()
         _ensure_prediction_snapshot_table(conn)
+        if db_path not in _HISTORY_INDEXED_DBS:
+            try:
+                ensure_history_indexes(conn)
+            except Exception as index_err:
+                logger.warning(f"[hist][{request_id}] could not ensure history indexes: {index_err}")
+            _HISTORY_INDEXED_DBS.add(db_path)
         logger.info(
             f"[hist][{request_id}] database connected and snapshot table ensured in "
             f"{(perf_counter() - t0_connect) * 1000:.1f} ms"
         )
+        db_stat = os.stat(db_path)
+        db_identity = (
+            os.path.abspath(db_path),
+            db_stat.st_mtime_ns,
+            db_stat.st_size,
+            read_data_version(conn),
+            datetime.utcnow().date().isoformat(),
+        )
+        league_filter_key = str(league_id) if league_id else ""
         
         # If year is not provided, pick a sensible default year and return all available years
         # so the UI can switch years without loading everything at once.
-        available_years = []
-        selected_year = None
-        year_summary = {}
-        try:
-            t0_years = perf_counter()
-            year_query = """
-            SELECT DISTINCT substr(e.date_event, 1, 4) AS yr
-            FROM event e
-            WHERE e.date_event IS NOT NULL
-            """
-            year_params = []
-            if league_id:
-                year_query += " AND e.league_id = ?"
-                year_params.append(league_id)
-            year_query += " ORDER BY yr DESC"
-            cursor.execute(year_query, year_params)
-            available_years = [r[0] for r in cursor.fetchall() if r and r[0]]
-            logger.info(f"[hist][{request_id}] available_years query completed in {(perf_counter() - t0_years) * 1000:.1f} ms (count={len(available_years)})")
-        except Exception as e:
-            logger.warning(f"[hist][{request_id}] could not compute available years: {e}")
-            available_years = []
-
-        # Build a lightweight year summary (total matches vs completed matches).
-        # This helps the UI explain why a year exists (scheduled games) but has 0 completed.
-        try:
-            t0_summary = perf_counter()
+        # The lightweight year summary (total matches vs completed matches) helps the UI
+        # explain why a year exists (scheduled games) but has 0 completed.
+        def _build_year_summary():
             sum_sql = """
                 SELECT
                     substr(e.date_event, 1, 4) AS yr,
@@ -6597,21 +7860,22 @@ def get_historical_predictions_http(req: https_fn.Request) -> https_fn.Response:
                 sum_params.append(league_id)
             sum_sql += " GROUP BY yr ORDER BY yr DESC"
             cursor.execute(sum_sql, sum_params)
+            summary = {}
             for r in cursor.fetchall() or []:
-                try:
-                    yr = r[0]
-                    if not yr:
-                        continue
-                    year_summary[str(yr)] = {
-                        "total": int(r[1] or 0),
-                        "completed": int(r[2] or 0),
-                    }
-                except Exception:
-                    continue
-            logger.info(f"[hist][{request_id}] year_summary query completed in {(perf_counter() - t0_summary) * 1000:.1f} ms (years={len(year_summary)})")
+                if r and r[0]:
+                    summary[str(r[0])] = {"total": int(r[1] or 0), "completed": int(r[2] or 0)}
+            return summary
+
+        selected_year = None
+        try:
+            t0_summary = perf_counter()
+            year_summary = _history_meta_cached(("years", db_identity, league_filter_key), _build_year_summary)
+            available_years = list(year_summary)
+            logger.info(f"[hist][{request_id}] year_summary resolved in {(perf_counter() - t0_summary) * 1000:.1f} ms (years={len(year_summary)})")
         except Exception as e:
             logger.warning(f"[hist][{request_id}] could not compute year summary: {e}")
             year_summary = {}
+            available_years = []
 
         # Prefer current calendar year when available (but keep Rugby World Cup on tournament years).
         now_utc = datetime.utcnow()
@@ -6652,29 +7916,55 @@ def get_historical_predictions_http(req: https_fn.Request) -> https_fn.Response:
             event_where.append("e.league_id = ?")
             event_params.append(league_id)
         if selected_year:
+            # Range predicates (not substr) so the date indexes apply:
+            # for 'YYYY-...' strings, substr(d,1,4) IN (yr-1, yr) <=> 'yr-1' <= d < 'yr+1'.
             try:
                 yr = int(str(selected_year).strip()[:4])
-                prev_yr = str(yr - 1)
-                event_where.append("(substr(e.date_event, 1, 4) = ? OR substr(e.date_event, 1, 4) = ?)")
-                event_params.extend([str(yr), prev_yr])
+                event_where.append("e.date_event >= ? AND e.date_event < ?")
+                event_params.extend([str(yr - 1), str(yr + 1)])
             except (ValueError, TypeError):
                 event_where.append("substr(e.date_event, 1, 4) = ?")
                 event_params.append(str(selected_year))
 
         event_filter_sql = " AND ".join(event_where)
-        count_query = f"""
-            SELECT COUNT(1)
-            FROM event e
-            WHERE {event_filter_sql}
-        """
+
+        def _build_count_and_buckets():
+            cursor.execute(
+                f"""
+                SELECT substr(e.date_event, 1, 4) AS yr,
+                       {_ISO_YEAR_WEEK_SQL} AS year_week,
+                       COUNT(1),
+                       MIN(e.date_event),
+                       MAX(e.date_event)
+                FROM event e
+                WHERE {event_filter_sql}
+                GROUP BY yr, year_week
+                ORDER BY MIN(e.date_event)
+                """,
+                event_params,
+            )
+            buckets = [
+                {
+                    "year": r[0] or "Unknown",
+                    "year_week": r[1] or "Unknown",
+                    "matches": int(r[2] or 0),
+                    "first_date": r[3],
+                    "last_date": r[4],
+                }
+                for r in cursor.fetchall()
+            ]
+            return sum(b["matches"] for b in buckets), buckets
+
         t0_count = perf_counter()
-        cursor.execute(count_query, event_params)
-        total_rows = int((cursor.fetchone() or [0])[0] or 0)
+        total_rows, week_buckets = _history_meta_cached(
+            ("count", db_identity, league_filter_key, str(selected_year or "")), _build_count_and_buckets
+        )
         logger.info(
-            f"[hist][{request_id}] count query completed in {(perf_counter() - t0_count) * 1000:.1f} ms "
-            f"(rows={total_rows}, limit={limit}, offset={offset})"
+            f"[hist][{request_id}] count resolved in {(perf_counter() - t0_count) * 1000:.1f} ms "
+            f"(rows={total_rows}, limit={limit}, offset={offset}, cursor={bool(cursor_key)})"
         )
 
+        keyset_sql = " AND (e.date_event > ? OR (e.date_event = ? AND e.id > ?))" if cursor_key else ""
         unified_data_sql = f"""
             SELECT
                 e.id,
@@ -6692,6 +7982,9 @@ def get_historical_predictions_http(req: https_fn.Request) -> https_fn.Response:
                 e.round,
                 e.venue,
                 e.status,
+                substr(e.date_event, 1, 4) AS year_key,
+                {_ISO_WEEK_SQL} AS iso_week,
+                {_ISO_YEAR_WEEK_SQL} AS iso_year_week,
                 s.predicted_winner,
                 s.predicted_home_score,
                 s.predicted_away_score,
@@ -6713,13 +8006,20 @@ def get_historical_predictions_http(req: https_fn.Request) -> https_fn.Response:
                 ORDER BY CASE s2.snapshot_type WHEN 'pre_kickoff_live' THEN 0 ELSE 1 END, s2.id DESC
                 LIMIT 1
             )
-            WHERE {event_filter_sql}
-            ORDER BY e.date_event ASC, e.league_id
+            WHERE {event_filter_sql}{keyset_sql}
+            ORDER BY e.date_event ASC, e.id ASC
             LIMIT ? OFFSET ?
         """
+        keyset_params: list[Any] = []
+        if cursor_key:
+            keyset_params = [cursor_key[0], cursor_key[0], cursor_key[1]]
         t0_data = perf_counter()
-        cursor.execute(unified_data_sql, [model_version, *event_params, limit, offset])
+        # One extra row tells us whether another page exists without a COUNT.
+        cursor.execute(unified_data_sql, [model_version, *event_params, *keyset_params, limit + 1, offset])
         results = cursor.fetchall()
+        has_more = len(results) > limit
+        results = results[:limit]
+        next_cursor = _encode_history_cursor(results[-1][3], results[-1][0]) if (has_more and results) else None
         logger.info(
             f"[hist][{request_id}] unified data query completed in {(perf_counter() - t0_data) * 1000:.1f} ms "
             f"(returned={len(results)})"
@@ -6788,6 +8088,9 @@ def get_historical_predictions_http(req: https_fn.Request) -> https_fn.Response:
                 round_num,
                 venue,
                 status,
+                sql_year_key,
+                sql_iso_week,
+                sql_iso_year_week,
                 predicted_winner,
                 predicted_home_score,
                 predicted_away_score,
@@ -6829,7 +8132,7 @@ def get_historical_predictions_http(req: https_fn.Request) -> https_fn.Response:
                 except Exception:
                     pass
 
-            year_key = date_event[:4] if date_event else "Unknown"
+            year_key = sql_year_key or "Unknown"
             key = (match_id, date_event[:10] if date_event else '')
             try:
                 api_r = int(str(round_num or '').strip()) if round_num is not None else None
@@ -6838,10 +8141,10 @@ def get_historical_predictions_http(req: https_fn.Request) -> https_fn.Response:
                 use_api = False
             effective_round = round_num if use_api else league_rounds.get(key)
             try:
-                round_key = str(int(effective_round)) if effective_round is not None else get_year_week_key(date_event)
+                round_key = str(int(effective_round)) if effective_round is not None else (sql_iso_year_week or "Unknown")
             except Exception:
-                round_key = get_year_week_key(date_event)
-            week = get_week_number(date_event)
+                round_key = sql_iso_year_week or "Unknown"
+            week = int(sql_iso_week or 0)
 
             kickoff_at = kickoff_ts if (kickoff_ts and _has_meaningful_time(kickoff_ts)) else None
             status_norm = str(status or "").upper()
@@ -6916,11 +8219,14 @@ def get_historical_predictions_http(req: https_fn.Request) -> https_fn.Response:
             'pagination': {
                 'limit': limit,
                 'offset': offset,
+                'cursor': page_cursor,
                 'total_rows': total_rows,
                 'returned_rows': len(results),
-                'has_more': (offset + len(results)) < total_rows,
-                'next_offset': (offset + len(results)) if (offset + len(results)) < total_rows else None,
+                'has_more': has_more,
+                'next_cursor': next_cursor,
+                'next_offset': (offset + len(results)) if (has_more and not cursor_key) else None,
             },
+            'week_buckets': week_buckets,
             'by_league': {},
             'debug': {
                 'data_source': 'event_with_snapshot',
@@ -6992,6 +8298,7 @@ def get_historical_predictions_http(req: https_fn.Request) -> https_fn.Response:
 
 
 @https_fn.on_request(timeout_sec=540, memory=2048)
+@_http_response_cached("get_historical_backtest_http")
 def get_historical_backtest_http(req: https_fn.Request) -> https_fn.Response:
     """
     HTTP endpoint for TRUE historical evaluation via walk-forward backtest (unseen).
@@ -7023,7 +8330,7 @@ def get_historical_backtest_http(req: https_fn.Request) -> https_fn.Response:
         headers = {
             "Access-Control-Allow-Origin": "*",
             "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-            "Access-Control-Allow-Headers": "Content-Type, Authorization",
+            "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Client-Request-Id, If-None-Match",
             "Access-Control-Max-Age": "3600",
         }
         return https_fn.Response("", status=204, headers=headers)
@@ -7212,8 +8519,8 @@ def get_historical_backtest_http(req: https_fn.Request) -> https_fn.Response:
         # IMPORTANT: build features on a SMALL in-memory DB for this league only.
         # The full DB can be large and may cause slowdowns or memory issues in Cloud Functions.
         from prediction.features import build_feature_table, FeatureConfig
+        from prediction.xgb_training import DEFAULT_TRIPLET_PARAMS, train_triplet
         import pandas as pd
-        import xgboost as xgb
 
         today_iso = datetime.utcnow().date().isoformat()
         min_date_iso = (datetime.utcnow().date() - timedelta(days=days_back)).isoformat()
@@ -7359,47 +8666,13 @@ def get_historical_backtest_http(req: https_fn.Request) -> https_fn.Response:
         weeks_evaluated = 0
         weeks_skipped = 0
 
-        # Model hyperparams (same defaults as training)
+        # Model hyperparams (same defaults as training); the three models share one training matrix
         def train_models(train_df):
             X_train = train_df[feature_cols].fillna(0).values
             y_winner = (train_df["home_score"] > train_df["away_score"]).astype(int).values
             y_home = train_df["home_score"].values
             y_away = train_df["away_score"].values
-
-            clf = xgb.XGBClassifier(
-                n_estimators=200,
-                max_depth=6,
-                learning_rate=0.1,
-                subsample=0.8,
-                colsample_bytree=0.8,
-                random_state=42,
-                eval_metric="logloss",
-            )
-            clf.fit(X_train, y_winner)
-
-            reg_home = xgb.XGBRegressor(
-                n_estimators=200,
-                max_depth=6,
-                learning_rate=0.1,
-                subsample=0.8,
-                colsample_bytree=0.8,
-                random_state=42,
-                eval_metric="mae",
-            )
-            reg_home.fit(X_train, y_home)
-
-            reg_away = xgb.XGBRegressor(
-                n_estimators=200,
-                max_depth=6,
-                learning_rate=0.1,
-                subsample=0.8,
-                colsample_bytree=0.8,
-                random_state=42,
-                eval_metric="mae",
-            )
-            reg_away.fit(X_train, y_away)
-
-            return clf, reg_home, reg_away
+            return train_triplet(X_train, y_winner, y_home, y_away, DEFAULT_TRIPLET_PARAMS)
 
         for wk in week_keys:
             wk_start = week_first_date.loc[wk]
@@ -7664,7 +8937,10 @@ def scan_firestore_matches_http(req: https_fn.Request) -> https_fn.Response:
     {
         "remove_duplicates": false,
         "confirm_remove": false,
-        "sample_limit": 25
+        "sample_limit": 25,
+        "mode": "incremental",   // or "full"; incremental only reads docs synced since the last scan
+        "max_docs": 5000,        // optional bound for an incremental pass (resume while has_more)
+        "page_size": 500
     }
     """
     import logging
@@ -7693,6 +8969,11 @@ def scan_firestore_matches_http(req: https_fn.Request) -> https_fn.Response:
         except Exception:
             sample_limit = 25
         sample_limit = max(1, min(sample_limit, 100))
+        mode = str(data.get("mode") or "incremental").strip().lower()
+        if mode not in {"incremental", "full"}:
+            mode = "incremental"
+        max_docs = _coerce_int(data.get("max_docs"))
+        page_size = _coerce_int(data.get("page_size")) or 500
 
         if remove_duplicates and not confirm_remove:
             return https_fn.Response(
@@ -7713,9 +8994,13 @@ def scan_firestore_matches_http(req: https_fn.Request) -> https_fn.Response:
             db,
             remove_duplicates=remove_duplicates,
             sample_limit=sample_limit,
+            mode=mode,
+            page_size=page_size,
+            max_docs=max_docs if max_docs and max_docs > 0 else None,
         )
         logger.info(
-            "Firestore match scan complete: total=%s duplicate_docs=%s removed=%s dry_run=%s",
+            "Firestore match scan complete: mode=%s total=%s duplicate_docs=%s removed=%s dry_run=%s",
+            result.get("mode"),
             result.get("total_docs"),
             result.get("duplicate_docs"),
             result.get("removed_docs"),
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import sqlite3
-from typing import Any, Dict, Iterable, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 
 def to_int_or_none(value: Any) -> Optional[int]:
@@ -11,6 +12,285 @@ def to_int_or_none(value: Any) -> Optional[int]:
         return None
 
 
+def normalize_fixture_date(value: Any) -> Optional[str]:
+    """UTC calendar date (YYYY-MM-DD) of a date, datetime, Firestore timestamp or ISO string."""
+    if value is None:
+        return None
+
+    if hasattr(value, "to_datetime"):
+        try:
+            value = value.to_datetime()
+        except Exception:
+            pass
+
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).date().isoformat()
+
+    text = str(value).strip()
+    if not text:
+        return None
+
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+
+    try:
+        parsed = datetime.fromisoformat(text)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc).date().isoformat()
+    except Exception:
+        pass
+
+    if len(text) >= 10:
+        return text[:10]
+    return None
+
+
+def fixture_key(league_id: Any, date_event: Any, home_team_id: Any, away_team_id: Any) -> Optional[str]:
+    """
+    Canonical fixture identity: "league|YYYY-MM-DD|home_team_id|away_team_id".
+
+    Matches the `event.fixture_key` column maintained by `ensure_fixture_key`
+    and the key stored on Firestore match docs.
+    """
+    date_key = normalize_fixture_date(date_event)
+    league = to_int_or_none(league_id)
+    home = to_int_or_none(home_team_id)
+    away = to_int_or_none(away_team_id)
+    if league is None or home is None or away is None or not date_key:
+        return None
+    return f"{league}|{date_key}|{home}|{away}"
+
+
+def _fixture_key_sql(alias: str) -> str:
+    """SQL expression computing the fixture key from an event-shaped row."""
+    return (
+        f"CASE WHEN {alias}.league_id IS NOT NULL AND {alias}.home_team_id IS NOT NULL "
+        f"AND {alias}.away_team_id IS NOT NULL AND DATE({alias}.date_event) IS NOT NULL "
+        f"THEN {alias}.league_id || '|' || DATE({alias}.date_event) || '|' || "
+        f"{alias}.home_team_id || '|' || {alias}.away_team_id END"
+    )
+
+
+def ensure_fixture_key(conn: sqlite3.Connection) -> int:
+    """
+    Add and maintain `event.fixture_key` with a unique index (idempotent).
+
+    Rows without a key are backfilled, one per fixture: when legacy duplicates
+    exist, the lowest id gets the key and the rest stay NULL until the cleanup
+    script removes them. Triggers keep the key current for every writer. A
+    write that would duplicate an existing fixture leaves its key NULL rather
+    than failing. Returns the number of rows backfilled.
+    """
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(event)").fetchall()}
+    if "fixture_key" not in cols:
+        conn.execute("ALTER TABLE event ADD COLUMN fixture_key TEXT")
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_event_fixture_key ON event(fixture_key) "
+        "WHERE fixture_key IS NOT NULL;"
+    )
+    key_event = _fixture_key_sql("event")
+    key_new = _fixture_key_sql("NEW")
+    cur = conn.execute(
+        f"""
+        UPDATE OR IGNORE event SET fixture_key = {key_event}
+        WHERE fixture_key IS NULL
+          AND id IN (
+              SELECT MIN(id) FROM event
+              WHERE fixture_key IS NULL AND {key_event} IS NOT NULL
+              GROUP BY {key_event}
+          )
+          AND NOT EXISTS (SELECT 1 FROM event k WHERE k.fixture_key = {key_event});
+        """
+    )
+    backfilled = max(0, cur.rowcount or 0)
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_event_fixture_key_insert
+        AFTER INSERT ON event
+        WHEN NEW.fixture_key IS NULL
+        BEGIN
+            UPDATE OR IGNORE event SET fixture_key = {key_new} WHERE id = NEW.id;
+        END;
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_event_fixture_key_update
+        AFTER UPDATE OF league_id, date_event, home_team_id, away_team_id ON event
+        BEGIN
+            UPDATE event SET fixture_key = NULL WHERE id = NEW.id;
+            UPDATE OR IGNORE event SET fixture_key = {key_new} WHERE id = NEW.id;
+        END;
+        """
+    )
+    conn.commit()
+    return backfilled
+
+
+def ensure_data_version(conn: sqlite3.Connection) -> None:
+    """
+    Create the `data_version` stamp table (idempotent).
+
+    The `events` scope is bumped by triggers on every event write, so readers
+    can key caches and derived tables on it regardless of which script wrote.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS data_version (
+            scope TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT
+        );
+        """
+    )
+    conn.execute(
+        "INSERT OR IGNORE INTO data_version(scope, version, updated_at) VALUES ('events', 0, datetime('now'));"
+    )
+    bump = "UPDATE data_version SET version = version + 1, updated_at = datetime('now') WHERE scope = 'events';"
+    for name, when in (
+        ("trg_event_version_insert", "AFTER INSERT ON event"),
+        ("trg_event_version_update", "AFTER UPDATE ON event"),
+        ("trg_event_version_delete", "AFTER DELETE ON event"),
+    ):
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {when} BEGIN {bump} END;")
+    conn.commit()
+
+
+def read_data_version(conn: sqlite3.Connection, scope: str = "events") -> Optional[int]:
+    """Current version stamp for `scope`, or None when the DB predates `data_version`."""
+    try:
+        row = conn.execute("SELECT version FROM data_version WHERE scope = ?", (scope,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return int(row[0]) if row else None
+
+
+def bump_data_version(conn: sqlite3.Connection, scope: str) -> int:
+    """Increment (creating if needed) the version stamp for a scope without triggers."""
+    ensure_data_version(conn)
+    conn.execute(
+        """
+        INSERT INTO data_version(scope, version, updated_at) VALUES (?, 1, datetime('now'))
+        ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at;
+        """,
+        (scope,),
+    )
+    conn.commit()
+    return read_data_version(conn, scope) or 0
+
+
+def ensure_league_summary_tables(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS league_summary (
+            league_id INTEGER PRIMARY KEY,
+            total_events INTEGER NOT NULL,
+            completed_events INTEGER NOT NULL,
+            last_completed_date TEXT,
+            last_completed_event_id INTEGER,
+            data_version INTEGER NOT NULL,
+            refreshed_at TEXT
+        );
+        """
+    )
+    # Per-day fixture counts so "next/last 7 days" can be answered for any
+    # current date without rescanning `event`.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS league_day_summary (
+            league_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            fixtures INTEGER NOT NULL,
+            completed INTEGER NOT NULL,
+            PRIMARY KEY (league_id, day)
+        ) WITHOUT ROWID;
+        """
+    )
+
+
+def refresh_league_summary(conn: sqlite3.Connection) -> int:
+    """
+    Rebuild `league_summary` / `league_day_summary` from `event`.
+
+    Rows are stamped with the current `events` data version; readers treat
+    the summary as stale (and fall back to live queries) once it moves on.
+    Returns the number of leagues summarised.
+    """
+    ensure_data_version(conn)
+    ensure_league_summary_tables(conn)
+    cur = conn.cursor()
+    cur.execute("DELETE FROM league_day_summary;")
+    cur.execute("DELETE FROM league_summary;")
+    version = read_data_version(conn) or 0
+    cur.execute(
+        """
+        INSERT INTO league_day_summary(league_id, day, fixtures, completed)
+        SELECT league_id, DATE(date_event),
+               COUNT(*),
+               SUM(CASE WHEN home_score IS NOT NULL AND away_score IS NOT NULL THEN 1 ELSE 0 END)
+        FROM event
+        WHERE DATE(date_event) IS NOT NULL
+          AND home_team_id IS NOT NULL AND away_team_id IS NOT NULL
+        GROUP BY league_id, DATE(date_event);
+        """
+    )
+    cur.execute(
+        """
+        INSERT INTO league_summary(
+            league_id, total_events, completed_events, last_completed_date,
+            last_completed_event_id, data_version, refreshed_at
+        )
+        SELECT t.league_id, t.total_events, t.completed_events, l.day, l.id, ?, datetime('now')
+        FROM (
+            SELECT league_id,
+                   COUNT(*) AS total_events,
+                   SUM(CASE WHEN home_score IS NOT NULL AND away_score IS NOT NULL THEN 1 ELSE 0 END) AS completed_events
+            FROM event
+            GROUP BY league_id
+        ) t
+        LEFT JOIN (
+            SELECT league_id, id, DATE(date_event) AS day,
+                   ROW_NUMBER() OVER (PARTITION BY league_id ORDER BY date_event DESC, id DESC) AS rn
+            FROM event
+            WHERE home_score IS NOT NULL AND away_score IS NOT NULL
+              AND home_team_id IS NOT NULL AND away_team_id IS NOT NULL
+              AND DATE(date_event) IS NOT NULL
+        ) l ON l.league_id = t.league_id AND l.rn = 1;
+        """,
+        (version,),
+    )
+    count = cur.rowcount or 0
+    conn.commit()
+    return max(0, count)
+
+
+def ensure_history_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Partial covering indexes over completed events for the history view (idempotent).
+
+    They hold only scored rows, in (league, date, id) order, and carry the team
+    ids and scores, so counts, week buckets and keyset pages on
+    `(date_event, id)` are answered from the index alone (`USING COVERING INDEX`).
+    """
+    # Superseded non-covering versions of the same indexes.
+    conn.execute("DROP INDEX IF EXISTS idx_event_completed_league_date;")
+    conn.execute("DROP INDEX IF EXISTS idx_event_completed_date;")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_event_history_league_date "
+        "ON event(league_id, date_event, id, home_team_id, away_team_id, home_score, away_score) "
+        "WHERE home_score IS NOT NULL AND away_score IS NOT NULL;"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_event_history_date "
+        "ON event(date_event, id, league_id, home_team_id, away_team_id, home_score, away_score) "
+        "WHERE home_score IS NOT NULL AND away_score IS NOT NULL;"
+    )
+    conn.commit()
+
+
 def connect(db_path: str) -> sqlite3.Connection:
     conn = sqlite3.connect(db_path)
     conn.execute("PRAGMA foreign_keys = ON;")
@@ -86,8 +366,12 @@ def init_db(conn: sqlite3.Connection) -> None:
 
     cur.execute("CREATE INDEX IF NOT EXISTS idx_event_league_season ON event(league_id, season);")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_event_date ON event(date_event);")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_team_name ON team(name);")
 
     conn.commit()
+    ensure_fixture_key(conn)
+    ensure_data_version(conn)
+    ensure_history_indexes(conn)
 
 
 def ensure_configured_leagues(conn: sqlite3.Connection, league_names: Dict[int, str]) -> int:
@@ -186,7 +470,7 @@ def team_exists(conn: sqlite3.Connection, team_id: int) -> bool:
     return cur.fetchone() is not None
 
 
-def upsert_event(conn: sqlite3.Connection, event: Dict[str, Any], override_league_id: Optional[int] = None) -> None:
+def _event_row(event: Dict[str, Any], override_league_id: Optional[int] = None) -> Tuple[Any, ...]:
     id_event_raw = event.get("idEvent")
     if id_event_raw is None:
         raise ValueError("event.idEvent is required")
@@ -198,17 +482,23 @@ def upsert_event(conn: sqlite3.Connection, event: Dict[str, Any], override_leagu
         ts = str(event.get("strTimestamp"))
         if len(ts) >= 10:
             date_event_val = ts[:10]
-    round_val = to_int_or_none(event.get("intRound"))
-    home_team_val = to_int_or_none(event.get("idHomeTeam"))
-    away_team_val = to_int_or_none(event.get("idAwayTeam"))
-    home_score_val = to_int_or_none(event.get("intHomeScore"))
-    away_score_val = to_int_or_none(event.get("intAwayScore"))
-    conn.execute(
-        """
-        INSERT INTO event (
-            id, league_id, season, date_event, timestamp, round, home_team_id, away_team_id, home_score, away_score, venue, status
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(id) DO UPDATE SET
+    return (
+        id_event_val,
+        league_id_val,
+        event.get("strSeason"),
+        date_event_val,
+        event.get("strTimestamp"),
+        to_int_or_none(event.get("intRound")),
+        to_int_or_none(event.get("idHomeTeam")),
+        to_int_or_none(event.get("idAwayTeam")),
+        to_int_or_none(event.get("intHomeScore")),
+        to_int_or_none(event.get("intAwayScore")),
+        event.get("strVenue"),
+        event.get("strStatus") or event.get("strPostponed"),
+    )
+
+
+_EVENT_UPSERT_SET = """
             league_id=excluded.league_id,
             season=excluded.season,
             date_event=excluded.date_event,
@@ -219,26 +509,342 @@ def upsert_event(conn: sqlite3.Connection, event: Dict[str, Any], override_leagu
             home_score=excluded.home_score,
             away_score=excluded.away_score,
             venue=excluded.venue,
-            status=excluded.status;
+            status=excluded.status
+"""
+
+
+def upsert_event(conn: sqlite3.Connection, event: Dict[str, Any], override_league_id: Optional[int] = None) -> None:
+    conn.execute(
+        f"""
+        INSERT INTO event (
+            id, league_id, season, date_event, timestamp, round, home_team_id, away_team_id, home_score, away_score, venue, status
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET{_EVENT_UPSERT_SET};
         """,
-        (
-            id_event_val,
-            league_id_val,
-            event.get("strSeason"),
-            date_event_val,
-            event.get("strTimestamp"),
-            round_val,
-            home_team_val,
-            away_team_val,
-            home_score_val,
-            away_score_val,
-            event.get("strVenue"),
-            event.get("strStatus") or event.get("strPostponed"),
-        ),
+        _event_row(event, override_league_id),
     )
 
 
 def bulk_upsert_events(conn: sqlite3.Connection, events: Iterable[Dict[str, Any]], override_league_id: Optional[int] = None) -> None:
-    for ev in events:
-        upsert_event(conn, ev, override_league_id=override_league_id)
-    conn.commit()
+    """
+    Upsert many events in one transaction.
+
+    Rows are staged in a temp table with `executemany` and applied with a single
+    INSERT ... SELECT ... ON CONFLICT. When an id repeats, the last row wins,
+    matching the old row-by-row loop.
+    """
+    rows = [_event_row(ev, override_league_id) for ev in events]
+    if not rows:
+        conn.commit()
+        return
+    conn.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS event_stage (
+            seq INTEGER PRIMARY KEY,
+            id INTEGER NOT NULL, league_id INTEGER, season TEXT, date_event TEXT, timestamp TEXT,
+            round INTEGER, home_team_id INTEGER, away_team_id INTEGER, home_score INTEGER,
+            away_score INTEGER, venue TEXT, status TEXT
+        );
+        """
+    )
+    try:
+        conn.execute("DELETE FROM temp.event_stage;")
+        conn.executemany(
+            """
+            INSERT INTO temp.event_stage (
+                id, league_id, season, date_event, timestamp, round, home_team_id, away_team_id,
+                home_score, away_score, venue, status
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+            """,
+            rows,
+        )
+        # `WHERE true` disambiguates the upsert clause from a join constraint.
+        conn.execute(
+            f"""
+            INSERT INTO event (
+                id, league_id, season, date_event, timestamp, round, home_team_id, away_team_id, home_score, away_score, venue, status
+            )
+            SELECT id, league_id, season, date_event, timestamp, round, home_team_id, away_team_id,
+                   home_score, away_score, venue, status
+            FROM temp.event_stage
+            WHERE seq IN (SELECT MAX(seq) FROM temp.event_stage GROUP BY id)
+            ORDER BY seq
+            ON CONFLICT(id) DO UPDATE SET{_EVENT_UPSERT_SET};
+            """
+        )
+        conn.execute("DELETE FROM temp.event_stage;")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def _sql_scalar(value: Any) -> Any:
+    """Bindable form of a free-form game field: None, int, float or text."""
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+def bulk_ingest_games(conn: sqlite3.Connection, games: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Set-based ingestion of fetched fixtures keyed by league, team names and date.
+
+    `games` are Highlightly-style rows (league_id, home_team, away_team,
+    date_event, home_score, away_score, season, timestamp, status,
+    highlightly_match_id). The event table must have the highlightly_match_id
+    column and the fixture key (`ensure_fixture_key`). In one transaction this:
+      - stages the games in a temp table with `executemany`,
+      - creates missing teams by name and resolves team ids with one join,
+      - matches existing events through the unique fixture-key index,
+      - merges repeats of a fixture within the batch into one row, preferring
+        the first copy that carries the final score,
+      - fills scores for existing events that have none, links Highlightly ids,
+        and inserts the rest with INSERT ... SELECT / UPDATE ... FROM.
+
+    Rows are validated and coerced to bindable values before staging. If the
+    set-based pass still fails, it is rolled back and the games are applied one
+    at a time, so a single bad row only fails itself.
+
+    Returns {"results": [(game index, event id, action), ...], "created_teams": [...]}
+    where action is "inserted", "scored", "linked", "unchanged", "duplicate"
+    (merged into another copy of the fixture in the same batch; carries that
+    copy's event id), "invalid" (missing league, team name or date) or "error"
+    (the database rejected the row).
+    """
+    indexed = list(enumerate(games))
+    try:
+        return _ingest_game_batch(conn, indexed)
+    except sqlite3.Error:
+        if len(indexed) <= 1:
+            raise
+    results: List[Tuple[int, Optional[int], str]] = []
+    created_teams: List[str] = []
+    for item in indexed:
+        try:
+            outcome = _ingest_game_batch(conn, [item])
+        except sqlite3.Error:
+            results.append((item[0], None, "error"))
+            continue
+        results.extend(outcome["results"])
+        created_teams.extend(outcome["created_teams"])
+    return {"results": results, "created_teams": created_teams}
+
+
+def _ingest_game_batch(conn: sqlite3.Connection, indexed_games: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+    """One transaction of `bulk_ingest_games` over (game index, game) pairs."""
+    staged: List[Tuple[Any, ...]] = []
+    results: Dict[int, Tuple[int, Optional[int], str]] = {}
+    for idx, game in indexed_games:
+        league_id = to_int_or_none(game.get("league_id"))
+        home = str(game.get("home_team") or "").strip()
+        away = str(game.get("away_team") or "").strip()
+        date_event = game.get("date_event")
+        if league_id is None or not home or not away or not date_event or not normalize_fixture_date(date_event):
+            results[idx] = (idx, None, "invalid")
+            continue
+        hl_match_id = game.get("highlightly_match_id")
+        if hl_match_id is None and (to_int_or_none(game.get("event_id")) or 0) >= 1_000_000:
+            hl_match_id = game.get("event_id")
+        staged.append(
+            (
+                idx,
+                league_id,
+                home,
+                away,
+                _sql_scalar(date_event),
+                to_int_or_none(game.get("home_score")),
+                to_int_or_none(game.get("away_score")),
+                _sql_scalar(game.get("season")),
+                _sql_scalar(game.get("timestamp")),
+                _sql_scalar(game.get("status")),
+                to_int_or_none(hl_match_id),
+            )
+        )
+    if not staged:
+        return {"results": [results[i] for i in sorted(results)], "created_teams": []}
+
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS game_stage (
+            idx INTEGER PRIMARY KEY,
+            league_id INTEGER NOT NULL,
+            home_team TEXT NOT NULL,
+            away_team TEXT NOT NULL,
+            date_event TEXT NOT NULL,
+            home_score INTEGER,
+            away_score INTEGER,
+            season TEXT,
+            timestamp TEXT,
+            status TEXT,
+            highlightly_match_id INTEGER,
+            home_team_id INTEGER,
+            away_team_id INTEGER,
+            fixture_key TEXT,
+            event_id INTEGER,
+            action TEXT
+        );
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_team_name ON team(name);")
+    try:
+        cur.execute("DELETE FROM temp.game_stage;")
+        cur.executemany(
+            """
+            INSERT INTO temp.game_stage (
+                idx, league_id, home_team, away_team, date_event, home_score, away_score,
+                season, timestamp, status, highlightly_match_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+            """,
+            staged,
+        )
+
+        # Teams: create unknown names in first-seen order, then resolve ids.
+        new_teams = [
+            row[0]
+            for row in cur.execute(
+                """
+                SELECT c.name FROM (
+                    SELECT home_team AS name, idx * 2 AS ord FROM temp.game_stage
+                    UNION ALL
+                    SELECT away_team AS name, idx * 2 + 1 AS ord FROM temp.game_stage
+                ) AS c
+                WHERE NOT EXISTS (SELECT 1 FROM team t WHERE t.name = c.name)
+                GROUP BY c.name
+                ORDER BY MIN(c.ord);
+                """
+            ).fetchall()
+        ]
+        cur.executemany("INSERT INTO team (name) VALUES (?);", [(name,) for name in new_teams])
+        cur.execute(
+            """
+            UPDATE temp.game_stage SET
+                home_team_id = (SELECT MIN(t.id) FROM team t WHERE t.name = game_stage.home_team),
+                away_team_id = (SELECT MIN(t.id) FROM team t WHERE t.name = game_stage.away_team);
+            """
+        )
+        cur.execute(f"UPDATE temp.game_stage SET fixture_key = {_fixture_key_sql('game_stage')};")
+        cur.execute(
+            """
+            UPDATE temp.game_stage SET action = 'invalid' WHERE fixture_key IS NULL;
+            """
+        )
+
+        # Repeats of a fixture within the batch merge into one copy: the first
+        # one with a final score, else the first one. Fields the kept copy lacks
+        # are filled from the other copies in batch order.
+        cur.execute(
+            """
+            UPDATE temp.game_stage SET action = 'duplicate'
+            WHERE action IS NULL
+              AND idx NOT IN (
+                  SELECT COALESCE(
+                      MIN(CASE WHEN home_score IS NOT NULL AND away_score IS NOT NULL THEN idx END),
+                      MIN(idx)
+                  )
+                  FROM temp.game_stage
+                  WHERE action IS NULL
+                  GROUP BY fixture_key
+              );
+            """
+        )
+        merge_fields = ("season", "timestamp", "status", "highlightly_match_id")
+        cur.execute(
+            "UPDATE temp.game_stage SET "
+            + ", ".join(
+                f"""{col} = COALESCE({col}, (
+                    SELECT d.{col} FROM temp.game_stage d
+                    WHERE d.action = 'duplicate' AND d.fixture_key = game_stage.fixture_key
+                      AND d.{col} IS NOT NULL
+                    ORDER BY d.idx LIMIT 1
+                ))"""
+                for col in merge_fields
+            )
+            + """
+            WHERE action IS NULL
+              AND fixture_key IN (SELECT fixture_key FROM temp.game_stage WHERE action = 'duplicate');
+            """
+        )
+
+        # Existing events: one unique-index probe per staged fixture.
+        cur.execute(
+            """
+            UPDATE temp.game_stage SET event_id = e.id
+            FROM event e
+            WHERE game_stage.action IS NULL AND e.fixture_key = game_stage.fixture_key;
+            """
+        )
+        cur.execute(
+            """
+            UPDATE temp.game_stage SET action = CASE
+                WHEN game_stage.home_score IS NOT NULL AND game_stage.away_score IS NOT NULL
+                     AND e.home_score IS NULL THEN 'scored'
+                WHEN game_stage.highlightly_match_id IS NOT NULL AND e.highlightly_match_id IS NULL THEN 'linked'
+                ELSE 'unchanged'
+            END
+            FROM event e
+            WHERE game_stage.action IS NULL AND e.id = game_stage.event_id;
+            """
+        )
+        cur.execute(
+            """
+            UPDATE event SET
+                home_score = s.home_score,
+                away_score = s.away_score,
+                season = COALESCE(s.season, event.season),
+                timestamp = COALESCE(s.timestamp, event.timestamp),
+                status = COALESCE(s.status, event.status),
+                highlightly_match_id = COALESCE(s.highlightly_match_id, event.highlightly_match_id)
+            FROM temp.game_stage s
+            WHERE s.action = 'scored' AND event.id = s.event_id;
+            """
+        )
+        cur.execute(
+            """
+            UPDATE event SET highlightly_match_id = s.highlightly_match_id
+            FROM temp.game_stage s
+            WHERE s.action = 'linked' AND event.id = s.event_id;
+            """
+        )
+
+        # New fixtures. The unique fixture key makes the insert conflict-safe;
+        # ids are mapped back through the same index.
+        cur.execute("UPDATE temp.game_stage SET action = 'inserted' WHERE action IS NULL;")
+        cur.execute(
+            """
+            INSERT INTO event (
+                home_team_id, away_team_id, date_event, home_score, away_score,
+                league_id, season, timestamp, status, highlightly_match_id, fixture_key
+            )
+            SELECT home_team_id, away_team_id, date_event, home_score, away_score,
+                   league_id, season, timestamp, status, highlightly_match_id, fixture_key
+            FROM temp.game_stage
+            WHERE action = 'inserted'
+            ORDER BY idx
+            ON CONFLICT(fixture_key) WHERE fixture_key IS NOT NULL DO NOTHING;
+            """
+        )
+        cur.execute(
+            """
+            UPDATE temp.game_stage SET event_id = e.id
+            FROM event e
+            WHERE game_stage.action = 'inserted' AND e.fixture_key = game_stage.fixture_key;
+            """
+        )
+
+        rows = cur.execute(
+            "SELECT idx, event_id, action, fixture_key FROM temp.game_stage ORDER BY idx;"
+        ).fetchall()
+        kept_event = {key: event_id for _, event_id, action, key in rows if action not in ("duplicate", "invalid")}
+        for idx, event_id, action, key in rows:
+            if action == "duplicate":
+                event_id = kept_event.get(key)
+            results[idx] = (idx, event_id, action)
+
+        cur.execute("DELETE FROM temp.game_stage;")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return {"results": [results[i] for i in sorted(results)], "created_teams": new_teams}
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import queue
 import sqlite3
+import threading
 import time
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from .highlightly_client import HighlightlyRugbyAPI
 
@@ -30,6 +34,43 @@ YEAR_SPAN_LEAGUE_IDS = {4414, 4430, 4446}
 WOMEN_INDICATORS = (" w rugby", " women", " womens", " w ", " women's", " w's")
 
 
+class RateBudget:
+    """
+    Thread-safe token bucket shared by every Highlightly request in a run.
+
+    `rate_per_s` tokens are added per second up to `burst`; `acquire` blocks
+    until a token is available, so concurrent workers together never exceed
+    the plan's request rate.
+    """
+
+    def __init__(self, rate_per_s: float, burst: int = 1):
+        self.rate_per_s = max(0.01, float(rate_per_s))
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate_per_s)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait_s = (1.0 - self._tokens) / self.rate_per_s
+            time.sleep(wait_s)
+
+
+def _pace(sleep_s: float, budget: Optional[RateBudget]) -> None:
+    """Wait before an API call: token bucket when given, else the fixed sleep."""
+    if budget is not None:
+        budget.acquire()
+    elif sleep_s > 0:
+        time.sleep(sleep_s)
+
+
 def ensure_highlightly_match_id_column(conn: sqlite3.Connection) -> None:
     """Add event.highlightly_match_id if missing (idempotent)."""
     cols = {row[1] for row in conn.execute("PRAGMA table_info(event)").fetchall()}
@@ -53,6 +94,177 @@ def lookup_highlightly_match_id(conn: sqlite3.Connection, local_event_id: int) -
         return None
 
 
+def ensure_page_fingerprint_tables(conn: sqlite3.Connection) -> None:
+    """Create the Highlightly delta-fetch bookkeeping tables (idempotent)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS highlightly_page_fingerprint (
+            league_id INTEGER NOT NULL,
+            season INTEGER NOT NULL,
+            page_offset INTEGER NOT NULL,
+            page_size INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            row_count INTEGER NOT NULL,
+            min_date TEXT,
+            max_date TEXT,
+            settled INTEGER NOT NULL DEFAULT 0,
+            fetched_at INTEGER NOT NULL,
+            PRIMARY KEY (league_id, season, page_offset)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS highlightly_season_scan (
+            league_id INTEGER NOT NULL,
+            season INTEGER NOT NULL,
+            total_count INTEGER NOT NULL,
+            last_full_scan_at INTEGER,
+            last_scan_at INTEGER NOT NULL,
+            PRIMARY KEY (league_id, season)
+        )
+        """
+    )
+    conn.commit()
+
+
+class PageFingerprints:
+    """
+    Snapshot of stored per-(league, season, page) fingerprints for one run.
+
+    Loaded on the writer thread before fetching starts and only read by the
+    fetch workers. A season needs a full rescan when it has never been fully
+    scanned, when its last full scan is older than `full_rescan_after_s`, or
+    when Highlightly reports a different total (offsets may have shifted).
+    """
+
+    def __init__(
+        self,
+        pages: Dict[Tuple[int, int, int], Dict[str, Any]],
+        seasons: Dict[Tuple[int, int], Dict[str, Any]],
+        full_rescan_after_s: float,
+        now_s: Optional[float] = None,
+    ):
+        self.pages = pages
+        self.seasons = seasons
+        self.full_rescan_after_s = full_rescan_after_s
+        self.now_s = time.time() if now_s is None else now_s
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection, full_rescan_after_s: float) -> "PageFingerprints":
+        ensure_page_fingerprint_tables(conn)
+        pages = {
+            (int(r[0]), int(r[1]), int(r[2])): {"page_size": int(r[3]), "content_hash": r[4], "settled": bool(r[5])}
+            for r in conn.execute(
+                "SELECT league_id, season, page_offset, page_size, content_hash, settled "
+                "FROM highlightly_page_fingerprint"
+            )
+        }
+        seasons = {
+            (int(r[0]), int(r[1])): {"total_count": int(r[2]), "last_full_scan_at": r[3]}
+            for r in conn.execute(
+                "SELECT league_id, season, total_count, last_full_scan_at FROM highlightly_season_scan"
+            )
+        }
+        return cls(pages, seasons, full_rescan_after_s)
+
+    def needs_full_scan(self, league_id: int, season: int, total_count: int) -> bool:
+        stored = self.seasons.get((league_id, season))
+        if not stored or stored.get("last_full_scan_at") is None:
+            return True
+        if int(stored.get("total_count") or 0) != int(total_count):
+            return True
+        return self.now_s - float(stored["last_full_scan_at"]) >= self.full_rescan_after_s
+
+    def page(self, league_id: int, season: int, offset: int, page_size: int) -> Optional[Dict[str, Any]]:
+        stored = self.pages.get((league_id, season, offset))
+        if stored is None or stored["page_size"] != page_size:
+            return None
+        return stored
+
+
+def page_fingerprint(rows: List[Dict[str, Any]], settled_before: date) -> Dict[str, Any]:
+    """
+    Content hash and date range of one raw Highlightly page.
+
+    A page is "settled" when every match on it either has a final score or is
+    older than `settled_before`; settled pages are skipped between full rescans.
+    """
+    content_hash = hashlib.sha1(json.dumps(rows, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    dates: List[date] = []
+    settled = bool(rows)
+    for row in rows:
+        dt = parse_match_dt(row.get("date"))
+        if dt is not None:
+            dates.append(dt.date())
+        home, away = extract_scores(row)
+        if (home is None or away is None) and (dt is None or dt.date() >= settled_before):
+            settled = False
+    return {
+        "content_hash": content_hash,
+        "row_count": len(rows),
+        "min_date": min(dates).isoformat() if dates else None,
+        "max_date": max(dates).isoformat() if dates else None,
+        "settled": settled,
+    }
+
+
+def record_page_fingerprint(conn: sqlite3.Connection, event: Dict[str, Any]) -> None:
+    """
+    Persist the fingerprint carried by a fetched page event (after its games were written).
+
+    The season's total and full-scan time are recorded separately, by
+    `record_season_scan`, once every page of the season is in.
+    """
+    fp = event.get("fingerprint")
+    if not fp:
+        return
+    now_s = int(time.time())
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO highlightly_page_fingerprint (
+            league_id, season, page_offset, page_size, content_hash, row_count,
+            min_date, max_date, settled, fetched_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            event["league_id"], event["season"], event["offset"], event["page_size"], fp["content_hash"],
+            fp["row_count"], fp["min_date"], fp["max_date"], int(fp["settled"]), now_s,
+        ),
+    )
+    conn.commit()
+
+
+def record_season_scan(conn: sqlite3.Connection, event: Dict[str, Any], complete: bool = True) -> None:
+    """
+    Persist a finished season scan (a `season_done` event).
+
+    The total and `last_full_scan_at` are only updated when every page of the
+    season was fetched and written (`failed_pages == 0` and `complete`).
+    Otherwise only `last_scan_at` moves, so the stored total still disagrees
+    with a shifted season and the next run rescans it in full.
+    """
+    if event.get("total_count") is None:
+        return
+    now_s = int(time.time())
+    succeeded = complete and not event.get("failed_pages")
+    conn.execute(
+        """
+        INSERT INTO highlightly_season_scan (league_id, season, total_count, last_full_scan_at, last_scan_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(league_id, season) DO UPDATE SET
+            total_count = CASE WHEN ? THEN excluded.total_count ELSE total_count END,
+            last_full_scan_at = COALESCE(excluded.last_full_scan_at, last_full_scan_at),
+            last_scan_at = excluded.last_scan_at
+        """,
+        (
+            event["league_id"], event["season"], int(event["total_count"]),
+            now_s if (succeeded and event.get("full_scan")) else None, now_s, int(succeeded),
+        ),
+    )
+    conn.commit()
+
+
 def parse_api_key(explicit: Optional[str] = None) -> str:
     import os
 
@@ -121,14 +333,14 @@ def detect_best_season(
     today: datetime,
     request_counter: Optional[List[int]] = None,
     sleep_s: float = 0.0,
+    budget: Optional[RateBudget] = None,
 ) -> Tuple[Optional[int], int]:
     best_season: Optional[int] = None
     best_score = -1
     best_total = 0
 
     for season in season_candidates(today, our_league_id, include_history=False):
-        if sleep_s > 0:
-            time.sleep(sleep_s)
+        _pace(sleep_s, budget)
         resp = api.get_matches(league_id=highlightly_league_id, season=season, limit=1)
         if request_counter is not None:
             request_counter[0] += 1
@@ -160,6 +372,7 @@ def fetch_season_matches(
     page_size: int = 100,
     request_counter: Optional[List[int]] = None,
     sleep_s: float = 0.0,
+    budget: Optional[RateBudget] = None,
 ) -> List[Dict[str, Any]]:
     rows: List[Dict[str, Any]] = []
     offset = 0
@@ -167,8 +380,7 @@ def fetch_season_matches(
     page_size = max(1, min(page_size, 100))
 
     while True:
-        if sleep_s > 0:
-            time.sleep(sleep_s)
+        _pace(sleep_s, budget)
         resp = api.get_matches(
             league_id=highlightly_league_id,
             season=season,
@@ -334,6 +546,11 @@ def highlightly_row_to_game(
     }
 
 
+def _date_window(days_ahead: int, days_back: int) -> Tuple[date, date]:
+    today = datetime.utcnow().date()
+    return today - timedelta(days=days_back), today + timedelta(days=days_ahead)
+
+
 def _filter_by_date_window(
     games: List[Dict[str, Any]],
     days_ahead: int,
@@ -341,8 +558,7 @@ def _filter_by_date_window(
     league_name: str,
 ) -> List[Dict[str, Any]]:
     today = datetime.utcnow().date()
-    min_date = today - timedelta(days=days_back)
-    max_date = today + timedelta(days=days_ahead)
+    min_date, max_date = _date_window(days_ahead, days_back)
     in_window: List[Dict[str, Any]] = []
     past = future = 0
 
@@ -370,6 +586,44 @@ def _filter_by_date_window(
     return in_window
 
 
+def _seasons_to_fetch(
+    api: HighlightlyRugbyAPI,
+    our_league_id: int,
+    league_name: str,
+    highlightly_league_id: int,
+    today: datetime,
+    include_history: bool,
+    request_counter: Optional[List[int]] = None,
+    sleep_s: float = 0.0,
+    budget: Optional[RateBudget] = None,
+) -> List[int]:
+    if include_history:
+        return season_candidates(today, our_league_id, include_history=True)
+    # Fetch the recent candidate seasons (current + previous), NOT just the
+    # single "best" one. detect_best_season adds a large future-fixture
+    # bonus, so once a season ends and the next season's schedule is
+    # published it locks onto the upcoming season and stops refreshing the
+    # just-finished one - leaving recently completed matches stuck with no
+    # score. Pulling the recent candidates guarantees those results are
+    # backfilled; the date-window filter still trims anything too old.
+    seasons = season_candidates(today, our_league_id, include_history=False)[:3]
+    if seasons:
+        return seasons
+    best, _total = detect_best_season(
+        api,
+        highlightly_league_id,
+        our_league_id,
+        today,
+        request_counter=request_counter,
+        sleep_s=sleep_s,
+        budget=budget,
+    )
+    if best is None:
+        logger.warning("No Highlightly season with fixtures for %s", league_name)
+        return []
+    return [best]
+
+
 def fetch_games_from_highlightly(
     api: HighlightlyRugbyAPI,
     our_league_id: int,
@@ -392,31 +646,12 @@ def fetch_games_from_highlightly(
         include_history,
     )
 
-    seasons: List[int]
-    if include_history:
-        seasons = season_candidates(today, our_league_id, include_history=True)
-    else:
-        # Fetch the recent candidate seasons (current + previous), NOT just the
-        # single "best" one. detect_best_season adds a large future-fixture
-        # bonus, so once a season ends and the next season's schedule is
-        # published it locks onto the upcoming season and stops refreshing the
-        # just-finished one - leaving recently completed matches stuck with no
-        # score. Pulling the recent candidates guarantees those results are
-        # backfilled; the date-window filter still trims anything too old.
-        seasons = season_candidates(today, our_league_id, include_history=False)[:3]
-        if not seasons:
-            best, _total = detect_best_season(
-                api,
-                highlightly_league_id,
-                our_league_id,
-                today,
-                request_counter=request_counter,
-                sleep_s=sleep_s,
-            )
-            if best is None:
-                logger.warning("No Highlightly season with fixtures for %s", league_name)
-                return []
-            seasons = [best]
+    seasons = _seasons_to_fetch(
+        api, our_league_id, league_name, highlightly_league_id, today, include_history,
+        request_counter=request_counter, sleep_s=sleep_s,
+    )
+    if not seasons:
+        return []
 
     games: List[Dict[str, Any]] = []
     seen: set[tuple] = set()
@@ -447,6 +682,243 @@ def fetch_games_from_highlightly(
     return _filter_by_date_window(games, days_ahead, days_back, league_name)
 
 
+def iter_league_pages_concurrently(
+    api: HighlightlyRugbyAPI,
+    leagues: List[Tuple[int, str, int]],
+    budget: RateBudget,
+    max_workers: int = 4,
+    include_history: bool = False,
+    days_ahead: int = 180,
+    days_back: int = 14,
+    page_size: int = 100,
+    page_attempts: int = 2,
+    request_counter: Optional[List[int]] = None,
+    fingerprints: Optional[PageFingerprints] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Fetch season pages for many leagues in parallel and yield them as they land.
+
+    `leagues` holds (our league id, league name, Highlightly league id). Every
+    request goes through the shared `budget`, so throughput is bounded by the
+    plan's rate limit rather than per-request sleeps. Once a season's first page
+    reports its total, the remaining offsets are fetched concurrently.
+
+    Yields, on the caller's thread (so a single SQLite connection can consume
+    them):
+      {"type": "page", "league_id", "league_name", "season", "offset", "page_size",
+       "games", "changed", "fingerprint", "total_count", "full_scan"}
+      {"type": "season_done", "league_id", "league_name", "season", "total_count",
+       "full_scan", "failed_pages"}
+      {"type": "league_done", "league_id", "league_name", "games", "failed_pages",
+       "skipped_pages", "unchanged_pages"}
+
+    `season_done` follows every page event of its season; `games` counts the
+    games on changed pages only.
+
+    A page that keeps failing is counted in `failed_pages` and skipped; the rest
+    of the league and the other leagues carry on. Games are deduplicated per
+    league and, unless `include_history`, trimmed to the date window.
+
+    With `fingerprints` (delta mode), a season whose total is unchanged and whose
+    full rescan is not yet due only re-requests pages that are not settled, and
+    pages whose content hash is unchanged come back with `changed=False` and no
+    games. The caller persists each page's fingerprint via `record_page_fingerprint`
+    and each finished season via `record_season_scan`.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    page_size = max(1, min(page_size, 100))
+    today = datetime.now(timezone.utc)
+    min_date, max_date = _date_window(days_ahead, days_back)
+    events: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+    lock = threading.Lock()
+    state: Dict[int, Dict[str, Any]] = {
+        our_id: {
+            "name": name,
+            "outstanding": 1,
+            "games": 0,
+            "failed_pages": 0,
+            "skipped_pages": 0,
+            "unchanged_pages": 0,
+            "seen": set(),
+        }
+        for our_id, name, _hl_id in leagues
+    }
+    seasons: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+    def _count_request() -> None:
+        if request_counter is not None:
+            with lock:
+                request_counter[0] += 1
+
+    def _submit(our_id: int, fn, *args) -> None:
+        # Count the task before it can run so a league never looks finished
+        # while its follow-up pages are still queued.
+        with lock:
+            state[our_id]["outstanding"] += 1
+        pool.submit(fn, our_id, *args)
+
+    def _submit_page(our_id: int, hl_id: int, season: int, offset: int, full_scan: bool = True) -> None:
+        with lock:
+            scan = seasons.setdefault(
+                (our_id, season), {"outstanding": 0, "failed_pages": 0, "total_count": None, "full_scan": True}
+            )
+            scan["outstanding"] += 1
+        _submit(our_id, _fetch_page, hl_id, season, offset, full_scan)
+
+    def _finish_page(our_id: int, season: int, failed: bool) -> None:
+        with lock:
+            scan = seasons[(our_id, season)]
+            scan["outstanding"] -= 1
+            if failed:
+                scan["failed_pages"] += 1
+            done = scan["outstanding"] == 0
+        if done:
+            events.put(
+                {
+                    "type": "season_done",
+                    "league_id": our_id,
+                    "league_name": state[our_id]["name"],
+                    "season": season,
+                    "total_count": scan["total_count"],
+                    "full_scan": scan["full_scan"],
+                    "failed_pages": scan["failed_pages"],
+                }
+            )
+
+    def _finish_task(our_id: int) -> None:
+        with lock:
+            league = state[our_id]
+            league["outstanding"] -= 1
+            done = league["outstanding"] == 0
+        if done:
+            events.put(
+                {
+                    "type": "league_done",
+                    "league_id": our_id,
+                    "league_name": league["name"],
+                    "games": league["games"],
+                    "failed_pages": league["failed_pages"],
+                    "skipped_pages": league["skipped_pages"],
+                    "unchanged_pages": league["unchanged_pages"],
+                }
+            )
+
+    def _fetch_page(our_id: int, hl_id: int, season: int, offset: int, full_scan: bool = True) -> None:
+        league = state[our_id]
+        failed = False
+        try:
+            resp: Dict[str, Any] = {}
+            for attempt in range(max(1, page_attempts)):
+                budget.acquire()
+                resp = api.get_matches(league_id=hl_id, season=season, limit=page_size, offset=offset)
+                _count_request()
+                # The client swallows HTTP errors into an empty payload. Past the
+                # first page the season is known to have rows, so retry those.
+                if resp.get("data") or resp.get("pagination") or offset == 0:
+                    break
+            else:
+                raise RuntimeError("empty page after retries")
+
+            batch = resp.get("data") or []
+            total = int((resp.get("pagination") or {}).get("totalCount") or 0)
+            if offset == 0:
+                full_scan = fingerprints is None or total <= 0 or fingerprints.needs_full_scan(our_id, season, total)
+                with lock:
+                    seasons[(our_id, season)].update(total_count=total, full_scan=full_scan)
+            if batch:
+                if total > 0:
+                    if offset == 0:
+                        for next_offset in range(len(batch), total, page_size):
+                            stored = None if full_scan else fingerprints.page(our_id, season, next_offset, page_size)
+                            if stored is not None and stored["settled"]:
+                                with lock:
+                                    league["skipped_pages"] += 1
+                                continue
+                            _submit_page(our_id, hl_id, season, next_offset, full_scan)
+                elif len(batch) >= page_size:
+                    # No total reported: walk the season page by page.
+                    _submit_page(our_id, hl_id, season, offset + len(batch), full_scan)
+
+            fingerprint = page_fingerprint(batch, min_date) if fingerprints is not None and batch else None
+            changed = True
+            if fingerprint is not None and not full_scan:
+                stored = fingerprints.page(our_id, season, offset, page_size)
+                changed = stored is None or stored["content_hash"] != fingerprint["content_hash"]
+                if not changed:
+                    with lock:
+                        league["unchanged_pages"] += 1
+
+            games: List[Dict[str, Any]] = []
+            for row in batch:
+                game = highlightly_row_to_game(row, our_id, league["name"], season)
+                if not game:
+                    continue
+                if not include_history and not (min_date <= game["date_event"] <= max_date):
+                    continue
+                key = (game["date_event"], game["home_team"], game["away_team"])
+                with lock:
+                    if key in league["seen"]:
+                        continue
+                    league["seen"].add(key)
+                    if changed:
+                        league["games"] += 1
+                games.append(game)
+            if games or fingerprint is not None:
+                events.put(
+                    {
+                        "type": "page",
+                        "league_id": our_id,
+                        "league_name": league["name"],
+                        "season": season,
+                        "offset": offset,
+                        "page_size": page_size,
+                        "games": games if changed else [],
+                        "changed": changed,
+                        "fingerprint": fingerprint,
+                        "total_count": total if offset == 0 else None,
+                        "full_scan": full_scan,
+                    }
+                )
+        except Exception as exc:
+            failed = True
+            with lock:
+                league["failed_pages"] += 1
+            logger.warning(
+                "Highlightly page failed for %s season=%s offset=%s: %s", league["name"], season, offset, exc
+            )
+        finally:
+            _finish_page(our_id, season, failed)
+            _finish_task(our_id)
+
+    def _start_league(our_id: int, name: str, hl_id: int) -> None:
+        try:
+            season_list = _seasons_to_fetch(
+                api, our_id, name, hl_id, today, include_history,
+                request_counter=request_counter, budget=budget,
+            )
+            for season in season_list:
+                _submit_page(our_id, hl_id, season, 0)
+        except Exception as exc:
+            with lock:
+                state[our_id]["failed_pages"] += 1
+            logger.warning("Highlightly season lookup failed for %s: %s", name, exc)
+        finally:
+            _finish_task(our_id)
+
+    if not leagues:
+        return
+    remaining = len(state)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="highlightly") as pool:
+        for our_id, name, hl_id in leagues:
+            pool.submit(_start_league, our_id, name, hl_id)  # counted by the initial outstanding=1
+        while remaining:
+            event = events.get()
+            if event["type"] == "league_done":
+                remaining -= 1
+            yield event
+
+
 def scan_league_summary(
     api: HighlightlyRugbyAPI,
     our_league_id: int,
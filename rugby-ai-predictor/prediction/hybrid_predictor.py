@@ -6,15 +6,14 @@ Expected accuracy: 67-70% (vs 59% AI-only)
 
 import sqlite3
 import pickle
-import numpy as np
-import pandas as pd
 import os
 import json
 import logging
 import hashlib
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Optional, Tuple, Any
-from prediction.features import build_feature_table, FeatureConfig
+from typing import Dict, List, Optional, Tuple, Any
 from prediction.sportdevs_client import SportDevsClient, extract_odds_features
 from prediction.international_leagues import (
     has_own_or_linked_model,
@@ -93,7 +92,11 @@ class HybridPredictor:
     def get_ai_prediction(self, home_team_id: int, away_team_id: int, 
                          match_date: str) -> Dict[str, Any]:
         """Get prediction from trained AI model"""
-        
+        # numpy/pandas are only needed by the legacy XGBoost path; importing them
+        # here keeps MultiLeaguePredictor construction free of ML dependencies.
+        import numpy as np
+        from prediction.features import build_feature_table, FeatureConfig
+
         # Build features for this match
         conn = sqlite3.connect(self.db_path)
         config = FeatureConfig(
@@ -507,6 +510,9 @@ class HybridPredictor:
 
 class MultiLeaguePredictor:
     """Wrapper class that manages multiple HybridPredictor instances for different leagues"""
+
+    # How long a "no model in storage" answer is trusted before re-checking.
+    MODEL_MISSING_TTL_SECONDS = float(os.getenv("MODEL_MISSING_TTL_SECONDS", "60"))
     
     def __init__(self, db_path: str = 'data.sqlite', sportdevs_api_key: Optional[str] = None, 
                  artifacts_dir: str = 'artifacts', storage_bucket: Optional[str] = None):
@@ -531,6 +537,15 @@ class MultiLeaguePredictor:
             )
         self.sportdevs_api_key = sportdevs_api_key or os.getenv('SPORTDEVS_API_KEY', '')
         self._predictors: Dict[Tuple[str, int], Any] = {}
+        # Storage existence checks are network round trips. A published model
+        # stays published, so hits are kept for the instance lifetime; misses
+        # expire after MODEL_MISSING_TTL_SECONDS so a model uploaded later
+        # (e.g. by an incremental retrain) is picked up without a restart.
+        self._model_exists_cache: Dict[Tuple[int, str], float] = {}
+        # One lock per (family, league) so a background warm-up and a user
+        # request never download the same checkpoints twice.
+        self._load_locks: Dict[Tuple[str, int], threading.Lock] = {}
+        self._load_locks_guard = threading.Lock()
 
     @staticmethod
     def _load_champion_map() -> Dict[str, str]:
@@ -584,7 +599,16 @@ class MultiLeaguePredictor:
         if cache_key in self._predictors:
             logger.info(f"✅ Using cached predictor for league {league_id} family={requested_family}")
             return self._predictors[cache_key]
-        
+
+        with self._load_locks_guard:
+            load_lock = self._load_locks.setdefault(cache_key, threading.Lock())
+        with load_lock:
+            if cache_key in self._predictors:
+                return self._predictors[cache_key]
+            return self._load_predictor(league_id, requested_family, cache_key)
+
+    def _load_predictor(self, league_id: int, requested_family: str, cache_key: Tuple[str, int]) -> HybridPredictor:
+        """Download and construct the predictor for a league (called under its load lock)."""
         logger.info(f"Creating new predictor for league {league_id}")
         logger.info(f"storage_bucket={self.storage_bucket}, db_path={self.db_path}")
         
@@ -689,18 +713,33 @@ class MultiLeaguePredictor:
             logger.error(f"❌ Failed to initialize HybridPredictor: {e}", exc_info=True)
             raise
     
-    def has_trained_model(self, league_id: int) -> bool:
-        """Return True when a deployed model exists for this league or a linked international league."""
+    def _model_exists(self, league_id: int, family: str) -> bool:
+        """Cached `model_exists_in_storage` lookup."""
+        key = (int(league_id), family)
+        expires_at = self._model_exists_cache.get(key)
+        if expires_at is not None:
+            if expires_at == float("inf"):
+                return True
+            if time.monotonic() < expires_at:
+                return False
         from .storage_loader import model_exists_in_storage
 
+        exists = model_exists_in_storage(
+            league_id=int(league_id),
+            bucket_name=self.storage_bucket,
+            preferred_family=family,
+        )
+        self._model_exists_cache[key] = (
+            float("inf") if exists else time.monotonic() + self.MODEL_MISSING_TTL_SECONDS
+        )
+        return exists
+
+    def has_trained_model(self, league_id: int) -> bool:
+        """Return True when a deployed model exists for this league or a linked international league."""
         requested_family = self._requested_model_family(league_id)
 
         def _exists(lid: int) -> bool:
-            return model_exists_in_storage(
-                league_id=int(lid),
-                bucket_name=self.storage_bucket,
-                preferred_family=requested_family,
-            )
+            return self._model_exists(lid, requested_family)
 
         return has_own_or_linked_model(int(league_id), _exists)
 
@@ -712,16 +751,10 @@ class MultiLeaguePredictor:
     ) -> Tuple[int, Dict[str, Any]]:
         import sqlite3
 
-        from .storage_loader import model_exists_in_storage
-
         requested_family = self._requested_model_family(league_id)
 
         def _exists(lid: int) -> bool:
-            return model_exists_in_storage(
-                league_id=int(lid),
-                bucket_name=self.storage_bucket,
-                preferred_family=requested_family,
-            )
+            return self._model_exists(lid, requested_family)
 
         conn = sqlite3.connect(self.db_path)
         try:
@@ -735,6 +768,95 @@ class MultiLeaguePredictor:
         finally:
             conn.close()
 
+    def _upcoming_fixtures(self, league_id: int, horizon_days: int) -> List[Tuple[str, str, str]]:
+        """(home, away, date) for unplayed fixtures of a league inside the horizon."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(
+                """
+                SELECT ht.name, at.name, substr(e.date_event, 1, 10)
+                FROM event e
+                JOIN team ht ON ht.id = e.home_team_id
+                JOIN team at ON at.id = e.away_team_id
+                WHERE e.league_id = ?
+                  AND e.home_score IS NULL
+                  AND e.away_score IS NULL
+                  AND date(e.date_event) >= date('now')
+                  AND date(e.date_event) <= date('now', ?)
+                ORDER BY e.date_event ASC, e.id ASC
+                """,
+                (int(league_id), f"+{int(horizon_days)} days"),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [(str(h), str(a), str(d)) for h, a, d in rows if h and a and d]
+
+    def warm_up(
+        self,
+        league_ids: List[int],
+        budget_seconds: float = 60.0,
+        horizon_days: int = 14,
+    ) -> Dict[str, Any]:
+        """
+        Preload models and prime caches for the given leagues within a time budget.
+
+        Per league: storage existence check, model download + load (through the
+        same cache `predict_match` uses), then the runtime's own warm-up for the
+        upcoming fixtures (team names, team histories, one forward pass). A league
+        is skipped when the remaining budget is below the average cost of the
+        leagues warmed so far, so models are never half-loaded; the runtime's
+        fixture warm-up also stops at the deadline.
+        """
+        started = time.perf_counter()
+        deadline = started + float(budget_seconds)
+        report: Dict[str, Any] = {"leagues": {}, "skipped": [], "budget_seconds": float(budget_seconds)}
+        league_costs: List[float] = []
+
+        for league_id in league_ids:
+            league_id = int(league_id)
+            remaining = deadline - time.perf_counter()
+            expected = (sum(league_costs) / len(league_costs)) if league_costs else 0.0
+            if remaining <= 0 or remaining < expected:
+                report["skipped"].append(league_id)
+                continue
+            league_started = time.perf_counter()
+            stages: Dict[str, Any] = {}
+            try:
+                t0 = time.perf_counter()
+                fixtures = self._upcoming_fixtures(league_id, horizon_days)
+                stages["fixtures_s"] = round(time.perf_counter() - t0, 4)
+
+                t0 = time.perf_counter()
+                has_model = self.has_trained_model(league_id)
+                stages["model_exists_s"] = round(time.perf_counter() - t0, 4)
+                if not has_model:
+                    stages["status"] = "no_model"
+                    report["leagues"][str(league_id)] = stages
+                    continue
+
+                t0 = time.perf_counter()
+                source_league_id = league_id
+                if fixtures:
+                    source_league_id, _ = self._resolve_prediction_league(
+                        league_id, fixtures[0][0], fixtures[0][1]
+                    )
+                predictor = self._get_predictor(source_league_id)
+                stages["load_model_s"] = round(time.perf_counter() - t0, 4)
+
+                if hasattr(predictor, "warm_up"):
+                    stages.update(predictor.warm_up(fixtures, deadline=deadline))
+                stages["status"] = "ok"
+                league_costs.append(time.perf_counter() - league_started)
+            except Exception as warm_error:
+                logger.warning("Warm-up failed for league %s: %s", league_id, warm_error)
+                stages["status"] = "error"
+                stages["error"] = str(warm_error)
+            stages["total_s"] = round(sum(v for k, v in stages.items() if k.endswith("_s")), 4)
+            report["leagues"][str(league_id)] = stages
+
+        report["elapsed_s"] = round(time.perf_counter() - started, 4)
+        return report
+
     def predict_match_odds_only(
         self,
         home_team: str,
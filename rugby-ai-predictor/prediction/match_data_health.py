@@ -2,56 +2,20 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+from .db import fixture_key, normalize_fixture_date
 
-def _normalize_date_key(value: Any) -> Optional[str]:
-    if value is None:
-        return None
 
-    if hasattr(value, "to_datetime"):
-        try:
-            value = value.to_datetime()
-        except Exception:
-            pass
-
-    if isinstance(value, datetime):
-        if value.tzinfo is None:
-            value = value.replace(tzinfo=timezone.utc)
-        return value.astimezone(timezone.utc).date().isoformat()
-
-    text = str(value).strip()
-    if not text:
-        return None
-
-    if text.endswith("Z"):
-        text = text[:-1] + "+00:00"
-
-    try:
-        parsed = datetime.fromisoformat(text)
-        if parsed.tzinfo is None:
-            parsed = parsed.replace(tzinfo=timezone.utc)
-        return parsed.astimezone(timezone.utc).date().isoformat()
-    except Exception:
-        pass
-
-    if len(text) >= 10:
-        return text[:10]
-    return None
+_normalize_date_key = normalize_fixture_date
 
 
 def _fixture_key(data: Dict[str, Any]) -> Optional[str]:
-    league_id = data.get("league_id")
-    home_team_id = data.get("home_team_id")
-    away_team_id = data.get("away_team_id")
-    date_key = _normalize_date_key(data.get("date_event"))
-
-    if league_id is None or home_team_id is None or away_team_id is None or not date_key:
-        return None
-
-    return f"{int(league_id)}|{date_key}|{int(home_team_id)}|{int(away_team_id)}"
+    stored = data.get("fixture_key")
+    if isinstance(stored, str) and stored:
+        return stored
+    return fixture_key(data.get("league_id"), data.get("date_event"), data.get("home_team_id"), data.get("away_team_id"))
 
 
 def _doc_quality_score(doc_id: str, data: Dict[str, Any]) -> int:
@@ -102,99 +66,248 @@ def _pick_keeper(docs: List[Tuple[str, Dict[str, Any]]]) -> Tuple[str, List[str]
     return keeper_id, delete_ids
 
 
+DIGEST_COLLECTION = "match_fixture_digest"
+STATE_COLLECTION = "match_health_state"
+STATE_DOC_ID = "matches"
+_SCAN_FIELDS = ["id", "league_id", "date_event", "home_team_id", "away_team_id", "fixture_key", "synced_at"]
+
+
+class _FixtureIndex:
+    """Per-league fixture_key -> doc ids, plus the reverse doc -> (league, key) map."""
+
+    def __init__(self) -> None:
+        self.by_league: Dict[int, Dict[str, List[str]]] = {}
+        self.doc_keys: Dict[str, Tuple[int, str]] = {}
+        self.dirty: set = set()
+
+    def load(self, league_id: int, fixtures: Dict[str, List[str]]) -> None:
+        league = self.by_league.setdefault(league_id, {})
+        for key, doc_ids in (fixtures or {}).items():
+            league[key] = [str(d) for d in doc_ids]
+            for doc_id in league[key]:
+                self.doc_keys[doc_id] = (league_id, key)
+
+    def remove(self, doc_id: str) -> None:
+        old = self.doc_keys.pop(doc_id, None)
+        if old is None:
+            return
+        league_id, key = old
+        doc_ids = self.by_league.get(league_id, {}).get(key, [])
+        if doc_id in doc_ids:
+            doc_ids.remove(doc_id)
+            if not doc_ids:
+                self.by_league[league_id].pop(key, None)
+        self.dirty.add(league_id)
+
+    def assign(self, doc_id: str, league_id: int, key: str) -> None:
+        if self.doc_keys.get(doc_id) == (league_id, key):
+            return
+        self.remove(doc_id)
+        self.by_league.setdefault(league_id, {}).setdefault(key, []).append(doc_id)
+        self.doc_keys[doc_id] = (league_id, key)
+        self.dirty.add(league_id)
+
+    def doc_ids(self, league_id: int, key: str) -> List[str]:
+        return list(self.by_league.get(league_id, {}).get(key, []))
+
+
+def _paged(query: Any, page_size: int):
+    """Stream a query page by page so only one page of snapshots is held at a time."""
+    last = None
+    while True:
+        page_query = query.limit(page_size)
+        if last is not None:
+            page_query = page_query.start_after(last)
+        page = list(page_query.stream())
+        for snap in page:
+            yield snap
+        if len(page) < page_size:
+            return
+        last = page[-1]
+
+
 def scan_firestore_matches(
     firestore_db: Any,
     *,
     remove_duplicates: bool = False,
     sample_limit: int = 25,
+    mode: str = "full",
+    page_size: int = 500,
+    max_docs: Optional[int] = None,
+    persist_index: bool = True,
 ) -> Dict[str, Any]:
+    """
+    Find duplicate fixtures and data issues in the Firestore `matches` collection.
+
+    mode="full" pages through every doc (projected to the identity fields) and
+    rebuilds the per-league fixture-key digests in `match_fixture_digest`.
+    mode="incremental" only reads docs whose `synced_at` is after the last
+    scan's watermark, updates the affected digests and reports the
+    duplicate groups those docs touch; it falls back to a full scan when no
+    watermark exists. `max_docs` bounds an incremental pass; the watermark
+    only advances past processed docs, so the next call resumes
+    (`has_more`). Full documents are fetched only for duplicate groups.
+    """
     matches_ref = firestore_db.collection("matches")
+    state_ref = firestore_db.collection(STATE_COLLECTION).document(STATE_DOC_ID)
+    page_size = max(50, min(int(page_size or 500), 1000))
+
+    watermark = None
+    if mode == "incremental":
+        try:
+            state_snap = state_ref.get()
+            if state_snap.exists:
+                watermark = (state_snap.to_dict() or {}).get("last_synced_at")
+        except Exception:
+            watermark = None
+        if watermark is None:
+            mode = "full"
+
+    index = _FixtureIndex()
+    loaded_leagues: set = set()
+
+    def _ensure_league(league_id: int) -> None:
+        if mode != "incremental" or league_id in loaded_leagues:
+            return
+        loaded_leagues.add(league_id)
+        snap = firestore_db.collection(DIGEST_COLLECTION).document(str(league_id)).get()
+        if snap.exists:
+            index.load(league_id, (snap.to_dict() or {}).get("fixtures") or {})
+
+    if mode == "incremental":
+        query = matches_ref.where("synced_at", ">", watermark).order_by("synced_at")
+        if max_docs is not None:
+            page_size = max(50, min(page_size, int(max_docs)))
+    else:
+        query = matches_ref.select(_SCAN_FIELDS).order_by("__name__")
 
     total_docs = 0
-    fixture_groups: Dict[str, List[Tuple[str, Dict[str, Any]]]] = defaultdict(list)
+    has_more = False
+    max_synced_at = watermark
+    touched: set = set()
+    id_mismatch_count = 0
     id_mismatches: List[Dict[str, Any]] = []
+    missing_count = 0
     missing_fields: List[Dict[str, Any]] = []
+    seen_record_ids: Dict[str, str] = {}
     duplicate_ids: List[Dict[str, Any]] = []
 
-    for doc in matches_ref.stream():
-        total_docs += 1
+    for doc in _paged(query, page_size):
         data = doc.to_dict() or {}
         doc_id = doc.id
+        synced_at = data.get("synced_at")
+        # Sync batches share one server timestamp, so only stop at a timestamp
+        # boundary; otherwise the next pass would resume inside the same run.
+        if (
+            max_docs is not None
+            and mode == "incremental"
+            and total_docs >= max_docs
+            and synced_at != max_synced_at
+        ):
+            has_more = True
+            break
+        total_docs += 1
+
+        if synced_at is not None:
+            try:
+                if max_synced_at is None or synced_at > max_synced_at:
+                    max_synced_at = synced_at
+            except TypeError:
+                pass
 
         record_id = data.get("id")
         if record_id is not None and str(record_id) != str(doc_id):
-            id_mismatches.append(
-                {
-                    "doc_id": doc_id,
-                    "id_field": record_id,
-                    "league_id": data.get("league_id"),
-                    "date_event": _normalize_date_key(data.get("date_event")),
-                }
-            )
-
-        fixture_key = _fixture_key(data)
-        if not fixture_key:
-            missing_fields.append(
-                {
-                    "doc_id": doc_id,
-                    "league_id": data.get("league_id"),
-                    "date_event": data.get("date_event"),
-                    "home_team_id": data.get("home_team_id"),
-                    "away_team_id": data.get("away_team_id"),
-                }
-            )
+            id_mismatch_count += 1
+            if len(id_mismatches) < sample_limit:
+                id_mismatches.append(
+                    {
+                        "doc_id": doc_id,
+                        "id_field": record_id,
+                        "league_id": data.get("league_id"),
+                        "date_event": _normalize_date_key(data.get("date_event")),
+                    }
+                )
+        if record_id is not None and mode == "full":
+            record_key = str(record_id)
+            if record_key in seen_record_ids and seen_record_ids[record_key] != doc_id:
+                duplicate_ids.append(
+                    {
+                        "id_field": record_id,
+                        "doc_ids": sorted({seen_record_ids[record_key], doc_id}),
+                    }
+                )
+            else:
+                seen_record_ids[record_key] = doc_id
+
+        key = _fixture_key(data)
+        league_id = data.get("league_id")
+        if not key or league_id is None:
+            missing_count += 1
+            if len(missing_fields) < sample_limit:
+                missing_fields.append(
+                    {
+                        "doc_id": doc_id,
+                        "league_id": data.get("league_id"),
+                        "date_event": str(data.get("date_event")) if data.get("date_event") is not None else None,
+                        "home_team_id": data.get("home_team_id"),
+                        "away_team_id": data.get("away_team_id"),
+                    }
+                )
+            index.remove(doc_id)
             continue
 
-        fixture_groups[fixture_key].append((doc_id, data))
+        league_id = int(league_id)
+        _ensure_league(league_id)
+        index.assign(doc_id, league_id, key)
+        touched.add((league_id, key))
+
+    if mode == "full":
+        candidates = [
+            (league_id, key)
+            for league_id, fixtures in index.by_league.items()
+            for key, doc_ids in fixtures.items()
+            if len(doc_ids) > 1
+        ]
+    else:
+        candidates = [(league_id, key) for league_id, key in touched if len(index.doc_ids(league_id, key)) > 1]
+    candidates.sort(key=lambda item: (-len(index.doc_ids(*item)), item[1]))
 
     duplicate_groups: List[Dict[str, Any]] = []
     docs_marked_for_delete: List[str] = []
-
-    for fixture_key, docs in fixture_groups.items():
+    for league_id, key in candidates:
+        refs = [matches_ref.document(doc_id) for doc_id in index.doc_ids(league_id, key)]
+        docs: List[Tuple[str, Dict[str, Any]]] = []
+        for snap in firestore_db.get_all(refs):
+            if snap.exists:
+                docs.append((snap.id, snap.to_dict() or {}))
+            else:
+                # Deleted outside the scanner: drop it from the digest.
+                index.remove(snap.id)
         if len(docs) <= 1:
             continue
 
         keeper_id, delete_ids = _pick_keeper(docs)
-        duplicate_groups.append(
-            {
-                "fixture_key": fixture_key,
-                "count": len(docs),
-                "keeper_doc_id": keeper_id,
-                "delete_doc_ids": delete_ids,
-                "matches": [_serialize_match_doc(doc_id, data) for doc_id, data in docs],
-            }
-        )
+        group: Dict[str, Any] = {
+            "fixture_key": key,
+            "count": len(docs),
+            "keeper_doc_id": keeper_id,
+            "delete_doc_ids": delete_ids,
+        }
+        if len(duplicate_groups) < sample_limit:
+            group["matches"] = [_serialize_match_doc(doc_id, data) for doc_id, data in docs]
+        duplicate_groups.append(group)
         docs_marked_for_delete.extend(delete_ids)
 
     duplicate_groups.sort(key=lambda group: (-group["count"], group["fixture_key"]))
     duplicate_doc_count = sum(max(0, group["count"] - 1) for group in duplicate_groups)
 
-    seen_record_ids: Dict[str, str] = {}
-    for doc_id, data in (
-        (doc_id, data)
-        for docs in fixture_groups.values()
-        for doc_id, data in docs
-    ):
-        record_id = data.get("id")
-        if record_id is None:
-            continue
-        record_key = str(record_id)
-        if record_key in seen_record_ids and seen_record_ids[record_key] != doc_id:
-            duplicate_ids.append(
-                {
-                    "id_field": record_id,
-                    "doc_ids": sorted({seen_record_ids[record_key], doc_id}),
-                }
-            )
-        else:
-            seen_record_ids[record_key] = doc_id
-
     deleted_count = 0
     if remove_duplicates and docs_marked_for_delete:
         batch = firestore_db.batch()
         batch_count = 0
         for doc_id in docs_marked_for_delete:
             batch.delete(matches_ref.document(doc_id))
+            index.remove(doc_id)
             batch_count += 1
             deleted_count += 1
             if batch_count >= 450:
@@ -204,14 +317,42 @@ def scan_firestore_matches(
         if batch_count:
             batch.commit()
 
+    scanned_at = datetime.now(timezone.utc)
+    digests_written = 0
+    if persist_index:
+        leagues_to_write = set(index.by_league) if mode == "full" else set(index.dirty)
+        for league_id in sorted(leagues_to_write):
+            fixtures = index.by_league.get(league_id, {})
+            firestore_db.collection(DIGEST_COLLECTION).document(str(league_id)).set(
+                {
+                    "league_id": league_id,
+                    "fixtures": fixtures,
+                    "doc_count": sum(len(doc_ids) for doc_ids in fixtures.values()),
+                    "updated_at": scanned_at.isoformat(),
+                }
+            )
+            digests_written += 1
+        state_ref.set(
+            {
+                "last_synced_at": max_synced_at,
+                "last_scan_at": scanned_at.isoformat(),
+                "last_scan_mode": mode,
+                "last_scan_docs": total_docs,
+            },
+            merge=True,
+        )
+
     return {
         "success": True,
-        "scanned_at": datetime.now(timezone.utc).isoformat(),
+        "mode": mode,
+        "scanned_at": scanned_at.isoformat(),
         "total_docs": total_docs,
+        "has_more": has_more,
+        "digests_written": digests_written,
         "duplicate_fixture_groups": len(duplicate_groups),
         "duplicate_docs": duplicate_doc_count,
-        "id_mismatches": len(id_mismatches),
-        "missing_fixture_key_docs": len(missing_fields),
+        "id_mismatches": id_mismatch_count,
+        "missing_fixture_key_docs": missing_count,
         "duplicate_id_field_groups": len(duplicate_ids),
         "removed_docs": deleted_count if remove_duplicates else 0,
         "dry_run": not remove_duplicates,
@@ -0,0 +1,342 @@
+"""
+Team sequence features shared by V4/V5 training and runtime inference.
+
+Training (`scripts/maz_boss_maxed_v4.build_temporal_sequences`) and serving
+(`V4RuntimePredictor._build_team_histories`) replay the same chronology-safe
+recurrence over completed matches: rest days, rolling margin volatility and an
+ELO-like margin rating. Both go through `TeamSequenceEngine` so the features a
+model was trained on are bit-identical to the ones it is served with.
+
+Each sequence step is (SEQ_FEATURE_DIM = 11):
+[points_for_scaled, points_against_scaled, margin_scaled, is_home, venue_adv_context,
+ rest_days_norm, margin_vol5_norm, margin_vol10_norm,
+ team_rating_pre_scaled, opp_rating_pre_scaled, expected_margin_pre_scaled]
+Opponent identity at each step is carried separately as raw team ids (-1 = empty step).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SEQ_FEATURE_DIM = 11
+DEFAULT_LEAGUE_SCORE_STATS = (20.0, 8.0)
+NS_PER_DAY = 86_400 * 1_000_000_000
+_EPOCH = datetime(1970, 1, 1)
+# Rolling margin volatility windows (the margin history keeps the last 10).
+_VOL_SHORT = 5
+_VOL_LONG = 10
+
+
+def iso_day_ns(values: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse `YYYY-MM-DD...` values to int64 nanoseconds since the epoch.
+
+    Returns (day_ns, valid); rows whose first 10 characters do not parse are
+    marked invalid so callers can drop them.
+    """
+    out: List[int] = []
+    valid: List[bool] = []
+    for value in values:
+        try:
+            day = datetime.strptime(str(value)[:10], "%Y-%m-%d")
+        except Exception:
+            out.append(0)
+            valid.append(False)
+            continue
+        out.append((day - _EPOCH).days * NS_PER_DAY)
+        valid.append(True)
+    return np.array(out, dtype=np.int64), np.array(valid, dtype=bool)
+
+
+def project_sequence_features(seq: np.ndarray, seq_dim: int) -> np.ndarray:
+    """
+    Map full 11-dim steps onto an older checkpoint's `seq_dim` layout.
+
+    seq_dim 10 checkpoints predate `venue_adv_context`; anything below 10 also
+    predates the rating features. Extra trailing dims are zero-filled.
+    """
+    if seq_dim == SEQ_FEATURE_DIM:
+        return seq
+    cols = [0, 1, 2, 3]
+    if seq_dim >= 11:
+        cols.append(4)
+    cols.extend([5, 6, 7])
+    if seq_dim >= 10:
+        cols.extend([8, 9, 10])
+    cols = cols[:seq_dim]
+    out = np.zeros(seq.shape[:-1] + (seq_dim,), dtype=np.float32)
+    out[..., : len(cols)] = seq[..., cols]
+    return out
+
+
+def map_team_ids(raw: np.ndarray, team_to_idx: Dict[int, int]) -> np.ndarray:
+    """Map raw opponent ids to embedding ids; empty steps and unknown/negative ids map to 0."""
+    uniq, inverse = np.unique(raw, return_inverse=True)
+    mapped = np.array(
+        [team_to_idx.get(int(x), 0) if int(x) >= 0 else 0 for x in uniq],
+        dtype=np.int64,
+    )
+    return mapped[inverse].reshape(raw.shape)
+
+
+class TeamSequenceEngine:
+    """
+    Incremental sequence-feature builder over matches in chronological order.
+
+    Per-team state lives in preallocated ring buffers (`seq_len` steps of
+    features and opponent ids per team slot), so emitting a window is two slice
+    copies instead of stacking per-step arrays. `consume` can be called
+    repeatedly with later matches; the state carries over.
+    """
+
+    def __init__(
+        self,
+        seq_len: int,
+        league_stats: Optional[Dict[int, Tuple[float, float]]] = None,
+        league_env_stats: Optional[Dict[int, Dict[str, float]]] = None,
+        rating_k: float = 0.06,
+        rating_home_adv: float = 2.0,
+        rating_scale: float = 7.0,
+        team_capacity: int = 64,
+    ):
+        self.seq_len = int(seq_len)
+        self.league_stats = league_stats
+        self.league_env_stats = league_env_stats
+        self.rating_k = float(rating_k)
+        self.rating_home_adv = float(rating_home_adv)
+        self.rating_scale = float(rating_scale)
+
+        capacity = max(1, int(team_capacity))
+        self._slot: Dict[int, int] = {}
+        self._feats = np.zeros((capacity, self.seq_len, SEQ_FEATURE_DIM), dtype=np.float32)
+        self._opp = np.full((capacity, self.seq_len), -1, dtype=np.int64)
+        self._count: List[int] = []
+        self._rating: List[float] = []
+        self._last_day_ns: List[Optional[int]] = []
+        self._margins: List[List[float]] = []
+        self._league_params: Dict[int, Tuple[float, float, float, float]] = {}
+        self.team_ids: set = set()
+        self.league_ids: set = set()
+
+    # -- state -----------------------------------------------------------------
+
+    def _slot_for(self, team_id: int) -> int:
+        slot = self._slot.get(team_id)
+        if slot is not None:
+            return slot
+        slot = len(self._count)
+        if slot >= self._feats.shape[0]:
+            grow = self._feats.shape[0]
+            self._feats = np.concatenate(
+                [self._feats, np.zeros((grow, self.seq_len, SEQ_FEATURE_DIM), dtype=np.float32)], axis=0
+            )
+            self._opp = np.concatenate([self._opp, np.full((grow, self.seq_len), -1, dtype=np.int64)], axis=0)
+        self._slot[team_id] = slot
+        self._count.append(0)
+        self._rating.append(0.0)
+        self._last_day_ns.append(None)
+        self._margins.append([])
+        self.team_ids.add(team_id)
+        return slot
+
+    def _params_for(self, league_id: int) -> Tuple[float, float, float, float]:
+        params = self._league_params.get(league_id)
+        if params is None:
+            mu_l, sd_l = (
+                self.league_stats.get(league_id, DEFAULT_LEAGUE_SCORE_STATS)
+                if self.league_stats
+                else DEFAULT_LEAGUE_SCORE_STATS
+            )
+            env = (self.league_env_stats.get(league_id) if self.league_env_stats else None) or {}
+            params = (
+                mu_l,
+                sd_l,
+                float(env.get("home_strength", 1.0)),
+                float(env.get("rating_home_adv", self.rating_home_adv)),
+            )
+            self._league_params[league_id] = params
+            self.league_ids.add(league_id)
+        return params
+
+    def _window_into(self, slot: int, seq_out: np.ndarray, opp_out: np.ndarray) -> int:
+        """Copy the slot's steps (oldest first) into the right end of the outputs."""
+        count = self._count[slot]
+        L = self.seq_len
+        if count <= 0:
+            return 0
+        if count <= L:
+            seq_out[L - count :] = self._feats[slot, :count]
+            opp_out[L - count :] = self._opp[slot, :count]
+            return count
+        start = count % L
+        seq_out[: L - start] = self._feats[slot, start:]
+        seq_out[L - start :] = self._feats[slot, :start]
+        opp_out[: L - start] = self._opp[slot, start:]
+        opp_out[L - start :] = self._opp[slot, :start]
+        return L
+
+    def team_sequence(self, team_id: int) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        Current window for `team_id`: (features [seq_len, 11], raw opponent ids
+        [seq_len] with -1 for empty steps, number of filled steps).
+        """
+        seq = np.zeros((self.seq_len, SEQ_FEATURE_DIM), dtype=np.float32)
+        opp = np.full((self.seq_len,), -1, dtype=np.int64)
+        slot = self._slot.get(int(team_id))
+        filled = self._window_into(slot, seq, opp) if slot is not None else 0
+        return seq, opp, filled
+
+    # -- recurrence ------------------------------------------------------------
+
+    def _margin_volatility(
+        self,
+        slots_h: List[int],
+        slots_a: List[int],
+        hs_list: List[float],
+        aw_list: List[float],
+    ) -> Tuple[List[float], List[float], List[float], List[float]]:
+        """
+        Pre-match rolling margin std (last 5 / last 10) for both sides of every row.
+
+        Margins do not depend on the rating recurrence, so the windows are known
+        up front and each window length is reduced with one vectorized np.std.
+        Advances the per-team margin history.
+        """
+        n = len(slots_h)
+        extended = [list(m) for m in self._margins]
+        pos_h = [0] * n
+        pos_a = [0] * n
+        for i in range(n):
+            sh = slots_h[i]
+            sa = slots_a[i]
+            pos_h[i] = len(extended[sh])
+            pos_a[i] = len(extended[sa])
+            extended[sh].append(hs_list[i] - aw_list[i])
+            extended[sa].append(aw_list[i] - hs_list[i])
+
+        offsets = np.zeros(len(extended) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(m) for m in extended])
+        flat = np.fromiter((x for m in extended for x in m), dtype=float, count=int(offsets[-1]))
+        ends = np.concatenate(
+            [offsets[slots_h] + np.array(pos_h, dtype=np.int64), offsets[slots_a] + np.array(pos_a, dtype=np.int64)]
+        )
+        history = np.concatenate([np.array(pos_h, dtype=np.int64), np.array(pos_a, dtype=np.int64)])
+
+        vols = []
+        for window in (_VOL_SHORT, _VOL_LONG):
+            out = np.zeros(2 * n, dtype=float)
+            width = np.minimum(history, window)
+            for w in range(2, window + 1):
+                rows = np.nonzero(width == w)[0]
+                if len(rows):
+                    out[rows] = np.std(flat[ends[rows, None] + np.arange(-w, 0)], axis=1)
+            vols.append(out)
+
+        self._margins = [m[-_VOL_LONG:] for m in extended]
+        vol5, vol10 = vols
+        return vol5[:n].tolist(), vol10[:n].tolist(), vol5[n:].tolist(), vol10[n:].tolist()
+
+    def consume(
+        self,
+        day_ns: Sequence[int],
+        home_team_ids: Sequence[int],
+        away_team_ids: Sequence[int],
+        league_ids: Sequence[int],
+        home_scores: Sequence[float],
+        away_scores: Sequence[float],
+        emit: bool = True,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Advance the state over completed matches (already in chronological order).
+
+        With `emit`, returns (home_seq, away_seq, home_opp_raw, away_opp_raw) where
+        row i holds each team's window *before* match i. Serving passes
+        `emit=False` and reads `team_sequence` afterwards.
+        """
+        n = len(day_ns)
+        days = np.asarray(day_ns, dtype=np.int64).tolist()
+        homes = [int(x) for x in home_team_ids]
+        aways = [int(x) for x in away_team_ids]
+        leagues = [int(x) for x in league_ids]
+        hs_list = [float(x) for x in home_scores]
+        aw_list = [float(x) for x in away_scores]
+
+        L = self.seq_len
+        if emit:
+            home_seq = np.zeros((n, L, SEQ_FEATURE_DIM), dtype=np.float32)
+            away_seq = np.zeros((n, L, SEQ_FEATURE_DIM), dtype=np.float32)
+            home_opp = np.full((n, L), -1, dtype=np.int64)
+            away_opp = np.full((n, L), -1, dtype=np.int64)
+
+        slots_h = [self._slot_for(h) for h in homes]
+        slots_a = [self._slot_for(a) for a in aways]
+        vol5_hs, vol10_hs, vol5_as, vol10_as = self._margin_volatility(slots_h, slots_a, hs_list, aw_list)
+
+        rating_k = self.rating_k
+        rating_scale = max(1.0, self.rating_scale)
+        count = self._count
+        rating = self._rating
+        last_day = self._last_day_ns
+
+        for i in range(n):
+            h = homes[i]
+            a = aways[i]
+            hs = hs_list[i]
+            aw = aw_list[i]
+            day = days[i]
+            sh = slots_h[i]
+            sa = slots_a[i]
+            mu_l, sd_l, home_strength, rating_home_adv_l = self._params_for(leagues[i])
+
+            if emit:
+                self._window_into(sh, home_seq[i], home_opp[i])
+                self._window_into(sa, away_seq[i], away_opp[i])
+
+            # Update state after consuming this row (chronology-safe).
+            d_h = float((day - last_day[sh]) // NS_PER_DAY) if last_day[sh] is not None else 7.0
+            d_a = float((day - last_day[sa]) // NS_PER_DAY) if last_day[sa] is not None else 7.0
+            rest_h = max(0.0, min(d_h, 42.0)) / 14.0
+            rest_a = max(0.0, min(d_a, 42.0)) / 14.0
+            vol_sd = max(1.0, sd_l)
+            vol5_h = vol5_hs[i] / vol_sd
+            vol10_h = vol10_hs[i] / vol_sd
+            vol5_a = vol5_as[i] / vol_sd
+            vol10_a = vol10_as[i] / vol_sd
+            hs_s = (hs - mu_l) / sd_l
+            aw_s = (aw - mu_l) / sd_l
+            m_h_s = (hs - aw) / sd_l
+            m_a_s = (aw - hs) / sd_l
+            rating_h_pre = rating[sh]
+            rating_a_pre = rating[sa]
+            exp_margin_h = (rating_h_pre - rating_a_pre + rating_home_adv_l) / rating_scale
+            exp_margin_a = -exp_margin_h
+            feat_sd = max(1.0, float(sd_l))
+
+            pos = count[sh] % L
+            self._feats[sh, pos] = (
+                hs_s, aw_s, m_h_s, 1.0, home_strength, rest_h, vol5_h, vol10_h,
+                rating_h_pre / feat_sd, rating_a_pre / feat_sd, exp_margin_h / feat_sd,
+            )
+            self._opp[sh, pos] = a
+            count[sh] += 1
+            pos = count[sa] % L
+            self._feats[sa, pos] = (
+                aw_s, hs_s, m_a_s, 0.0, -home_strength, rest_a, vol5_a, vol10_a,
+                rating_a_pre / feat_sd, rating_h_pre / feat_sd, exp_margin_a / feat_sd,
+            )
+            self._opp[sa, pos] = h
+            count[sa] += 1
+
+            # ELO-like margin rating update.
+            err = (hs - aw) - exp_margin_h
+            rating[sh] = rating[sh] + (rating_k * err)
+            rating[sa] = rating[sa] - (rating_k * err)
+            last_day[sh] = day
+            last_day[sa] = day
+
+        if emit:
+            return home_seq, away_seq, home_opp, away_opp
+        return None
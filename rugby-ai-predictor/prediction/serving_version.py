@@ -0,0 +1,49 @@
+"""Serving version stamps shared by the pipelines and the Cloud Functions.
+
+`serving_version/current` in Firestore holds one counter per scope: `events`
+is bumped after ingestion syncs matches, `models` after training publishes
+metrics. The functions fold these counters (plus the SQLite `data_version`)
+into their response-cache keys, so a bump invalidates cached responses on
+every instance without the functions re-reading the underlying data.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict
+
+SERVING_VERSION_COLLECTION = "serving_version"
+SERVING_VERSION_DOC = "current"
+SERVING_VERSION_SCOPES = ("events", "models")
+
+
+def bump_serving_version(db: Any, scope: str) -> None:
+    """Atomically increment the stamp for `scope` (creating the doc if needed)."""
+    from google.cloud import firestore  # type: ignore
+
+    db.collection(SERVING_VERSION_COLLECTION).document(SERVING_VERSION_DOC).set(
+        {
+            scope: firestore.Increment(1),
+            f"{scope}_updated_at": datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
+        },
+        merge=True,
+    )
+
+
+def read_serving_versions(db: Any) -> Dict[str, int]:
+    """Current counters per scope; missing scopes read as 0."""
+    snap = db.collection(SERVING_VERSION_COLLECTION).document(SERVING_VERSION_DOC).get()
+    data = snap.to_dict() if getattr(snap, "exists", False) else None
+    data = data or {}
+    versions: Dict[str, int] = {}
+    for scope in SERVING_VERSION_SCOPES:
+        try:
+            versions[scope] = int(data.get(scope) or 0)
+        except (TypeError, ValueError):
+            versions[scope] = 0
+    return versions
+
+
+def serving_version_stamp(versions: Dict[str, int]) -> str:
+    """Compact, order-stable stamp such as `events=12;models=3`."""
+    return ";".join(f"{scope}={int(versions.get(scope, 0))}" for scope in SERVING_VERSION_SCOPES)
@@ -11,11 +11,12 @@ import logging
 import pickle
 import re
 import sqlite3
-from collections import OrderedDict, defaultdict, deque
-from datetime import datetime
-from typing import Any, Deque, Dict, List, Optional, Tuple
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
+from prediction.sequence_features import TeamSequenceEngine, iso_day_ns, project_sequence_features
 from prediction.sportdevs_client import SportDevsClient, extract_odds_features
 
 try:
@@ -292,8 +293,13 @@ class V4RuntimePredictor:
         # match in the same round (same date) can reuse one full league scan
         # instead of re-querying SQLite per prediction. Bounded to a handful of
         # dates to keep memory flat.
-        self._histories_cache: "OrderedDict[str, Dict[int, Deque[Tuple[np.ndarray, int]]]]" = OrderedDict()
+        self._histories_cache: "OrderedDict[str, TeamSequenceEngine]" = OrderedDict()
         self._histories_cache_max = 8
+        # Streaming batch predictions share one runtime across worker threads.
+        self._histories_lock = threading.Lock()
+        # Resolved team ids keyed by the lower-cased request name. Same lifetime
+        # argument as the history cache: the DB does not change under us.
+        self._team_id_cache: Dict[str, int] = {}
 
         with open(v4_assets["meta_path"], "rb") as f:
             self.meta: Dict[str, Any] = pickle.load(f)
@@ -376,6 +382,15 @@ class V4RuntimePredictor:
         return TEAM_NAME_ALIAS_BY_NORMALIZED.get(normalized, normalized)
 
     def _resolve_team_id(self, conn: sqlite3.Connection, team_name: str) -> int:
+        cache_key = str(team_name or "").strip().lower()
+        cached = self._team_id_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        team_id = self._lookup_team_id(conn, team_name)
+        self._team_id_cache[cache_key] = team_id
+        return team_id
+
+    def _lookup_team_id(self, conn: sqlite3.Connection, team_name: str) -> int:
         target_norm = self._normalize_team_name(team_name)
         cur = conn.cursor()
 
@@ -426,51 +441,8 @@ class V4RuntimePredictor:
 
         raise ValueError(f"Team '{team_name}' not found in database")
 
-    def _history_features(
-        self,
-        *,
-        points_for_scaled: float,
-        points_against_scaled: float,
-        margin_scaled: float,
-        is_home: float,
-        venue_adv_context: float,
-        rest_days_norm: float,
-        margin_vol5_norm: float,
-        margin_vol10_norm: float,
-        team_rating_pre: float,
-        opp_rating_pre: float,
-        expected_margin_pre: float,
-        score_sd: float,
-    ) -> np.ndarray:
-        feats: List[float] = [
-            points_for_scaled,
-            points_against_scaled,
-            margin_scaled,
-            is_home,
-        ]
-        if self.seq_dim >= 11:
-            feats.append(venue_adv_context)
-        feats.extend(
-            [
-                rest_days_norm,
-                margin_vol5_norm,
-                margin_vol10_norm,
-            ]
-        )
-        if self.seq_dim >= 10:
-            sd = max(1.0, float(score_sd))
-            feats.extend(
-                [
-                    float(team_rating_pre) / sd,
-                    float(opp_rating_pre) / sd,
-                    float(expected_margin_pre) / sd,
-                ]
-            )
-        if len(feats) < self.seq_dim:
-            feats.extend([0.0] * (self.seq_dim - len(feats)))
-        return np.array(feats[: self.seq_dim], dtype=np.float32)
-
-    def _build_team_histories(self, conn: sqlite3.Connection, match_date: str) -> Dict[int, Deque[Tuple[np.ndarray, int]]]:
+    def _build_team_histories(self, conn: sqlite3.Connection, match_date: str) -> TeamSequenceEngine:
+        """Replay the league's completed matches before `match_date` through the shared sequence engine."""
         cur = conn.cursor()
         cur.execute(
             """
@@ -487,134 +459,58 @@ class V4RuntimePredictor:
         )
         rows = cur.fetchall()
 
-        histories: Dict[int, Deque[Tuple[np.ndarray, int]]] = defaultdict(
-            lambda: deque(maxlen=self.seq_len)
-        )
-        team_last_date: Dict[int, datetime] = {}
-        team_margin_hist: Dict[int, Deque[float]] = defaultdict(lambda: deque(maxlen=10))
-        team_rating: Dict[int, float] = defaultdict(float)
         mu_l, sd_l = self.league_score_stats.get(self.league_id, (20.0, 8.0))
         sd_l = sd_l if sd_l > 1e-6 else 8.0
-        league_env = self.league_env_stats.get(self.league_id) or {}
-        home_strength = float(league_env.get("home_strength", 1.0))
-        rating_home_adv = float(league_env.get("rating_home_adv", self.rating_home_adv))
-
-        for date_event, home_team_id, away_team_id, home_score, away_score in rows:
-            h = _team_key(home_team_id)
-            a = _team_key(away_team_id)
-            hs = float(home_score)
-            aw = float(away_score)
-            try:
-                dt = datetime.strptime(str(date_event)[:10], "%Y-%m-%d")
-            except Exception:
-                continue
-
-            d_h = float((dt - team_last_date[h]).days) if h in team_last_date else 7.0
-            d_a = float((dt - team_last_date[a]).days) if a in team_last_date else 7.0
-            rest_h = max(0.0, min(d_h, 42.0)) / 14.0
-            rest_a = max(0.0, min(d_a, 42.0)) / 14.0
-
-            def _roll_std(vals: Deque[float], n: int) -> float:
-                if not vals:
-                    return 0.0
-                arr = np.array(list(vals)[-n:], dtype=float)
-                return float(np.std(arr)) if len(arr) > 1 else 0.0
-
-            vol5_h = _roll_std(team_margin_hist[h], 5) / max(1.0, sd_l)
-            vol10_h = _roll_std(team_margin_hist[h], 10) / max(1.0, sd_l)
-            vol5_a = _roll_std(team_margin_hist[a], 5) / max(1.0, sd_l)
-            vol10_a = _roll_std(team_margin_hist[a], 10) / max(1.0, sd_l)
-
-            hs_s = (hs - mu_l) / sd_l
-            aw_s = (aw - mu_l) / sd_l
-            m_h_s = (hs - aw) / sd_l
-            m_a_s = (aw - hs) / sd_l
-            rating_h_pre = float(team_rating.get(h, 0.0))
-            rating_a_pre = float(team_rating.get(a, 0.0))
-            exp_margin_h = (rating_h_pre - rating_a_pre + rating_home_adv) / max(
-                1.0,
-                self.rating_scale,
-            )
-            exp_margin_a = -exp_margin_h
-            histories[h].append(
-                (
-                    self._history_features(
-                        points_for_scaled=hs_s,
-                        points_against_scaled=aw_s,
-                        margin_scaled=m_h_s,
-                        is_home=1.0,
-                        venue_adv_context=home_strength,
-                        rest_days_norm=rest_h,
-                        margin_vol5_norm=vol5_h,
-                        margin_vol10_norm=vol10_h,
-                        team_rating_pre=rating_h_pre,
-                        opp_rating_pre=rating_a_pre,
-                        expected_margin_pre=exp_margin_h,
-                        score_sd=sd_l,
-                    ),
-                    a,
-                )
-            )
-            histories[a].append(
-                (
-                    self._history_features(
-                        points_for_scaled=aw_s,
-                        points_against_scaled=hs_s,
-                        margin_scaled=m_a_s,
-                        is_home=0.0,
-                        venue_adv_context=-home_strength,
-                        rest_days_norm=rest_a,
-                        margin_vol5_norm=vol5_a,
-                        margin_vol10_norm=vol10_a,
-                        team_rating_pre=rating_a_pre,
-                        opp_rating_pre=rating_h_pre,
-                        expected_margin_pre=exp_margin_a,
-                        score_sd=sd_l,
-                    ),
-                    h,
-                )
-            )
-
-            team_margin_hist[h].append(hs - aw)
-            team_margin_hist[a].append(aw - hs)
-            exp_h = (team_rating.get(h, 0.0) - team_rating.get(a, 0.0) + rating_home_adv) / max(
-                1.0,
-                self.rating_scale,
-            )
-            err = (hs - aw) - exp_h
-            team_rating[h] = team_rating.get(h, 0.0) + (self.rating_k * err)
-            team_rating[a] = team_rating.get(a, 0.0) - (self.rating_k * err)
-            team_last_date[h] = dt
-            team_last_date[a] = dt
-        return histories
+        engine = TeamSequenceEngine(
+            self.seq_len,
+            league_stats={int(self.league_id): (mu_l, sd_l)},
+            league_env_stats=self.league_env_stats,
+            rating_k=self.rating_k,
+            rating_home_adv=self.rating_home_adv,
+            rating_scale=self.rating_scale,
+        )
+        if not rows:
+            return engine
+        day_ns, valid = iso_day_ns(row[0] for row in rows)
+        rows = [row for row, ok in zip(rows, valid) if ok]
+        engine.consume(
+            day_ns[valid],
+            [_team_key(row[1]) for row in rows],
+            [_team_key(row[2]) for row in rows],
+            [int(self.league_id)] * len(rows),
+            [row[3] for row in rows],
+            [row[4] for row in rows],
+            emit=False,
+        )
+        return engine
 
-    def _get_team_histories_cached(
-        self, conn: sqlite3.Connection, match_date: str
-    ) -> Dict[int, Deque[Tuple[np.ndarray, int]]]:
+    def _get_team_histories_cached(self, conn: sqlite3.Connection, match_date: str) -> TeamSequenceEngine:
         key = str(match_date or "")[:10]
-        cached = self._histories_cache.get(key)
-        if cached is not None:
-            self._histories_cache.move_to_end(key)
-            return cached
+        with self._histories_lock:
+            cached = self._histories_cache.get(key)
+            if cached is not None:
+                self._histories_cache.move_to_end(key)
+                return cached
+        # Built outside the lock so other dates are not blocked; if two threads
+        # race on the same date, the first stored engine wins.
         histories = self._build_team_histories(conn, match_date)
-        self._histories_cache[key] = histories
-        while len(self._histories_cache) > self._histories_cache_max:
-            self._histories_cache.popitem(last=False)
+        with self._histories_lock:
+            histories = self._histories_cache.setdefault(key, histories)
+            self._histories_cache.move_to_end(key)
+            while len(self._histories_cache) > self._histories_cache_max:
+                self._histories_cache.popitem(last=False)
         return histories
 
     def _build_single_input(self, conn: sqlite3.Connection, home_team_id: int, away_team_id: int, match_date: str):
         histories = self._get_team_histories_cached(conn, match_date)
 
         def _seq_for(team_id: int) -> Tuple[np.ndarray, np.ndarray]:
-            seq = np.zeros((self.seq_len, self.seq_dim), dtype=np.float32)
+            full_seq, opp_raw, filled = histories.team_sequence(team_id)
+            seq = project_sequence_features(full_seq, self.seq_dim)
             opp = np.zeros((self.seq_len,), dtype=np.int64)
-            hist = list(histories.get(team_id, []))
-            if hist:
-                arr = np.stack([x[0] for x in hist], axis=0)
-                opp_raw = [x[1] for x in hist]
-                seq[-len(hist) :, :] = arr
-                opp[-len(hist) :] = np.array(
-                    [self.team_to_idx.get(int(o), 0) for o in opp_raw], dtype=np.int64
+            if filled:
+                opp[-filled:] = np.array(
+                    [self.team_to_idx.get(int(o), 0) for o in opp_raw[-filled:]], dtype=np.int64
                 )
             seq = (seq - self.norm_mean.reshape(1, -1)) / self.norm_std.reshape(1, -1)
             return seq.astype(np.float32), opp
@@ -638,6 +534,68 @@ class V4RuntimePredictor:
             torch.tensor(a_opp[None, :], dtype=torch.long),
         )
 
+    def warm_up(self, fixtures: List[Tuple[str, str, str]], deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Prime the per-instance caches for upcoming fixtures.
+
+        `fixtures` is a list of (home_team, away_team, match_date). Resolves team
+        names, builds the team histories for every distinct match date and runs
+        one forward pass so the first user request only pays for odds + inference.
+        With a `deadline` (time.perf_counter() value) the work stops between
+        fixtures once it has passed and `truncated` is set.
+        Returns per-stage timings in seconds.
+        """
+        import time
+
+        def _out_of_time() -> bool:
+            if deadline is not None and time.perf_counter() >= deadline:
+                timings["truncated"] = True
+                return True
+            return False
+
+        timings: Dict[str, Any] = {"fixtures": len(fixtures)}
+        resolved: List[Tuple[int, int, str]] = []
+        conn = sqlite3.connect(self.db_path)
+        try:
+            t0 = time.perf_counter()
+            for home_team, away_team, match_date in fixtures:
+                if _out_of_time():
+                    break
+                try:
+                    resolved.append(
+                        (
+                            self._resolve_team_id(conn, home_team),
+                            self._resolve_team_id(conn, away_team),
+                            str(match_date),
+                        )
+                    )
+                except ValueError as name_error:
+                    logger.warning("V4 warm-up could not resolve fixture teams: %s", name_error)
+            timings["team_names_s"] = round(time.perf_counter() - t0, 4)
+
+            t0 = time.perf_counter()
+            dates = sorted({match_date[:10] for _, _, match_date in resolved})
+            built = 0
+            for match_date in dates:
+                if _out_of_time():
+                    break
+                self._get_team_histories_cached(conn, match_date)
+                built += 1
+            timings["team_histories_s"] = round(time.perf_counter() - t0, 4)
+            timings["history_dates"] = built
+
+            if resolved and not _out_of_time():
+                t0 = time.perf_counter()
+                home_team_id, away_team_id, match_date = resolved[0]
+                tensors = self._build_single_input(conn, home_team_id, away_team_id, match_date)
+                with torch.no_grad():
+                    for model in self.models:
+                        model(*tensors)
+                timings["forward_pass_s"] = round(time.perf_counter() - t0, 4)
+        finally:
+            conn.close()
+        return timings
+
     def predict_match(
         self,
         home_team: str,
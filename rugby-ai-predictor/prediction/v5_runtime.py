@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import logging
 import pickle
+import threading
 from collections import OrderedDict
 from typing import Any, Dict, Tuple
 
@@ -256,8 +257,10 @@ class V5RuntimePredictor(V4RuntimePredictor):
         # initialized here too. Without it, super().predict_match() ->
         # _get_team_histories_cached() raises AttributeError and every V5 prediction
         # silently fails during backfill.
-        self._histories_cache: "OrderedDict[str, Dict[int, Any]]" = OrderedDict()
+        self._histories_cache: "OrderedDict[str, Any]" = OrderedDict()
         self._histories_cache_max = 8
+        self._histories_lock = threading.Lock()
+        self._team_id_cache: Dict[str, int] = {}
 
         with open(v5_assets["meta_path"], "rb") as f:
             self.meta: Dict[str, Any] = pickle.load(f)
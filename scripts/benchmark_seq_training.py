@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Step-time benchmark for the V4/V5 sequence-model training loop.
+
+Trains V4Model and V5Model on synthetic seed inputs (same shapes and dtypes as
+`seed_training_arrays`) and reports samples/sec and ms/step per loop
+configuration:
+
+  gather      per-step fancy-index of every input tensor (the pre-packing loop)
+  packed      `seq_training.train_epochs` on `PackedTrainingData`
+  accum<k>    packed, micro-batches of batch_size/k with k-step accumulation
+  compile     packed under torch.compile (opt-in with --compile)
+
+Usage:
+  python scripts/benchmark_seq_training.py
+  python scripts/benchmark_seq_training.py --rows 4000 --epochs 3 --compile --output seq_bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import torch
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from seq_training import LossWeights, PackedTrainingData, sequence_model_loss, train_epochs  # noqa: E402
+
+SEQ_DIM = 11
+N_LEAGUES = 4
+
+
+def _load_script(name: str, filename: str):
+    spec = importlib.util.spec_from_file_location(name, SCRIPT_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthetic_seed_data(rows: int, seq_len: int, n_teams: int, seed: int) -> Dict[str, torch.Tensor]:
+    rng = np.random.default_rng(seed)
+    home = rng.integers(0, n_teams, rows)
+    away = (home + rng.integers(1, n_teams, rows)) % n_teams
+    scores = rng.integers(0, 50, (rows, 2)).astype(np.float32)
+    y = np.column_stack([(scores[:, 0] > scores[:, 1]).astype(np.float32), scores]).astype(np.float32)
+    return {
+        "xh": torch.from_numpy(rng.standard_normal((rows, seq_len, SEQ_DIM)).astype(np.float32)),
+        "xa": torch.from_numpy(rng.standard_normal((rows, seq_len, SEQ_DIM)).astype(np.float32)),
+        "ih": torch.from_numpy(home.astype(np.int64)),
+        "ia": torch.from_numpy(away.astype(np.int64)),
+        "ioh": torch.from_numpy(rng.integers(0, n_teams, (rows, seq_len)).astype(np.int64)),
+        "ioa": torch.from_numpy(rng.integers(0, n_teams, (rows, seq_len)).astype(np.int64)),
+        "il": torch.from_numpy(rng.integers(0, N_LEAGUES, rows).astype(np.int64)),
+        "ir": torch.from_numpy(rng.integers(0, 4, rows).astype(np.int64)),
+        "y": torch.from_numpy(y),
+        "w": torch.from_numpy(rng.uniform(0.5, 1.5, rows).astype(np.float32)),
+    }
+
+
+def gather_epochs(model, data, optimizer, epochs: int, batch_size: int, loss_weights: LossWeights) -> None:
+    """The inline loop V4/V5 used before packing: one gather per input tensor per step."""
+    n = int(data["y"].shape[0])
+    for _ in range(epochs):
+        model.train()
+        perm = torch.randperm(n)
+        for i in range(0, n, batch_size):
+            idx = perm[i : i + batch_size]
+            optimizer.zero_grad()
+            out = model(
+                data["ih"][idx], data["ia"][idx], data["il"][idx], data["ir"][idx],
+                data["xh"][idx], data["xa"][idx], data["ioh"][idx], data["ioa"][idx],
+            )
+            loss = sequence_model_loss(model.team_emb.weight, out, data["y"][idx], data["w"][idx], loss_weights)
+            loss.backward()
+            torch.nn.utils.clip_grad_norm_(model.parameters(), 1.0)
+            optimizer.step()
+
+
+def _configs(batch_size: int, accum: int, compile_model: bool) -> List[Dict[str, Any]]:
+    configs = [
+        {"name": "gather", "batch_size": batch_size, "accum": 1, "compile": False, "packed": False},
+        {"name": "packed", "batch_size": batch_size, "accum": 1, "compile": False, "packed": True},
+    ]
+    if accum > 1:
+        configs.append(
+            {"name": f"accum{accum}", "batch_size": max(1, batch_size // accum), "accum": accum, "compile": False, "packed": True}
+        )
+    if compile_model:
+        configs.append({"name": "compile", "batch_size": batch_size, "accum": 1, "compile": True, "packed": True})
+    return configs
+
+
+def bench_config(
+    make_model: Callable[[], torch.nn.Module],
+    data: Dict[str, torch.Tensor],
+    config: Dict[str, Any],
+    loss_weights: LossWeights,
+    epochs: int,
+    repeat: int,
+) -> Dict[str, Any]:
+    rows = int(data["y"].shape[0])
+    steps_per_epoch = -(-rows // int(config["batch_size"]))
+    timings = []
+    for r in range(max(1, repeat)):
+        torch.manual_seed(r)
+        model = make_model()
+        opt = torch.optim.AdamW(model.parameters(), lr=1e-3, weight_decay=1e-4)
+        packed = PackedTrainingData(data) if config["packed"] else None
+
+        def run(n_epochs: int) -> None:
+            if packed is None:
+                gather_epochs(model, data, opt, n_epochs, config["batch_size"], loss_weights)
+            else:
+                train_epochs(
+                    model,
+                    packed,
+                    opt,
+                    epochs=n_epochs,
+                    batch_size=config["batch_size"],
+                    loss_weights=loss_weights,
+                    grad_accum_steps=config["accum"],
+                    compile_model=config["compile"],
+                )
+
+        # Warm-up epoch absorbs allocator growth (and compilation for `compile`).
+        t0 = time.perf_counter()
+        run(1)
+        warmup_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        run(epochs)
+        timings.append((time.perf_counter() - t0, warmup_s))
+    elapsed = statistics.median(t for t, _ in timings)
+    return {
+        **{k: config[k] for k in ("name", "batch_size", "accum", "compile")},
+        "runs": len(timings),
+        "warmup_s": round(statistics.median(w for _, w in timings), 3),
+        "epoch_s": round(elapsed / epochs, 4),
+        "step_ms": round(1000.0 * elapsed / (epochs * steps_per_epoch), 3),
+        "samples_per_sec": round(rows * epochs / elapsed, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark V4/V5 training-loop throughput on synthetic data.")
+    parser.add_argument("--model", action="append", choices=["v4", "v5"], help="Limit to model(s).")
+    parser.add_argument("--rows", type=int, default=3000)
+    parser.add_argument("--seq-len", type=int, default=10)
+    parser.add_argument("--teams", type=int, default=40)
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--grad-accum-steps", type=int, default=4, help="k for the accum<k> configuration (<=1 skips it).")
+    parser.add_argument("--epochs", type=int, default=2, help="Timed epochs per run (after one warm-up epoch).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration (median is reported).")
+    parser.add_argument("--torch-threads", type=int, default=0, help="torch.set_num_threads (0 = torch default).")
+    parser.add_argument("--compile", action="store_true", help="Also benchmark torch.compile.")
+    parser.add_argument("--output", type=str, default="", help="Optional JSON output path.")
+    args = parser.parse_args()
+
+    if args.torch_threads > 0:
+        torch.set_num_threads(args.torch_threads)
+    data = synthetic_seed_data(args.rows, args.seq_len, args.teams, seed=7)
+    models = args.model or ["v4", "v5"]
+    v4 = _load_script("_maz_v4_bench", "maz_boss_maxed_v4.py")
+    v5 = _load_script("_maz_v5_bench", "maz_boss_maxed_v5.py") if "v5" in models else None
+
+    # Defaults mirror each script's argparse defaults.
+    builders: Dict[str, Any] = {
+        "v4": (
+            lambda: v4.V4Model(n_teams=args.teams, n_leagues=N_LEAGUES, emb_dim=32, seq_dim=SEQ_DIM, hidden_dim=64),
+            LossWeights(winner=1.0, score=0.25, ranking=0.10, var_reg=0.002, embedding_l2=0.0005),
+        ),
+        "v5": (
+            lambda: v5.V5Model(
+                n_teams=args.teams, n_leagues=N_LEAGUES, emb_dim=32, seq_dim=SEQ_DIM, hidden_dim=80,
+                n_experts=4, adapter_dim=24, cross_heads=4,
+            ),
+            LossWeights.from_args(
+                SimpleNamespace(
+                    winner_loss_weight=1.0, score_loss_weight=0.30, ranking_loss_weight=0.12,
+                    var_reg_weight=0.002, embedding_l2_weight=0.0005, expert_balance_weight=0.01,
+                )
+            ),
+        ),
+    }
+
+    results = []
+    print(f"{'model':<6} {'config':<10} {'batch':>6} {'accum':>6} {'ms/step':>9} {'samples/s':>11} {'vs gather':>10}")
+    for name in models:
+        make_model, loss_weights = builders[name]
+        rows = [
+            bench_config(make_model, data, cfg, loss_weights, args.epochs, args.repeat)
+            for cfg in _configs(args.batch_size, args.grad_accum_steps, args.compile)
+        ]
+        base = rows[0]["samples_per_sec"]
+        for row in rows:
+            row["model"] = name
+            row["speedup_vs_gather"] = round(row["samples_per_sec"] / base, 3) if base else None
+            print(
+                f"{name:<6} {row['name']:<10} {row['batch_size']:>6} {row['accum']:>6} "
+                f"{row['step_ms']:>9.2f} {row['samples_per_sec']:>11.1f} {row['speedup_vs_gather']:>9.2f}x"
+            )
+        results.extend(rows)
+
+    report = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "torch": torch.__version__,
+        "torch_threads": torch.get_num_threads(),
+        "rows": args.rows,
+        "seq_len": args.seq_len,
+        "epochs": args.epochs,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nWrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
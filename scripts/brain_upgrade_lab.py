@@ -14,6 +14,7 @@ It creates a stronger rugby predictor in this project by measurable metrics.
 from __future__ import annotations
 
 import argparse
+import importlib.util
 import json
 import os
 import sqlite3
@@ -25,20 +26,21 @@ from typing import Any, Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn.metrics import accuracy_score, mean_absolute_error
-from sklearn.model_selection import TimeSeriesSplit
 
 # Ensure local imports work when run from repo root.
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
 
-try:
-    import xgboost as xgb
-except Exception:
+if importlib.util.find_spec("xgboost") is None:
     print("XGBoost is required: pip install xgboost")
-    raise
+    raise ImportError("No module named 'xgboost'")
 
 from prediction.config import LEAGUE_MAPPINGS
-from prediction.features import FeatureConfig, build_feature_table
+from prediction.dataset_cache import cached_feature_table, default_dataset_cache
+from prediction.features import FeatureConfig
+from prediction.xgb_training import TripletTrainer, map_leagues
+
+from cv_engine import CVData, CVEngine, CVResult, ModelSpec, default_fold_cache, timeseries_plan
 
 
 @dataclass
@@ -73,7 +75,7 @@ def _load_league_df(conn: sqlite3.Connection, league_id: int) -> pd.DataFrame:
         elo_k=24.0,
         neutral_mode=(league_id in (4574, 4714)),
     )
-    df = build_feature_table(conn, cfg)
+    df = cached_feature_table(conn, cfg, default_dataset_cache())
     df = df[df["league_id"] == league_id].copy()
     df = df[df["home_score"].notna() & df["away_score"].notna()].copy()
     if df.empty:
@@ -109,46 +111,42 @@ def _train_triplet(
     y_home_train: np.ndarray,
     y_away_train: np.ndarray,
     params: Dict[str, Any],
+    nthread: int = 0,
 ) -> Tuple[Any, Any, Any]:
-    clf = xgb.XGBClassifier(
-        n_estimators=params["n_estimators"],
-        max_depth=params["max_depth"],
-        learning_rate=params["learning_rate"],
-        subsample=params["subsample"],
-        colsample_bytree=params["colsample_bytree"],
-        min_child_weight=params["min_child_weight"],
-        reg_lambda=params["reg_lambda"],
-        random_state=42,
-        eval_metric="logloss",
-    )
-    clf.fit(X_train, y_winner_train)
-
-    reg_home = xgb.XGBRegressor(
-        n_estimators=params["n_estimators"],
-        max_depth=params["max_depth"],
-        learning_rate=params["learning_rate"],
-        subsample=params["subsample"],
-        colsample_bytree=params["colsample_bytree"],
-        min_child_weight=params["min_child_weight"],
-        reg_lambda=params["reg_lambda"],
-        random_state=42,
-        eval_metric="mae",
-    )
-    reg_home.fit(X_train, y_home_train)
-
-    reg_away = xgb.XGBRegressor(
-        n_estimators=params["n_estimators"],
-        max_depth=params["max_depth"],
-        learning_rate=params["learning_rate"],
-        subsample=params["subsample"],
-        colsample_bytree=params["colsample_bytree"],
-        min_child_weight=params["min_child_weight"],
-        reg_lambda=params["reg_lambda"],
-        random_state=42,
-        eval_metric="mae",
+    return TripletTrainer(X_train, params, nthread=nthread).triplet(y_winner_train, y_home_train, y_away_train)
+
+
+def _eval_result(result: CVResult, train_rows: int) -> EvalResult:
+    fold_metrics = result.fold_metrics()
+    if not fold_metrics:
+        return EvalResult(0.0, 999.0, 999.0, 999.0, 0, train_rows)
+
+    home_mae = float(np.mean([m["home_mae"] for m in fold_metrics]))
+    away_mae = float(np.mean([m["away_mae"] for m in fold_metrics]))
+    return EvalResult(
+        winner_accuracy=float(np.mean([m["accuracy"] for m in fold_metrics])),
+        home_mae=home_mae,
+        away_mae=away_mae,
+        overall_mae=(home_mae + away_mae) / 2.0,
+        folds_used=len(fold_metrics),
+        train_rows=train_rows,
     )
-    reg_away.fit(X_train, y_away_train)
-    return clf, reg_home, reg_away
+
+
+def evaluate_candidates(
+    engine: CVEngine,
+    X: np.ndarray,
+    y_winner: np.ndarray,
+    y_home: np.ndarray,
+    y_away: np.ndarray,
+    specs: List[ModelSpec],
+    n_splits: int,
+    meta: Dict[str, Any] | None = None,
+) -> Dict[str, EvalResult]:
+    """TimeSeries CV of every spec on one shared fold plan (folds with no class variance skipped)."""
+    data = CVData(X, y_winner, y_home, y_away)
+    results = engine.evaluate(data, timeseries_plan(data, n_splits), specs, meta=meta)
+    return {name: _eval_result(result, len(X)) for name, result in results.items()}
 
 
 def evaluate_with_timeseries_cv(
@@ -158,45 +156,25 @@ def evaluate_with_timeseries_cv(
     y_away: np.ndarray,
     params: Dict[str, Any],
     n_splits: int,
+    nthread: int = 0,
 ) -> EvalResult:
-    tscv = TimeSeriesSplit(n_splits=n_splits)
-    accs: List[float] = []
-    home_maes: List[float] = []
-    away_maes: List[float] = []
-
-    for train_idx, test_idx in tscv.split(X):
-        X_train, X_test = X[train_idx], X[test_idx]
-        y_w_train, y_w_test = y_winner[train_idx], y_winner[test_idx]
-        y_h_train, y_h_test = y_home[train_idx], y_home[test_idx]
-        y_a_train, y_a_test = y_away[train_idx], y_away[test_idx]
-
-        # Skip folds with no class variance.
-        if len(np.unique(y_w_train)) < 2:
-            continue
-
-        clf, reg_home, reg_away = _train_triplet(X_train, y_w_train, y_h_train, y_a_train, params)
-
-        y_w_pred = clf.predict(X_test)
-        y_h_pred = reg_home.predict(X_test)
-        y_a_pred = reg_away.predict(X_test)
+    spec = ModelSpec("candidate", params)
+    engine = CVEngine(total_threads=nthread)
+    return evaluate_candidates(engine, X, y_winner, y_home, y_away, [spec], n_splits)[spec.name]
 
-        accs.append(float(accuracy_score(y_w_test, y_w_pred)))
-        home_maes.append(float(mean_absolute_error(y_h_test, y_h_pred)))
-        away_maes.append(float(mean_absolute_error(y_a_test, y_a_pred)))
 
-    if not accs:
-        return EvalResult(0.0, 999.0, 999.0, 999.0, 0, len(X))
-
-    home_mae = float(np.mean(home_maes))
-    away_mae = float(np.mean(away_maes))
-    return EvalResult(
-        winner_accuracy=float(np.mean(accs)),
-        home_mae=home_mae,
-        away_mae=away_mae,
-        overall_mae=(home_mae + away_mae) / 2.0,
-        folds_used=len(accs),
-        train_rows=len(X),
-    )
+def _parse_candidate(text: str, base: Dict[str, Any]) -> ModelSpec:
+    """`NAME=JSON` -> spec whose params are `base` updated with the JSON object."""
+    name, sep, raw = text.partition("=")
+    if not sep or not name.strip():
+        raise SystemExit(f"--candidate expects NAME=JSON, got: {text}")
+    try:
+        overrides = json.loads(raw)
+    except ValueError as exc:
+        raise SystemExit(f"--candidate {name}: invalid JSON ({exc})")
+    if not isinstance(overrides, dict):
+        raise SystemExit(f"--candidate {name}: JSON must be an object")
+    return ModelSpec(name.strip(), {**base, **overrides})
 
 
 def _train_full_and_save(
@@ -209,8 +187,9 @@ def _train_full_and_save(
     league_id: int,
     league_name: str,
     output_dir: Path,
+    nthread: int = 0,
 ) -> str:
-    clf, reg_home, reg_away = _train_triplet(X, y_winner, y_home, y_away, params)
+    clf, reg_home, reg_away = _train_triplet(X, y_winner, y_home, y_away, params, nthread=nthread)
     payload = {
         "league_id": league_id,
         "league_name": league_name,
@@ -251,6 +230,26 @@ def main() -> None:
         default=0.01,
         help="Required accuracy gain to count as superior (default 0.01 = +1%).",
     )
+    parser.add_argument(
+        "--candidate",
+        action="append",
+        default=[],
+        metavar="NAME=JSON",
+        help="Extra candidate on the same folds: baseline params updated with a JSON object (repeatable).",
+    )
+    parser.add_argument("--league-workers", type=int, default=1, help="Leagues evaluated concurrently.")
+    parser.add_argument("--fold-workers", type=int, default=1, help="CV folds trained concurrently per league.")
+    parser.add_argument(
+        "--cv-cache-dir",
+        default=None,
+        help="Fold cache directory (default $RUGBY_CV_CACHE_DIR or artifacts/cv_cache; 'off' disables).",
+    )
+    parser.add_argument(
+        "--xgb-threads",
+        type=int,
+        default=0,
+        help="XGBoost thread budget shared by concurrent leagues (0 = all cores).",
+    )
     args = parser.parse_args()
 
     db_path = Path(args.db_path) if args.db_path else _default_db_path()
@@ -298,20 +297,38 @@ def main() -> None:
         "leagues": {},
     }
 
+    rows: Dict[int, Dict[str, Any]] = {}
+    jobs: List[Tuple[int, str, pd.DataFrame]] = []
     for league_id, league_name in leagues.items():
         df = _load_league_df(conn, league_id)
         if len(df) < args.min_games:
             report["summary"]["skipped"] += 1
-            report["leagues"][str(league_id)] = {
+            rows[league_id] = {
                 "name": league_name,
                 "status": "skipped",
                 "reason": f"not enough games ({len(df)} < {args.min_games})",
             }
             continue
+        jobs.append((league_id, league_name, df))
 
+    conn.close()
+
+    specs = [ModelSpec("baseline", baseline_params), ModelSpec("challenger", challenger_params)]
+    specs += [_parse_candidate(text, baseline_params) for text in args.candidate]
+    if len({spec.name for spec in specs}) != len(specs):
+        raise SystemExit("Candidate names must be unique (baseline/challenger are reserved).")
+    engine = CVEngine(default_fold_cache(args.cv_cache_dir))
+
+    def evaluate_league(job: Tuple[int, str, pd.DataFrame], nthread: int) -> Dict[str, Any]:
+        league_id, league_name, df = job
         X, y_w, y_h, y_a, feature_cols = _prepare_xy(df)
-        base = evaluate_with_timeseries_cv(X, y_w, y_h, y_a, baseline_params, args.splits)
-        ch = evaluate_with_timeseries_cv(X, y_w, y_h, y_a, challenger_params, args.splits)
+        evals = evaluate_candidates(
+            engine.with_budget(args.fold_workers, nthread),
+            X, y_w, y_h, y_a, specs, args.splits,
+            meta={"league_id": league_id, "league_name": league_name, "source": "brain_upgrade_lab"},
+        )
+        base = evals["baseline"]
+        ch = evals["challenger"]
 
         acc_gain = ch.winner_accuracy - base.winner_accuracy
         mae_gain = base.overall_mae - ch.overall_mae
@@ -328,24 +345,37 @@ def main() -> None:
             "mae_reduction": mae_gain,
             "challenger_superior": superior,
         }
+        if len(specs) > 2:
+            row["candidates"] = {
+                spec.name: {
+                    **evals[spec.name].__dict__,
+                    "params": spec.params,
+                    "accuracy_gain": evals[spec.name].winner_accuracy - base.winner_accuracy,
+                    "mae_reduction": base.overall_mae - evals[spec.name].overall_mae,
+                }
+                for spec in specs[2:]
+            }
 
         if superior and args.save_challenger:
             saved_path = _train_full_and_save(
-                X, y_w, y_h, y_a, feature_cols, challenger_params, league_id, league_name, Path("artifacts")
+                X, y_w, y_h, y_a, feature_cols, challenger_params, league_id, league_name, Path("artifacts"),
+                nthread=nthread,
             )
             row["saved_challenger_model"] = saved_path
 
-        report["leagues"][str(league_id)] = row
-        report["summary"]["tested"] += 1
-        if superior:
-            report["summary"]["challenger_better"] += 1
-
         print(
             f"[{league_name}] base_acc={base.winner_accuracy:.3f} -> chal_acc={ch.winner_accuracy:.3f} "
             f"| base_mae={base.overall_mae:.3f} -> chal_mae={ch.overall_mae:.3f} | superior={superior}"
         )
+        return row
 
-    conn.close()
+    tested = map_leagues(evaluate_league, jobs, workers=args.league_workers, total_threads=args.xgb_threads)
+    for (league_id, _, _), row in zip(jobs, tested):
+        rows[league_id] = row
+        report["summary"]["tested"] += 1
+        if row["challenger_superior"]:
+            report["summary"]["challenger_better"] += 1
+    report["leagues"] = {str(league_id): rows[league_id] for league_id in leagues if league_id in rows}
 
     out_dir = Path("artifacts")
     out_dir.mkdir(exist_ok=True)
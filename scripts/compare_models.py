@@ -3,8 +3,10 @@
 Model Comparison Script
 Compares XGBoost models (artifacts/) vs Optimized Stacking models (artifacts_optimized/)
 Shows side-by-side accuracy, MAE, and performance metrics
+With --cv-cache-dir also shows candidates evaluated on identical cached CV folds
 """
 
+import argparse
 import json
 import os
 import sys
@@ -253,6 +255,12 @@ def print_summary(xgboost_registry: Dict, optimized_registry: Dict):
 
 def main():
     """Main comparison function"""
+    parser = argparse.ArgumentParser(description="Compare XGBoost vs Optimized model registries")
+    parser.add_argument("--cv-cache-dir", default=None, help="Also show cached CV fold results from this directory")
+    parser.add_argument("--cv-plan", choices=["timeseries", "holdout"], default=None, help="Cached fold plan to show")
+    parser.add_argument("--cv-reference", default=None, help="Cached spec the deltas are taken against (default: first)")
+    args = parser.parse_args()
+
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
     
@@ -299,6 +307,12 @@ def main():
     
     # Print summary
     print_summary(xgboost_registry, optimized_registry)
+
+    if args.cv_cache_dir:
+        from cv_engine import FoldCache, print_cached_cv_summary
+
+        league_ids = [int(lid) for lid in common_league_ids if str(lid).isdigit()]
+        print_cached_cv_summary(FoldCache(args.cv_cache_dir), league_ids or None, args.cv_plan, args.cv_reference)
     
     print(f"\n{Colors.BOLD}{'='*120}{Colors.END}\n")
 
@@ -7,6 +7,8 @@ Old Method: Winner determined from predicted scores
 New Method: Winner from classifier, scores adjusted to match
 
 This script evaluates both methods on historical data to see which is more accurate.
+With --cv-cache-dir both methods are instead scored on the out-of-sample fold
+predictions cached by brain_upgrade_lab.py / maz_boss_benchmark.py (no retraining).
 """
 
 import sqlite3
@@ -20,10 +22,13 @@ from datetime import datetime
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
 
 from prediction.config import LEAGUE_MAPPINGS
-from prediction.features import build_feature_table, FeatureConfig
+from prediction.dataset_cache import cached_feature_table, default_dataset_cache
+from prediction.features import FeatureConfig
 from prediction.hybrid_predictor import HybridPredictor
+from cv_engine import FoldCache, latest_runs_by_league, load_cached_runs
 
 # Colors for terminal output
 class Colors:
@@ -37,6 +42,71 @@ class Colors:
     BOLD = '\033[1m'
     END = '\033[0m'
 
+def old_method_from_raw(home_win_prob: float, predicted_home_score: float,
+                        predicted_away_score: float) -> Dict[str, Any]:
+    """Old method on raw model outputs: winner from the predicted scores"""
+    if predicted_home_score > predicted_away_score:
+        predicted_winner = 'Home'
+    elif predicted_away_score > predicted_home_score:
+        predicted_winner = 'Away'
+    else:
+        # Tie - use classifier to break
+        predicted_winner = 'Home' if home_win_prob > 0.5 else 'Away'
+    
+    return {
+        'predicted_winner': predicted_winner,
+        'predicted_home_score': float(predicted_home_score),
+        'predicted_away_score': float(predicted_away_score),
+        'home_win_prob': float(home_win_prob),
+        'method': 'old'
+    }
+
+def new_method_from_raw(home_win_prob: float, predicted_home_score: float,
+                        predicted_away_score: float) -> Dict[str, Any]:
+    """New method on raw model outputs: winner from the classifier, scores adjusted to agree"""
+    classifier_home_wins = home_win_prob > 0.5
+    score_based_home_wins = predicted_home_score > predicted_away_score
+    score_margin = abs(predicted_home_score - predicted_away_score)
+    total_score = predicted_home_score + predicted_away_score
+    
+    if classifier_home_wins != score_based_home_wins:
+        # Scores and classifier disagree - adjust scores to match classifier
+        if classifier_home_wins:
+            min_margin = max(1.0, score_margin * 0.5)
+            predicted_home_score = (total_score + min_margin) / 2
+            predicted_away_score = (total_score - min_margin) / 2
+        else:
+            min_margin = max(1.0, score_margin * 0.5)
+            predicted_away_score = (total_score + min_margin) / 2
+            predicted_home_score = (total_score - min_margin) / 2
+        
+        predicted_home_score = max(0, round(predicted_home_score))
+        predicted_away_score = max(0, round(predicted_away_score))
+        
+        if classifier_home_wins:
+            if predicted_home_score <= predicted_away_score:
+                predicted_home_score = predicted_away_score + 1
+        else:
+            if predicted_away_score <= predicted_home_score:
+                predicted_away_score = predicted_home_score + 1
+    
+    elif predicted_home_score == predicted_away_score:
+        if classifier_home_wins:
+            predicted_home_score = predicted_away_score + 1
+        else:
+            predicted_away_score = predicted_home_score + 1
+    
+    # Determine winner from classifier (new method)
+    predicted_winner = 'Home' if home_win_prob > 0.5 else 'Away'
+    
+    return {
+        'predicted_winner': predicted_winner,
+        'predicted_home_score': float(predicted_home_score),
+        'predicted_away_score': float(predicted_away_score),
+        'home_win_prob': float(home_win_prob),
+        'method': 'new'
+    }
+
 def get_old_method_prediction(predictor: HybridPredictor, home_team_id: int, 
                              away_team_id: int, match_date: str) -> Dict[str, Any]:
     """
@@ -50,7 +120,7 @@ def get_old_method_prediction(predictor: HybridPredictor, home_team_id: int,
             elo_k=24.0,
             neutral_mode=(predictor.league_id == 4574)
         )
-        df = build_feature_table(conn, config)
+        df = cached_feature_table(conn, config, default_dataset_cache())
         conn.close()
         
         match_features = df[
@@ -82,22 +152,7 @@ def get_old_method_prediction(predictor: HybridPredictor, home_team_id: int,
         predicted_home_score = max(0, predictor.reg_home_model.predict(X)[0])
         predicted_away_score = max(0, predictor.reg_away_model.predict(X)[0])
         
-        # OLD METHOD: Determine winner from scores (not from classifier)
-        if predicted_home_score > predicted_away_score:
-            predicted_winner = 'Home'
-        elif predicted_away_score > predicted_home_score:
-            predicted_winner = 'Away'
-        else:
-            # Tie - use classifier to break
-            predicted_winner = 'Home' if home_win_prob > 0.5 else 'Away'
-        
-        return {
-            'predicted_winner': predicted_winner,
-            'predicted_home_score': float(predicted_home_score),
-            'predicted_away_score': float(predicted_away_score),
-            'home_win_prob': float(home_win_prob),
-            'method': 'old'
-        }
+        return old_method_from_raw(home_win_prob, predicted_home_score, predicted_away_score)
     except Exception as e:
         print(f"  ⚠️  Error in old method: {e}")
         return None
@@ -112,53 +167,11 @@ def get_new_method_prediction(predictor: HybridPredictor, home_team_id: int,
     ai_pred = predictor.get_ai_prediction(home_team_id, away_team_id, match_date)
     
     # Simulate hybrid_predict with AI-only (effective_odds_weight == 0.0)
-    home_win_prob = ai_pred['home_win_prob']
-    predicted_home_score = ai_pred['predicted_home_score']
-    predicted_away_score = ai_pred['predicted_away_score']
-    
-    # NEW METHOD: Adjust scores to match classifier (AI-only mode)
-    classifier_home_wins = home_win_prob > 0.5
-    score_based_home_wins = predicted_home_score > predicted_away_score
-    score_margin = abs(predicted_home_score - predicted_away_score)
-    total_score = predicted_home_score + predicted_away_score
-    
-    if classifier_home_wins != score_based_home_wins:
-        # Scores and classifier disagree - adjust scores to match classifier
-        if classifier_home_wins:
-            min_margin = max(1.0, score_margin * 0.5)
-            predicted_home_score = (total_score + min_margin) / 2
-            predicted_away_score = (total_score - min_margin) / 2
-        else:
-            min_margin = max(1.0, score_margin * 0.5)
-            predicted_away_score = (total_score + min_margin) / 2
-            predicted_home_score = (total_score - min_margin) / 2
-        
-        predicted_home_score = max(0, round(predicted_home_score))
-        predicted_away_score = max(0, round(predicted_away_score))
-        
-        if classifier_home_wins:
-            if predicted_home_score <= predicted_away_score:
-                predicted_home_score = predicted_away_score + 1
-        else:
-            if predicted_away_score <= predicted_home_score:
-                predicted_away_score = predicted_home_score + 1
-    
-    elif predicted_home_score == predicted_away_score:
-        if classifier_home_wins:
-            predicted_home_score = predicted_away_score + 1
-        else:
-            predicted_away_score = predicted_home_score + 1
-    
-    # Determine winner from classifier (new method)
-    predicted_winner = 'Home' if home_win_prob > 0.5 else 'Away'
-    
-    return {
-        'predicted_winner': predicted_winner,
-        'predicted_home_score': float(predicted_home_score),
-        'predicted_away_score': float(predicted_away_score),
-        'home_win_prob': float(home_win_prob),
-        'method': 'new'
-    }
+    return new_method_from_raw(
+        ai_pred['home_win_prob'],
+        ai_pred['predicted_home_score'],
+        ai_pred['predicted_away_score'],
+    )
 
 def evaluate_method(conn: sqlite3.Connection, league_id: int, 
                    predictor: HybridPredictor, method_func) -> Dict[str, Any]:
@@ -184,11 +197,7 @@ def evaluate_method(conn: sqlite3.Connection, league_id: int,
     if len(df) == 0:
         return None
     
-    correct = 0
-    total = 0
-    score_errors = []
-    inconsistencies = 0  # Cases where predicted winner doesn't match scores
-    
+    outcomes = []
     for _, row in df.iterrows():
         try:
             # Get prediction
@@ -202,34 +211,46 @@ def evaluate_method(conn: sqlite3.Connection, league_id: int,
             if prediction is None:
                 continue
             
-            # Determine actual winner
-            if row['home_score'] > row['away_score']:
-                actual_winner = 'Home'
-            elif row['away_score'] > row['home_score']:
-                actual_winner = 'Away'
-            else:
-                actual_winner = 'Draw'
-            
-            # Check if prediction is correct
-            if prediction['predicted_winner'] == actual_winner:
-                correct += 1
-            
-            # Check for inconsistencies (winner doesn't match scores)
-            score_winner = 'Home' if prediction['predicted_home_score'] > prediction['predicted_away_score'] else 'Away'
-            if prediction['predicted_winner'] != score_winner:
-                inconsistencies += 1
-            
-            # Calculate score errors
-            home_error = abs(prediction['predicted_home_score'] - row['home_score'])
-            away_error = abs(prediction['predicted_away_score'] - row['away_score'])
-            score_errors.append((home_error + away_error) / 2)
-            
-            total += 1
+            outcomes.append((prediction, row['home_score'], row['away_score']))
             
         except Exception as e:
             print(f"  ⚠️  Error processing match {row['id']}: {e}")
             continue
     
+    return summarize_method(outcomes)
+
+def summarize_method(outcomes: List[Tuple[Dict[str, Any], float, float]]) -> Dict[str, Any]:
+    """Accuracy, score error and inconsistencies of (prediction, home_score, away_score) outcomes"""
+    correct = 0
+    total = 0
+    score_errors = []
+    inconsistencies = 0  # Cases where predicted winner doesn't match scores
+    
+    for prediction, home_score, away_score in outcomes:
+        # Determine actual winner
+        if home_score > away_score:
+            actual_winner = 'Home'
+        elif away_score > home_score:
+            actual_winner = 'Away'
+        else:
+            actual_winner = 'Draw'
+        
+        # Check if prediction is correct
+        if prediction['predicted_winner'] == actual_winner:
+            correct += 1
+        
+        # Check for inconsistencies (winner doesn't match scores)
+        score_winner = 'Home' if prediction['predicted_home_score'] > prediction['predicted_away_score'] else 'Away'
+        if prediction['predicted_winner'] != score_winner:
+            inconsistencies += 1
+        
+        # Calculate score errors
+        home_error = abs(prediction['predicted_home_score'] - home_score)
+        away_error = abs(prediction['predicted_away_score'] - away_score)
+        score_errors.append((home_error + away_error) / 2)
+        
+        total += 1
+    
     if total == 0:
         return None
     
@@ -293,6 +314,38 @@ def compare_methods(league_id: int, league_name: str, db_path: str):
         print(f"{Colors.RED}❌ Could not evaluate methods{Colors.END}")
         return None
     
+    return print_method_comparison(league_id, league_name, old_results, new_results)
+
+def compare_methods_on_cached_folds(league_id: int, league_name: str, run, spec_name: str = None):
+    """Compare old vs new method on the cached out-of-sample predictions of one CV spec"""
+    
+    print(f"\n{Colors.BOLD}{'='*80}{Colors.END}")
+    print(f"{Colors.BOLD}League: {league_name} (ID: {league_id}){Colors.END}")
+    print(f"{Colors.BOLD}{'='*80}{Colors.END}")
+    
+    spec_name = spec_name if spec_name in run.specs else next(iter(run.specs))
+    result = run.specs[spec_name]
+    print(f"\n{Colors.CYAN}📊 Cached {run.kind} folds: spec '{spec_name}', {len(result.folds)} fold(s){Colors.END}")
+    
+    old_outcomes = []
+    new_outcomes = []
+    for fold in result.folds:
+        for p, h, a, yh, ya in zip(fold.p_home, fold.home_pred, fold.away_pred, fold.y_home, fold.y_away):
+            h, a = max(0.0, float(h)), max(0.0, float(a))
+            old_outcomes.append((old_method_from_raw(float(p), h, a), float(yh), float(ya)))
+            new_outcomes.append((new_method_from_raw(float(p), h, a), float(yh), float(ya)))
+    
+    old_results = summarize_method(old_outcomes)
+    new_results = summarize_method(new_outcomes)
+    if not old_results or not new_results:
+        print(f"{Colors.RED}❌ No cached fold predictions{Colors.END}")
+        return None
+    
+    return print_method_comparison(league_id, league_name, old_results, new_results)
+
+def print_method_comparison(league_id: int, league_name: str, old_results: Dict[str, Any],
+                            new_results: Dict[str, Any]) -> Dict[str, Any]:
+    """Print the old vs new results table and summary for one league"""
     # Display results
     print(f"\n{Colors.BOLD}Results:{Colors.END}")
     print(f"{'Metric':<30} {'Old Method':<20} {'New Method':<20} {'Difference':<20}")
@@ -341,9 +394,33 @@ def main():
     parser.add_argument('--league-id', type=int, help='Compare specific league ID')
     parser.add_argument('--all-leagues', action='store_true', help='Compare all leagues')
     parser.add_argument('--db-path', type=str, default=None, help='Path to database')
+    parser.add_argument('--cv-cache-dir', type=str, default=None,
+                        help='Score both methods on cached CV fold predictions instead of the database')
+    parser.add_argument('--cv-plan', choices=['timeseries', 'holdout'], default=None, help='Cached fold plan to use')
+    parser.add_argument('--cv-spec', type=str, default=None, help='Cached model spec to use (default: first)')
     
     args = parser.parse_args()
     
+    if args.cv_cache_dir:
+        runs = latest_runs_by_league(load_cached_runs(FoldCache(args.cv_cache_dir), plan_kind=args.cv_plan))
+        if args.league_id:
+            runs = {lid: run for lid, run in runs.items() if lid == args.league_id}
+        if not runs:
+            print(f"{Colors.RED}❌ No cached CV folds in {args.cv_cache_dir}{Colors.END}")
+            sys.exit(1)
+        print(f"{Colors.BOLD}🔬 Prediction Method Comparison: Old vs New (cached CV folds){Colors.END}")
+        print(f"{Colors.BOLD}{'='*80}{Colors.END}")
+        print(f"📁 CV cache: {args.cv_cache_dir}")
+        results = []
+        for league_id in sorted(runs):
+            run = runs[league_id]
+            league_name = run.meta.get('league_name') or LEAGUE_MAPPINGS.get(league_id, f'League {league_id}')
+            result = compare_methods_on_cached_folds(league_id, league_name, run, args.cv_spec)
+            if result:
+                results.append(result)
+        print_overall_summary(results)
+        return
+    
     # Find database
     if args.db_path:
         db_path = args.db_path
@@ -380,6 +457,10 @@ def main():
         if result:
             results.append(result)
     
+    print_overall_summary(results)
+
+def print_overall_summary(results: List[Dict[str, Any]]):
+    """Print totals across leagues"""
     # Overall summary
     if len(results) > 1:
         print(f"\n{Colors.BOLD}{'='*80}{Colors.END}")
@@ -9,6 +9,7 @@ Designed for "max detail" diagnostics:
 - "Best model by metric" counts
 - Schema/mismatch diagnostics
 - Optional CSV export of every parsed field
+- Optional fold-level comparison from the CV cache (--cv-cache-dir)
 """
 
 from __future__ import annotations
@@ -20,6 +21,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from cv_engine import FoldCache, print_cached_cv_summary
+
 
 @dataclass
 class PerfMetrics:
@@ -495,6 +498,13 @@ def main() -> None:
         default=None,
         help="Optional output CSV path for full parsed matrix.",
     )
+    parser.add_argument(
+        "--cv-cache-dir",
+        default=None,
+        help="Also compare cached CV folds (brain_upgrade_lab / maz_boss_benchmark) for the covered leagues.",
+    )
+    parser.add_argument("--cv-plan", choices=["timeseries", "holdout"], default=None, help="Cached fold plan to show.")
+    parser.add_argument("--cv-reference", default=None, help="Cached spec the deltas are taken against (default: first).")
     args = parser.parse_args()
 
     if not args.v2_report and not args.v3_report and not args.v4_report:
@@ -568,6 +578,9 @@ def main() -> None:
     _print_best_model_counts(rows)
     _print_mismatch_diagnostics(rows)
 
+    if args.cv_cache_dir:
+        print_cached_cv_summary(FoldCache(args.cv_cache_dir), lids, args.cv_plan, args.cv_reference)
+
     if args.export_csv:
         out_csv = Path(args.export_csv)
         _export_csv(rows, out_csv)
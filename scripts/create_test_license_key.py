@@ -114,6 +114,7 @@ def create_unlimited_license_key(email: str = "test@rugbyai.com"):
     # Create subscription data
     subscription_data = {
         'license_key': license_key,
+        'license_key_normalized': license_key.replace('-', '').upper(),
         'email': email,
         'subscription_type': 'lifetime',  # Special type for unlimited
         'created_at': firestore.SERVER_TIMESTAMP,
@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Fold-level cross-validation engine shared by the XGBoost evaluation scripts.
+
+A `FoldPlan` fixes a league's fold index sets once: expanding-window
+`TimeSeriesSplit` folds (brain_upgrade_lab) or the chronological holdout of
+maz_boss_benchmark. `CVEngine.evaluate` trains every candidate `ModelSpec` on
+every fold and keeps each fold's test predictions and fitted model in a
+`FoldCache` keyed by (data + plan, spec hash, fold). Re-running with one more
+candidate trains only that candidate; baselines come back from the cache.
+Folds that still need training run in parallel, and the candidates of one
+fold share its XGBoost training matrix.
+
+Cached folds carry their test targets, so `compare_*` scripts can score
+cached candidates on identical folds without the DB (`load_cached_runs`).
+
+The cache lives under `artifacts/cv_cache` (`RUGBY_CV_CACHE_DIR` overrides;
+`off` disables). Entries are keyed by the feature matrix and targets
+themselves, so new matches or feature changes land on a new entry; the least
+recently used datasets are pruned on write. Spec keys include the xgboost
+version and the source of `prediction.xgb_training` and of the modules that
+define the kind's fit/predict functions, so library or training-code changes
+retrain instead of reusing stale folds.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import shutil
+import sys
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import xgboost as xgb
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import TimeSeriesSplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prediction import xgb_training  # noqa: E402
+from prediction.dataset_cache import fingerprint, source_fingerprint  # noqa: E402
+from prediction.xgb_training import TripletTrainer, map_leagues  # noqa: E402
+
+LOG = logging.getLogger("cv_engine")
+
+CV_CACHE_ENV = "RUGBY_CV_CACHE_DIR"
+DEFAULT_CV_CACHE_DIR = Path("artifacts") / "cv_cache"
+# Bump when the on-disk layout or FoldOutcome fields change.
+CV_CACHE_FORMAT = 1
+
+
+@dataclass
+class ModelSpec:
+    """A candidate model: `kind` selects the trainer, `params` its hyperparameters."""
+
+    name: str
+    params: Dict[str, Any]
+    kind: str = "xgb_triplet"
+    version: int = 1
+
+    @property
+    def key(self) -> str:
+        # The name is a label only: renaming a candidate keeps its cached folds.
+        return fingerprint(self.kind, self.version, self.params, model_code_fingerprint(self.kind))
+
+
+@dataclass
+class CVData:
+    X: np.ndarray
+    y_winner: np.ndarray
+    y_home: np.ndarray
+    y_away: np.ndarray
+
+    @property
+    def key(self) -> str:
+        h = hashlib.sha1()
+        for arr in (self.X, self.y_winner, self.y_home, self.y_away):
+            arr = np.ascontiguousarray(arr)
+            h.update(repr((arr.dtype.str, arr.shape)).encode("utf-8"))
+            h.update(arr.tobytes())
+        return h.hexdigest()[:20]
+
+
+@dataclass
+class FoldPlan:
+    kind: str
+    config: Dict[str, Any]
+    folds: List[Tuple[np.ndarray, np.ndarray]]
+
+
+def timeseries_plan(data: CVData, n_splits: int, skip_single_class: bool = True) -> FoldPlan:
+    """Expanding-window folds; folds whose training winners are all one class are dropped."""
+    folds = [
+        (train_idx, test_idx)
+        for train_idx, test_idx in TimeSeriesSplit(n_splits=n_splits).split(data.X)
+        if not skip_single_class or len(np.unique(data.y_winner[train_idx])) >= 2
+    ]
+    return FoldPlan("timeseries", {"n_splits": int(n_splits), "skip_single_class": bool(skip_single_class)}, folds)
+
+
+def holdout_split_index(n_rows: int, holdout_ratio: float, min_train: int = 30, min_test: int = 10) -> int:
+    split_idx = int(round(n_rows * (1.0 - holdout_ratio)))
+    return max(min_train, min(split_idx, n_rows - min_test))
+
+
+def holdout_plan(data: CVData, holdout_ratio: float) -> FoldPlan:
+    """One chronological fold: the first rows train, the last `holdout_ratio` test."""
+    n = len(data.X)
+    split_idx = holdout_split_index(n, holdout_ratio)
+    return FoldPlan(
+        "holdout",
+        {"holdout_ratio": float(holdout_ratio)},
+        [(np.arange(split_idx), np.arange(split_idx, n))],
+    )
+
+
+@dataclass
+class FoldOutcome:
+    """One spec on one fold: test predictions, test targets and the fitted model."""
+
+    fold: int
+    train_rows: int
+    test_idx: np.ndarray
+    p_home: np.ndarray
+    home_pred: np.ndarray
+    away_pred: np.ndarray
+    y_winner: np.ndarray
+    y_home: np.ndarray
+    y_away: np.ndarray
+    model: Any = None
+
+    def metrics(self, inclusive_threshold: bool = False) -> Dict[str, float]:
+        """
+        Winner accuracy and score MAEs. `inclusive_threshold` predicts a home win
+        at p >= 0.5 (maz_boss_benchmark); the default p > 0.5 matches `clf.predict`.
+        """
+        y_pred = (self.p_home >= 0.5) if inclusive_threshold else (self.p_home > 0.5)
+        home_mae = float(mean_absolute_error(self.y_home, self.home_pred))
+        away_mae = float(mean_absolute_error(self.y_away, self.away_pred))
+        return {
+            "accuracy": float(np.mean(y_pred.astype(int) == self.y_winner)),
+            "home_mae": home_mae,
+            "away_mae": away_mae,
+            "overall_mae": float((home_mae + away_mae) / 2.0),
+            "rows": int(len(self.test_idx)),
+        }
+
+
+@dataclass
+class CVResult:
+    spec: ModelSpec
+    folds: List[FoldOutcome]
+    trained_folds: int = 0
+
+    def fold_metrics(self, inclusive_threshold: bool = False) -> List[Dict[str, float]]:
+        return [f.metrics(inclusive_threshold) for f in self.folds]
+
+
+class FoldTrainingSet:
+    """Training rows of one fold; specs fitted on it share one XGBoost matrix."""
+
+    def __init__(self, data: CVData, train_idx: np.ndarray, nthread: int = 0):
+        self.X = data.X[train_idx]
+        self.y_winner = data.y_winner[train_idx]
+        self.y_home = data.y_home[train_idx]
+        self.y_away = data.y_away[train_idx]
+        self.nthread = int(nthread)
+        self._trainer: Optional[TripletTrainer] = None
+
+    def trainer(self, params: Dict[str, Any]) -> TripletTrainer:
+        if self._trainer is None:
+            self._trainer = TripletTrainer(self.X, params, nthread=self.nthread)
+            return self._trainer
+        return self._trainer.with_params(params)
+
+
+# kind -> (fit(training_set, params) -> model, predict(model, X) -> (p_home, home_pred, away_pred))
+ModelFit = Callable[[FoldTrainingSet, Dict[str, Any]], Any]
+ModelPredict = Callable[[Any, np.ndarray], Tuple[np.ndarray, np.ndarray, np.ndarray]]
+MODEL_KINDS: Dict[str, Tuple[ModelFit, ModelPredict]] = {}
+
+
+def register_model_kind(kind: str, fit: ModelFit, predict: ModelPredict) -> None:
+    MODEL_KINDS[kind] = (fit, predict)
+
+
+def model_code_fingerprint(kind: str) -> str:
+    """xgboost version plus the source of the shared trainer and of `kind`'s fit/predict modules."""
+    sources = [source_fingerprint(xgb_training.__file__)]
+    for fn in MODEL_KINDS.get(kind, ()):
+        module_file = inspect.getsourcefile(fn)
+        sources.append(source_fingerprint(module_file) if module_file else getattr(fn, "__qualname__", repr(fn)))
+    return fingerprint(xgb.__version__, sources)
+
+
+def _fit_xgb_triplet(train: FoldTrainingSet, params: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+    return train.trainer(params).triplet(train.y_winner, train.y_home, train.y_away)
+
+
+def _predict_xgb_triplet(model: Tuple[Any, Any, Any], X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    clf, reg_home, reg_away = model
+    return clf.predict_proba(X)[:, 1], reg_home.predict(X), reg_away.predict(X)
+
+
+register_model_kind("xgb_triplet", _fit_xgb_triplet, _predict_xgb_triplet)
+
+
+class FoldCache:
+    """
+    `<root>/<dataset key>/plan.json` plus `<spec key>/spec.json` and
+    `<spec key>/fold_<i>.pkl` per cached fold.
+    """
+
+    def __init__(self, root: Path, keep_datasets: int = 24):
+        self.root = Path(root)
+        self.keep_datasets = max(1, int(keep_datasets))
+
+    def _fold_path(self, dataset_key: str, spec_key: str, fold: int) -> Path:
+        return self.root / dataset_key / spec_key / f"fold_{fold}.pkl"
+
+    def load(self, dataset_key: str, spec_key: str, fold: int) -> Optional[FoldOutcome]:
+        path = self._fold_path(dataset_key, spec_key, fold)
+        if not path.exists():
+            return None
+        try:
+            with path.open("rb") as f:
+                payload = pickle.load(f)
+            if payload.get("format") != CV_CACHE_FORMAT:
+                return None
+            try:
+                os.utime(self.root / dataset_key)
+            except OSError:
+                pass
+            return payload["outcome"]
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, KeyError) as exc:
+            LOG.warning("cv cache entry %s unreadable (%s); retraining", path, exc)
+            return None
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        """Write to a private temp file, then rename into place (safe under concurrent runs)."""
+        tmp = path.with_name(f".tmp-{path.name}-{uuid.uuid4().hex[:8]}")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError as exc:
+            LOG.debug("cv cache write skipped for %s: %s", path, exc)
+            tmp.unlink(missing_ok=True)
+
+    def store(
+        self,
+        dataset_key: str,
+        plan: FoldPlan,
+        meta: Dict[str, Any],
+        spec: ModelSpec,
+        outcome: FoldOutcome,
+    ) -> None:
+        new_dataset = not (self.root / dataset_key).exists()
+        plan_path = self.root / dataset_key / "plan.json"
+        if not plan_path.exists():
+            doc = {"format": CV_CACHE_FORMAT, "kind": plan.kind, "config": plan.config, "n_folds": len(plan.folds), "meta": meta}
+            self._write_atomic(plan_path, json.dumps(doc, indent=2, default=str).encode("utf-8"))
+        spec_path = self.root / dataset_key / spec.key / "spec.json"
+        if not spec_path.exists():
+            doc = {"name": spec.name, "kind": spec.kind, "version": spec.version, "params": spec.params}
+            self._write_atomic(spec_path, json.dumps(doc, indent=2, default=str).encode("utf-8"))
+        payload = {"format": CV_CACHE_FORMAT, "outcome": outcome}
+        self._write_atomic(
+            self._fold_path(dataset_key, spec.key, outcome.fold),
+            pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+        if new_dataset:
+            self._prune()
+
+    def _prune(self) -> None:
+        entries = sorted(
+            (p for p in self.root.iterdir() if p.is_dir() and not p.name.startswith(".")),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for stale in entries[self.keep_datasets :]:
+            shutil.rmtree(stale, ignore_errors=True)
+
+
+def default_fold_cache(path: Optional[str] = None) -> Optional[FoldCache]:
+    """Cache at `path`, else `$RUGBY_CV_CACHE_DIR` (default `artifacts/cv_cache`); None when `off`."""
+    raw = (path if path is not None else os.getenv(CV_CACHE_ENV, "")).strip()
+    if raw.lower() in ("off", "0", "none", "false"):
+        return None
+    return FoldCache(Path(raw) if raw else DEFAULT_CV_CACHE_DIR)
+
+
+def dataset_key(data: CVData, plan: FoldPlan) -> str:
+    return fingerprint(data.key, plan.kind, plan.config, CV_CACHE_FORMAT)
+
+
+class CVEngine:
+    """
+    Evaluates specs on a fold plan through the fold cache. Folds missing for
+    any spec run on up to `workers` threads sharing `total_threads` XGBoost
+    threads (0 = all cores); fold results are also kept in memory.
+    """
+
+    def __init__(self, cache: Optional[FoldCache] = None, workers: int = 1, total_threads: int = 0):
+        self.cache = cache
+        self.workers = max(1, int(workers))
+        self.total_threads = max(0, int(total_threads))
+        self._memory: Dict[Tuple[str, str, int], FoldOutcome] = {}
+
+    def with_budget(self, workers: int, total_threads: int) -> "CVEngine":
+        """Same cache and memory, different parallelism (e.g. inside a league worker)."""
+        engine = CVEngine(self.cache, workers, total_threads)
+        engine._memory = self._memory
+        return engine
+
+    def _lookup(self, key: str, spec: ModelSpec, fold: int) -> Optional[FoldOutcome]:
+        hit = self._memory.get((key, spec.key, fold))
+        if hit is None and self.cache is not None:
+            hit = self.cache.load(key, spec.key, fold)
+            if hit is not None:
+                self._memory[(key, spec.key, fold)] = hit
+        return hit
+
+    def _train_fold(
+        self,
+        data: CVData,
+        plan: FoldPlan,
+        fold: int,
+        specs: Sequence[ModelSpec],
+        nthread: int,
+    ) -> List[FoldOutcome]:
+        train_idx, test_idx = plan.folds[fold]
+        train = FoldTrainingSet(data, train_idx, nthread=nthread)
+        X_test = data.X[test_idx]
+        outcomes = []
+        for spec in specs:
+            fit, predict = MODEL_KINDS[spec.kind]
+            model = fit(train, spec.params)
+            p_home, home_pred, away_pred = predict(model, X_test)
+            outcomes.append(
+                FoldOutcome(
+                    fold=fold,
+                    train_rows=int(len(train_idx)),
+                    test_idx=np.asarray(test_idx),
+                    p_home=np.asarray(p_home),
+                    home_pred=np.asarray(home_pred),
+                    away_pred=np.asarray(away_pred),
+                    y_winner=np.asarray(data.y_winner[test_idx]),
+                    y_home=np.asarray(data.y_home[test_idx]),
+                    y_away=np.asarray(data.y_away[test_idx]),
+                    model=model,
+                )
+            )
+        return outcomes
+
+    def evaluate(
+        self,
+        data: CVData,
+        plan: FoldPlan,
+        specs: Sequence[ModelSpec],
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, CVResult]:
+        """`{spec.name: CVResult}`, training only the (spec, fold) pairs not cached."""
+        key = dataset_key(data, plan)
+        results = {spec.name: CVResult(spec, []) for spec in specs}
+        missing: Dict[int, List[ModelSpec]] = {}
+        found: Dict[Tuple[str, int], FoldOutcome] = {}
+        for spec in specs:
+            for fold in range(len(plan.folds)):
+                hit = self._lookup(key, spec, fold)
+                if hit is None:
+                    missing.setdefault(fold, []).append(spec)
+                else:
+                    found[(spec.name, fold)] = hit
+
+        jobs = sorted(missing.items())
+        trained = map_leagues(
+            lambda job, nthread: self._train_fold(data, plan, job[0], job[1], nthread),
+            jobs,
+            workers=self.workers,
+            total_threads=self.total_threads,
+        )
+        for (fold, fold_specs), outcomes in zip(jobs, trained):
+            for spec, outcome in zip(fold_specs, outcomes):
+                found[(spec.name, fold)] = outcome
+                results[spec.name].trained_folds += 1
+                self._memory[(key, spec.key, fold)] = outcome
+                if self.cache is not None:
+                    self.cache.store(key, plan, dict(meta or {}), spec, outcome)
+
+        for spec in specs:
+            results[spec.name].folds = [found[(spec.name, fold)] for fold in range(len(plan.folds))]
+        return results
+
+
+@dataclass
+class CachedRun:
+    """Every fully cached spec of one (dataset, plan) entry, as read back from disk."""
+
+    dataset_key: str
+    kind: str
+    config: Dict[str, Any]
+    meta: Dict[str, Any]
+    specs: Dict[str, CVResult] = field(default_factory=dict)
+
+
+def load_cached_runs(
+    cache: FoldCache,
+    league_id: Optional[int] = None,
+    plan_kind: Optional[str] = None,
+) -> List[CachedRun]:
+    """Cached runs (newest first), optionally limited to one league / plan kind."""
+    runs: List[CachedRun] = []
+    if not cache.root.exists():
+        return runs
+    entries = sorted(
+        (p for p in cache.root.iterdir() if (p / "plan.json").exists()),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in entries:
+        try:
+            plan_doc = json.loads((entry / "plan.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        meta = plan_doc.get("meta", {})
+        if league_id is not None and meta.get("league_id") != league_id:
+            continue
+        if plan_kind is not None and plan_doc.get("kind") != plan_kind:
+            continue
+        run = CachedRun(entry.name, plan_doc.get("kind", ""), plan_doc.get("config", {}), meta)
+        n_folds = int(plan_doc.get("n_folds", 0))
+        for spec_dir in sorted(p for p in entry.iterdir() if (p / "spec.json").exists()):
+            try:
+                spec_doc = json.loads((spec_dir / "spec.json").read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            spec = ModelSpec(spec_doc["name"], spec_doc["params"], spec_doc["kind"], spec_doc["version"])
+            folds = [cache.load(entry.name, spec_dir.name, fold) for fold in range(n_folds)]
+            if n_folds and all(f is not None for f in folds):
+                run.specs[spec.name] = CVResult(spec, folds)
+        if run.specs:
+            runs.append(run)
+    return runs
+
+
+def latest_runs_by_league(runs: Sequence[CachedRun]) -> Dict[int, CachedRun]:
+    """Newest cached run per league id (runs are newest first)."""
+    out: Dict[int, CachedRun] = {}
+    for run in runs:
+        lid = run.meta.get("league_id")
+        if lid is not None and int(lid) not in out:
+            out[int(lid)] = run
+    return out
+
+
+def summarize_run(run: CachedRun, reference: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Fold-averaged metrics of every cached spec in `run`, with paired per-fold
+    deltas against `reference` (default: the first spec). Holdout runs score
+    winners at p >= 0.5 like maz_boss_benchmark.
+    """
+    inclusive = run.kind == "holdout"
+    ref_name = reference if reference in run.specs else next(iter(run.specs))
+    ref_folds = run.specs[ref_name].fold_metrics(inclusive)
+    rows: List[Dict[str, Any]] = []
+    for name, result in run.specs.items():
+        folds = result.fold_metrics(inclusive)
+        acc_deltas = [m["accuracy"] - r["accuracy"] for m, r in zip(folds, ref_folds)]
+        mae_deltas = [r["overall_mae"] - m["overall_mae"] for m, r in zip(folds, ref_folds)]
+        rows.append(
+            {
+                "spec": name,
+                "reference": ref_name,
+                "folds": len(folds),
+                "winner_accuracy": float(np.mean([m["accuracy"] for m in folds])),
+                "overall_mae": float(np.mean([m["overall_mae"] for m in folds])),
+                "accuracy_delta": float(np.mean(acc_deltas)),
+                "mae_reduction": float(np.mean(mae_deltas)),
+                "folds_more_accurate": int(sum(d > 0 for d in acc_deltas)),
+            }
+        )
+    return rows
+
+
+def print_cached_cv_summary(
+    cache: FoldCache,
+    league_ids: Optional[Sequence[int]] = None,
+    plan_kind: Optional[str] = None,
+    reference: Optional[str] = None,
+) -> int:
+    """Print the newest cached run of each league; returns the number of leagues shown."""
+    runs = latest_runs_by_league(load_cached_runs(cache, plan_kind=plan_kind))
+    if league_ids is not None:
+        runs = {lid: run for lid, run in runs.items() if lid in set(league_ids)}
+    print(f"\n=== CACHED CV FOLDS ({cache.root}; same folds for every spec of a league) ===")
+    if not runs:
+        print("- No cached fold results. Run brain_upgrade_lab.py or maz_boss_benchmark.py first.")
+        return 0
+    print("league_id | league_name                      | plan       | spec             | folds | win_acc | mae    | acc_d vs ref | mae_red vs ref | folds_better")
+    print("-" * 150)
+    for lid in sorted(runs):
+        run = runs[lid]
+        name = str(run.meta.get("league_name", f"League {lid}"))
+        for row in summarize_run(run, reference):
+            print(
+                f"{lid:9d} | {name[:32]:32s} | {run.kind:10s} | {row['spec'][:16]:16s} | {row['folds']:5d} | "
+                f"{row['winner_accuracy']:7.3f} | {row['overall_mae']:6.3f} | "
+                f"{row['accuracy_delta']:+12.4f} | {row['mae_reduction']:+14.4f} | "
+                f"{row['folds_more_accurate']}/{row['folds']} vs {row['reference']}"
+            )
+    return len(runs)
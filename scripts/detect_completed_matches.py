@@ -195,39 +195,58 @@ def get_league_retraining_status(db_path: str) -> tuple[Dict[int, bool], List[Di
     
     return retraining_needed, completed_matches, current_state
 
-def trigger_model_retraining(leagues_to_retrain: List[int]) -> bool:
-    """Trigger model retraining for specific leagues"""
-    if not leagues_to_retrain:
+def trigger_model_retraining(leagues_to_retrain: List[int], full: bool = False) -> bool:
+    """Trigger model retraining for specific leagues.
+
+    By default runs scripts/incremental_retrain.py, which fine-tunes the V5
+    models of `leagues_to_retrain` only, then retrains the XGBoost models of
+    those leagues with scripts/train_xgboost_models.py; `full=True` retrains
+    every league from scratch.
+    """
+    if not leagues_to_retrain and not full:
         logger.info("No leagues need retraining")
         return True
     
-    logger.info(f"Triggering retraining for leagues: {leagues_to_retrain}")
+    logger.info(f"Triggering {'full' if full else 'incremental'} retraining for leagues: {leagues_to_retrain}")
     
-    # Run the training script
-    train_script = os.path.join(project_root, "scripts", "train_xgboost_models.py")
+    league_ids = ",".join(str(lid) for lid in leagues_to_retrain)
+    retrain_script = os.path.join(project_root, "scripts", "incremental_retrain.py")
+    seq_cmd = [sys.executable, retrain_script, "--force"]
+    xgb_cmd = [sys.executable, os.path.join(project_root, "scripts", "train_xgboost_models.py")]
+    if full:
+        seq_cmd.append("--full")
+        xgb_cmd.append("--all-leagues")
+    else:
+        seq_cmd += ["--league-ids", league_ids]
+        xgb_cmd += ["--league-ids", league_ids]
     
-    try:
-        result = subprocess.run(
-            [sys.executable, train_script],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            timeout=1800  # 30 minutes timeout
-        )
+    steps = [
+        ("sequence model", seq_cmd, 7200 if full else 1800),  # full retrain: 2 hours, incremental: 30 minutes
+        ("XGBoost", xgb_cmd, 1800),
+    ]
+    for label, cmd, timeout in steps:
+        try:
+            result = subprocess.run(
+                cmd,
+                cwd=project_root,
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            logger.error(f"{label} retraining timed out")
+            return False
+        except Exception as e:
+            logger.error(f"Failed to trigger {label} retraining: {e}")
+            return False
         
-        if result.returncode == 0:
-            logger.info("Model retraining completed successfully")
-            return True
-        else:
-            logger.error(f"Model retraining failed: {result.stderr}")
+        if result.returncode != 0:
+            logger.error(f"{label} retraining failed: {result.stderr}")
             return False
-            
-    except subprocess.TimeoutExpired:
-        logger.error("Model retraining timed out")
-        return False
-    except Exception as e:
-        logger.error(f"Failed to trigger model retraining: {e}")
-        return False
+        logger.info(f"{label} retraining completed successfully")
+    
+    logger.info("Model retraining completed successfully")
+    return True
 
 def commit_and_push_changes() -> bool:
     """Commit and push model changes to GitHub"""
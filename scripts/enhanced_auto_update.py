@@ -42,14 +42,24 @@ def _load_local_env_files() -> None:
         if p.exists():
             load_dotenv(dotenv_path=p, override=True)
 
-from prediction.db import ensure_configured_leagues
+from prediction.db import (
+    bulk_ingest_games,
+    ensure_configured_leagues,
+    ensure_data_version,
+    ensure_fixture_key,
+    refresh_league_summary,
+)
 from prediction.highlightly_client import HighlightlyRugbyAPI
 from prediction.config import LEAGUE_MAPPINGS as CONFIG_LEAGUE_NAMES
 from prediction.highlightly_leagues import (
     HIGHLIGHTLY_LEAGUE_MAPPINGS,
+    PageFingerprints,
+    RateBudget,
     ensure_highlightly_match_id_column,
-    fetch_games_from_highlightly,
+    iter_league_pages_concurrently,
     parse_api_key,
+    record_page_fingerprint,
+    record_season_scan,
 )
 
 # Configure logging
@@ -480,120 +490,40 @@ def get_manual_urc_fixtures() -> List[Dict[str, Any]]:
     return games
 
 def update_database_with_games(conn: sqlite3.Connection, games: List[Dict[str, Any]], snapshot_runtime: Optional[SnapshotRuntime] = None) -> int:
-    """Update database with fetched games."""
+    """Update database with fetched games (set-based; one transaction per call)."""
     ensure_highlightly_match_id_column(conn)
-    cursor = conn.cursor()
+    try:
+        outcome = bulk_ingest_games(conn, games)
+    except Exception as e:
+        logger.error(f"Error applying {len(games)} games: {e}")
+        return 0
+
+    for team_name in outcome["created_teams"]:
+        logger.info(f"Created new team: {team_name}")
+
     updated_count = 0
-    
-    for game in games:
-        try:
-            hl_match_id = game.get("highlightly_match_id") or (
-                game.get("event_id") if int(game.get("event_id") or 0) >= 1_000_000 else None
-            )
-            if hl_match_id is not None:
-                try:
-                    hl_match_id = int(hl_match_id)
-                except (TypeError, ValueError):
-                    hl_match_id = None
+    for idx, event_id, action in outcome["results"]:
+        game = games[idx]
+        if action == "invalid":
+            continue
+        if action == "error":
+            logger.error(f"Error updating game {game.get('home_team', 'unknown')} vs {game.get('away_team', 'unknown')}: rejected by the database")
+            continue
+        if action == "scored":
+            updated_count += 1
+            logger.info(f"Score added: {game['home_team']} {game['home_score']}-{game['away_score']} {game['away_team']}")
+        elif action == "linked":
+            updated_count += 1
+            logger.debug("Linked Highlightly match id %s -> event %s", game.get("highlightly_match_id"), event_id)
+        elif action == "inserted":
+            updated_count += 1
+            logger.info(f"Added: {game['home_team']} vs {game['away_team']} ({game['date_event']})")
+        else:
+            # Game already exists - skip silently (prevent duplicates)
+            logger.debug(f"Skipped existing: {game['home_team']} vs {game['away_team']} on {game['date_event']}")
+        if snapshot_runtime and event_id:
+            snapshot_runtime.process_event(conn, int(event_id), game)
 
-            # Get team IDs
-            home_team_id = get_team_id(conn, game['home_team'], game['league_id'])
-            away_team_id = get_team_id(conn, game['away_team'], game['league_id'])
-            
-            if not home_team_id or not away_team_id:
-                continue
-            
-            # BULLETPROOF: Check by league, DATE (no time), and teams
-            cursor.execute("""
-                SELECT id, home_score, away_score, date_event, highlightly_match_id
-                FROM event 
-                WHERE league_id = ?
-                AND home_team_id = ? 
-                AND away_team_id = ? 
-                AND DATE(date_event) = DATE(?)
-            """, (game['league_id'], home_team_id, away_team_id, game['date_event']))
-            
-            existing = cursor.fetchone()
-            
-            if existing:
-                event_id, existing_home_score, existing_away_score, existing_date, existing_hl_id = existing
-                
-                # Only update if we have NEW score data (game completed)
-                if (game['home_score'] is not None and game['away_score'] is not None and
-                    existing_home_score is None):  # Only update if previously had no score
-                    
-                    cursor.execute("""
-                        UPDATE event 
-                        SET home_score = ?, away_score = ?, season = COALESCE(?, season),
-                            timestamp = COALESCE(?, timestamp), status = COALESCE(?, status),
-                            highlightly_match_id = COALESCE(?, highlightly_match_id)
-                        WHERE id = ?
-                    """, (
-                        game['home_score'], game['away_score'], game.get('season'),
-                        game.get('timestamp'), game.get('status'), hl_match_id, event_id,
-                    ))
-                    
-                    updated_count += 1
-                    logger.info(f"Score added: {game['home_team']} {game['home_score']}-{game['away_score']} {game['away_team']}")
-                elif hl_match_id and not existing_hl_id:
-                    cursor.execute(
-                        "UPDATE event SET highlightly_match_id = ? WHERE id = ?",
-                        (hl_match_id, event_id),
-                    )
-                    updated_count += 1
-                    logger.debug(
-                        "Linked Highlightly match id %s -> event %s",
-                        hl_match_id,
-                        event_id,
-                    )
-                else:
-                    # Game already exists - skip silently (prevent duplicates)
-                    logger.debug(f"Skipped existing: {game['home_team']} vs {game['away_team']} on {game['date_event']}")
-                if snapshot_runtime:
-                    snapshot_runtime.process_event(conn, int(event_id), game)
-            else:
-                # DOUBLE-CHECK before inserting (extra safety)
-                cursor.execute("""
-                    SELECT COUNT(*) FROM event
-                    WHERE league_id = ?
-                    AND home_team_id = ?
-                    AND away_team_id = ?
-                    AND DATE(date_event) = DATE(?)
-                """, (game['league_id'], home_team_id, away_team_id, game['date_event']))
-                
-                if cursor.fetchone()[0] > 0:
-                    logger.debug(f"Double-check prevented duplicate: {game['home_team']} vs {game['away_team']}")
-                    continue
-                
-                # Safe to insert
-                cursor.execute("""
-                    INSERT INTO event (
-                        home_team_id, away_team_id, date_event, home_score, away_score,
-                        league_id, season, timestamp, status, highlightly_match_id
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    home_team_id,
-                    away_team_id,
-                    game['date_event'],
-                    game['home_score'],
-                    game['away_score'],
-                    game['league_id'],
-                    game.get('season'),
-                    game.get('timestamp'),
-                    game.get('status'),
-                    hl_match_id,
-                ))
-                event_id = cursor.lastrowid
-                
-                updated_count += 1
-                logger.info(f"Added: {game['home_team']} vs {game['away_team']} ({game['date_event']})")
-                if snapshot_runtime and event_id:
-                    snapshot_runtime.process_event(conn, int(event_id), game)
-                
-        except Exception as e:
-            logger.error(f"Error updating game {game.get('home_team', 'unknown')} vs {game.get('away_team', 'unknown')}: {e}")
-    
     conn.commit()
     return updated_count
 
@@ -606,7 +536,15 @@ def main():
     parser.add_argument('--api-key', default=None, help='Highlightly API key (or HIGHLIGHTLY_API_KEY env var)')
     parser.add_argument('--days-ahead', type=int, default=180, help='Only keep fixtures up to N days ahead (default: 180)')
     parser.add_argument('--days-back', type=int, default=14, help='Also keep fixtures up to N days back (default: 14)')
-    parser.add_argument('--sleep', type=float, default=0.35, help='Delay between Highlightly API calls in seconds')
+    parser.add_argument('--sleep', type=float, default=0.35, help='Delay between Highlightly API calls in seconds (sets the default --rate)')
+    parser.add_argument('--rate', type=float, default=float(os.getenv('HIGHLIGHTLY_RATE_PER_SEC', '0') or 0),
+                        help='Highlightly plan request budget per second shared by all workers (default: 1/--sleep)')
+    parser.add_argument('--burst', type=int, default=int(os.getenv('HIGHLIGHTLY_RATE_BURST', '2')),
+                        help='Token-bucket burst size (default: 2)')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent Highlightly page fetches (default: 4)')
+    parser.add_argument('--full-rescan-hours', type=float, default=168.0,
+                        help='Re-download every page of a season at most this often; in between only unsettled/changed pages are fetched (default: 168)')
+    parser.add_argument('--no-delta', action='store_true', help='Disable page fingerprints and fetch every page')
     parser.add_argument('--disable-event-snapshots', action='store_true', help='Disable event-driven pre-kickoff snapshots/finalization')
     parser.add_argument('--snapshot-before-minutes', type=int, default=20, help='Snapshot when kickoff is within this many minutes (default: 20)')
     parser.add_argument('--snapshot-after-minutes', type=int, default=5, help='Allow late snapshot this many minutes after kickoff (default: 5)')
@@ -637,6 +575,10 @@ def main():
     # Connect to database
     conn = sqlite3.connect(args.db)
     ensure_highlightly_match_id_column(conn)
+    backfilled_keys = ensure_fixture_key(conn)
+    ensure_data_version(conn)
+    if backfilled_keys:
+        logger.info(f"Backfilled fixture keys for {backfilled_keys} events")
     ensured_leagues = ensure_configured_leagues(conn, CONFIG_LEAGUE_NAMES)
     logger.info(f"Ensured {ensured_leagues} configured leagues in SQLite")
     snapshot_runtime = SnapshotRuntime(
@@ -651,34 +593,62 @@ def main():
     request_counter = [0]
     all_leagues = list(LEAGUE_MAPPINGS.keys())
     
-    logger.info(f"🔄 Fetching games for ALL {len(all_leagues)} leagues from Highlightly")
-    
-    for league_id in all_leagues:
-        league_info = LEAGUE_MAPPINGS[league_id]
-        league_name = league_info['name']
-        highlightly_id = league_info['highlightly_id']
-        
-        logger.info(f"🔄 Fetching games for {league_name} (Highlightly ID: {highlightly_id})")
-        
+    fingerprints = None if args.no_delta else PageFingerprints.load(conn, args.full_rescan_hours * 3600.0)
+    rate = args.rate if args.rate > 0 else (1.0 / args.sleep if args.sleep > 0 else 10.0)
+    budget = RateBudget(rate, burst=args.burst)
+    logger.info(
+        f"🔄 Fetching games for ALL {len(all_leagues)} leagues from Highlightly "
+        f"({args.workers} workers, {rate:.2f} req/s budget)"
+    )
+
+    # Pages arrive as soon as they are fetched and are written on this thread,
+    # which owns the SQLite connection.
+    league_updated: Dict[int, int] = {league_id: 0 for league_id in all_leagues}
+    # Seasons with a page whose games could not be written keep their old
+    # full-scan marker, so the next run fetches them in full again.
+    unwritten_seasons: set = set()
+    pages = iter_league_pages_concurrently(
+        api,
+        [(league_id, LEAGUE_MAPPINGS[league_id]['name'], LEAGUE_MAPPINGS[league_id]['highlightly_id'])
+         for league_id in all_leagues],
+        budget,
+        max_workers=args.workers,
+        include_history=args.include_history,
+        days_ahead=args.days_ahead,
+        days_back=args.days_back,
+        request_counter=request_counter,
+        fingerprints=fingerprints,
+    )
+    for event in pages:
+        league_id = event['league_id']
+        league_name = event['league_name']
         try:
-            games = fetch_games_from_highlightly(
-                api,
-                league_id,
-                league_name,
-                highlightly_id,
-                include_history=args.include_history,
-                days_ahead=args.days_ahead,
-                days_back=args.days_back,
-                sleep_s=max(0.0, args.sleep),
-                request_counter=request_counter,
-            )
-            
-            total_fetched += len(games or [])
-            if games:
-                updated = update_database_with_games(conn, games, snapshot_runtime=snapshot_runtime)
-                total_updated += updated
-                logger.info(f"✅ {league_name}: Updated {updated} games")
-                
+            if event['type'] == 'page':
+                if event['games']:
+                    updated = update_database_with_games(conn, event['games'], snapshot_runtime=snapshot_runtime)
+                    league_updated[league_id] += updated
+                    total_updated += updated
+                # Only remember the page once its games are safely written.
+                if fingerprints is not None:
+                    record_page_fingerprint(conn, event)
+                continue
+            if event['type'] == 'season_done':
+                if fingerprints is not None:
+                    complete = (league_id, event['season']) not in unwritten_seasons
+                    record_season_scan(conn, event, complete=complete)
+                continue
+
+            total_fetched += event['games']
+            if event['failed_pages']:
+                logger.warning(f"⚠️ {league_name}: {event['failed_pages']} Highlightly page(s) failed; kept the rest")
+            if event['skipped_pages'] or event['unchanged_pages']:
+                logger.info(
+                    f"⏭️ {league_name}: delta fetch skipped {event['skipped_pages']} settled page(s), "
+                    f"{event['unchanged_pages']} page(s) unchanged"
+                )
+            if event['games']:
+                logger.info(f"✅ {league_name}: Updated {league_updated[league_id]} of {event['games']} games")
+
                 if league_id == 4446:
                     logger.info(f"🔍 {league_name}: Checking for additional manual fixtures...")
                     missing_added = detect_and_add_missing_games(conn, league_id, league_name, snapshot_runtime=snapshot_runtime)
@@ -691,10 +661,14 @@ def main():
                 if missing_added > 0:
                     total_updated += missing_added
                     logger.info(f"🔧 {league_name}: Auto-added {missing_added} missing upcoming games from manual fixtures")
-                    
+
         except Exception as e:
+            if event['type'] == 'page':
+                unwritten_seasons.add((league_id, event['season']))
             logger.error(f"❌ Error updating {league_name}: {e}")
     
+    summarised = refresh_league_summary(conn)
+    logger.info(f"📊 Refreshed league summary for {summarised} leagues")
     conn.close()
 
     # If the probe passed but every league returned zero rows, the fetch is
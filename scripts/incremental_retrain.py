@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Post-round model refresh: retrain only the leagues with newly completed matches.
+
+Runs the V4/V5 production trainers (`--train-all-completed`) in `--incremental`
+mode: each affected league's deployed seeds are fine-tuned on its new matches
+plus a replay buffer of recent history and recalibrated, leagues without new
+matches keep their artifacts, and a league falls back to a full retrain when
+its deployed model cannot be reused (config change, new teams, edited history).
+Only the rewritten leagues' artifacts are uploaded. `--league-ids` (by default
+the leagues listed in the retrain flag file) limits the refresh to those leagues.
+
+The slow from-scratch retrain stays available with `--full` (weekly job).
+
+Usage:
+  python scripts/incremental_retrain.py --db data.sqlite
+  python scripts/incremental_retrain.py --family v5 --family v4 --skip-upload
+  python scripts/incremental_retrain.py --force --league-ids 4414,4446
+  python scripts/incremental_retrain.py --full
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_FLAG_FILE = ROOT / "retrain_needed.flag"
+DEFAULT_BUCKET = "rugby-ai-61fd0.firebasestorage.app"
+
+# Production hyperparameters, shared with run_pipeline.ps1 / run_pipeline_v5.ps1.
+# Incremental runs reuse deployed weights only when these match the deployed config.
+PROD_TRAIN_ARGS_PATH = ROOT / "scripts" / "prod_train_args.json"
+
+
+def load_prod_train_args(path: Path = PROD_TRAIN_ARGS_PATH) -> Dict[str, List[str]]:
+    """Per-family trainer flags from the shared production args file."""
+    doc = json.loads(path.read_text(encoding="utf-8"))
+    return {family: [str(arg) for arg in args] for family, args in doc.items() if not family.startswith("_")}
+
+
+PROD_TRAIN_ARGS: Dict[str, List[str]] = load_prod_train_args()
+
+
+def trainer_command(
+    family: str, db_path: str, full: bool, extra: List[str], league_ids: Optional[List[int]] = None
+) -> List[str]:
+    cmd = [
+        sys.executable,
+        str(ROOT / "scripts" / f"maz_boss_maxed_{family}.py"),
+        "--db-path", db_path,
+        "--all-leagues",
+        "--train-all-completed",
+        *PROD_TRAIN_ARGS[family],
+        f"--save-{family}-models",
+        "--save-report",
+        "--log-level", "INFO",
+    ]
+    if not full:
+        cmd.append("--incremental")
+        if league_ids:
+            cmd += ["--incremental-league-ids", ",".join(str(lid) for lid in league_ids)]
+    return cmd + list(extra)
+
+
+def updated_leagues(family: str, full: bool) -> List[int]:
+    """Leagues whose artifacts the trainer rewrote, from its production report."""
+    report_path = ROOT / "artifacts" / f"maz_maxed_{family}_prod_latest.json"
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    if not full and "incremental" in report:
+        return [int(x) for x in report["incremental"].get("updated", [])]
+    return [int(lid) for lid, payload in report.get("leagues", {}).items() if payload.get("status") == "trained_only"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Retrain only leagues with newly completed matches (V4/V5).")
+    parser.add_argument("--db", default=str(ROOT / "data.sqlite"), help="Path to SQLite DB.")
+    parser.add_argument("--family", action="append", choices=sorted(PROD_TRAIN_ARGS), help="Model family (default: v5).")
+    parser.add_argument("--full", action="store_true", help="Full from-scratch retrain of every league (weekly job).")
+    parser.add_argument(
+        "--flag-file",
+        default=str(DEFAULT_FLAG_FILE),
+        help="Flag written by detect_completed_matches.py; without it (and without --force/--full) nothing runs.",
+    )
+    parser.add_argument("--force", action="store_true", help="Run even if the flag file is missing.")
+    parser.add_argument(
+        "--league-ids",
+        default="",
+        help="Comma-separated league IDs to refresh (default: the flag file's leagues_to_retrain, else all).",
+    )
+    parser.add_argument("--bucket", default=DEFAULT_BUCKET, help="Cloud Storage bucket for the upload step.")
+    parser.add_argument("--skip-upload", action="store_true", help="Train only; do not upload artifacts.")
+    parser.add_argument("--timeout", type=int, default=3600, help="Per-trainer timeout in seconds.")
+    parser.add_argument("trainer_args", nargs=argparse.REMAINDER, help="Extra trainer flags after `--`.")
+    args = parser.parse_args()
+
+    flag_file = Path(args.flag_file)
+    if not (args.full or args.force or flag_file.exists()):
+        print(f"No retrain flag at {flag_file}; nothing to do.")
+        return 0
+    league_ids = [int(x) for x in args.league_ids.split(",") if x.strip()]
+    if flag_file.exists():
+        try:
+            flagged = json.loads(flag_file.read_text(encoding="utf-8")).get("leagues_to_retrain", [])
+            print(f"Flagged leagues: {flagged}")
+            if not league_ids:
+                league_ids = [int(x) for x in flagged]
+        except (OSError, ValueError):
+            pass
+    if league_ids and not args.full:
+        print(f"Refreshing leagues: {league_ids}")
+
+    extra = [a for a in (args.trainer_args or []) if a != "--"]
+    summary: Dict[str, List[int]] = {}
+    for family in args.family or ["v5"]:
+        cmd = trainer_command(family, args.db, args.full, extra, league_ids)
+        print(f"[{family}] {'full' if args.full else 'incremental'} retrain: {' '.join(cmd)}")
+        try:
+            proc = subprocess.run(cmd, cwd=str(ROOT), timeout=args.timeout)
+        except subprocess.TimeoutExpired:
+            print(f"[{family}] trainer timed out after {args.timeout}s")
+            return 1
+        if proc.returncode != 0:
+            print(f"[{family}] trainer failed (exit {proc.returncode})")
+            return proc.returncode
+        leagues = updated_leagues(family, args.full)
+        summary[family] = leagues
+        print(f"[{family}] updated leagues: {leagues or 'none'}")
+        if args.skip_upload or not leagues:
+            continue
+        upload = [
+            sys.executable,
+            str(ROOT / "scripts" / "upload_models_to_storage.py"),
+            "--bucket", args.bucket,
+            "--models-dir", "artifacts",
+            "--family-filter", family,
+            "--league-ids", ",".join(str(lid) for lid in leagues),
+        ]
+        if subprocess.run(upload, cwd=str(ROOT)).returncode != 0:
+            print(f"[{family}] upload failed")
+            return 1
+
+    if flag_file.exists():
+        os.remove(flag_file)
+    print(json.dumps({"updated_leagues": summary}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,6 +13,7 @@ Goal:
 from __future__ import annotations
 
 import argparse
+import importlib.util
 import json
 import pickle
 import sqlite3
@@ -20,22 +21,34 @@ import sys
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 from sklearn.metrics import accuracy_score, mean_absolute_error
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
 
-try:
-    import xgboost as xgb
-except Exception:
+if importlib.util.find_spec("xgboost") is None:
     print("XGBoost is required. Install with: pip install xgboost")
-    raise
+    raise ImportError("No module named 'xgboost'")
 
 from prediction.config import LEAGUE_MAPPINGS
-from prediction.features import FeatureConfig, build_feature_table
+from prediction.dataset_cache import cached_feature_table, default_dataset_cache
+from prediction.features import FeatureConfig
+from prediction.xgb_training import TripletTrainer, map_leagues
+
+from cv_engine import (
+    CVData,
+    CVEngine,
+    FoldTrainingSet,
+    ModelSpec,
+    default_fold_cache,
+    holdout_plan,
+    holdout_split_index,
+    register_model_kind,
+)
 
 
 @dataclass
@@ -60,7 +73,7 @@ def load_league_df(conn: sqlite3.Connection, league_id: int) -> pd.DataFrame:
         elo_k=24.0,
         neutral_mode=(league_id in (4574, 4714)),
     )
-    df = build_feature_table(conn, cfg)
+    df = cached_feature_table(conn, cfg, default_dataset_cache())
     df = df[df["league_id"] == league_id].copy()
     df = df[df["home_score"].notna() & df["away_score"].notna()].copy()
     if df.empty:
@@ -97,9 +110,7 @@ def chronological_split(
     y_away: np.ndarray,
     holdout_ratio: float,
 ) -> Dict[str, np.ndarray]:
-    n = len(X)
-    split_idx = int(round(n * (1.0 - holdout_ratio)))
-    split_idx = max(30, min(split_idx, n - 10))
+    split_idx = holdout_split_index(len(X), holdout_ratio)
     return {
         "X_train": X[:split_idx],
         "X_test": X[split_idx:],
@@ -118,46 +129,9 @@ def train_triplet(
     y_h_train: np.ndarray,
     y_a_train: np.ndarray,
     params: Dict[str, Any],
+    nthread: int = 0,
 ) -> Tuple[Any, Any, Any]:
-    clf = xgb.XGBClassifier(
-        n_estimators=params["n_estimators"],
-        max_depth=params["max_depth"],
-        learning_rate=params["learning_rate"],
-        subsample=params["subsample"],
-        colsample_bytree=params["colsample_bytree"],
-        min_child_weight=params["min_child_weight"],
-        reg_lambda=params["reg_lambda"],
-        random_state=42,
-        eval_metric="logloss",
-    )
-    clf.fit(X_train, y_w_train)
-
-    reg_home = xgb.XGBRegressor(
-        n_estimators=params["n_estimators"],
-        max_depth=params["max_depth"],
-        learning_rate=params["learning_rate"],
-        subsample=params["subsample"],
-        colsample_bytree=params["colsample_bytree"],
-        min_child_weight=params["min_child_weight"],
-        reg_lambda=params["reg_lambda"],
-        random_state=42,
-        eval_metric="mae",
-    )
-    reg_home.fit(X_train, y_h_train)
-
-    reg_away = xgb.XGBRegressor(
-        n_estimators=params["n_estimators"],
-        max_depth=params["max_depth"],
-        learning_rate=params["learning_rate"],
-        subsample=params["subsample"],
-        colsample_bytree=params["colsample_bytree"],
-        min_child_weight=params["min_child_weight"],
-        reg_lambda=params["reg_lambda"],
-        random_state=42,
-        eval_metric="mae",
-    )
-    reg_away.fit(X_train, y_a_train)
-    return clf, reg_home, reg_away
+    return TripletTrainer(X_train, params, nthread=nthread).triplet(y_w_train, y_h_train, y_a_train)
 
 
 def eval_triplet(
@@ -183,10 +157,35 @@ def eval_triplet(
     return metrics, {"p_home": p_home, "home_pred": y_h_pred, "away_pred": y_a_pred}
 
 
+MAZ_PARAMS_A: Dict[str, Any] = {
+    "n_estimators": 250,
+    "max_depth": 6,
+    "learning_rate": 0.08,
+    "subsample": 0.85,
+    "colsample_bytree": 0.85,
+    "min_child_weight": 1.0,
+    "reg_lambda": 1.0,
+}
+MAZ_PARAMS_B: Dict[str, Any] = {
+    "n_estimators": 650,
+    "max_depth": 4,
+    "learning_rate": 0.04,
+    "subsample": 0.95,
+    "colsample_bytree": 0.95,
+    "min_child_weight": 4.0,
+    "reg_lambda": 2.5,
+}
+
+
 def make_maz_ensemble(
     train: Dict[str, np.ndarray],
     val_ratio: float = 0.2,
+    trainer: Optional[TripletTrainer] = None,
+    nthread: int = 0,
+    params_a: Optional[Dict[str, Any]] = None,
+    params_b: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
+    # `trainer` may carry a prebuilt matrix of train["X_train"] (e.g. the baseline's).
     # Split train into inner-train and inner-val chronologically.
     X = train["X_train"]
     y_w = train["y_w_train"]
@@ -201,27 +200,12 @@ def make_maz_ensemble(
     y_h_in, y_h_val = y_h[:cut], y_h[cut:]
     y_a_in, y_a_val = y_a[:cut], y_a[cut:]
 
-    params_a = {
-        "n_estimators": 250,
-        "max_depth": 6,
-        "learning_rate": 0.08,
-        "subsample": 0.85,
-        "colsample_bytree": 0.85,
-        "min_child_weight": 1.0,
-        "reg_lambda": 1.0,
-    }
-    params_b = {
-        "n_estimators": 650,
-        "max_depth": 4,
-        "learning_rate": 0.04,
-        "subsample": 0.95,
-        "colsample_bytree": 0.95,
-        "min_child_weight": 4.0,
-        "reg_lambda": 2.5,
-    }
+    params_a = dict(MAZ_PARAMS_A if params_a is None else params_a)
+    params_b = dict(MAZ_PARAMS_B if params_b is None else params_b)
 
-    a_clf, a_h, a_a = train_triplet(X_in, y_w_in, y_h_in, y_a_in, params_a)
-    b_clf, b_h, b_a = train_triplet(X_in, y_w_in, y_h_in, y_a_in, params_b)
+    inner = TripletTrainer(X_in, nthread=nthread)
+    a_clf, a_h, a_a = inner.with_params(params_a).triplet(y_w_in, y_h_in, y_a_in)
+    b_clf, b_h, b_a = inner.with_params(params_b).triplet(y_w_in, y_h_in, y_a_in)
 
     # Validation-derived weights.
     a_m, a_out = eval_triplet(a_clf, a_h, a_a, X_val, y_w_val, y_h_val, y_a_val)
@@ -240,8 +224,9 @@ def make_maz_ensemble(
     score_w = (inv_mae_a / score_w_sum, inv_mae_b / score_w_sum)
 
     # Retrain both members on full train.
-    a_clf, a_h, a_a = train_triplet(X, y_w, y_h, y_a, params_a)
-    b_clf, b_h, b_a = train_triplet(X, y_w, y_h, y_a, params_b)
+    full = trainer if trainer is not None else TripletTrainer(X, nthread=nthread)
+    a_clf, a_h, a_a = full.with_params(params_a).triplet(y_w, y_h, y_a)
+    b_clf, b_h, b_a = full.with_params(params_b).triplet(y_w, y_h, y_a)
 
     return {
         "members": {
@@ -256,21 +241,16 @@ def make_maz_ensemble(
     }
 
 
-def eval_maz_ensemble(maz: Dict[str, Any], test: Dict[str, np.ndarray]) -> ModelMetrics:
+def maz_predict(maz: Dict[str, Any], X_test: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Weighted (p_home, home_pred, away_pred) of the two MAZ members."""
     A = maz["members"]["A"]
     B = maz["members"]["B"]
     w_w_a, w_w_b = maz["weights"]["winner"]
     w_s_a, w_s_b = maz["weights"]["score"]
 
-    X_test = test["X_test"]
-    y_w_test = test["y_w_test"]
-    y_h_test = test["y_h_test"]
-    y_a_test = test["y_a_test"]
-
     p_a = A["clf"].predict_proba(X_test)[:, 1]
     p_b = B["clf"].predict_proba(X_test)[:, 1]
     p_home = w_w_a * p_a + w_w_b * p_b
-    y_w_pred = (p_home >= 0.5).astype(int)
 
     h_a = A["reg_home"].predict(X_test)
     h_b = B["reg_home"].predict(X_test)
@@ -278,6 +258,36 @@ def eval_maz_ensemble(maz: Dict[str, Any], test: Dict[str, np.ndarray]) -> Model
     a_b = B["reg_away"].predict(X_test)
     y_h_pred = w_s_a * h_a + w_s_b * h_b
     y_a_pred = w_s_a * a_a + w_s_b * a_b
+    return p_home, y_h_pred, y_a_pred
+
+
+def _fit_maz_ensemble(train: FoldTrainingSet, params: Dict[str, Any]) -> Dict[str, Any]:
+    split = {"X_train": train.X, "y_w_train": train.y_winner, "y_h_train": train.y_home, "y_a_train": train.y_away}
+    return make_maz_ensemble(
+        split,
+        val_ratio=params["val_ratio"],
+        trainer=train.trainer(params["A"]),
+        nthread=train.nthread,
+        params_a=params["A"],
+        params_b=params["B"],
+    )
+
+
+register_model_kind("maz_ensemble", _fit_maz_ensemble, maz_predict)
+
+
+def maz_spec() -> ModelSpec:
+    return ModelSpec("maz", {"val_ratio": 0.2, "A": MAZ_PARAMS_A, "B": MAZ_PARAMS_B}, kind="maz_ensemble")
+
+
+def eval_maz_ensemble(maz: Dict[str, Any], test: Dict[str, np.ndarray]) -> ModelMetrics:
+    X_test = test["X_test"]
+    y_w_test = test["y_w_test"]
+    y_h_test = test["y_h_test"]
+    y_a_test = test["y_a_test"]
+
+    p_home, y_h_pred, y_a_pred = maz_predict(maz, X_test)
+    y_w_pred = (p_home >= 0.5).astype(int)
 
     return ModelMetrics(
         accuracy=float(accuracy_score(y_w_test, y_w_pred)),
@@ -300,6 +310,87 @@ def baseline_params() -> Dict[str, Any]:
     }
 
 
+def benchmark_league(
+    league_id: int,
+    league_name: str,
+    df: pd.DataFrame,
+    holdout_ratio: float,
+    save_maz_models: bool,
+    engine: CVEngine,
+) -> Dict[str, Any]:
+    X, y_w, y_h, y_a, feature_cols = prepare_xy(df)
+    data = CVData(X, y_w, y_h, y_a)
+    plan = holdout_plan(data, holdout_ratio)
+    train_idx, test_idx = plan.folds[0]
+
+    # Current brain baseline and MAZ brain on the same holdout fold (cached per spec).
+    results = engine.evaluate(
+        data,
+        plan,
+        [ModelSpec("current", baseline_params()), maz_spec()],
+        meta={"league_id": league_id, "league_name": league_name, "source": "maz_boss_benchmark"},
+    )
+    baseline_m = ModelMetrics(**results["current"].folds[0].metrics(inclusive_threshold=True))
+    maz_fold = results["maz"].folds[0]
+    maz_m = ModelMetrics(**maz_fold.metrics(inclusive_threshold=True))
+    maz = maz_fold.model
+
+    # Head-to-head rule:
+    # - MAZ wins if accuracy improves and overall MAE does not worsen.
+    # - Current wins if opposite.
+    # - Else tie/trade-off.
+    maz_better = (maz_m.accuracy > baseline_m.accuracy) and (maz_m.overall_mae <= baseline_m.overall_mae)
+    current_better = (baseline_m.accuracy > maz_m.accuracy) and (baseline_m.overall_mae <= maz_m.overall_mae)
+
+    if maz_better:
+        winner = "MAZ"
+    elif current_better:
+        winner = "CURRENT"
+    else:
+        winner = "TIE_OR_TRADEOFF"
+
+    league_payload: Dict[str, Any] = {
+        "name": league_name,
+        "status": "tested",
+        "games": len(df),
+        "train_rows": int(len(train_idx)),
+        "test_rows": int(len(test_idx)),
+        "feature_count": len(feature_cols),
+        "current": baseline_m.__dict__,
+        "maz": maz_m.__dict__,
+        "deltas": {
+            "accuracy_gain": maz_m.accuracy - baseline_m.accuracy,
+            "overall_mae_reduction": baseline_m.overall_mae - maz_m.overall_mae,
+        },
+        "winner": winner,
+        "maz_validation_weights": maz["weights"],
+    }
+
+    if save_maz_models and winner == "MAZ":
+        out_dir = Path("artifacts")
+        out_dir.mkdir(exist_ok=True)
+        out_file = out_dir / f"league_{league_id}_model_maz_boss.pkl"
+        payload = {
+            "league_id": league_id,
+            "league_name": league_name,
+            "model_type": "maz_boss_ensemble",
+            "trained_at": datetime.now().isoformat(),
+            "feature_columns": feature_cols,
+            "maz": maz,
+            "baseline_metrics_unseen": baseline_m.__dict__,
+            "maz_metrics_unseen": maz_m.__dict__,
+        }
+        with out_file.open("wb") as f:
+            pickle.dump(payload, f)
+        league_payload["saved_maz_model"] = str(out_file)
+
+    print(
+        f"[{league_name}] current_acc={baseline_m.accuracy:.3f} maz_acc={maz_m.accuracy:.3f} | "
+        f"current_mae={baseline_m.overall_mae:.3f} maz_mae={maz_m.overall_mae:.3f} | winner={winner}"
+    )
+    return league_payload
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="MAZ Boss unseen benchmark vs current brain.")
     parser.add_argument("--db-path", default=None, help="SQLite path.")
@@ -308,6 +399,18 @@ def main() -> None:
     parser.add_argument("--holdout-ratio", type=float, default=0.2, help="Unseen holdout ratio.")
     parser.add_argument("--min-games", type=int, default=80, help="Min completed games to evaluate.")
     parser.add_argument("--save-maz-models", action="store_true", help="Save MAZ models when superior.")
+    parser.add_argument("--league-workers", type=int, default=1, help="Leagues benchmarked concurrently.")
+    parser.add_argument(
+        "--xgb-threads",
+        type=int,
+        default=0,
+        help="XGBoost thread budget shared by concurrent leagues (0 = all cores).",
+    )
+    parser.add_argument(
+        "--cv-cache-dir",
+        default=None,
+        help="Fold cache directory (default $RUGBY_CV_CACHE_DIR or artifacts/cv_cache; 'off' disables).",
+    )
     args = parser.parse_args()
 
     if not args.league_id and not args.all_leagues:
@@ -342,99 +445,38 @@ def main() -> None:
 
     conn = sqlite3.connect(str(db_path))
 
+    rows: Dict[int, Dict[str, Any]] = {}
+    jobs: List[Tuple[int, str, pd.DataFrame]] = []
     for league_id, league_name in leagues.items():
         df = load_league_df(conn, league_id)
         if len(df) < args.min_games:
             report["summary"]["skipped"] += 1
-            report["leagues"][str(league_id)] = {
+            rows[league_id] = {
                 "name": league_name,
                 "status": "skipped",
                 "reason": f"not enough games ({len(df)} < {args.min_games})",
             }
             continue
-
-        X, y_w, y_h, y_a, feature_cols = prepare_xy(df)
-        split = chronological_split(X, y_w, y_h, y_a, args.holdout_ratio)
-
-        # Current brain baseline.
-        b_clf, b_h, b_a = train_triplet(
-            split["X_train"],
-            split["y_w_train"],
-            split["y_h_train"],
-            split["y_a_train"],
-            baseline_params(),
-        )
-        baseline_m, _ = eval_triplet(
-            b_clf, b_h, b_a,
-            split["X_test"], split["y_w_test"], split["y_h_test"], split["y_a_test"]
-        )
-
-        # MAZ brain.
-        maz = make_maz_ensemble(split)
-        maz_m = eval_maz_ensemble(maz, split)
-
-        # Head-to-head rule:
-        # - MAZ wins if accuracy improves and overall MAE does not worsen.
-        # - Current wins if opposite.
-        # - Else tie/trade-off.
-        maz_better = (maz_m.accuracy > baseline_m.accuracy) and (maz_m.overall_mae <= baseline_m.overall_mae)
-        current_better = (baseline_m.accuracy > maz_m.accuracy) and (baseline_m.overall_mae <= maz_m.overall_mae)
-
-        if maz_better:
-            winner = "MAZ"
-            report["summary"]["maz_wins"] += 1
-        elif current_better:
-            winner = "CURRENT"
-            report["summary"]["current_wins"] += 1
-        else:
-            winner = "TIE_OR_TRADEOFF"
-            report["summary"]["ties"] += 1
-        report["summary"]["tested"] += 1
-
-        league_payload: Dict[str, Any] = {
-            "name": league_name,
-            "status": "tested",
-            "games": len(df),
-            "train_rows": int(len(split["X_train"])),
-            "test_rows": int(len(split["X_test"])),
-            "feature_count": len(feature_cols),
-            "current": baseline_m.__dict__,
-            "maz": maz_m.__dict__,
-            "deltas": {
-                "accuracy_gain": maz_m.accuracy - baseline_m.accuracy,
-                "overall_mae_reduction": baseline_m.overall_mae - maz_m.overall_mae,
-            },
-            "winner": winner,
-            "maz_validation_weights": maz["weights"],
-        }
-
-        if args.save_maz_models and winner == "MAZ":
-            out_dir = Path("artifacts")
-            out_dir.mkdir(exist_ok=True)
-            out_file = out_dir / f"league_{league_id}_model_maz_boss.pkl"
-            payload = {
-                "league_id": league_id,
-                "league_name": league_name,
-                "model_type": "maz_boss_ensemble",
-                "trained_at": datetime.now().isoformat(),
-                "feature_columns": feature_cols,
-                "maz": maz,
-                "baseline_metrics_unseen": baseline_m.__dict__,
-                "maz_metrics_unseen": maz_m.__dict__,
-            }
-            with out_file.open("wb") as f:
-                pickle.dump(payload, f)
-            league_payload["saved_maz_model"] = str(out_file)
-
-        report["leagues"][str(league_id)] = league_payload
-
-        print(
-            f"[{league_name}] current_acc={baseline_m.accuracy:.3f} maz_acc={maz_m.accuracy:.3f} | "
-            f"current_mae={baseline_m.overall_mae:.3f} maz_mae={maz_m.overall_mae:.3f} | winner={winner}"
-        )
+        jobs.append((league_id, league_name, df))
 
     conn.close()
 
+    engine = CVEngine(default_fold_cache(args.cv_cache_dir))
+    tested = map_leagues(
+        lambda job, nthread: benchmark_league(
+            *job, args.holdout_ratio, args.save_maz_models, engine.with_budget(1, nthread)
+        ),
+        jobs,
+        workers=args.league_workers,
+        total_threads=args.xgb_threads,
+    )
+    winner_keys = {"MAZ": "maz_wins", "CURRENT": "current_wins", "TIE_OR_TRADEOFF": "ties"}
+    for (league_id, _, _), league_payload in zip(jobs, tested):
+        rows[league_id] = league_payload
+        report["summary"][winner_keys[league_payload["winner"]]] += 1
+        report["summary"]["tested"] += 1
+    report["leagues"] = {str(league_id): rows[league_id] for league_id in leagues if league_id in rows}
+
     out_dir = Path("artifacts")
     out_dir.mkdir(exist_ok=True)
     out_path = out_dir / f"maz_boss_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
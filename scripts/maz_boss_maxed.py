@@ -45,7 +45,8 @@ except Exception:
     raise
 
 from prediction.config import LEAGUE_MAPPINGS
-from prediction.features import FeatureConfig, build_feature_table
+from prediction.dataset_cache import cached_feature_table, default_dataset_cache
+from prediction.features import FeatureConfig
 
 
 @dataclass
@@ -70,7 +71,7 @@ def load_league_df(conn: sqlite3.Connection, league_id: int) -> pd.DataFrame:
         elo_k=24.0,
         neutral_mode=(league_id in (4574, 4714)),
     )
-    df = build_feature_table(conn, cfg)
+    df = cached_feature_table(conn, cfg, default_dataset_cache())
     df = df[df["league_id"] == league_id].copy()
     df = df[df["home_score"].notna() & df["away_score"].notna()].copy()
     if df.empty:
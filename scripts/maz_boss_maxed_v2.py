@@ -53,7 +53,8 @@ except Exception:
     raise
 
 from prediction.config import LEAGUE_MAPPINGS
-from prediction.features import FeatureConfig, build_feature_table
+from prediction.dataset_cache import cached_feature_table, default_dataset_cache
+from prediction.features import FeatureConfig
 
 LOG = logging.getLogger("maz_v2")
 
@@ -108,7 +109,7 @@ def load_league_df(conn: sqlite3.Connection, league_id: int) -> pd.DataFrame:
         elo_k=24.0,
         neutral_mode=(league_id in (4574, 4714)),
     )
-    df = build_feature_table(conn, cfg)
+    df = cached_feature_table(conn, cfg, default_dataset_cache())
     df = df[df["league_id"] == league_id].copy()
     df = df[df["home_score"].notna() & df["away_score"].notna()].copy()
     if df.empty:
@@ -1305,7 +1306,10 @@ def run_walkforward(
     start = max(args.wf_start_train, 40)
     if start >= n - 1:
         raise ValueError(f"Not enough rows for walk-forward: n={n}, wf_start_train={start}")
-    total_chunks = len(range(start, n, max(1, args.wf_step)))
+    chunk_cuts = range(start, n, max(1, args.wf_step))
+    if args.wf_max_chunks > 0:
+        chunk_cuts = chunk_cuts[: args.wf_max_chunks]
+    total_chunks = len(chunk_cuts)
     LOG.info(
         "[league_seed=%s] walk-forward start: rows=%s, chunks=%s, step=%s",
         league_seed,
@@ -1430,7 +1434,7 @@ def run_walkforward(
     }
 
     step = max(1, args.wf_step)
-    for chunk_i, cut in enumerate(range(start, n, step), start=1):
+    for chunk_i, cut in enumerate(chunk_cuts, start=1):
         nxt = min(n, cut + step)
         X_tr = X[:cut][:, selected_idx]
         X_te = X[cut:nxt][:, selected_idx]
@@ -1567,6 +1571,12 @@ def main() -> None:
     parser.add_argument("--holdout-ratio", type=float, default=0.2, help="Used when --walk-forward is off.")
     parser.add_argument("--wf-start-train", type=int, default=120, help="Initial train rows for walk-forward.")
     parser.add_argument("--wf-step", type=int, default=20, help="Walk-forward chunk size.")
+    parser.add_argument(
+        "--wf-max-chunks",
+        type=int,
+        default=0,
+        help="Evaluate only the first N walk-forward chunks (0 = all). Used by tuning early stopping.",
+    )
     parser.add_argument("--min-games", type=int, default=120, help="Minimum completed games per league.")
     parser.add_argument("--search-rounds", type=int, default=6, help="Candidate rounds per family.")
     parser.add_argument("--top-k", type=int, default=6, help="Top candidates to blend.")
@@ -1635,6 +1645,7 @@ def main() -> None:
     parser.add_argument("--max-bet-uncertainty", type=float, default=0.72, help="Abstain betting above this uncertainty score (0..1).")
     parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
     parser.add_argument("--log-file", default=None, help="Optional run log file path.")
+    parser.add_argument("--report-path", default=None, help="Write the JSON report here instead of a timestamped artifacts/ file.")
     args = parser.parse_args()
     auto_log_file: Optional[str] = args.log_file
     if not auto_log_file:
@@ -1672,6 +1683,7 @@ def main() -> None:
             "holdout_ratio": args.holdout_ratio,
             "wf_start_train": args.wf_start_train,
             "wf_step": args.wf_step,
+            "wf_max_chunks": args.wf_max_chunks,
             "min_games": args.min_games,
             "search_rounds": args.search_rounds,
             "top_k": args.top_k,
@@ -1878,6 +1890,9 @@ def main() -> None:
     out_dir = Path("artifacts")
     out_dir.mkdir(exist_ok=True)
     out_file = out_dir / f"maz_maxed_v2_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    if args.report_path:
+        out_file = Path(args.report_path)
+        out_file.parent.mkdir(parents=True, exist_ok=True)
     out_file.write_text(json.dumps(report, indent=2), encoding="utf-8")
     LOG.info("=== MAZ MAXED V2 Summary ===")
     LOG.info("%s", json.dumps(report["summary"], indent=2))
@@ -48,7 +48,8 @@ except Exception:
     raise
 
 from prediction.config import LEAGUE_MAPPINGS
-from prediction.features import FeatureConfig, build_feature_table
+from prediction.dataset_cache import cached_feature_table, default_dataset_cache
+from prediction.features import FeatureConfig
 
 
 EPS = 1e-9
@@ -151,7 +152,7 @@ def default_db_path() -> Path:
 
 def load_all_df(conn: sqlite3.Connection, league_ids: Sequence[int]) -> pd.DataFrame:
     cfg = FeatureConfig(elo_priors=None, elo_k=24.0, neutral_mode=False)
-    df = build_feature_table(conn, cfg)
+    df = cached_feature_table(conn, cfg, default_dataset_cache())
     df = df[df["league_id"].isin(list(league_ids))].copy()
     df = df[df["home_score"].notna() & df["away_score"].notna()].copy()
     if df.empty:
@@ -1065,6 +1066,7 @@ def main() -> None:
     parser.add_argument("--holdout-ratio", type=float, default=0.2)
     parser.add_argument("--wf-start-train", type=int, default=80)
     parser.add_argument("--wf-step", type=int, default=20)
+    parser.add_argument("--wf-max-chunks", type=int, default=0, help="Evaluate only the first N walk-forward chunks (0 = all).")
     parser.add_argument("--min-games", type=int, default=120)
     parser.add_argument("--seed", type=int, default=42)
     parser.add_argument("--ensemble-seeds", type=str, default="42,1337,9001,2024,31415,27182,777")
@@ -1098,6 +1100,7 @@ def main() -> None:
     parser.add_argument("--save-v3-models", action="store_true")
     parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
     parser.add_argument("--log-file", default=None, help="Optional run log file path.")
+    parser.add_argument("--report-path", default=None, help="Write the JSON report here instead of a timestamped artifacts/ file.")
     args = parser.parse_args()
     auto_log_file: Optional[str] = args.log_file
     if not auto_log_file:
@@ -1167,6 +1170,7 @@ def main() -> None:
             "holdout_ratio": args.holdout_ratio,
             "wf_start_train": args.wf_start_train,
             "wf_step": args.wf_step,
+            "wf_max_chunks": args.wf_max_chunks,
             "min_games": args.min_games,
             "seed": args.seed,
             "ensemble_seeds": args._ensemble_seeds,
@@ -1228,7 +1232,10 @@ def main() -> None:
                 LOG.warning("[%s] skipped: not enough rows for walk-forward n=%s, start=%s", league_name, n, start)
                 continue
 
-            total_chunks = len(range(start, n, step))
+            chunk_cuts = range(start, n, step)
+            if args.wf_max_chunks > 0:
+                chunk_cuts = chunk_cuts[: args.wf_max_chunks]
+            total_chunks = len(chunk_cuts)
             LOG.info("[%s] walk-forward start: rows=%s, chunks=%s, step=%s", league_name, n, total_chunks, step)
             cur_parts: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
             v3_parts: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
@@ -1238,7 +1245,7 @@ def main() -> None:
             yas: List[np.ndarray] = []
             tested_rows = 0
 
-            for chunk_i, cut in enumerate(range(start, n, step), start=1):
+            for chunk_i, cut in enumerate(chunk_cuts, start=1):
                 nxt = min(n, cut + step)
                 te_idx = league_pos[cut:nxt]
                 if len(te_idx) == 0:
@@ -1471,6 +1478,9 @@ def main() -> None:
     out_dir = Path("artifacts")
     out_dir.mkdir(exist_ok=True)
     out_file = out_dir / f"maz_maxed_v3_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    if args.report_path:
+        out_file = Path(args.report_path)
+        out_file.parent.mkdir(parents=True, exist_ok=True)
     out_file.write_text(json.dumps(report, indent=2), encoding="utf-8")
     LOG.info("=== MAZ MAXED V3 Summary ===")
     LOG.info("%s", json.dumps(report["summary"], indent=2))
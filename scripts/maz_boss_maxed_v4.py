@@ -26,14 +26,17 @@ import argparse
 import json
 import logging
 import math
+import multiprocessing
+import os
 import pickle
 import sqlite3
 import sys
-from collections import defaultdict, deque
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Deque, Dict, List, Optional, Sequence, Set, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 try:
     import torch  # type: ignore
@@ -55,9 +58,24 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, mean_absolute_error
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "rugby-ai-predictor"))
+sys.path.insert(0, str(Path(__file__).parent))
 
 from prediction.config import LEAGUE_MAPPINGS
-from prediction.features import FeatureConfig, build_feature_table
+from prediction import sequence_features
+from prediction.dataset_cache import (
+    DatasetCache,
+    cached_feature_table,
+    default_dataset_cache,
+    fingerprint,
+    frame_fingerprint,
+    source_fingerprint,
+)
+from prediction.features import FeatureConfig
+from prediction.sequence_features import TeamSequenceEngine, map_team_ids
+
+if torch is not None:
+    from seq_training import LossWeights, PackedTrainingData, train_epochs
 
 V4_VERSION = "v4"
 LOG = logging.getLogger("maz_v4")
@@ -127,9 +145,13 @@ def default_db_path() -> Path:
     return p_main if p_main.exists() else p_fn
 
 
-def load_all_df(conn: sqlite3.Connection, league_ids: Sequence[int]) -> pd.DataFrame:
+def load_all_df(
+    conn: sqlite3.Connection,
+    league_ids: Sequence[int],
+    dataset_cache: Optional[DatasetCache] = None,
+) -> pd.DataFrame:
     cfg = FeatureConfig(elo_priors=None, elo_k=24.0, neutral_mode=False)
-    df = build_feature_table(conn, cfg)
+    df = cached_feature_table(conn, cfg, dataset_cache)
     df = df[df["league_id"].isin(list(league_ids))].copy()
     df = df[df["home_score"].notna() & df["away_score"].notna()].copy()
     if df.empty:
@@ -193,41 +215,51 @@ def build_league_score_stats(df_train: pd.DataFrame) -> Dict[int, Tuple[float, f
         )
         mu = float(np.mean(vals)) if len(vals) else 20.0
         sd = float(np.std(vals)) if len(vals) else 8.0
-        if not np.isfinite(mu):
-            mu = 20.0
-        if not np.isfinite(sd) or sd < 1e-6:
-            sd = 8.0
-        out[int(lid)] = (mu, sd)
+        out[int(lid)] = _guard_score_stats(mu, sd)
     return out
 
 
+def _guard_score_stats(mu: float, sd: float) -> Tuple[float, float]:
+    if not np.isfinite(mu):
+        mu = 20.0
+    if not np.isfinite(sd) or sd < 1e-6:
+        sd = 8.0
+    return (mu, sd)
+
+
 def build_league_environment_stats(
     df_train: pd.DataFrame,
     base_rating_home_adv: float,
 ) -> Dict[int, Dict[str, float]]:
     out: Dict[int, Dict[str, float]] = {}
-    default_prior = 0.55
     for lid, g in df_train.groupby("league_id"):
-        lid_i = int(lid)
-        prior_home_prob = float(LEAGUE_HOME_ADV_PRIOR.get(lid_i, default_prior))
-        n = len(g)
         empirical_home_prob = float(np.mean(g["home_score"].astype(float).values > g["away_score"].astype(float).values))
-        blend_w = min(0.80, max(0.0, n / 400.0))
-        blended_home_prob = ((blend_w * empirical_home_prob) + ((1.0 - blend_w) * prior_home_prob))
-        # "Home" here is really listing/context advantage, not purely venue.
-        # Some tournaments look neutral in theory but still have strong home-side signal in the data.
-        home_strength = float(np.clip((blended_home_prob - 0.50) / HOME_CONTEXT_RATE_SPAN, 0.0, 1.0))
-        # Keep the handcrafted rating update stable across leagues; let the neural features
-        # learn league-specific home/listing context from `home_strength`.
-        rating_home_adv = float(base_rating_home_adv)
-        out[lid_i] = {
-            "home_prob": blended_home_prob,
-            "home_strength": home_strength,
-            "rating_home_adv": rating_home_adv,
-        }
+        out[int(lid)] = _league_environment_entry(int(lid), len(g), empirical_home_prob, base_rating_home_adv)
     return out
 
 
+def _league_environment_entry(
+    lid: int,
+    n: int,
+    empirical_home_prob: float,
+    base_rating_home_adv: float,
+) -> Dict[str, float]:
+    prior_home_prob = float(LEAGUE_HOME_ADV_PRIOR.get(int(lid), 0.55))
+    blend_w = min(0.80, max(0.0, n / 400.0))
+    blended_home_prob = ((blend_w * empirical_home_prob) + ((1.0 - blend_w) * prior_home_prob))
+    # "Home" here is really listing/context advantage, not purely venue.
+    # Some tournaments look neutral in theory but still have strong home-side signal in the data.
+    home_strength = float(np.clip((blended_home_prob - 0.50) / HOME_CONTEXT_RATE_SPAN, 0.0, 1.0))
+    # Keep the handcrafted rating update stable across leagues; let the neural features
+    # learn league-specific home/listing context from `home_strength`.
+    rating_home_adv = float(base_rating_home_adv)
+    return {
+        "home_prob": blended_home_prob,
+        "home_strength": home_strength,
+        "rating_home_adv": rating_home_adv,
+    }
+
+
 def scale_score_targets(
     y_raw: np.ndarray,
     league_ids: np.ndarray,
@@ -288,13 +320,6 @@ def build_recency_weights(df: pd.DataFrame, half_life_days: float) -> np.ndarray
     return (weights / mean_w).astype(np.float32)
 
 
-def weighted_mean(values: torch.Tensor, weights: Optional[torch.Tensor]) -> torch.Tensor:
-    if weights is None or weights.numel() == 0:
-        return torch.mean(values)
-    w = weights / torch.clamp(torch.sum(weights), min=1e-6)
-    return torch.sum(values * w)
-
-
 def _quantile_or_fallback(values: np.ndarray, q: float, fallback: float) -> float:
     if len(values) == 0:
         return float(fallback)
@@ -304,40 +329,6 @@ def _quantile_or_fallback(values: np.ndarray, q: float, fallback: float) -> floa
     return out
 
 
-def _make_sequence_features(
-    *,
-    points_for_scaled: float,
-    points_against_scaled: float,
-    margin_scaled: float,
-    is_home: float,
-    venue_adv_context: float,
-    rest_days_norm: float,
-    margin_vol5_norm: float,
-    margin_vol10_norm: float,
-    team_rating_pre: float,
-    opp_rating_pre: float,
-    expected_margin_pre: float,
-    score_sd: float,
-) -> np.ndarray:
-    sd = max(1.0, float(score_sd))
-    return np.array(
-        [
-            points_for_scaled,
-            points_against_scaled,
-            margin_scaled,
-            is_home,
-            venue_adv_context,
-            rest_days_norm,
-            margin_vol5_norm,
-            margin_vol10_norm,
-            float(team_rating_pre) / sd,
-            float(opp_rating_pre) / sd,
-            float(expected_margin_pre) / sd,
-        ],
-        dtype=np.float32,
-    )
-
-
 def detect_regime(df_train: pd.DataFrame) -> Tuple[str, int, float]:
     if df_train.empty:
         return ("balanced_competitive", 1, 1.0)
@@ -364,15 +355,6 @@ def detect_regime_map_by_league(df_train: pd.DataFrame) -> Dict[int, Tuple[str,
     return out
 
 
-def _rolling_std(vals: Deque[float], n: int) -> float:
-    if not vals:
-        return 0.0
-    arr = np.array(list(vals)[-n:], dtype=float)
-    if len(arr) <= 1:
-        return 0.0
-    return float(np.std(arr))
-
-
 def build_temporal_sequences(
     df: pd.DataFrame,
     seq_len: int,
@@ -391,145 +373,91 @@ def build_temporal_sequences(
      rest_days_norm, margin_vol5_norm, margin_vol10_norm,
      team_rating_pre_scaled, opp_rating_pre_scaled, expected_margin_pre_scaled]
     Opponent identity at each step is carried separately as sequence ids.
+
+    Features come from prediction.sequence_features.TeamSequenceEngine, the same
+    engine the V4/V5 runtime predictors serve with.
     """
-    seq_dim = 11
-    n = len(df)
-    home_seq = np.zeros((n, seq_len, seq_dim), dtype=np.float32)
-    away_seq = np.zeros((n, seq_len, seq_dim), dtype=np.float32)
-    home_opp_raw = np.full((n, seq_len), -1, dtype=np.int64)
-    away_opp_raw = np.full((n, seq_len), -1, dtype=np.int64)
-    home_id = np.zeros(n, dtype=np.int64)
-    away_id = np.zeros(n, dtype=np.int64)
-    league_id_arr = np.zeros(n, dtype=np.int64)
-    y = np.zeros((n, 3), dtype=np.float32)  # winner, home_score, away_score
-
-    histories: Dict[int, Deque[Tuple[np.ndarray, int]]] = defaultdict(lambda: deque(maxlen=seq_len))
-    all_team_ids: set[int] = set()
-    all_league_ids: set[int] = set()
-    team_last_date: Dict[int, datetime] = {}
-    team_rating: Dict[int, float] = defaultdict(float)
-    team_margin_hist: Dict[int, Deque[float]] = defaultdict(lambda: deque(maxlen=10))
-
-    for i, r in df.iterrows():
-        h = _team_key(r["home_team_id"])
-        a = _team_key(r["away_team_id"])
-        lid = int(r["league_id"])
-        hs = float(r["home_score"])
-        aw = float(r["away_score"])
-        dt = pd.to_datetime(r["date_event"], errors="coerce")
-        if pd.isna(dt):
-            dt = pd.Timestamp("1970-01-01")
-        all_team_ids.add(h)
-        all_team_ids.add(a)
-        all_league_ids.add(lid)
-
-        h_hist = list(histories[h])
-        a_hist = list(histories[a])
-        if h_hist:
-            home_seq[i, -len(h_hist) :, :] = np.stack([x[0] for x in h_hist], axis=0)
-            home_opp_raw[i, -len(h_hist) :] = np.array([x[1] for x in h_hist], dtype=np.int64)
-        if a_hist:
-            away_seq[i, -len(a_hist) :, :] = np.stack([x[0] for x in a_hist], axis=0)
-            away_opp_raw[i, -len(a_hist) :] = np.array([x[1] for x in a_hist], dtype=np.int64)
-
-        home_id[i] = h
-        away_id[i] = a
-        league_id_arr[i] = lid
-        y[i, 0] = 1.0 if hs > aw else 0.0
-        y[i, 1] = hs
-        y[i, 2] = aw
-
-        # Update history after consuming this row (chronology-safe).
-        mu_l, sd_l = (league_stats.get(lid, (20.0, 8.0)) if league_stats else (20.0, 8.0))
-        env = (league_env_stats.get(lid) if league_env_stats else None) or {}
-        home_strength = float(env.get("home_strength", 1.0))
-        rating_home_adv_l = float(env.get("rating_home_adv", rating_home_adv))
-        d_h = float((dt.to_pydatetime() - team_last_date[h]).days) if h in team_last_date else 7.0
-        d_a = float((dt.to_pydatetime() - team_last_date[a]).days) if a in team_last_date else 7.0
-        rest_h = max(0.0, min(d_h, 42.0)) / 14.0
-        rest_a = max(0.0, min(d_a, 42.0)) / 14.0
-        vol5_h = _rolling_std(team_margin_hist[h], 5) / max(1.0, sd_l)
-        vol10_h = _rolling_std(team_margin_hist[h], 10) / max(1.0, sd_l)
-        vol5_a = _rolling_std(team_margin_hist[a], 5) / max(1.0, sd_l)
-        vol10_a = _rolling_std(team_margin_hist[a], 10) / max(1.0, sd_l)
-        hs_s = (hs - mu_l) / sd_l
-        aw_s = (aw - mu_l) / sd_l
-        m_h_s = (hs - aw) / sd_l
-        m_a_s = (aw - hs) / sd_l
-        rating_h_pre = float(team_rating.get(h, 0.0))
-        rating_a_pre = float(team_rating.get(a, 0.0))
-        exp_margin_h = (rating_h_pre - rating_a_pre + rating_home_adv_l) / max(1.0, rating_scale)
-        exp_margin_a = -exp_margin_h
-        histories[h].append(
-            (
-                _make_sequence_features(
-                    points_for_scaled=hs_s,
-                    points_against_scaled=aw_s,
-                    margin_scaled=m_h_s,
-                    is_home=1.0,
-                    venue_adv_context=home_strength,
-                    rest_days_norm=rest_h,
-                    margin_vol5_norm=vol5_h,
-                    margin_vol10_norm=vol10_h,
-                    team_rating_pre=rating_h_pre,
-                    opp_rating_pre=rating_a_pre,
-                    expected_margin_pre=exp_margin_h,
-                    score_sd=sd_l,
-                ),
-                a,
-            )
-        )
-        histories[a].append(
-            (
-                _make_sequence_features(
-                    points_for_scaled=aw_s,
-                    points_against_scaled=hs_s,
-                    margin_scaled=m_a_s,
-                    is_home=0.0,
-                    venue_adv_context=-home_strength,
-                    rest_days_norm=rest_a,
-                    margin_vol5_norm=vol5_a,
-                    margin_vol10_norm=vol10_a,
-                    team_rating_pre=rating_a_pre,
-                    opp_rating_pre=rating_h_pre,
-                    expected_margin_pre=exp_margin_a,
-                    score_sd=sd_l,
-                ),
-                h,
-            )
-        )
-        team_margin_hist[h].append(hs - aw)
-        team_margin_hist[a].append(aw - hs)
-        # ELO-like margin rating update.
-        exp_h = (team_rating.get(h, 0.0) - team_rating.get(a, 0.0) + rating_home_adv_l) / max(1.0, rating_scale)
-        err = (hs - aw) - exp_h
-        team_rating[h] = team_rating.get(h, 0.0) + (rating_k * err)
-        team_rating[a] = team_rating.get(a, 0.0) - (rating_k * err)
-        team_last_date[h] = dt.to_pydatetime()
-        team_last_date[a] = dt.to_pydatetime()
+    dates = pd.to_datetime(df["date_event"], errors="coerce").fillna(pd.Timestamp("1970-01-01"))
+    day_ns = dates.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    home_id = np.array([_team_key(x) for x in df["home_team_id"].tolist()], dtype=np.int64)
+    away_id = np.array([_team_key(x) for x in df["away_team_id"].tolist()], dtype=np.int64)
+    league_id_arr = df["league_id"].astype(np.int64).to_numpy()
+    hs = df["home_score"].astype(float).to_numpy()
+    aw = df["away_score"].astype(float).to_numpy()
+
+    engine = TeamSequenceEngine(
+        seq_len,
+        league_stats=league_stats,
+        league_env_stats=league_env_stats,
+        rating_k=rating_k,
+        rating_home_adv=rating_home_adv,
+        rating_scale=rating_scale,
+    )
+    home_seq, away_seq, home_opp_raw, away_opp_raw = engine.consume(
+        day_ns, home_id, away_id, league_id_arr, hs, aw
+    )
+    y = np.column_stack([(hs > aw).astype(np.float32), hs, aw]).astype(np.float32)  # winner, home_score, away_score
 
     # Remap sparse/negative team ids into compact embedding ids.
     if team_to_idx is None:
-        team_list = sorted(all_team_ids)
+        team_list = sorted(engine.team_ids)
         team_to_idx = {tid: i for i, tid in enumerate(team_list)}
     if league_to_idx is None:
-        league_to_idx = {lid2: i for i, lid2 in enumerate(sorted(all_league_ids))}
+        league_to_idx = {lid2: i for i, lid2 in enumerate(sorted(engine.league_ids))}
     home_idx = np.array([team_to_idx[int(t)] for t in home_id], dtype=np.int64)
     away_idx = np.array([team_to_idx[int(t)] for t in away_id], dtype=np.int64)
     league_idx = np.array([league_to_idx[int(l)] for l in league_id_arr], dtype=np.int64)
-    home_flat = home_opp_raw.reshape(-1)
-    away_flat = away_opp_raw.reshape(-1)
-    home_opp_idx = np.array(
-        [team_to_idx.get(int(x), 0) if int(x) >= 0 else 0 for x in home_flat],
-        dtype=np.int64,
-    ).reshape(home_opp_raw.shape)
-    away_opp_idx = np.array(
-        [team_to_idx.get(int(x), 0) if int(x) >= 0 else 0 for x in away_flat],
-        dtype=np.int64,
-    ).reshape(away_opp_raw.shape)
+    home_opp_idx = map_team_ids(home_opp_raw, team_to_idx)
+    away_opp_idx = map_team_ids(away_opp_raw, team_to_idx)
     return home_seq, away_seq, home_idx, away_idx, home_opp_idx, away_opp_idx, league_idx, y, league_id_arr, team_to_idx, league_to_idx
 
 
+SEQUENCE_SOURCE_COLUMNS = ("event_id", "league_id", "date_event", "home_team_id", "away_team_id", "home_score", "away_score")
+_SEQUENCE_ARRAYS = ("home_seq", "away_seq", "home_idx", "away_idx", "home_opp_idx", "away_opp_idx", "league_idx", "y_raw", "league_ids_row")
+
+
+def cached_temporal_sequences(
+    df: pd.DataFrame,
+    dataset_cache: Optional[DatasetCache],
+    seq_len: int,
+    team_to_idx: Dict[int, int],
+    league_to_idx: Dict[int, int],
+    league_stats: Dict[int, Tuple[float, float]],
+    league_env_stats: Dict[int, Dict[str, float]],
+    rating_k: float,
+    rating_home_adv: float,
+    rating_scale: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[int, int], Dict[int, int]]:
+    """
+    `build_temporal_sequences` with fixed id maps, served from the dataset cache.
+    Keyed by the source rows, every build parameter and the sequence code itself.
+    """
+    params = dict(
+        seq_len=seq_len,
+        team_to_idx=team_to_idx,
+        league_to_idx=league_to_idx,
+        league_stats=league_stats,
+        league_env_stats=league_env_stats,
+        rating_k=rating_k,
+        rating_home_adv=rating_home_adv,
+        rating_scale=rating_scale,
+    )
+    if dataset_cache is None:
+        return build_temporal_sequences(df, **params)
+    key = fingerprint(
+        frame_fingerprint(df, SEQUENCE_SOURCE_COLUMNS),
+        params,
+        source_fingerprint(sequence_features.__file__),
+        source_fingerprint(__file__),
+    )
+    arrays = dataset_cache.arrays(
+        "sequences",
+        key,
+        lambda: dict(zip(_SEQUENCE_ARRAYS, build_temporal_sequences(df, **params)[: len(_SEQUENCE_ARRAYS)])),
+    )
+    return tuple(arrays[name] for name in _SEQUENCE_ARRAYS) + (team_to_idx, league_to_idx)
+
+
 def normalize_sequences(
     home_seq: np.ndarray,
     away_seq: np.ndarray,
@@ -546,6 +474,341 @@ def normalize_sequences(
     return h.astype(np.float32), a.astype(np.float32), stats
 
 
+def prepare_split_sequences(
+    tr_df: pd.DataFrame,
+    te_df: pd.DataFrame,
+    seq_len: int,
+    team_to_idx: Dict[int, int],
+    league_to_idx: Dict[int, int],
+    rating_k: float,
+    rating_home_adv: float,
+    rating_scale: float,
+) -> Dict[str, Any]:
+    """Train-only league stats plus normalized sequences for one chronological split."""
+    league_stats = build_league_score_stats(tr_df)
+    league_env_stats = build_league_environment_stats(tr_df, rating_home_adv)
+    home_seq, away_seq, home_idx, away_idx, home_opp_idx, away_opp_idx, league_idx, y_raw, league_ids_row, team_to_idx, _ = build_temporal_sequences(
+        pd.concat([tr_df, te_df], axis=0).reset_index(drop=True),
+        seq_len=seq_len,
+        team_to_idx=team_to_idx,
+        league_to_idx=league_to_idx,
+        league_stats=league_stats,
+        league_env_stats=league_env_stats,
+        rating_k=rating_k,
+        rating_home_adv=rating_home_adv,
+        rating_scale=rating_scale,
+    )
+    home_seq, away_seq, norm_stats = normalize_sequences(home_seq, away_seq, len(tr_df))
+    return {
+        "home_seq": home_seq,
+        "away_seq": away_seq,
+        "home_idx": home_idx,
+        "away_idx": away_idx,
+        "home_opp_idx": home_opp_idx,
+        "away_opp_idx": away_opp_idx,
+        "league_idx": league_idx,
+        "y_raw": y_raw,
+        "league_ids_row": league_ids_row,
+        "team_to_idx": team_to_idx,
+        "league_stats": league_stats,
+        "league_env_stats": league_env_stats,
+        "norm_stats": norm_stats,
+    }
+
+
+class WalkForwardSequences:
+    """
+    Sequence tensors for every walk-forward chunk of one league frame, built once.
+
+    Step features are affine in the train-only league stats (score mu/sd and
+    home strength; the rating recurrence does not depend on them), so the
+    engine replays the whole frame once with identity stats and `chunk` rescales
+    the rows it needs. Score stats, home rates and normalization moments for any
+    cut come from prefix sums. Output matches `prepare_split_sequences` on the
+    same split up to float32 rounding.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        seq_len: int,
+        team_to_idx: Dict[int, int],
+        league_to_idx: Dict[int, int],
+        rating_k: float,
+        rating_home_adv: float,
+        rating_scale: float,
+        dataset_cache: Optional[DatasetCache] = None,
+    ):
+        self.rating_home_adv = float(rating_home_adv)
+        self.league_ids = np.array(sorted(int(x) for x in df["league_id"].unique()), dtype=np.int64)
+        lids = [int(x) for x in self.league_ids]
+        (
+            raw_h,
+            raw_a,
+            self.home_idx,
+            self.away_idx,
+            self.home_opp_idx,
+            self.away_opp_idx,
+            self.league_idx,
+            self.y_raw,
+            self.league_ids_row,
+            self.team_to_idx,
+            _,
+        ) = cached_temporal_sequences(
+            df,
+            dataset_cache,
+            seq_len=seq_len,
+            team_to_idx=team_to_idx,
+            league_to_idx=league_to_idx,
+            league_stats={lid: (0.0, 1.0) for lid in lids},
+            league_env_stats={lid: {"home_strength": 1.0, "rating_home_adv": self.rating_home_adv} for lid in lids},
+            rating_k=rating_k,
+            rating_home_adv=rating_home_adv,
+            rating_scale=rating_scale,
+        )
+        n = len(df)
+        L = int(seq_len)
+        n_codes = len(lids)
+        row_code = np.searchsorted(self.league_ids, self.league_ids_row)
+
+        # League of the match behind every window step (-1 = empty step). Windows are
+        # right-aligned and oldest first, exactly as TeamSequenceEngine emits them.
+        teams = np.empty(2 * n, dtype=np.int64)
+        teams[0::2] = [_team_key(x) for x in df["home_team_id"].tolist()]
+        teams[1::2] = [_team_key(x) for x in df["away_team_id"].tolist()]
+        order = np.argsort(teams, kind="stable")
+        sorted_teams = teams[order]
+        new_group = np.ones(2 * n, dtype=bool)
+        new_group[1:] = sorted_teams[1:] != sorted_teams[:-1]
+        group_start = np.maximum.accumulate(np.where(new_group, np.arange(2 * n), 0))
+        prior = np.empty(2 * n, dtype=np.int64)
+        prior[order] = np.arange(2 * n) - group_start
+        start = np.empty(2 * n, dtype=np.int64)
+        start[order] = group_start
+        appearance = prior[:, None] - L + np.arange(L)[None, :]
+        filled = appearance >= 0
+        src_row = order[np.where(filled, start[:, None] + appearance, 0)] // 2
+        self._code = np.where(filled, row_code[src_row], -1).reshape(n, 2, L)
+        self._raw = np.stack([raw_h, raw_a], axis=1)
+
+        # Per-row contributions, accumulated so every cut reads its train prefix in O(1).
+        onehot = (self._code[..., None] == np.arange(n_codes)).astype(np.float64)
+        raw64 = self._raw.astype(np.float64)
+        self._step_s1 = _prefix_sum(np.einsum("nslc,nslf->ncf", onehot, raw64))
+        self._step_s2 = _prefix_sum(np.einsum("nslc,nslf->ncf", onehot, raw64 * raw64))
+        self._step_count = _prefix_sum(onehot.sum(axis=(1, 2)))
+        row_onehot = (row_code[:, None] == np.arange(n_codes)).astype(np.float64)
+        hs = df["home_score"].astype(float).to_numpy()
+        aw = df["away_score"].astype(float).to_numpy()
+        self._rows = _prefix_sum(row_onehot)
+        self._score_s1 = _prefix_sum(row_onehot * (hs + aw)[:, None])
+        self._score_s2 = _prefix_sum(row_onehot * ((hs * hs) + (aw * aw))[:, None])
+        self._home_wins = _prefix_sum(row_onehot * (hs > aw)[:, None])
+
+    def __len__(self) -> int:
+        return int(self._raw.shape[0])
+
+    def chunk(self, cut: int, nxt: int) -> Dict[str, Any]:
+        """Same payload as `prepare_split_sequences(g.iloc[:cut], g.iloc[cut:nxt], ...)`."""
+        n_codes = len(self.league_ids)
+        seq_dim = int(self._raw.shape[-1])
+        league_stats: Dict[int, Tuple[float, float]] = {}
+        league_env_stats: Dict[int, Dict[str, float]] = {}
+        scale = np.ones((n_codes, seq_dim), dtype=np.float64)
+        shift = np.zeros((n_codes, seq_dim), dtype=np.float64)
+        for c, lid in enumerate(int(x) for x in self.league_ids):
+            rows = int(self._rows[cut, c])
+            if rows > 0:
+                mean = float(self._score_s1[cut, c]) / (2.0 * rows)
+                var = max(0.0, (float(self._score_s2[cut, c]) / (2.0 * rows)) - (mean * mean))
+                mu, sd = _guard_score_stats(mean, math.sqrt(var))
+                env = _league_environment_entry(lid, rows, float(self._home_wins[cut, c]) / rows, self.rating_home_adv)
+                league_stats[lid] = (mu, sd)
+                league_env_stats[lid] = env
+                home_strength = float(env["home_strength"])
+            else:
+                # Leagues with no train rows fall back to the engine defaults.
+                mu, sd = 20.0, 8.0
+                home_strength = 1.0
+            feat_sd = max(1.0, sd)
+            scale[c, 0:3] = 1.0 / sd
+            shift[c, 0:2] = -mu / sd
+            scale[c, 4] = home_strength
+            scale[c, 6:] = 1.0 / feat_sd
+
+        # Train-window normalization moments, as normalize_sequences fits them.
+        s1 = self._step_s1[cut]
+        s2 = self._step_s2[cut]
+        cnt = self._step_count[cut][:, None]
+        total = max(1.0, 2.0 * cut * self._raw.shape[2])
+        mean = np.sum((scale * s1) + (shift * cnt), axis=0) / total
+        sq = np.sum((scale * scale * s2) + (2.0 * scale * shift * s1) + (shift * shift * cnt), axis=0) / total
+        var = sq - (mean * mean)
+        var = np.where(var < 1e-12 * np.maximum(1.0, mean * mean), 0.0, var)
+        std = np.sqrt(var)
+        std = np.where(std < 1e-6, 1.0, std)
+
+        code = self._code[:nxt]
+        pick = np.maximum(code, 0)
+        x = (self._raw[:nxt] * scale[pick]) + (shift[pick] * (code >= 0)[..., None])
+        x = ((x - mean) / std).astype(np.float32)
+        return {
+            "home_seq": x[:, 0],
+            "away_seq": x[:, 1],
+            "home_idx": self.home_idx[:nxt],
+            "away_idx": self.away_idx[:nxt],
+            "home_opp_idx": self.home_opp_idx[:nxt],
+            "away_opp_idx": self.away_opp_idx[:nxt],
+            "league_idx": self.league_idx[:nxt],
+            "y_raw": self.y_raw[:nxt],
+            "league_ids_row": self.league_ids_row[:nxt],
+            "team_to_idx": self.team_to_idx,
+            "league_stats": league_stats,
+            "league_env_stats": league_env_stats,
+            "norm_stats": {"mean": mean.tolist(), "std": std.tolist(), "seq_dim": seq_dim},
+        }
+
+
+def _prefix_sum(per_row: np.ndarray) -> np.ndarray:
+    out = np.zeros((per_row.shape[0] + 1,) + per_row.shape[1:], dtype=np.float64)
+    np.cumsum(per_row, axis=0, out=out[1:])
+    return out
+
+
+def trained_through_marker(df: pd.DataFrame) -> Dict[str, Any]:
+    """The rows a saved model was trained on: count, last match and a hash of the source columns."""
+    last = df.iloc[-1]
+    return {
+        "rows": int(len(df)),
+        "last_event_id": int(last["event_id"]),
+        "last_date_event": str(pd.Timestamp(last["date_event"]).date()),
+        "fingerprint": frame_fingerprint(df, SEQUENCE_SOURCE_COLUMNS),
+    }
+
+
+def plan_incremental_update(
+    g: pd.DataFrame,
+    lid: int,
+    family: str,
+    config: Dict[str, Any],
+    seeds: Sequence[int],
+    max_new_rows: int,
+    artifacts_dir: Path = Path("artifacts"),
+) -> Dict[str, Any]:
+    """
+    How an `--incremental` full-train run refreshes one league from its deployed
+    artifacts. `action` is `unchanged` (no new completed rows), `incremental`
+    (fine-tune the deployed seeds; `states` and `meta` are attached) or `full`
+    (`reason` says why the deployed model cannot be reused).
+    """
+
+    def _full(reason: str) -> Dict[str, Any]:
+        return {"action": "full", "reason": reason, "new_rows": None}
+
+    meta_file = artifacts_dir / f"league_{int(lid)}_model_maz_maxed_{family}_meta.pkl"
+    if not meta_file.exists():
+        return _full("no deployed model")
+    try:
+        with meta_file.open("rb") as f:
+            meta = pickle.load(f)
+    except Exception as exc:
+        return _full(f"unreadable deployed meta ({exc})")
+    marker = meta.get("trained_through")
+    if not marker:
+        return _full("deployed meta has no trained_through marker")
+    deployed_cfg = meta.get("config") or {}
+    changed = sorted(k for k, v in config.items() if deployed_cfg.get(k) != v)
+    if changed:
+        return _full(f"model config changed: {changed}")
+    if [int(s) for s in meta.get("ensemble_seeds") or []] != [int(s) for s in seeds]:
+        return _full("ensemble seeds changed")
+    rows = int(marker["rows"])
+    if len(g) < rows or frame_fingerprint(g.iloc[:rows], SEQUENCE_SOURCE_COLUMNS) != marker["fingerprint"]:
+        return _full("matches the deployed model was trained on have changed")
+    new_rows = len(g) - rows
+    if new_rows == 0:
+        return {"action": "unchanged", "reason": "no new completed matches", "new_rows": 0}
+    if new_rows > int(max_new_rows):
+        return _full(f"{new_rows} new rows exceed the incremental limit ({int(max_new_rows)})")
+    teams = {_team_key(t) for t in pd.concat([g["home_team_id"], g["away_team_id"]])}
+    unseen = teams - set(meta["team_to_idx"])
+    if unseen:
+        return _full(f"{len(unseen)} team(s) missing from the deployed embedding table")
+    leagues = {int(x) for x in g["league_id"].unique()}
+    if leagues - set(meta["league_to_idx"]) or leagues - set(meta["league_score_stats_train"]):
+        return _full("league(s) missing from the deployed league index")
+    states: Dict[int, Dict[str, torch.Tensor]] = {}
+    for s in seeds:
+        seed_file = artifacts_dir / f"league_{int(lid)}_model_maz_maxed_{family}_seed_{int(s)}.pt"
+        if not seed_file.exists():
+            return _full(f"missing deployed seed weights {seed_file.name}")
+        states[int(s)] = torch.load(seed_file, map_location="cpu")
+    return {
+        "action": "incremental",
+        "reason": f"{new_rows} new completed match(es)",
+        "new_rows": int(new_rows),
+        "meta": meta,
+        "states": states,
+    }
+
+
+def prepare_incremental_sequences(
+    g: pd.DataFrame,
+    meta: Dict[str, Any],
+    seq_len: int,
+    rating_k: float,
+    rating_home_adv: float,
+    rating_scale: float,
+    dataset_cache: Optional[DatasetCache] = None,
+) -> Dict[str, Any]:
+    """
+    `prepare_split_sequences` output for fine-tuning a deployed model: its id
+    maps, train-time league stats and normalization instead of refitted ones,
+    so the inputs keep the scale the deployed weights were trained on.
+    """
+    league_stats = {int(k): (float(v[0]), float(v[1])) for k, v in meta["league_score_stats_train"].items()}
+    league_env_stats = {int(k): dict(v) for k, v in meta["league_env_stats_train"].items()}
+    home_seq, away_seq, home_idx, away_idx, home_opp_idx, away_opp_idx, league_idx, y_raw, league_ids_row, team_to_idx, league_to_idx = cached_temporal_sequences(
+        g,
+        dataset_cache,
+        seq_len=seq_len,
+        team_to_idx=meta["team_to_idx"],
+        league_to_idx=meta["league_to_idx"],
+        league_stats=league_stats,
+        league_env_stats=league_env_stats,
+        rating_k=rating_k,
+        rating_home_adv=rating_home_adv,
+        rating_scale=rating_scale,
+    )
+    norm_stats = meta["normalization_stats"]
+    mean = np.asarray(norm_stats["mean"], dtype=home_seq.dtype).reshape(1, 1, -1)
+    std = np.asarray(norm_stats["std"], dtype=home_seq.dtype).reshape(1, 1, -1)
+    return {
+        "home_seq": ((home_seq - mean) / std).astype(np.float32),
+        "away_seq": ((away_seq - mean) / std).astype(np.float32),
+        "home_idx": home_idx,
+        "away_idx": away_idx,
+        "home_opp_idx": home_opp_idx,
+        "away_opp_idx": away_opp_idx,
+        "league_idx": league_idx,
+        "y_raw": y_raw,
+        "league_ids_row": league_ids_row,
+        "team_to_idx": team_to_idx,
+        "league_to_idx": league_to_idx,
+        "league_stats": league_stats,
+        "league_env_stats": league_env_stats,
+        "norm_stats": norm_stats,
+    }
+
+
+def load_previous_report(path: Path) -> Dict[str, Any]:
+    """Per-league payloads of an earlier report (empty if missing or unreadable)."""
+    try:
+        return dict(json.loads(path.read_text(encoding="utf-8")).get("leagues") or {})
+    except (OSError, ValueError):
+        return {}
+
+
 class V4Model(nn.Module):
     def __init__(self, n_teams: int, n_leagues: int, emb_dim: int, seq_dim: int, hidden_dim: int):
         super().__init__()
@@ -618,6 +881,121 @@ class V4Model(nn.Module):
         }
 
 
+SEED_INPUT_KEYS = ("xh", "xa", "ih", "ia", "ioh", "ioa", "il", "ir", "y", "w")
+
+
+def seed_training_arrays(
+    home_seq: np.ndarray,
+    away_seq: np.ndarray,
+    home_idx: np.ndarray,
+    away_idx: np.ndarray,
+    home_opp_idx: np.ndarray,
+    away_opp_idx: np.ndarray,
+    league_idx: np.ndarray,
+    regime_idx: np.ndarray,
+    y_scaled: np.ndarray,
+    weights: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """Contiguous, dtype-fixed training inputs shared by every seed of one fit."""
+    return {
+        "xh": np.ascontiguousarray(home_seq, dtype=np.float32),
+        "xa": np.ascontiguousarray(away_seq, dtype=np.float32),
+        "ih": np.ascontiguousarray(home_idx, dtype=np.int64),
+        "ia": np.ascontiguousarray(away_idx, dtype=np.int64),
+        "ioh": np.ascontiguousarray(home_opp_idx, dtype=np.int64),
+        "ioa": np.ascontiguousarray(away_opp_idx, dtype=np.int64),
+        "il": np.ascontiguousarray(league_idx, dtype=np.int64),
+        "ir": np.ascontiguousarray(regime_idx, dtype=np.int64),
+        "y": np.ascontiguousarray(y_scaled, dtype=np.float32),
+        "w": np.ascontiguousarray(weights, dtype=np.float32),
+    }
+
+
+def state_to_numpy(state: Dict[str, torch.Tensor]) -> Dict[str, np.ndarray]:
+    return {k: v.detach().cpu().numpy().copy() for k, v in state.items()}
+
+
+def state_from_numpy(state: Dict[str, np.ndarray]) -> Dict[str, torch.Tensor]:
+    return {k: torch.from_numpy(np.asarray(v)) for k, v in state.items()}
+
+
+def train_v4_seed(data: Dict[str, torch.Tensor], task: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Train one ensemble seed and return its weights as numpy arrays.
+
+    `task` carries the torch seed, V4Model kwargs, optional init weights, lr,
+    epochs and the run args. Seeding happens before model construction, as in
+    the sequential loop, so a seed trains the same wherever it runs.
+    """
+    args = task["args"]
+    torch.manual_seed(int(task["torch_seed"]))
+    model = V4Model(**task["model_kwargs"])
+    if task.get("init_state") is not None:
+        model.load_state_dict(state_from_numpy(task["init_state"]), strict=True)
+    opt = torch.optim.AdamW(model.parameters(), lr=float(task["lr"]), weight_decay=1e-4)
+    train_epochs(
+        model,
+        PackedTrainingData(data),
+        opt,
+        epochs=int(task["epochs"]),
+        batch_size=args.batch_size,
+        loss_weights=LossWeights.from_args(args, score_huber_mix=SCORE_HUBER_MIX),
+        grad_accum_steps=args.grad_accum_steps,
+        compile_model=args.torch_compile,
+    )
+    return state_to_numpy(model.state_dict())
+
+
+def _init_seed_worker(torch_threads: int) -> None:
+    torch.set_num_threads(max(1, int(torch_threads)))
+
+
+def _run_seed_task(train_fn: Any, data_dir: str, task: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    # Copy-on-write maps: pages are shared with the other workers and never written back.
+    data = {key: torch.from_numpy(np.load(Path(data_dir) / f"{key}.npy", mmap_mode="c")) for key in SEED_INPUT_KEYS}
+    return train_fn(data, task)
+
+
+class SeedTrainingPool:
+    """
+    Trains the seeds of an ensemble in parallel worker processes.
+
+    Each fit writes its shared inputs once as .npy files that every worker
+    memory-maps, so only the small per-seed task (seed, init weights, budget)
+    is pickled. Workers are spawned once per run with an explicit torch thread
+    count. With one worker, seeds train in-process one after another.
+    """
+
+    def __init__(self, workers: int, torch_threads: int = 0):
+        self.workers = max(1, int(workers))
+        cpus = os.cpu_count() or 1
+        self.torch_threads = int(torch_threads) if int(torch_threads) > 0 else max(1, cpus // self.workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_seed_worker,
+                initargs=(self.torch_threads,),
+            )
+
+    def train(self, train_fn: Any, arrays: Dict[str, np.ndarray], tasks: List[Dict[str, Any]]) -> List[Dict[str, torch.Tensor]]:
+        """Run `train_fn(data, task)` for every task; results come back in task order."""
+        if self._executor is None or len(tasks) <= 1:
+            data = {key: torch.from_numpy(arrays[key]) for key in SEED_INPUT_KEYS}
+            return [state_from_numpy(train_fn(data, task)) for task in tasks]
+        with tempfile.TemporaryDirectory(prefix="maz_seed_inputs_") as data_dir:
+            for key in SEED_INPUT_KEYS:
+                np.save(Path(data_dir) / f"{key}.npy", arrays[key])
+            futures = [self._executor.submit(_run_seed_task, train_fn, data_dir, task) for task in tasks]
+            return [state_from_numpy(f.result()) for f in futures]
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
 def _prob_brier(y_w: np.ndarray, p: np.ndarray) -> float:
     return float(np.mean((np.clip(p, 1e-6, 1.0 - 1e-6) - y_w.astype(float)) ** 2))
 
@@ -938,6 +1316,38 @@ def main() -> None:
     )
     parser.add_argument("--wf-start-train", type=int, default=80)
     parser.add_argument("--wf-step", type=int, default=20)
+    parser.add_argument(
+        "--wf-warm-epochs",
+        type=int,
+        default=3,
+        help="Fine-tune epochs (at --finetune-lr) for walk-forward chunks warm-started from the previous chunk.",
+    )
+    parser.add_argument(
+        "--wf-cold-start",
+        action="store_true",
+        help="Rebuild sequences and train every walk-forward chunk from scratch (slow reference mode).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "With --train-all-completed: fine-tune each league's deployed seeds on its newly completed "
+            "matches plus a replay buffer and recalibrate; leagues without new matches are left untouched."
+        ),
+    )
+    parser.add_argument("--incremental-epochs", type=int, default=3, help="Fine-tune epochs (at --finetune-lr) for --incremental.")
+    parser.add_argument("--replay-rows", type=int, default=256, help="Most recent already-trained rows replayed with the new matches.")
+    parser.add_argument(
+        "--incremental-max-new-rows",
+        type=int,
+        default=200,
+        help="Leagues with more new rows than this get a full retrain instead.",
+    )
+    parser.add_argument(
+        "--incremental-league-ids",
+        default="",
+        help="Comma-separated league IDs: with --incremental, only these leagues are refreshed; the rest keep their deployed models.",
+    )
     parser.add_argument("--seq-len", type=int, default=8)
     parser.add_argument("--emb-dim", type=int, default=32)
     parser.add_argument("--hidden-dim", type=int, default=64)
@@ -949,9 +1359,33 @@ def main() -> None:
     parser.add_argument("--global-pretrain-epochs", type=int, default=20)
     parser.add_argument("--finetune-epochs", type=int, default=12)
     parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument(
+        "--grad-accum-steps",
+        type=int,
+        default=1,
+        help="Mini-batches per optimizer step (effective batch = batch-size x steps).",
+    )
+    parser.add_argument("--torch-compile", action="store_true", help="Train through torch.compile (falls back to eager).")
     parser.add_argument("--lr", type=float, default=1e-3)
     parser.add_argument("--finetune-lr", type=float, default=3e-4)
     parser.add_argument("--ensemble-seeds", type=str, default="42,1337,9001")
+    parser.add_argument(
+        "--seed-workers",
+        type=int,
+        default=1,
+        help="Worker processes that train ensemble seeds in parallel (1 = in-process, sequential).",
+    )
+    parser.add_argument(
+        "--seed-torch-threads",
+        type=int,
+        default=0,
+        help="Torch threads per seed worker (0 = CPU count / --seed-workers).",
+    )
+    parser.add_argument(
+        "--no-dataset-cache",
+        action="store_true",
+        help="Rebuild feature tables and sequence tensors instead of using the dataset cache.",
+    )
     parser.add_argument("--winner-loss-weight", type=float, default=1.0)
     parser.add_argument("--score-loss-weight", type=float, default=0.25)
     parser.add_argument("--ranking-loss-weight", type=float, default=0.10)
@@ -980,6 +1414,8 @@ def main() -> None:
         raise SystemExit("Use --league-id <id> or --all-leagues")
     if args.walk_forward and args.train_all_completed:
         raise SystemExit("Use either --walk-forward or --train-all-completed, not both.")
+    if args.incremental and not (args.train_all_completed and args.save_v4_models):
+        raise SystemExit("--incremental updates deployed models: use it with --train-all-completed --save-v4-models.")
 
     np.random.seed(args.seed)
     torch.manual_seed(args.seed)
@@ -990,7 +1426,8 @@ def main() -> None:
 
     leagues = {args.league_id: LEAGUE_MAPPINGS.get(args.league_id, f"League {args.league_id}")} if args.league_id else LEAGUE_MAPPINGS
     conn = sqlite3.connect(str(db_path))
-    df_all = load_all_df(conn, leagues.keys())
+    dataset_cache = None if args.no_dataset_cache else default_dataset_cache()
+    df_all = load_all_df(conn, leagues.keys(), dataset_cache)
     conn.close()
     if df_all.empty:
         raise SystemExit("No completed games found for selected leagues.")
@@ -1018,8 +1455,37 @@ def main() -> None:
     global_team_to_idx = build_global_team_to_idx(df_all)
     global_league_to_idx = build_global_league_to_idx(keep_ids)
 
+    # Incremental mode: decide per league whether the deployed seeds can be fine-tuned.
+    incremental_plans: Dict[int, Dict[str, Any]] = {}
+    previous_prod: Dict[str, Any] = {}
+    if args.incremental:
+        plan_config = {
+            "seq_len": int(args.seq_len),
+            "emb_dim": int(args.emb_dim),
+            "hidden_dim": int(args.hidden_dim),
+            "rating_k": float(args.rating_k),
+            "rating_home_adv": float(args.rating_home_adv),
+            "rating_scale": float(args.rating_scale),
+            "score_huber_mix": SCORE_HUBER_MIX,
+        }
+        only_ids = set(_parse_int_list(args.incremental_league_ids))
+        for lid in keep_ids:
+            if only_ids and int(lid) not in only_ids:
+                plan = {"action": "unchanged", "reason": "not in --incremental-league-ids", "new_rows": 0}
+            else:
+                g_l = df_all[df_all["league_id"] == lid].copy().sort_values(["date_event", "event_id"]).reset_index(drop=True)
+                plan = plan_incremental_update(g_l, lid, "v4", plan_config, args._ensemble_seeds, args.incremental_max_new_rows)
+            incremental_plans[int(lid)] = plan
+            LOG.info("[%s] incremental plan: %s (%s)", leagues[lid], plan["action"], plan["reason"])
+        previous_prod = load_previous_report(Path("artifacts") / "maz_maxed_v4_prod_latest.json")
+    needs_full_train = not args.incremental or any(p["action"] == "full" for p in incremental_plans.values())
+    retrained_ids: List[int] = []
+
+    seed_pool = SeedTrainingPool(args.seed_workers, args.seed_torch_threads)
+    if seed_pool.workers > 1:
+        LOG.info("[V4] Seed training pool: workers=%s torch_threads=%s", seed_pool.workers, seed_pool.torch_threads)
     pretrained_by_seed: Dict[int, Dict[str, torch.Tensor]] = {}
-    if args.global_pretrain:
+    if args.global_pretrain and needs_full_train:
         pre_parts = []
         for lid in keep_ids:
             g_l = (
@@ -1045,112 +1511,63 @@ def main() -> None:
                 args.global_pretrain_epochs,
                 len(args._ensemble_seeds),
             )
-            for s in args._ensemble_seeds:
-                league_stats_g = build_league_score_stats(df_pre)
-                league_env_stats_g = build_league_environment_stats(df_pre, args.rating_home_adv)
-                home_seq_g, away_seq_g, home_idx_g, away_idx_g, home_opp_g, away_opp_g, league_idx_g, y_g_raw, league_ids_g, _, _ = build_temporal_sequences(
-                    df_pre,
-                    seq_len=args.seq_len,
-                    team_to_idx=global_team_to_idx,
-                    league_to_idx=global_league_to_idx,
-                    league_stats=league_stats_g,
-                    league_env_stats=league_env_stats_g,
-                    rating_k=args.rating_k,
-                    rating_home_adv=args.rating_home_adv,
-                    rating_scale=args.rating_scale,
-                )
-                n_train_g = len(df_pre)
-                home_seq_g, away_seq_g, _ = normalize_sequences(home_seq_g, away_seq_g, n_train_g)
-                y_g = scale_score_targets(y_g_raw, league_ids_g, league_stats_g)
-                w_g = torch.tensor(
-                    build_recency_weights(df_pre, args.recency_half_life_days),
-                    dtype=torch.float32,
-                )
-                xh_g = torch.tensor(home_seq_g, dtype=torch.float32)
-                xa_g = torch.tensor(away_seq_g, dtype=torch.float32)
-                ih_g = torch.tensor(home_idx_g, dtype=torch.long)
-                ia_g = torch.tensor(away_idx_g, dtype=torch.long)
-                ioh_g = torch.tensor(home_opp_g, dtype=torch.long)
-                ioa_g = torch.tensor(away_opp_g, dtype=torch.long)
-                il_g = torch.tensor(league_idx_g, dtype=torch.long)
-                reg_map_g = detect_regime_map_by_league(df_pre)
-                regime_idx_g = np.array([reg_map_g.get(int(lid), ("balanced_competitive", 1, 1.0))[1] for lid in league_ids_g], dtype=np.int64)
-                ir_g = torch.tensor(regime_idx_g, dtype=torch.long)
-                y_g_t = torch.tensor(y_g, dtype=torch.float32)
-                torch.manual_seed(int(s) + 7777)
-                model_g = V4Model(
-                    n_teams=len(global_team_to_idx),
-                    n_leagues=len(global_league_to_idx),
-                    emb_dim=args.emb_dim,
-                    seq_dim=int(home_seq_g.shape[-1]),
-                    hidden_dim=args.hidden_dim,
-                )
-                opt_g = torch.optim.AdamW(model_g.parameters(), lr=args.lr, weight_decay=1e-4)
-                for _ in range(max(1, int(args.global_pretrain_epochs))):
-                    model_g.train()
-                    perm = torch.randperm(n_train_g)
-                    for i in range(0, n_train_g, max(1, args.batch_size)):
-                        idx = perm[i : i + args.batch_size]
-                        out = model_g(ih_g[idx], ia_g[idx], il_g[idx], ir_g[idx], xh_g[idx], xa_g[idx], ioh_g[idx], ioa_g[idx])
-                        y_w = y_g_t[idx, 0]
-                        y_h = y_g_t[idx, 1]
-                        y_a = y_g_t[idx, 2]
-                        batch_w = w_g[idx]
-                        loss_w = weighted_mean(
-                            F.binary_cross_entropy_with_logits(out["winner_logit"], y_w, reduction="none"),
-                            batch_w,
-                        )
-                        mu = out["score_mu"]
-                        logvar = out["score_logvar"].clamp(-5.0, 4.0)
-                        var = torch.exp(logvar)
-                        rho = 0.95 * torch.tanh(out["score_rho_logit"])
-                        zh = (y_h - mu[:, 0]) / torch.sqrt(var[:, 0] + 1e-6)
-                        za = (y_a - mu[:, 1]) / torch.sqrt(var[:, 1] + 1e-6)
-                        den = torch.clamp(1.0 - (rho * rho), min=1e-4)
-                        nll = 0.5 * (
-                            logvar[:, 0]
-                            + logvar[:, 1]
-                            + torch.log(den)
-                            + ((zh * zh) + (za * za) - (2.0 * rho * zh * za)) / den
-                        )
-                        score_huber = F.huber_loss(
-                            mu,
-                            torch.stack([y_h, y_a], dim=1),
-                            reduction="none",
-                        ).mean(dim=1)
-                        loss_s = ((1.0 - SCORE_HUBER_MIX) * weighted_mean(nll, batch_w)) + (
-                            SCORE_HUBER_MIX * weighted_mean(score_huber, batch_w)
-                        )
-                        y_margin = y_h - y_a
-                        pred_margin = mu[:, 0] - mu[:, 1]
-                        m_non_draw = torch.abs(y_margin) > 1e-6
-                        if torch.any(m_non_draw):
-                            sign = torch.sign(y_margin[m_non_draw])
-                            loss_rank = weighted_mean(
-                                F.softplus(-(sign * pred_margin[m_non_draw])),
-                                batch_w[m_non_draw],
-                            )
-                        else:
-                            loss_rank = torch.tensor(0.0, dtype=loss_w.dtype, device=loss_w.device)
-                        var_reg = torch.mean(out["score_logvar"].clamp(-5.0, 4.0) ** 2)
-                        emb_reg = torch.mean(model_g.team_emb.weight**2)
-                        loss = (
-                            (args.winner_loss_weight * loss_w)
-                            + (args.score_loss_weight * loss_s)
-                            + (args.ranking_loss_weight * loss_rank)
-                            + (args.var_reg_weight * var_reg)
-                            + (args.embedding_l2_weight * emb_reg)
-                        )
-                        opt_g.zero_grad()
-                        loss.backward()
-                        torch.nn.utils.clip_grad_norm_(model_g.parameters(), 1.0)
-                        opt_g.step()
-                pretrained_by_seed[int(s)] = model_g.state_dict()
+            league_stats_g = build_league_score_stats(df_pre)
+            league_env_stats_g = build_league_environment_stats(df_pre, args.rating_home_adv)
+            home_seq_g, away_seq_g, home_idx_g, away_idx_g, home_opp_g, away_opp_g, league_idx_g, y_g_raw, league_ids_g, _, _ = cached_temporal_sequences(
+                df_pre,
+                dataset_cache,
+                seq_len=args.seq_len,
+                team_to_idx=global_team_to_idx,
+                league_to_idx=global_league_to_idx,
+                league_stats=league_stats_g,
+                league_env_stats=league_env_stats_g,
+                rating_k=args.rating_k,
+                rating_home_adv=args.rating_home_adv,
+                rating_scale=args.rating_scale,
+            )
+            n_train_g = len(df_pre)
+            home_seq_g, away_seq_g, _ = normalize_sequences(home_seq_g, away_seq_g, n_train_g)
+            y_g = scale_score_targets(y_g_raw, league_ids_g, league_stats_g)
+            reg_map_g = detect_regime_map_by_league(df_pre)
+            regime_idx_g = np.array([reg_map_g.get(int(lid), ("balanced_competitive", 1, 1.0))[1] for lid in league_ids_g], dtype=np.int64)
+            arrays_g = seed_training_arrays(
+                home_seq_g,
+                away_seq_g,
+                home_idx_g,
+                away_idx_g,
+                home_opp_g,
+                away_opp_g,
+                league_idx_g,
+                regime_idx_g,
+                y_g,
+                build_recency_weights(df_pre, args.recency_half_life_days),
+            )
+            model_kwargs_g = {
+                "n_teams": len(global_team_to_idx),
+                "n_leagues": len(global_league_to_idx),
+                "emb_dim": args.emb_dim,
+                "seq_dim": int(home_seq_g.shape[-1]),
+                "hidden_dim": args.hidden_dim,
+            }
+            tasks_g = [
+                {
+                    "torch_seed": int(s) + 7777,
+                    "model_kwargs": model_kwargs_g,
+                    "init_state": None,
+                    "lr": float(args.lr),
+                    "epochs": int(args.global_pretrain_epochs),
+                    "args": args,
+                }
+                for s in args._ensemble_seeds
+            ]
+            states_g = seed_pool.train(train_v4_seed, arrays_g, tasks_g)
+            for s, state_g in zip(args._ensemble_seeds, states_g):
+                pretrained_by_seed[int(s)] = state_g
                 if args.save_global_pretrained:
                     out_dir = Path("artifacts")
                     out_dir.mkdir(exist_ok=True)
                     gp = out_dir / f"global_pretrained_v4_seed_{int(s)}.pt"
-                    torch.save(model_g.state_dict(), gp)
+                    torch.save(state_g, gp)
                 LOG.info("[V4] Global pretraining done for seed=%s", int(s))
 
     report: Dict[str, Any] = {
@@ -1163,6 +1580,12 @@ def main() -> None:
             "train_all_completed": bool(args.train_all_completed),
             "wf_start_train": args.wf_start_train,
             "wf_step": args.wf_step,
+            "wf_warm_epochs": args.wf_warm_epochs,
+            "wf_cold_start": bool(args.wf_cold_start),
+            "incremental": bool(args.incremental),
+            "incremental_epochs": args.incremental_epochs,
+            "replay_rows": args.replay_rows,
+            "incremental_max_new_rows": args.incremental_max_new_rows,
             "seq_len": args.seq_len,
             "emb_dim": args.emb_dim,
             "hidden_dim": args.hidden_dim,
@@ -1174,9 +1597,14 @@ def main() -> None:
             "global_pretrain_epochs": args.global_pretrain_epochs,
             "finetune_epochs": args.finetune_epochs,
             "batch_size": args.batch_size,
+            "grad_accum_steps": args.grad_accum_steps,
+            "torch_compile": bool(args.torch_compile),
             "lr": args.lr,
             "finetune_lr": args.finetune_lr,
             "ensemble_seeds": args._ensemble_seeds,
+            "seed_workers": int(seed_pool.workers),
+            "seed_torch_threads": int(seed_pool.torch_threads),
+            "dataset_cache": str(dataset_cache.root) if dataset_cache is not None else None,
             "winner_loss_weight": args.winner_loss_weight,
             "score_loss_weight": args.score_loss_weight,
             "score_huber_mix": SCORE_HUBER_MIX,
@@ -1217,29 +1645,46 @@ def main() -> None:
         te_df: pd.DataFrame,
         save_models: bool,
         train_all_mode: bool = False,
+        prepared: Optional[Dict[str, Any]] = None,
+        warm_states: Optional[Dict[int, Dict[str, torch.Tensor]]] = None,
+        warm_epochs: Optional[int] = None,
+        finetune_from: int = 0,
     ) -> Dict[str, Any]:
+        """
+        Train one split. `warm_states` fine-tunes existing seeds for `warm_epochs`
+        (default --wf-warm-epochs); `finetune_from` limits the rows the seeds are
+        trained on to `tr_df[finetune_from:]`, while calibration still uses all of `tr_df`.
+        """
         if len(tr_df) < 60 or (len(te_df) < 1 and not train_all_mode):
             return {"ok": False, "reason": "insufficient split rows"}
-        league_stats = build_league_score_stats(tr_df)
-        league_env_stats = build_league_environment_stats(tr_df, args.rating_home_adv)
-        home_seq, away_seq, home_idx, away_idx, home_opp_idx, away_opp_idx, league_idx, y_raw, league_ids_row, team_to_idx, _ = build_temporal_sequences(
-            pd.concat([tr_df, te_df], axis=0).reset_index(drop=True),
-            seq_len=args.seq_len,
-            team_to_idx=global_team_to_idx,
-            league_to_idx=global_league_to_idx,
-            league_stats=league_stats,
-            league_env_stats=league_env_stats,
-            rating_k=args.rating_k,
-            rating_home_adv=args.rating_home_adv,
-            rating_scale=args.rating_scale,
-        )
+        if prepared is None:
+            prepared = prepare_split_sequences(
+                tr_df,
+                te_df,
+                seq_len=args.seq_len,
+                team_to_idx=global_team_to_idx,
+                league_to_idx=global_league_to_idx,
+                rating_k=args.rating_k,
+                rating_home_adv=args.rating_home_adv,
+                rating_scale=args.rating_scale,
+            )
+        home_seq = prepared["home_seq"]
+        away_seq = prepared["away_seq"]
+        home_idx = prepared["home_idx"]
+        away_idx = prepared["away_idx"]
+        home_opp_idx = prepared["home_opp_idx"]
+        away_opp_idx = prepared["away_opp_idx"]
+        league_idx = prepared["league_idx"]
+        y_raw = prepared["y_raw"]
+        league_ids_row = prepared["league_ids_row"]
+        team_to_idx = prepared["team_to_idx"]
+        league_to_idx = prepared.get("league_to_idx", global_league_to_idx)
+        league_stats = prepared["league_stats"]
+        league_env_stats = prepared["league_env_stats"]
+        norm_stats = prepared["norm_stats"]
         n_train = len(tr_df)
-        home_seq, away_seq, norm_stats = normalize_sequences(home_seq, away_seq, n_train)
         y_scaled = scale_score_targets(y_raw, league_ids_row, league_stats)
-        w_tr = torch.tensor(
-            build_recency_weights(tr_df, args.recency_half_life_days),
-            dtype=torch.float32,
-        )
+        w_tr = build_recency_weights(tr_df, args.recency_half_life_days)
         seq_dim = int(home_seq.shape[-1])
         xh_tr = torch.tensor(home_seq[:n_train], dtype=torch.float32)
         xa_tr = torch.tensor(away_seq[:n_train], dtype=torch.float32)
@@ -1264,7 +1709,6 @@ def main() -> None:
             LOW_SAMPLE_SHRINK_MAX if len(tr_df) < SMALL_SAMPLE_ROWS else HIGH_SAMPLE_SHRINK_MAX
         )
         ir_tr = torch.full((n_train,), int(regime_idx), dtype=torch.long)
-        y_tr = torch.tensor(y_scaled[:n_train], dtype=torch.float32)
         xh_te = torch.tensor(home_seq[n_train:], dtype=torch.float32)
         xa_te = torch.tensor(away_seq[n_train:], dtype=torch.float32)
         ih_te = torch.tensor(home_idx[n_train:], dtype=torch.long)
@@ -1293,98 +1737,62 @@ def main() -> None:
         emb_norm_means: List[float] = []
         emb_norm_stds: List[float] = []
         saved_seed_models: List[str] = []
+        seed_states: Dict[int, Dict[str, torch.Tensor]] = {}
 
+        model_kwargs = {
+            "n_teams": len(team_to_idx),
+            "n_leagues": len(league_to_idx),
+            "emb_dim": args.emb_dim,
+            "seq_dim": seq_dim,
+            "hidden_dim": args.hidden_dim,
+        }
+        seed_tasks: List[Dict[str, Any]] = []
         for s in args._ensemble_seeds:
-            torch.manual_seed(int(s) + int(lid))
-            model = V4Model(
-                n_teams=len(global_team_to_idx),
-                n_leagues=len(global_league_to_idx),
-                emb_dim=args.emb_dim,
-                seq_dim=seq_dim,
-                hidden_dim=args.hidden_dim,
-            )
-            if int(s) in pretrained_by_seed:
-                model.load_state_dict(pretrained_by_seed[int(s)], strict=True)
+            warm_state = warm_states.get(int(s)) if warm_states else None
+            init_state = warm_state if warm_state is not None else pretrained_by_seed.get(int(s))
             use_lr = float(args.finetune_lr if args.global_pretrain else args.lr)
             use_epochs = int(args.finetune_epochs if args.global_pretrain else args.epochs)
-            if args.global_pretrain:
+            if warm_state is not None:
+                # Warm seeds (previous walk-forward chunk, or the deployed model) already saw all but the newest rows.
+                use_lr = float(args.finetune_lr)
+                use_epochs = int(warm_epochs if warm_epochs is not None else args.wf_warm_epochs)
+            elif args.global_pretrain:
                 if len(tr_df) < SMALL_SAMPLE_ROWS:
                     use_lr *= 0.75
                     use_epochs = max(4, min(use_epochs, 6))
                 elif len(tr_df) < MEDIUM_SAMPLE_ROWS:
                     use_lr *= 0.90
                     use_epochs = max(6, min(use_epochs, 9))
-            opt = torch.optim.AdamW(model.parameters(), lr=use_lr, weight_decay=1e-4)
-
-            for _ in range(max(1, use_epochs)):
-                model.train()
-                perm = torch.randperm(n_train)
-                for i in range(0, n_train, max(1, args.batch_size)):
-                    idx = perm[i : i + args.batch_size]
-                    out = model(
-                        ih_tr[idx],
-                        ia_tr[idx],
-                        il_tr[idx],
-                        ir_tr[idx],
-                        xh_tr[idx],
-                        xa_tr[idx],
-                        ioh_tr[idx],
-                        ioa_tr[idx],
-                    )
-                    y_w = y_tr[idx, 0]
-                    y_h = y_tr[idx, 1]
-                    y_a = y_tr[idx, 2]
-                    batch_w = w_tr[idx]
-                    loss_w = weighted_mean(
-                        F.binary_cross_entropy_with_logits(out["winner_logit"], y_w, reduction="none"),
-                        batch_w,
-                    )
-                    mu = out["score_mu"]
-                    logvar = out["score_logvar"].clamp(-5.0, 4.0)
-                    var = torch.exp(logvar)
-                    rho = 0.95 * torch.tanh(out["score_rho_logit"])
-                    zh = (y_h - mu[:, 0]) / torch.sqrt(var[:, 0] + 1e-6)
-                    za = (y_a - mu[:, 1]) / torch.sqrt(var[:, 1] + 1e-6)
-                    den = torch.clamp(1.0 - (rho * rho), min=1e-4)
-                    nll = 0.5 * (
-                        logvar[:, 0]
-                        + logvar[:, 1]
-                        + torch.log(den)
-                        + ((zh * zh) + (za * za) - (2.0 * rho * zh * za)) / den
-                    )
-                    score_huber = F.huber_loss(
-                        mu,
-                        torch.stack([y_h, y_a], dim=1),
-                        reduction="none",
-                    ).mean(dim=1)
-                    loss_s = ((1.0 - SCORE_HUBER_MIX) * weighted_mean(nll, batch_w)) + (
-                        SCORE_HUBER_MIX * weighted_mean(score_huber, batch_w)
-                    )
-                    var_reg = torch.mean(out["score_logvar"].clamp(-5.0, 4.0) ** 2)
-                    emb_reg = torch.mean(model.team_emb.weight**2)
-                    y_margin = y_h - y_a
-                    pred_margin = mu[:, 0] - mu[:, 1]
-                    m_non_draw = torch.abs(y_margin) > 1e-6
-                    if torch.any(m_non_draw):
-                        sign = torch.sign(y_margin[m_non_draw])
-                        loss_rank = weighted_mean(
-                            F.softplus(-(sign * pred_margin[m_non_draw])),
-                            batch_w[m_non_draw],
-                        )
-                    else:
-                        loss_rank = torch.tensor(0.0, dtype=loss_w.dtype, device=loss_w.device)
-                    loss = (
-                        (args.winner_loss_weight * loss_w)
-                        + (args.score_loss_weight * loss_s)
-                        + (args.ranking_loss_weight * loss_rank)
-                        + (args.var_reg_weight * var_reg)
-                        + (args.embedding_l2_weight * emb_reg)
-                    )
-                    opt.zero_grad()
-                    loss.backward()
-                    torch.nn.utils.clip_grad_norm_(model.parameters(), 1.0)
-                    opt.step()
+            seed_tasks.append(
+                {
+                    "torch_seed": int(s) + int(lid),
+                    "model_kwargs": model_kwargs,
+                    "init_state": state_to_numpy(init_state) if init_state is not None else None,
+                    "lr": use_lr,
+                    "epochs": use_epochs,
+                    "args": args,
+                }
+            )
+        trained_states = seed_pool.train(
+            train_v4_seed,
+            seed_training_arrays(
+                home_seq[finetune_from:n_train],
+                away_seq[finetune_from:n_train],
+                home_idx[finetune_from:n_train],
+                away_idx[finetune_from:n_train],
+                home_opp_idx[finetune_from:n_train],
+                away_opp_idx[finetune_from:n_train],
+                league_idx[finetune_from:n_train],
+                np.full((n_train - finetune_from,), int(regime_idx), dtype=np.int64),
+                y_scaled[finetune_from:n_train],
+                w_tr[finetune_from:],
+            ),
+            seed_tasks,
+        )
 
+        for s, trained_state in zip(args._ensemble_seeds, trained_states):
+            model = V4Model(**model_kwargs)
+            model.load_state_dict(trained_state, strict=True)
             model.eval()
             with torch.no_grad():
                 out_tr = model(ih_tr, ia_tr, il_tr, ir_tr, xh_tr, xa_tr, ioh_tr, ioa_tr)
@@ -1451,6 +1859,7 @@ def main() -> None:
             emb_norms = np.linalg.norm(emb_weights, axis=1)
             emb_norm_means.append(float(np.mean(emb_norms)))
             emb_norm_stds.append(float(np.std(emb_norms)))
+            seed_states[int(s)] = trained_state
             if save_models and args.save_v4_models:
                 out_dir = Path("artifacts")
                 out_dir.mkdir(exist_ok=True)
@@ -1564,6 +1973,7 @@ def main() -> None:
             "high_confidence_total": hc_total,
             "high_confidence_correct": hc_correct,
             "saved_seed_models": saved_seed_models,
+            "seed_states": seed_states,
             "team_to_idx": team_to_idx,
             "league_stats": league_stats,
             "league_env_stats": league_env_stats,
@@ -1580,7 +1990,7 @@ def main() -> None:
                         "league_id": int(lid),
                         "league_name": name,
                         "team_to_idx": team_to_idx,
-                        "league_to_idx": global_league_to_idx,
+                        "league_to_idx": league_to_idx,
                         "league_score_stats_train": {int(k): (float(v[0]), float(v[1])) for k, v in league_stats.items()},
                         "league_env_stats_train": {
                             int(k): {
@@ -1612,6 +2022,7 @@ def main() -> None:
                         "alpha_avg_test": float(np.mean(a_te)) if len(a_te) else None,
                         "ensemble_seeds": args._ensemble_seeds,
                         "saved_seed_models": saved_seed_models,
+                        "trained_through": trained_through_marker(tr_df),
                     },
                     f,
                 )
@@ -1628,9 +2039,49 @@ def main() -> None:
         )
         n = len(g)
         if args.train_all_completed:
-            LOG.info("[%s] full-train mode: using all completed games (n=%s)", name, n)
+            plan = incremental_plans.get(int(lid))
             te_empty = g.iloc[0:0].copy()
-            out = _run_split(lid, name, g, te_empty, save_models=True, train_all_mode=True)
+            if plan is not None and plan["action"] == "unchanged":
+                LOG.info("[%s] incremental: %s; deployed model kept", name, plan["reason"])
+                report["summary"]["unchanged"] = report["summary"].get("unchanged", 0) + 1
+                kept = dict(previous_prod.get(str(lid)) or {"name": name, "status": "unchanged"})
+                kept["incremental"] = {"action": "unchanged", "reason": plan["reason"], "new_rows": 0}
+                report["leagues"][str(lid)] = kept
+                continue
+            if plan is not None and plan["action"] == "incremental":
+                finetune_from = max(0, n - int(plan["new_rows"]) - max(0, int(args.replay_rows)))
+                LOG.info(
+                    "[%s] incremental fine-tune: new_rows=%s replay_rows=%s epochs=%s",
+                    name,
+                    plan["new_rows"],
+                    n - int(plan["new_rows"]) - finetune_from,
+                    args.incremental_epochs,
+                )
+                out = _run_split(
+                    lid,
+                    name,
+                    g,
+                    te_empty,
+                    save_models=True,
+                    train_all_mode=True,
+                    prepared=prepare_incremental_sequences(
+                        g,
+                        plan["meta"],
+                        seq_len=args.seq_len,
+                        rating_k=args.rating_k,
+                        rating_home_adv=args.rating_home_adv,
+                        rating_scale=args.rating_scale,
+                        dataset_cache=dataset_cache,
+                    ),
+                    warm_states=plan["states"],
+                    warm_epochs=args.incremental_epochs,
+                    finetune_from=finetune_from,
+                )
+            else:
+                if plan is not None:
+                    LOG.info("[%s] incremental: full retrain (%s)", name, plan["reason"])
+                LOG.info("[%s] full-train mode: using all completed games (n=%s)", name, n)
+                out = _run_split(lid, name, g, te_empty, save_models=True, train_all_mode=True)
             if not out.get("ok"):
                 report["summary"]["skipped"] += 1
                 report["leagues"][str(lid)] = {"name": name, "status": "skipped", "reason": str(out.get("reason", "train failed"))}
@@ -1640,7 +2091,7 @@ def main() -> None:
             payload = {
                 "name": name,
                 "status": "trained_only",
-                "mode": "train_all_completed",
+                "mode": "incremental" if (plan is not None and plan["action"] == "incremental") else "train_all_completed",
                 "train_rows": int(out["train_rows"]),
                 "test_rows": 0,
                 "ensemble_size": int(len(args._ensemble_seeds)),
@@ -1663,6 +2114,9 @@ def main() -> None:
             if args.save_v4_models and out.get("saved_seed_models"):
                 payload["saved_seed_models"] = out["saved_seed_models"]
                 payload["saved_meta"] = out.get("saved_meta")
+            if plan is not None:
+                payload["incremental"] = {"action": plan["action"], "reason": plan["reason"], "new_rows": plan["new_rows"]}
+                retrained_ids.append(int(lid))
             report["leagues"][str(lid)] = payload
             tm = out.get("train_metrics")
             if tm is not None:
@@ -1691,11 +2145,39 @@ def main() -> None:
             hc_total = 0
             hc_correct = 0
             last_ok: Optional[Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Any]]] = None
+            # Sequences are built once per league; each chunk warm-starts from the previous chunk's seeds.
+            wf_sequences = None
+            if not args.wf_cold_start:
+                wf_sequences = WalkForwardSequences(
+                    g,
+                    seq_len=args.seq_len,
+                    team_to_idx=global_team_to_idx,
+                    league_to_idx=global_league_to_idx,
+                    rating_k=args.rating_k,
+                    rating_home_adv=args.rating_home_adv,
+                    rating_scale=args.rating_scale,
+                    dataset_cache=dataset_cache,
+                )
+            warm_states: Optional[Dict[int, Dict[str, torch.Tensor]]] = None
+            save_out: Dict[str, Any] = {}
             for chunk_i, cut in enumerate(range(start, n, step), start=1):
                 nxt = min(n, cut + step)
                 tr = g.iloc[:cut].copy()
                 te = g.iloc[cut:nxt].copy()
-                out = _run_split(lid, name, tr, te, save_models=False)
+                if wf_sequences is None:
+                    out = _run_split(lid, name, tr, te, save_models=False)
+                else:
+                    out = _run_split(
+                        lid,
+                        name,
+                        tr,
+                        te,
+                        save_models=False,
+                        prepared=wf_sequences.chunk(cut, nxt),
+                        warm_states=warm_states,
+                    )
+                    if out.get("ok"):
+                        warm_states = out["seed_states"]
                 if not out.get("ok"):
                     LOG.warning(
                         "[%s] chunk %s/%s skipped: %s",
@@ -1730,10 +2212,10 @@ def main() -> None:
                 report["leagues"][str(lid)] = {"name": name, "status": "skipped", "reason": "walk-forward produced no valid chunks"}
                 continue
             if args.save_v4_models:
+                # Saved artifacts are a fresh full fit of the last split, not the
+                # chain of short warm fine-tunes used for the walk-forward metrics.
                 tr_last, te_last, _ = last_ok
                 save_out = _run_split(lid, name, tr_last, te_last, save_models=True)
-            else:
-                save_out = {}
             m_agg = Metrics(
                 winner_accuracy=win_sum / rows_total,
                 home_mae=mae_h_sum / rows_total,
@@ -1841,6 +2323,15 @@ def main() -> None:
                 float(out["low_confidence_rate"]),
             )
 
+    seed_pool.close()
+    if args.incremental:
+        # Leagues whose artifacts were rewritten; the orchestrator publishes only these.
+        report["incremental"] = {
+            "updated": retrained_ids,
+            "fine_tuned": [lid for lid in retrained_ids if incremental_plans[lid]["action"] == "incremental"],
+            "full_retrain": [lid for lid in retrained_ids if incremental_plans[lid]["action"] == "full"],
+            "unchanged": [lid for lid, plan in incremental_plans.items() if plan["action"] == "unchanged"],
+        }
     LOG.info("=== MAZ MAXED V4 Summary ===")
     LOG.info("%s", json.dumps(report["summary"], indent=2))
     LOG.info("=== MAZ MAXED V4 Final League Recap ===")
@@ -69,6 +69,10 @@ def _load_v4_base() -> Any:
 
 _V4 = _load_v4_base()
 
+if torch is not None:
+    # Loading the v4 base put scripts/ on sys.path.
+    from seq_training import LossWeights, PackedTrainingData, train_epochs  # noqa: E402
+
 Metrics = _V4.Metrics
 LEAGUE_MAPPINGS = _V4.LEAGUE_MAPPINGS
 FRIENDLIES_LEAGUE_ID = _V4.FRIENDLIES_LEAGUE_ID
@@ -84,10 +88,21 @@ scale_score_targets = _V4.scale_score_targets
 unscale_score_predictions = _V4.unscale_score_predictions
 unscale_score_variances = _V4.unscale_score_variances
 build_recency_weights = _V4.build_recency_weights
-weighted_mean = _V4.weighted_mean
 _quantile_or_fallback = _V4._quantile_or_fallback
 build_temporal_sequences = _V4.build_temporal_sequences
+cached_temporal_sequences = _V4.cached_temporal_sequences
+default_dataset_cache = _V4.default_dataset_cache
 normalize_sequences = _V4.normalize_sequences
+prepare_split_sequences = _V4.prepare_split_sequences
+WalkForwardSequences = _V4.WalkForwardSequences
+trained_through_marker = _V4.trained_through_marker
+plan_incremental_update = _V4.plan_incremental_update
+prepare_incremental_sequences = _V4.prepare_incremental_sequences
+load_previous_report = _V4.load_previous_report
+SeedTrainingPool = _V4.SeedTrainingPool
+seed_training_arrays = _V4.seed_training_arrays
+state_to_numpy = _V4.state_to_numpy
+state_from_numpy = _V4.state_from_numpy
 detect_regime = _V4.detect_regime
 detect_regime_map_by_league = _V4.detect_regime_map_by_league
 fit_probability_blender = _V4.fit_probability_blender
@@ -363,89 +378,29 @@ def _make_bundle(
     )
 
 
-def _model_forward(model: V5Model, bundle: SplitBundle, idx: Optional[torch.Tensor] = None) -> Dict[str, torch.Tensor]:
-    if idx is None:
-        return model(bundle.ih, bundle.ia, bundle.il, bundle.ir, bundle.xh, bundle.xa, bundle.ioh, bundle.ioa)
-    return model(
-        bundle.ih[idx],
-        bundle.ia[idx],
-        bundle.il[idx],
-        bundle.ir[idx],
-        bundle.xh[idx],
-        bundle.xa[idx],
-        bundle.ioh[idx],
-        bundle.ioa[idx],
-    )
-
-
-def _loss_from_outputs(model: V5Model, out: Dict[str, torch.Tensor], y: torch.Tensor, weights: Optional[torch.Tensor], args: Any) -> torch.Tensor:
-    y_w = y[:, 0]
-    y_h = y[:, 1]
-    y_a = y[:, 2]
-    loss_w = weighted_mean(
-        F.binary_cross_entropy_with_logits(out["winner_logit"], y_w, reduction="none"),
-        weights,
-    )
-    mu = out["score_mu"]
-    logvar = out["score_logvar"].clamp(-5.0, 4.0)
-    var = torch.exp(logvar)
-    rho = 0.95 * torch.tanh(out["score_rho_logit"])
-    zh = (y_h - mu[:, 0]) / torch.sqrt(var[:, 0] + 1e-6)
-    za = (y_a - mu[:, 1]) / torch.sqrt(var[:, 1] + 1e-6)
-    den = torch.clamp(1.0 - (rho * rho), min=1e-4)
-    nll = 0.5 * (
-        logvar[:, 0]
-        + logvar[:, 1]
-        + torch.log(den)
-        + ((zh * zh) + (za * za) - (2.0 * rho * zh * za)) / den
-    )
-    loss_s = weighted_mean(nll, weights)
-    y_margin = y_h - y_a
-    pred_margin = mu[:, 0] - mu[:, 1]
-    m_non_draw = torch.abs(y_margin) > 1e-6
-    if torch.any(m_non_draw):
-        sign = torch.sign(y_margin[m_non_draw])
-        rank_weights = weights[m_non_draw] if weights is not None else None
-        loss_rank = weighted_mean(
-            F.softplus(-(sign * pred_margin[m_non_draw])),
-            rank_weights,
-        )
-    else:
-        loss_rank = torch.tensor(0.0, dtype=loss_w.dtype, device=loss_w.device)
-    var_reg = torch.mean(logvar ** 2)
-    emb_reg = torch.mean(model.team_emb.weight ** 2)
-    expert_usage = torch.mean(out["expert_weights"], dim=0)
-    expert_target = torch.full_like(expert_usage, 1.0 / float(out["expert_weights"].shape[1]))
-    expert_balance = torch.mean((expert_usage - expert_target) ** 2)
-    return (
-        (args.winner_loss_weight * loss_w)
-        + (args.score_loss_weight * loss_s)
-        + (args.ranking_loss_weight * loss_rank)
-        + (args.var_reg_weight * var_reg)
-        + (args.embedding_l2_weight * emb_reg)
-        + (args.expert_balance_weight * expert_balance)
+def _model_forward(model: V5Model, bundle: SplitBundle) -> Dict[str, torch.Tensor]:
+    return model(bundle.ih, bundle.ia, bundle.il, bundle.ir, bundle.xh, bundle.xa, bundle.ioh, bundle.ioa)
+
+
+def train_v5_seed(data: Dict[str, torch.Tensor], task: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Seed-pool entry point: train one V5 seed on shared inputs (see SeedTrainingPool)."""
+    args = task["args"]
+    torch.manual_seed(int(task["torch_seed"]))
+    model = V5Model(**task["model_kwargs"])
+    if task.get("init_state") is not None:
+        model.load_state_dict(state_from_numpy(task["init_state"]), strict=True)
+    opt = torch.optim.AdamW(model.parameters(), lr=float(task["lr"]), weight_decay=1e-4)
+    train_epochs(
+        model,
+        PackedTrainingData(data),
+        opt,
+        epochs=int(task["epochs"]),
+        batch_size=args.batch_size,
+        loss_weights=LossWeights.from_args(args),
+        grad_accum_steps=args.grad_accum_steps,
+        compile_model=args.torch_compile,
     )
-
-
-def _train_model(model: V5Model, bundle: SplitBundle, epochs: int, batch_size: int, optimizer: torch.optim.Optimizer, args: Any) -> None:
-    n_rows = bundle.n_rows
-    for _ in range(max(1, int(epochs))):
-        model.train()
-        perm = torch.randperm(n_rows)
-        for i in range(0, n_rows, max(1, batch_size)):
-            idx = perm[i : i + batch_size]
-            out = _model_forward(model, bundle, idx)
-            loss = _loss_from_outputs(
-                model,
-                out,
-                bundle.y[idx],
-                (bundle.weights[idx] if bundle.weights is not None else None),
-                args,
-            )
-            optimizer.zero_grad()
-            loss.backward()
-            torch.nn.utils.clip_grad_norm_(model.parameters(), 1.0)
-            optimizer.step()
+    return state_to_numpy(model.state_dict())
 
 
 def _predict_bundle(
@@ -527,6 +482,38 @@ def main() -> None:
     parser.add_argument("--train-all-completed", action="store_true")
     parser.add_argument("--wf-start-train", type=int, default=80)
     parser.add_argument("--wf-step", type=int, default=20)
+    parser.add_argument(
+        "--wf-warm-epochs",
+        type=int,
+        default=3,
+        help="Fine-tune epochs (at --finetune-lr) for walk-forward chunks warm-started from the previous chunk.",
+    )
+    parser.add_argument(
+        "--wf-cold-start",
+        action="store_true",
+        help="Rebuild sequences and train every walk-forward chunk from scratch (slow reference mode).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "With --train-all-completed: fine-tune each league's deployed seeds on its newly completed "
+            "matches plus a replay buffer and recalibrate; leagues without new matches are left untouched."
+        ),
+    )
+    parser.add_argument("--incremental-epochs", type=int, default=3, help="Fine-tune epochs (at --finetune-lr) for --incremental.")
+    parser.add_argument("--replay-rows", type=int, default=256, help="Most recent already-trained rows replayed with the new matches.")
+    parser.add_argument(
+        "--incremental-max-new-rows",
+        type=int,
+        default=200,
+        help="Leagues with more new rows than this get a full retrain instead.",
+    )
+    parser.add_argument(
+        "--incremental-league-ids",
+        default="",
+        help="Comma-separated league IDs: with --incremental, only these leagues are refreshed; the rest keep their deployed models.",
+    )
     parser.add_argument("--seq-len", type=int, default=10)
     parser.add_argument("--emb-dim", type=int, default=32)
     parser.add_argument("--hidden-dim", type=int, default=80)
@@ -541,9 +528,33 @@ def main() -> None:
     parser.add_argument("--global-pretrain-epochs", type=int, default=24)
     parser.add_argument("--finetune-epochs", type=int, default=14)
     parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument(
+        "--grad-accum-steps",
+        type=int,
+        default=1,
+        help="Mini-batches per optimizer step (effective batch = batch-size x steps).",
+    )
+    parser.add_argument("--torch-compile", action="store_true", help="Train through torch.compile (falls back to eager).")
     parser.add_argument("--lr", type=float, default=1e-3)
     parser.add_argument("--finetune-lr", type=float, default=3e-4)
     parser.add_argument("--ensemble-seeds", type=str, default="42,1337,9001")
+    parser.add_argument(
+        "--seed-workers",
+        type=int,
+        default=1,
+        help="Worker processes that train ensemble seeds in parallel (1 = in-process, sequential).",
+    )
+    parser.add_argument(
+        "--seed-torch-threads",
+        type=int,
+        default=0,
+        help="Torch threads per seed worker (0 = CPU count / --seed-workers).",
+    )
+    parser.add_argument(
+        "--no-dataset-cache",
+        action="store_true",
+        help="Rebuild feature tables and sequence tensors instead of using the dataset cache.",
+    )
     parser.add_argument("--winner-loss-weight", type=float, default=1.0)
     parser.add_argument("--score-loss-weight", type=float, default=0.30)
     parser.add_argument("--ranking-loss-weight", type=float, default=0.12)
@@ -574,6 +585,8 @@ def main() -> None:
         raise SystemExit("Use --league-id <id> or --all-leagues")
     if args.walk_forward and args.train_all_completed:
         raise SystemExit("Use either --walk-forward or --train-all-completed, not both.")
+    if args.incremental and not (args.train_all_completed and args.save_v5_models):
+        raise SystemExit("--incremental updates deployed models: use it with --train-all-completed --save-v5-models.")
 
     np.random.seed(args.seed)
     torch.manual_seed(args.seed)
@@ -584,7 +597,8 @@ def main() -> None:
 
     leagues = {args.league_id: LEAGUE_MAPPINGS.get(args.league_id, f"League {args.league_id}")} if args.league_id else LEAGUE_MAPPINGS
     conn = sqlite3.connect(str(db_path))
-    df_all = load_all_df(conn, leagues.keys())
+    dataset_cache = None if args.no_dataset_cache else default_dataset_cache()
+    df_all = load_all_df(conn, leagues.keys(), dataset_cache)
     conn.close()
     if df_all.empty:
         raise SystemExit("No completed games found for selected leagues.")
@@ -619,8 +633,48 @@ def main() -> None:
     global_team_to_idx = build_global_team_to_idx(df_all)
     global_league_to_idx = build_global_league_to_idx(keep_ids)
 
+    def _league_frame(lid: int) -> pd.DataFrame:
+        """Training rows for one league (its linked international pool when enabled)."""
+        if international_pool_enabled(lid, args.international_pool):
+            rows = df_all[df_all["league_id"].isin(get_linked_league_ids(lid))]
+        else:
+            rows = df_all[df_all["league_id"] == lid]
+        return rows.copy().sort_values(["date_event", "event_id"]).reset_index(drop=True)
+
+    # Incremental mode: decide per league whether the deployed seeds can be fine-tuned.
+    incremental_plans: Dict[int, Dict[str, Any]] = {}
+    previous_prod: Dict[str, Any] = {}
+    if args.incremental:
+        plan_config = {
+            "seq_len": int(args.seq_len),
+            "emb_dim": int(args.emb_dim),
+            "hidden_dim": int(args.hidden_dim),
+            "n_experts": int(args.n_experts),
+            "adapter_dim": int(args.adapter_dim),
+            "cross_heads": int(args.cross_heads),
+            "rating_k": float(args.rating_k),
+            "rating_home_adv": float(args.rating_home_adv),
+            "rating_scale": float(args.rating_scale),
+        }
+        only_ids = set(_parse_int_list(args.incremental_league_ids))
+        for lid in keep_ids:
+            if only_ids and int(lid) not in only_ids:
+                plan = {"action": "unchanged", "reason": "not in --incremental-league-ids", "new_rows": 0}
+            else:
+                plan = plan_incremental_update(
+                    _league_frame(lid), lid, "v5", plan_config, args._ensemble_seeds, args.incremental_max_new_rows
+                )
+            incremental_plans[int(lid)] = plan
+            LOG.info("[%s] incremental plan: %s (%s)", leagues[lid], plan["action"], plan["reason"])
+        previous_prod = load_previous_report(Path("artifacts") / "maz_maxed_v5_prod_latest.json")
+    needs_full_train = not args.incremental or any(p["action"] == "full" for p in incremental_plans.values())
+    retrained_ids: List[int] = []
+
+    seed_pool = SeedTrainingPool(args.seed_workers, args.seed_torch_threads)
+    if seed_pool.workers > 1:
+        LOG.info("[V5] Seed training pool: workers=%s torch_threads=%s", seed_pool.workers, seed_pool.torch_threads)
     pretrained_by_seed: Dict[int, Dict[str, torch.Tensor]] = {}
-    if args.global_pretrain:
+    if args.global_pretrain and needs_full_train:
         pre_parts = []
         for lid in keep_ids:
             g_l = (
@@ -645,8 +699,9 @@ def main() -> None:
             league_stats_g = build_league_score_stats(df_pre)
             league_env_stats_g = build_league_environment_stats(df_pre, args.rating_home_adv)
             reg_map_g = detect_regime_map_by_league(df_pre)
-            home_seq_g, away_seq_g, home_idx_g, away_idx_g, home_opp_g, away_opp_g, league_idx_g, y_g_raw, league_ids_g, _, _ = build_temporal_sequences(
+            home_seq_g, away_seq_g, home_idx_g, away_idx_g, home_opp_g, away_opp_g, league_idx_g, y_g_raw, league_ids_g, _, _ = cached_temporal_sequences(
                 df_pre,
+                dataset_cache,
                 seq_len=args.seq_len,
                 team_to_idx=global_team_to_idx,
                 league_to_idx=global_league_to_idx,
@@ -663,7 +718,7 @@ def main() -> None:
                 [reg_map_g.get(int(lid), ("balanced_competitive", 1, 1.0))[1] for lid in league_ids_g],
                 dtype=np.int64,
             )
-            bundle_g = _make_bundle(
+            arrays_g = seed_training_arrays(
                 home_seq_g,
                 away_seq_g,
                 home_idx_g,
@@ -675,26 +730,35 @@ def main() -> None:
                 y_g,
                 build_recency_weights(df_pre, args.recency_half_life_days),
             )
-            for s in args._ensemble_seeds:
-                torch.manual_seed(int(s) + 7777)
-                model_g = V5Model(
-                    n_teams=len(global_team_to_idx),
-                    n_leagues=len(global_league_to_idx),
-                    emb_dim=args.emb_dim,
-                    seq_dim=int(home_seq_g.shape[-1]),
-                    hidden_dim=args.hidden_dim,
-                    n_experts=args.n_experts,
-                    adapter_dim=args.adapter_dim,
-                    cross_heads=args.cross_heads,
-                )
-                opt_g = torch.optim.AdamW(model_g.parameters(), lr=args.lr, weight_decay=1e-4)
-                _train_model(model_g, bundle_g, args.global_pretrain_epochs, args.batch_size, opt_g, args)
-                pretrained_by_seed[int(s)] = model_g.state_dict()
+            model_kwargs_g = {
+                "n_teams": len(global_team_to_idx),
+                "n_leagues": len(global_league_to_idx),
+                "emb_dim": args.emb_dim,
+                "seq_dim": int(home_seq_g.shape[-1]),
+                "hidden_dim": args.hidden_dim,
+                "n_experts": args.n_experts,
+                "adapter_dim": args.adapter_dim,
+                "cross_heads": args.cross_heads,
+            }
+            tasks_g = [
+                {
+                    "torch_seed": int(s) + 7777,
+                    "model_kwargs": model_kwargs_g,
+                    "init_state": None,
+                    "lr": float(args.lr),
+                    "epochs": int(args.global_pretrain_epochs),
+                    "args": args,
+                }
+                for s in args._ensemble_seeds
+            ]
+            states_g = seed_pool.train(train_v5_seed, arrays_g, tasks_g)
+            for s, state_g in zip(args._ensemble_seeds, states_g):
+                pretrained_by_seed[int(s)] = state_g
                 if args.save_global_pretrained:
                     out_dir = Path("artifacts")
                     out_dir.mkdir(exist_ok=True)
                     gp = out_dir / f"global_pretrained_v5_seed_{int(s)}.pt"
-                    torch.save(model_g.state_dict(), gp)
+                    torch.save(state_g, gp)
                 LOG.info("[V5] Global pretraining done for seed=%s", int(s))
 
     report: Dict[str, Any] = {
@@ -710,6 +774,12 @@ def main() -> None:
             "train_all_completed": bool(args.train_all_completed),
             "wf_start_train": args.wf_start_train,
             "wf_step": args.wf_step,
+            "wf_warm_epochs": args.wf_warm_epochs,
+            "wf_cold_start": bool(args.wf_cold_start),
+            "incremental": bool(args.incremental),
+            "incremental_epochs": args.incremental_epochs,
+            "replay_rows": args.replay_rows,
+            "incremental_max_new_rows": args.incremental_max_new_rows,
             "seq_len": args.seq_len,
             "emb_dim": args.emb_dim,
             "hidden_dim": args.hidden_dim,
@@ -724,9 +794,14 @@ def main() -> None:
             "global_pretrain_epochs": args.global_pretrain_epochs,
             "finetune_epochs": args.finetune_epochs,
             "batch_size": args.batch_size,
+            "grad_accum_steps": args.grad_accum_steps,
+            "torch_compile": bool(args.torch_compile),
             "lr": args.lr,
             "finetune_lr": args.finetune_lr,
             "ensemble_seeds": args._ensemble_seeds,
+            "seed_workers": int(seed_pool.workers),
+            "seed_torch_threads": int(seed_pool.torch_threads),
+            "dataset_cache": str(dataset_cache.root) if dataset_cache is not None else None,
             "winner_loss_weight": args.winner_loss_weight,
             "score_loss_weight": args.score_loss_weight,
             "ranking_loss_weight": args.ranking_loss_weight,
@@ -767,7 +842,16 @@ def main() -> None:
         te_df: pd.DataFrame,
         save_models: bool,
         train_all_mode: bool = False,
+        prepared: Optional[Dict[str, Any]] = None,
+        warm_states: Optional[Dict[int, Dict[str, torch.Tensor]]] = None,
+        warm_epochs: Optional[int] = None,
+        finetune_from: int = 0,
     ) -> Dict[str, Any]:
+        """
+        Train one split. `warm_states` fine-tunes existing seeds for `warm_epochs`
+        (default --wf-warm-epochs); `finetune_from` limits the rows the seeds are
+        trained on to `tr_df[finetune_from:]`, while calibration still uses all of `tr_df`.
+        """
         min_rows = max(1, int(getattr(args, "min_train_rows", 1)))
         if len(tr_df) < min_rows or (len(te_df) < 1 and not train_all_mode):
             return {
@@ -775,27 +859,38 @@ def main() -> None:
                 "reason": f"insufficient split rows (have={len(tr_df)}, need>={min_rows})",
             }
 
-        league_stats = build_league_score_stats(tr_df)
-        league_env_stats = build_league_environment_stats(tr_df, args.rating_home_adv)
-        home_seq, away_seq, home_idx, away_idx, home_opp_idx, away_opp_idx, league_idx, y_raw, league_ids_row, team_to_idx, _ = build_temporal_sequences(
-            pd.concat([tr_df, te_df], axis=0).reset_index(drop=True),
-            seq_len=args.seq_len,
-            team_to_idx=global_team_to_idx,
-            league_to_idx=global_league_to_idx,
-            league_stats=league_stats,
-            league_env_stats=league_env_stats,
-            rating_k=args.rating_k,
-            rating_home_adv=args.rating_home_adv,
-            rating_scale=args.rating_scale,
-        )
+        if prepared is None:
+            prepared = prepare_split_sequences(
+                tr_df,
+                te_df,
+                seq_len=args.seq_len,
+                team_to_idx=global_team_to_idx,
+                league_to_idx=global_league_to_idx,
+                rating_k=args.rating_k,
+                rating_home_adv=args.rating_home_adv,
+                rating_scale=args.rating_scale,
+            )
+        home_seq = prepared["home_seq"]
+        away_seq = prepared["away_seq"]
+        home_idx = prepared["home_idx"]
+        away_idx = prepared["away_idx"]
+        home_opp_idx = prepared["home_opp_idx"]
+        away_opp_idx = prepared["away_opp_idx"]
+        league_idx = prepared["league_idx"]
+        y_raw = prepared["y_raw"]
+        league_ids_row = prepared["league_ids_row"]
+        team_to_idx = prepared["team_to_idx"]
+        league_to_idx = prepared.get("league_to_idx", global_league_to_idx)
+        league_stats = prepared["league_stats"]
+        league_env_stats = prepared["league_env_stats"]
+        norm_stats = prepared["norm_stats"]
         n_train = len(tr_df)
         n_test = len(te_df)
-        home_seq, away_seq, norm_stats = normalize_sequences(home_seq, away_seq, n_train)
         y_scaled = scale_score_targets(y_raw, league_ids_row, league_stats)
         regime_name, regime_idx, regime_unc_mult = detect_regime(tr_df)
         regime_idx_tr = np.full((n_train,), int(regime_idx), dtype=np.int64)
         regime_idx_te = np.full((n_test,), int(regime_idx), dtype=np.int64)
-        train_bundle = _make_bundle(
+        train_arrays = seed_training_arrays(
             home_seq[:n_train],
             away_seq[:n_train],
             home_idx[:n_train],
@@ -807,6 +902,18 @@ def main() -> None:
             y_scaled[:n_train],
             build_recency_weights(tr_df, args.recency_half_life_days),
         )
+        train_bundle = _make_bundle(
+            train_arrays["xh"],
+            train_arrays["xa"],
+            train_arrays["ih"],
+            train_arrays["ia"],
+            train_arrays["ioh"],
+            train_arrays["ioa"],
+            train_arrays["il"],
+            train_arrays["ir"],
+            train_arrays["y"],
+            train_arrays["w"],
+        )
         test_bundle = _make_bundle(
             home_seq[n_train:],
             away_seq[n_train:],
@@ -838,25 +945,45 @@ def main() -> None:
         emb_norm_stds: List[float] = []
         expert_usages: List[List[float]] = []
         saved_seed_models: List[str] = []
+        seed_states: Dict[int, Dict[str, torch.Tensor]] = {}
 
+        model_kwargs = {
+            "n_teams": len(team_to_idx),
+            "n_leagues": len(league_to_idx),
+            "emb_dim": args.emb_dim,
+            "seq_dim": int(home_seq.shape[-1]),
+            "hidden_dim": args.hidden_dim,
+            "n_experts": args.n_experts,
+            "adapter_dim": args.adapter_dim,
+            "cross_heads": args.cross_heads,
+        }
+        seed_tasks: List[Dict[str, Any]] = []
         for s in args._ensemble_seeds:
-            torch.manual_seed(int(s) + int(lid))
-            model = V5Model(
-                n_teams=len(global_team_to_idx),
-                n_leagues=len(global_league_to_idx),
-                emb_dim=args.emb_dim,
-                seq_dim=int(home_seq.shape[-1]),
-                hidden_dim=args.hidden_dim,
-                n_experts=args.n_experts,
-                adapter_dim=args.adapter_dim,
-                cross_heads=args.cross_heads,
-            )
-            if int(s) in pretrained_by_seed:
-                model.load_state_dict(pretrained_by_seed[int(s)], strict=True)
+            warm_state = warm_states.get(int(s)) if warm_states else None
+            init_state = warm_state if warm_state is not None else pretrained_by_seed.get(int(s))
             use_lr = float(args.finetune_lr if args.global_pretrain else args.lr)
             use_epochs = int(args.finetune_epochs if args.global_pretrain else args.epochs)
-            opt = torch.optim.AdamW(model.parameters(), lr=use_lr, weight_decay=1e-4)
-            _train_model(model, train_bundle, use_epochs, args.batch_size, opt, args)
+            if warm_state is not None:
+                # Warm seeds (previous walk-forward chunk, or the deployed model) already saw all but the newest rows.
+                use_lr = float(args.finetune_lr)
+                use_epochs = int(warm_epochs if warm_epochs is not None else args.wf_warm_epochs)
+            seed_tasks.append(
+                {
+                    "torch_seed": int(s) + int(lid),
+                    "model_kwargs": model_kwargs,
+                    "init_state": state_to_numpy(init_state) if init_state is not None else None,
+                    "lr": use_lr,
+                    "epochs": use_epochs,
+                    "args": args,
+                }
+            )
+        fit_arrays = {k: v[finetune_from:] for k, v in train_arrays.items()} if finetune_from else train_arrays
+        trained_states = seed_pool.train(train_v5_seed, fit_arrays, seed_tasks)
+
+        for s, trained_state in zip(args._ensemble_seeds, trained_states):
+            model = V5Model(**model_kwargs)
+            model.load_state_dict(trained_state, strict=True)
+            seed_states[int(s)] = trained_state
 
             pred_tr = _predict_bundle(model, train_bundle, league_ids_row[:n_train], league_stats, regime_unc_mult)
             if n_test > 0:
@@ -1000,6 +1127,7 @@ def main() -> None:
             "high_confidence_correct": hc_correct,
             "expert_usage_avg": np.mean(np.array(expert_usages, dtype=float), axis=0).tolist() if expert_usages else None,
             "saved_seed_models": saved_seed_models,
+            "seed_states": seed_states,
             "team_to_idx": team_to_idx,
             "league_stats": league_stats,
             "league_env_stats": league_env_stats,
@@ -1017,7 +1145,7 @@ def main() -> None:
                         "league_id": int(lid),
                         "league_name": name,
                         "team_to_idx": team_to_idx,
-                        "league_to_idx": global_league_to_idx,
+                        "league_to_idx": league_to_idx,
                         "league_score_stats_train": {int(k): (float(v[0]), float(v[1])) for k, v in league_stats.items()},
                         "league_env_stats_train": {
                             int(k): {
@@ -1052,6 +1180,7 @@ def main() -> None:
                         "expert_usage_avg": out["expert_usage_avg"],
                         "ensemble_seeds": args._ensemble_seeds,
                         "saved_seed_models": saved_seed_models,
+                        "trained_through": trained_through_marker(tr_df),
                     },
                     f,
                 )
@@ -1060,34 +1189,60 @@ def main() -> None:
 
     for lid in keep_ids:
         name = leagues[lid]
+        g = _league_frame(lid)
         if international_pool_enabled(lid, args.international_pool):
-            pool_ids = get_linked_league_ids(lid)
-            g = (
-                df_all[df_all["league_id"].isin(pool_ids)]
-                .copy()
-                .sort_values(["date_event", "event_id"])
-                .reset_index(drop=True)
-            )
-            n_own = int((df_all["league_id"] == lid).sum())
             LOG.info(
                 "[%s] international pool enabled: own_rows=%s pooled_rows=%s pool_leagues=%s",
                 name,
-                n_own,
+                int((df_all["league_id"] == lid).sum()),
                 len(g),
-                pool_ids,
-            )
-        else:
-            g = (
-                df_all[df_all["league_id"] == lid]
-                .copy()
-                .sort_values(["date_event", "event_id"])
-                .reset_index(drop=True)
+                get_linked_league_ids(lid),
             )
         n = len(g)
         if args.train_all_completed:
-            LOG.info("[%s] full-train mode: using all completed games (n=%s)", name, n)
+            plan = incremental_plans.get(int(lid))
             te_empty = g.iloc[0:0].copy()
-            out = _run_split(lid, name, g, te_empty, save_models=True, train_all_mode=True)
+            if plan is not None and plan["action"] == "unchanged":
+                LOG.info("[%s] incremental: %s; deployed model kept", name, plan["reason"])
+                report["summary"]["unchanged"] = report["summary"].get("unchanged", 0) + 1
+                kept = dict(previous_prod.get(str(lid)) or {"name": name, "status": "unchanged"})
+                kept["incremental"] = {"action": "unchanged", "reason": plan["reason"], "new_rows": 0}
+                report["leagues"][str(lid)] = kept
+                continue
+            if plan is not None and plan["action"] == "incremental":
+                finetune_from = max(0, n - int(plan["new_rows"]) - max(0, int(args.replay_rows)))
+                LOG.info(
+                    "[%s] incremental fine-tune: new_rows=%s replay_rows=%s epochs=%s",
+                    name,
+                    plan["new_rows"],
+                    n - int(plan["new_rows"]) - finetune_from,
+                    args.incremental_epochs,
+                )
+                out = _run_split(
+                    lid,
+                    name,
+                    g,
+                    te_empty,
+                    save_models=True,
+                    train_all_mode=True,
+                    prepared=prepare_incremental_sequences(
+                        g,
+                        plan["meta"],
+                        seq_len=args.seq_len,
+                        rating_k=args.rating_k,
+                        rating_home_adv=args.rating_home_adv,
+                        rating_scale=args.rating_scale,
+                        dataset_cache=dataset_cache,
+                    ),
+                    warm_states=plan["states"],
+                    warm_epochs=args.incremental_epochs,
+                    finetune_from=finetune_from,
+                )
+            else:
+                if plan is not None:
+                    LOG.info("[%s] incremental: full retrain (%s)", name, plan["reason"])
+                LOG.info("[%s] full-train mode: using all completed games (n=%s)", name, n)
+                out = _run_split(lid, name, g, te_empty, save_models=True, train_all_mode=True)
             if not out.get("ok"):
                 report["summary"]["skipped"] += 1
                 report["leagues"][str(lid)] = {"name": name, "status": "skipped", "reason": str(out.get("reason", "train failed"))}
@@ -1096,7 +1251,7 @@ def main() -> None:
             payload = {
                 "name": name,
                 "status": "trained_only",
-                "mode": "train_all_completed",
+                "mode": "incremental" if (plan is not None and plan["action"] == "incremental") else "train_all_completed",
                 "train_rows": int(out["train_rows"]),
                 "test_rows": 0,
                 "ensemble_size": int(len(args._ensemble_seeds)),
@@ -1121,6 +1276,9 @@ def main() -> None:
             if args.save_v5_models and out.get("saved_seed_models"):
                 payload["saved_seed_models"] = out["saved_seed_models"]
                 payload["saved_meta"] = out.get("saved_meta")
+            if plan is not None:
+                payload["incremental"] = {"action": plan["action"], "reason": plan["reason"], "new_rows": plan["new_rows"]}
+                retrained_ids.append(int(lid))
             report["leagues"][str(lid)] = payload
         elif args.walk_forward:
             start = max(max(1, int(args.min_train_rows)), int(args.wf_start_train))
@@ -1138,11 +1296,39 @@ def main() -> None:
             hc_total = 0
             hc_correct = 0
             last_ok: Optional[Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Any]]] = None
+            # Sequences are built once per league; each chunk warm-starts from the previous chunk's seeds.
+            wf_sequences = None
+            if not args.wf_cold_start:
+                wf_sequences = WalkForwardSequences(
+                    g,
+                    seq_len=args.seq_len,
+                    team_to_idx=global_team_to_idx,
+                    league_to_idx=global_league_to_idx,
+                    rating_k=args.rating_k,
+                    rating_home_adv=args.rating_home_adv,
+                    rating_scale=args.rating_scale,
+                    dataset_cache=dataset_cache,
+                )
+            warm_states: Optional[Dict[int, Dict[str, torch.Tensor]]] = None
+            save_out: Dict[str, Any] = {}
             for chunk_i, cut in enumerate(range(start, n, step), start=1):
                 nxt = min(n, cut + step)
                 tr = g.iloc[:cut].copy()
                 te = g.iloc[cut:nxt].copy()
-                out = _run_split(lid, name, tr, te, save_models=False)
+                if wf_sequences is None:
+                    out = _run_split(lid, name, tr, te, save_models=False)
+                else:
+                    out = _run_split(
+                        lid,
+                        name,
+                        tr,
+                        te,
+                        save_models=False,
+                        prepared=wf_sequences.chunk(cut, nxt),
+                        warm_states=warm_states,
+                    )
+                    if out.get("ok"):
+                        warm_states = out["seed_states"]
                 if not out.get("ok"):
                     LOG.warning("[%s] chunk %s/%s skipped: %s", name, chunk_i, total_chunks, out.get("reason", "split failed"))
                     continue
@@ -1171,10 +1357,10 @@ def main() -> None:
                 report["leagues"][str(lid)] = {"name": name, "status": "skipped", "reason": "walk-forward produced no valid chunks"}
                 continue
             if args.save_v5_models:
+                # Saved artifacts are a fresh full fit of the last split, not the
+                # chain of short warm fine-tunes used for the walk-forward metrics.
                 tr_last, te_last, _ = last_ok
                 save_out = _run_split(lid, name, tr_last, te_last, save_models=True)
-            else:
-                save_out = {}
             m_agg = Metrics(
                 winner_accuracy=win_sum / rows_total,
                 home_mae=mae_h_sum / rows_total,
@@ -1286,6 +1472,15 @@ def main() -> None:
                 float(out["low_confidence_rate"]),
             )
 
+    seed_pool.close()
+    if args.incremental:
+        # Leagues whose artifacts were rewritten; the orchestrator publishes only these.
+        report["incremental"] = {
+            "updated": retrained_ids,
+            "fine_tuned": [lid for lid in retrained_ids if incremental_plans[lid]["action"] == "incremental"],
+            "full_retrain": [lid for lid in retrained_ids if incremental_plans[lid]["action"] == "full"],
+            "unchanged": [lid for lid, plan in incremental_plans.items() if plan["action"] == "unchanged"],
+        }
     LOG.info("=== MAZ MAXED V5 Summary ===")
     LOG.info("%s", json.dumps(report["summary"], indent=2))
     LOG.info("=== MAZ MAXED V5 Final League Recap ===")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Backfill `license_key_normalized` on every subscription document.
+
+License verification looks keys up with a single equality query on
+`license_key_normalized` (upper-case, no dashes/spaces). Subscriptions created
+before that field existed are only reachable through the legacy fallback
+queries; run this once per project, then deploy with LICENSE_LEGACY_LOOKUP=0.
+
+Usage:
+  python scripts/migrate_license_key_normalized.py --dry-run
+  python scripts/migrate_license_key_normalized.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+try:
+    from firebase_admin import initialize_app, firestore
+except ImportError:
+    print("Error: firebase-admin not installed")
+    sys.exit(1)
+
+BATCH_SIZE = 400
+
+
+def normalize_license_key(license_key: str) -> str:
+    # Must match main._normalize_license_key.
+    return (license_key or "").strip().upper().replace("-", "").replace(" ", "")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Backfill license_key_normalized on subscriptions.")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing.")
+    args = parser.parse_args()
+
+    initialize_app()
+    db = firestore.client()
+
+    scanned = updated = missing_key = 0
+    batch = db.batch()
+    pending = 0
+    for doc in db.collection("subscriptions").select(["license_key", "license_key_normalized"]).stream():
+        scanned += 1
+        data = doc.to_dict() or {}
+        normalized = normalize_license_key(str(data.get("license_key") or ""))
+        if not normalized:
+            missing_key += 1
+            continue
+        if data.get("license_key_normalized") == normalized:
+            continue
+        updated += 1
+        if args.dry_run:
+            continue
+        batch.update(doc.reference, {"license_key_normalized": normalized})
+        pending += 1
+        if pending >= BATCH_SIZE:
+            batch.commit()
+            batch = db.batch()
+            pending = 0
+    if pending:
+        batch.commit()
+
+    verb = "Would update" if args.dry_run else "Updated"
+    print(f"Scanned {scanned} subscriptions. {verb} {updated}. Skipped {missing_key} without a license_key.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
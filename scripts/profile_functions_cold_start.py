@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Profile cold-start import cost of the Cloud Functions entry module per endpoint.
+
+Every function in `rugby-ai-predictor/main.py` is deployed from the same module,
+so each cold start pays for the module-level imports plus whatever the endpoint
+imports on first use. This script measures both parts in a fresh interpreter per
+endpoint group and records which heavy libraries ended up loaded.
+
+Usage:
+  python scripts/profile_functions_cold_start.py
+  python scripts/profile_functions_cold_start.py --repeat 5 --check --output cold_start.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+FUNCTIONS_DIR = ROOT / "rugby-ai-predictor"
+
+# Modules each endpoint group imports on its first request (mirrors the
+# function-level imports in main.py).
+ENDPOINT_FIRST_USE_IMPORTS: Dict[str, List[str]] = {
+    "licensing": ["firebase_admin.firestore"],
+    "email_login": ["firebase_admin.firestore", "smtplib", "email.mime.text", "email.mime.multipart"],
+    "proxy_video_http": ["requests", "urllib.parse"],
+    "predict": [
+        "firebase_admin.firestore",
+        "prediction.hybrid_predictor",
+        "prediction.enhanced_predictor",
+        "prediction.storage_loader",
+        "prediction.v4_runtime",
+        "prediction.v5_runtime",
+    ],
+    "news": [
+        "firebase_admin.firestore",
+        "prediction.hybrid_predictor",
+        "prediction.news_service",
+        "prediction.sportdevs_client",
+        "prediction.sportsdb_client",
+        "prediction.config",
+        "prediction.social_media_fetcher",
+        "google.cloud.translate_v2",
+    ],
+    "standings": ["firebase_admin.firestore", "prediction.sportradar_client", "prediction.standings_compute"],
+    "lineups": [
+        "prediction.sportradar_client",
+        "prediction.lineups_normalize",
+        "prediction.lineups_match_list",
+        "prediction.jersey_kits",
+    ],
+    "historical_predictions": ["firebase_admin.firestore", "prediction.db"],
+    "historical_backtest": ["firebase_admin.firestore", "prediction.features", "pandas", "xgboost"],
+    "match_data_health": ["firebase_admin.firestore", "prediction.match_data_health"],
+}
+
+ML_MODULES = ("torch", "xgboost", "pandas", "numpy", "sklearn")
+WATCHED_MODULES = ML_MODULES + (
+    "google.cloud.firestore",
+    "google.cloud.translate_v2",
+    "requests",
+    "prediction.news_service",
+)
+
+# Endpoints that must cold-start without any ML library.
+ML_FREE_ENDPOINTS = ("licensing", "email_login", "proxy_video_http")
+
+_CHILD_CODE = r"""
+import importlib, json, sys, time
+t0 = time.perf_counter()
+import main  # noqa: F401
+t1 = time.perf_counter()
+after_main = sorted(m for m in WATCHED if m in sys.modules)
+failed = {}
+for name in MODULES:
+    try:
+        importlib.import_module(name)
+    except Exception as exc:
+        failed[name] = f"{type(exc).__name__}: {exc}"
+t2 = time.perf_counter()
+print(json.dumps({
+    "main_import_ms": (t1 - t0) * 1000.0,
+    "first_use_import_ms": (t2 - t1) * 1000.0,
+    "watched_after_main": after_main,
+    "watched_after_first_use": sorted(m for m in WATCHED if m in sys.modules),
+    "failed_imports": failed,
+}))
+"""
+
+
+def _run_child(modules: List[str]) -> Dict[str, Any]:
+    code = f"MODULES = {modules!r}\nWATCHED = {list(WATCHED_MODULES)!r}\n{_CHILD_CODE}"
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=str(FUNCTIONS_DIR),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        return {"error": (proc.stderr or proc.stdout).strip().splitlines()[-1:]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def profile_endpoint(endpoint: str, repeat: int) -> Dict[str, Any]:
+    runs = [_run_child(ENDPOINT_FIRST_USE_IMPORTS[endpoint]) for _ in range(max(1, repeat))]
+    ok_runs = [r for r in runs if "error" not in r]
+    if not ok_runs:
+        return {"endpoint": endpoint, "error": runs[-1].get("error")}
+
+    last = ok_runs[-1]
+    main_ms = statistics.median(r["main_import_ms"] for r in ok_runs)
+    first_use_ms = statistics.median(r["first_use_import_ms"] for r in ok_runs)
+    loaded_ml = [m for m in last["watched_after_first_use"] if m in ML_MODULES]
+    return {
+        "endpoint": endpoint,
+        "runs": len(ok_runs),
+        "main_import_ms": round(main_ms, 2),
+        "first_use_import_ms": round(first_use_ms, 2),
+        "cold_start_import_ms": round(main_ms + first_use_ms, 2),
+        "watched_after_main": last["watched_after_main"],
+        "watched_after_first_use": last["watched_after_first_use"],
+        "ml_modules_loaded": loaded_ml,
+        "failed_imports": last["failed_imports"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Profile Cloud Functions cold-start import cost per endpoint.")
+    parser.add_argument("--endpoint", action="append", choices=sorted(ENDPOINT_FIRST_USE_IMPORTS), help="Limit to endpoint group(s).")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per endpoint (median is reported).")
+    parser.add_argument("--output", type=str, default="", help="Optional JSON output path.")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit non-zero if main.py imports ML libraries at module level or an ML-free endpoint loads them.",
+    )
+    args = parser.parse_args()
+
+    endpoints = args.endpoint or list(ENDPOINT_FIRST_USE_IMPORTS)
+    results = [profile_endpoint(endpoint, args.repeat) for endpoint in endpoints]
+
+    print(f"{'endpoint':<24} {'main ms':>9} {'first-use ms':>13} {'total ms':>9}  ml modules")
+    for row in results:
+        if "error" in row:
+            print(f"{row['endpoint']:<24} ERROR {row['error']}")
+            continue
+        print(
+            f"{row['endpoint']:<24} {row['main_import_ms']:>9.1f} {row['first_use_import_ms']:>13.1f} "
+            f"{row['cold_start_import_ms']:>9.1f}  {','.join(row['ml_modules_loaded']) or '-'}"
+        )
+
+    violations: List[str] = []
+    for row in results:
+        if "error" in row:
+            continue
+        eager_ml = [m for m in row["watched_after_main"] if m in ML_MODULES]
+        if eager_ml:
+            violations.append(f"main.py imports {eager_ml} at module level")
+        if row["endpoint"] in ML_FREE_ENDPOINTS and row["ml_modules_loaded"]:
+            violations.append(f"{row['endpoint']} loads {row['ml_modules_loaded']} on first use")
+
+    report = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "repeat": args.repeat,
+        "results": results,
+        "violations": sorted(set(violations)),
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nWrote {args.output}")
+
+    for violation in report["violations"]:
+        print(f"VIOLATION: {violation}")
+    if args.check and report["violations"]:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,12 +7,16 @@ Backward-compatible with the original V4 publisher, while also supporting V5.
 
 import argparse
 import json
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict
 
 from firebase_admin import firestore, get_app, initialize_app
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "rugby-ai-predictor"))
+from prediction.serving_version import bump_serving_version  # noqa: E402
+
 
 def _ai_rating_from_accuracy(accuracy_pct: float) -> str:
     if accuracy_pct >= 80:
@@ -110,6 +114,9 @@ def publish(
         db.collection("league_metrics").document(str(league_id)).set(payload, merge=True)
         updated += 1
 
+    if updated:
+        # Invalidates the functions' cached metrics/history responses.
+        bump_serving_version(db, "models")
     return updated
 
 
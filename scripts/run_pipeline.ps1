@@ -18,6 +18,9 @@ $env:PYTHONIOENCODING = "utf-8"
 $RepoRoot = Split-Path -Parent $PSScriptRoot
 Set-Location $RepoRoot
 
+# Production trainer hyperparameters (shared with scripts/incremental_retrain.py).
+$ProdTrainArgs = @((Get-Content "scripts/prod_train_args.json" -Raw | ConvertFrom-Json).v4)
+
 Write-Host "1. Detecting completed matches (scores from API)..."
 python scripts/detect_completed_matches.py --db $DbPath --verbose
 
@@ -38,10 +41,10 @@ python scripts/sync_to_firestore.py --db $DbPath --project-id rugby-ai-61fd0
 
 if (-not $SkipRetrain) {
   Write-Host "6. Retraining V4 eval (80/20 walk-forward)..."
-  python scripts/maz_boss_maxed_v4.py --all-leagues --walk-forward --wf-start-train 80 --wf-step 20 --min-games 100 --seq-len 10 --emb-dim 32 --hidden-dim 64 --rating-k 0.06 --rating-home-adv 2.0 --rating-scale 7.0 --ensemble-seeds "42,1337,9001" --global-pretrain --global-pretrain-epochs 20 --finetune-epochs 12 --lr 0.001 --finetune-lr 0.0003 --batch-size 128 --winner-loss-weight 1.0 --score-loss-weight 0.25 --ranking-loss-weight 0.10 --embedding-l2-weight 0.0005 --var-reg-weight 0.002 --confidence-variance-threshold 40 --save-v4-models --save-global-pretrained --save-report --log-level INFO
+  python scripts/maz_boss_maxed_v4.py --all-leagues --walk-forward --wf-start-train 80 --wf-step 20 @ProdTrainArgs --confidence-variance-threshold 40 --save-v4-models --save-report --log-level INFO
 
   Write-Host "7. Retraining V4 production brain (100% completed games)..."
-  python scripts/maz_boss_maxed_v4.py --all-leagues --train-all-completed --min-games 100 --seq-len 10 --emb-dim 32 --hidden-dim 64 --rating-k 0.06 --rating-home-adv 2.0 --rating-scale 7.0 --ensemble-seeds "42,1337,9001" --global-pretrain --global-pretrain-epochs 20 --finetune-epochs 12 --lr 0.001 --finetune-lr 0.0003 --batch-size 128 --winner-loss-weight 1.0 --score-loss-weight 0.25 --ranking-loss-weight 0.10 --embedding-l2-weight 0.0005 --var-reg-weight 0.002 --save-v4-models --save-global-pretrained --save-report --log-level INFO
+  python scripts/maz_boss_maxed_v4.py --all-leagues --train-all-completed @ProdTrainArgs --save-v4-models --save-report --log-level INFO
 
   Write-Host "8. Uploading V4 artifacts to Cloud Storage..."
   python scripts/upload_models_to_storage.py --bucket rugby-ai-61fd0.firebasestorage.app --models-dir artifacts
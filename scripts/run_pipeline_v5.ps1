@@ -4,6 +4,7 @@ param(
   [int]$DaysBack = 90,
   [switch]$IncludeHistory = $false,
   [switch]$SkipRetrain = $false,
+  [switch]$FullRetrain = $false,
   [switch]$SkipDeploy = $false
 )
 
@@ -18,6 +19,9 @@ $env:LIVE_MODEL_FAMILY = "champion"
 $RepoRoot = Split-Path -Parent $PSScriptRoot
 Set-Location $RepoRoot
 
+# Production trainer hyperparameters (shared with scripts/incremental_retrain.py).
+$ProdTrainArgs = @((Get-Content "scripts/prod_train_args.json" -Raw | ConvertFrom-Json).v5)
+
 Write-Host "1. Detecting completed matches (scores from API)..."
 python scripts/detect_completed_matches.py --db $DbPath --verbose
 
@@ -36,12 +40,19 @@ Copy-Item -Path $DbPath -Destination "rugby-ai-predictor/data.sqlite" -Force
 Write-Host "5. Syncing to Firestore (PWA matches)..."
 python scripts/sync_to_firestore.py --db $DbPath --project-id rugby-ai-61fd0
 
-if (-not $SkipRetrain) {
+if ((-not $SkipRetrain) -and (-not $FullRetrain)) {
+  Write-Host "6-8. Incremental V5 refresh (fine-tune + upload only leagues with new completed matches)..."
+  Write-Host "     Run with -FullRetrain for the weekly from-scratch retrain and eval refresh."
+  python scripts/incremental_retrain.py --db $DbPath --family v5 --force --bucket rugby-ai-61fd0.firebasestorage.app
+
+  Write-Host "9. Publishing V5 metrics to Firestore..."
+  python scripts/publish_v5_metrics_to_firestore.py --report artifacts/maz_maxed_v5_metrics_latest.json --prod-report artifacts/maz_maxed_v5_prod_latest.json --project-id rugby-ai-61fd0
+} elseif (-not $SkipRetrain) {
   Write-Host "6. Retraining V5 eval (80/20 walk-forward)..."
-  python scripts/maz_boss_maxed_v5.py --all-leagues --walk-forward --wf-start-train 80 --wf-step 20 --min-games 100 --seq-len 10 --emb-dim 32 --hidden-dim 80 --n-experts 4 --adapter-dim 24 --cross-heads 4 --rating-k 0.06 --rating-home-adv 2.0 --rating-scale 7.0 --ensemble-seeds "42,1337,9001" --global-pretrain --global-pretrain-epochs 24 --finetune-epochs 14 --lr 0.001 --finetune-lr 0.0003 --batch-size 128 --winner-loss-weight 1.0 --score-loss-weight 0.30 --ranking-loss-weight 0.12 --embedding-l2-weight 0.0005 --var-reg-weight 0.002 --expert-balance-weight 0.01 --confidence-variance-threshold 40 --save-v5-models --save-global-pretrained --save-report --log-level INFO
+  python scripts/maz_boss_maxed_v5.py --all-leagues --walk-forward --wf-start-train 80 --wf-step 20 @ProdTrainArgs --confidence-variance-threshold 40 --save-v5-models --save-report --log-level INFO
 
   Write-Host "7. Retraining V5 production brain (100% completed games)..."
-  python scripts/maz_boss_maxed_v5.py --all-leagues --train-all-completed --min-games 100 --seq-len 10 --emb-dim 32 --hidden-dim 80 --n-experts 4 --adapter-dim 24 --cross-heads 4 --rating-k 0.06 --rating-home-adv 2.0 --rating-scale 7.0 --ensemble-seeds "42,1337,9001" --global-pretrain --global-pretrain-epochs 24 --finetune-epochs 14 --lr 0.001 --finetune-lr 0.0003 --batch-size 128 --winner-loss-weight 1.0 --score-loss-weight 0.30 --ranking-loss-weight 0.12 --embedding-l2-weight 0.0005 --var-reg-weight 0.002 --expert-balance-weight 0.01 --save-v5-models --save-global-pretrained --save-report --log-level INFO
+  python scripts/maz_boss_maxed_v5.py --all-leagues --train-all-completed @ProdTrainArgs --save-v5-models --save-report --log-level INFO
 
   Write-Host "8. Uploading V5 artifacts to Cloud Storage..."
   python scripts/upload_models_to_storage.py --bucket rugby-ai-61fd0.firebasestorage.app --models-dir artifacts --family-filter v5
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Mini-batch training loop shared by the V4 and V5 sequence models.
+
+The seed inputs (`SEED_INPUT_KEYS` in maz_boss_maxed_v4) are packed into a few
+contiguous tensors laid out feature-major, e.g. `seq` is (2, n, L, F) for the
+home/away windows and `ids` is (4, n) for team/league/regime ids. Each epoch
+gathers every packed tensor once in shuffled order, so a mini-batch is a set
+of contiguous slices instead of ten fancy-index gathers per step. Shuffling
+uses the same single `torch.randperm(n)` per epoch as the old inline loops,
+so a seed sees the same batches in the same order.
+
+`sequence_model_loss` is the winner BCE + bivariate-normal score NLL + margin
+ranking loss (+ regularisers) that V4 and V5 used to assemble separately; V5
+adds the expert-balance term through `LossWeights.expert_balance`.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+
+import torch
+import torch.nn.functional as F
+
+LOG = logging.getLogger("maz_seq_training")
+
+
+@dataclass(frozen=True)
+class LossWeights:
+    winner: float
+    score: float
+    ranking: float
+    var_reg: float
+    embedding_l2: float
+    expert_balance: float = 0.0
+    score_huber_mix: float = 0.0
+
+    @classmethod
+    def from_args(cls, args: Any, score_huber_mix: float = 0.0) -> "LossWeights":
+        return cls(
+            winner=float(args.winner_loss_weight),
+            score=float(args.score_loss_weight),
+            ranking=float(args.ranking_loss_weight),
+            var_reg=float(args.var_reg_weight),
+            embedding_l2=float(args.embedding_l2_weight),
+            expert_balance=float(getattr(args, "expert_balance_weight", 0.0)),
+            score_huber_mix=float(score_huber_mix),
+        )
+
+
+class SeqBatch(NamedTuple):
+    ih: torch.Tensor
+    ia: torch.Tensor
+    il: torch.Tensor
+    ir: torch.Tensor
+    xh: torch.Tensor
+    xa: torch.Tensor
+    ioh: torch.Tensor
+    ioa: torch.Tensor
+    y: torch.Tensor
+    w: Optional[torch.Tensor]
+
+
+def weighted_mean(values: torch.Tensor, weights: Optional[torch.Tensor]) -> torch.Tensor:
+    if weights is None or weights.numel() == 0:
+        return torch.mean(values)
+    w = weights / torch.clamp(torch.sum(weights), min=1e-6)
+    return torch.sum(values * w)
+
+
+class PackedTrainingData:
+    """Seed inputs packed into contiguous, feature-major tensors."""
+
+    def __init__(self, data: Dict[str, torch.Tensor]):
+        self.n_rows = int(data["y"].shape[0])
+        self.seq = torch.stack([data["xh"], data["xa"]], dim=0).to(torch.float32).contiguous()
+        self.ids = torch.stack([data["ih"], data["ia"], data["il"], data["ir"]], dim=0).to(torch.long).contiguous()
+        self.opp = torch.stack([data["ioh"], data["ioa"]], dim=0).to(torch.long).contiguous()
+        self.y = data["y"].to(torch.float32).contiguous()
+        w = data.get("w")
+        self.w = w.to(torch.float32).contiguous() if w is not None else None
+
+    def num_batches(self, batch_size: int) -> int:
+        step = max(1, int(batch_size))
+        return (self.n_rows + step - 1) // step
+
+    def epoch_batches(self, batch_size: int) -> Iterator[SeqBatch]:
+        """One shuffled pass: gather once, then yield contiguous slices."""
+        perm = torch.randperm(self.n_rows)
+        seq = torch.index_select(self.seq, 1, perm)
+        ids = torch.index_select(self.ids, 1, perm)
+        opp = torch.index_select(self.opp, 1, perm)
+        y = torch.index_select(self.y, 0, perm)
+        w = torch.index_select(self.w, 0, perm) if self.w is not None else None
+        step = max(1, int(batch_size))
+        for i in range(0, self.n_rows, step):
+            j = i + step
+            yield SeqBatch(
+                ih=ids[0, i:j],
+                ia=ids[1, i:j],
+                il=ids[2, i:j],
+                ir=ids[3, i:j],
+                xh=seq[0, i:j],
+                xa=seq[1, i:j],
+                ioh=opp[0, i:j],
+                ioa=opp[1, i:j],
+                y=y[i:j],
+                w=(w[i:j] if w is not None else None),
+            )
+
+
+def bivariate_normal_nll(
+    y_h: torch.Tensor,
+    y_a: torch.Tensor,
+    mu: torch.Tensor,
+    logvar: torch.Tensor,
+    rho_logit: torch.Tensor,
+) -> torch.Tensor:
+    """Per-row NLL of (home, away) scores under a correlated Gaussian (logvar already clamped)."""
+    var = torch.exp(logvar)
+    rho = 0.95 * torch.tanh(rho_logit)
+    zh = (y_h - mu[:, 0]) / torch.sqrt(var[:, 0] + 1e-6)
+    za = (y_a - mu[:, 1]) / torch.sqrt(var[:, 1] + 1e-6)
+    den = torch.clamp(1.0 - (rho * rho), min=1e-4)
+    return 0.5 * (
+        logvar[:, 0]
+        + logvar[:, 1]
+        + torch.log(den)
+        + ((zh * zh) + (za * za) - (2.0 * rho * zh * za)) / den
+    )
+
+
+def sequence_model_loss(
+    team_emb_weight: torch.Tensor,
+    out: Dict[str, torch.Tensor],
+    y: torch.Tensor,
+    weights: Optional[torch.Tensor],
+    lw: LossWeights,
+) -> torch.Tensor:
+    y_w = y[:, 0]
+    y_h = y[:, 1]
+    y_a = y[:, 2]
+    loss_w = weighted_mean(F.binary_cross_entropy_with_logits(out["winner_logit"], y_w, reduction="none"), weights)
+    mu = out["score_mu"]
+    logvar = out["score_logvar"].clamp(-5.0, 4.0)
+    loss_s = weighted_mean(bivariate_normal_nll(y_h, y_a, mu, logvar, out["score_rho_logit"]), weights)
+    if lw.score_huber_mix > 0.0:
+        score_huber = F.huber_loss(mu, torch.stack([y_h, y_a], dim=1), reduction="none").mean(dim=1)
+        loss_s = ((1.0 - lw.score_huber_mix) * loss_s) + (lw.score_huber_mix * weighted_mean(score_huber, weights))
+
+    y_margin = y_h - y_a
+    pred_margin = mu[:, 0] - mu[:, 1]
+    m_non_draw = torch.abs(y_margin) > 1e-6
+    if torch.any(m_non_draw):
+        sign = torch.sign(y_margin[m_non_draw])
+        loss_rank = weighted_mean(
+            F.softplus(-(sign * pred_margin[m_non_draw])),
+            weights[m_non_draw] if weights is not None else None,
+        )
+    else:
+        loss_rank = torch.tensor(0.0, dtype=loss_w.dtype, device=loss_w.device)
+
+    loss = (
+        (lw.winner * loss_w)
+        + (lw.score * loss_s)
+        + (lw.ranking * loss_rank)
+        + (lw.var_reg * torch.mean(logvar**2))
+        + (lw.embedding_l2 * torch.mean(team_emb_weight**2))
+    )
+    if lw.expert_balance != 0.0 and "expert_weights" in out:
+        expert_usage = torch.mean(out["expert_weights"], dim=0)
+        expert_target = torch.full_like(expert_usage, 1.0 / float(out["expert_weights"].shape[1]))
+        loss = loss + (lw.expert_balance * torch.mean((expert_usage - expert_target) ** 2))
+    return loss
+
+
+class _CompiledForward:
+    """
+    Calls a `torch.compile`d model and falls back to the eager model for good on
+    the first failure. Compilation is lazy (it happens on the first forward and
+    on recompiles), so backend/toolchain problems only surface here; an error
+    the eager model also raises still propagates.
+    """
+
+    def __init__(self, model: torch.nn.Module, compiled: Any):
+        self._model = model
+        self._compiled = compiled
+
+    def __call__(self, *args: Any) -> Any:
+        if self._compiled is not None:
+            try:
+                return self._compiled(*args)
+            except Exception as exc:  # noqa: BLE001 - backend/toolchain problems must not stop training
+                LOG.warning("torch.compile failed (%s); training eagerly", exc)
+                self._compiled = None
+        return self._model(*args)
+
+
+def maybe_compile(model: torch.nn.Module, enabled: bool) -> Any:
+    """`torch.compile(model)` when requested and available; eager model otherwise."""
+    if not enabled:
+        return model
+    if not hasattr(torch, "compile"):
+        LOG.warning("torch.compile unavailable in torch %s; training eagerly", torch.__version__)
+        return model
+    try:
+        return _CompiledForward(model, torch.compile(model, dynamic=True))
+    except Exception as exc:  # noqa: BLE001 - backend/toolchain problems must not stop training
+        LOG.warning("torch.compile failed (%s); training eagerly", exc)
+        return model
+
+
+def train_epochs(
+    model: torch.nn.Module,
+    data: PackedTrainingData,
+    optimizer: torch.optim.Optimizer,
+    epochs: int,
+    batch_size: int,
+    loss_weights: LossWeights,
+    grad_accum_steps: int = 1,
+    compile_model: bool = False,
+    max_grad_norm: float = 1.0,
+) -> None:
+    """
+    Train `model` in place. With `grad_accum_steps=k` the optimizer steps once
+    per k mini-batches (and at the end of each epoch) on the averaged gradient;
+    a shorter last group of an epoch is averaged over its own size.
+    """
+    forward = maybe_compile(model, compile_model)
+    accum = max(1, int(grad_accum_steps))
+    n_batches = data.num_batches(batch_size)
+    for _ in range(max(1, int(epochs))):
+        model.train()
+        pending = 0
+        for index, batch in enumerate(data.epoch_batches(batch_size)):
+            if pending == 0:
+                optimizer.zero_grad()
+                group_size = min(accum, n_batches - index)
+            out = forward(batch.ih, batch.ia, batch.il, batch.ir, batch.xh, batch.xa, batch.ioh, batch.ioa)
+            loss = sequence_model_loss(model.team_emb.weight, out, batch.y, batch.w, loss_weights)
+            if group_size > 1:
+                loss = loss / group_size
+            loss.backward()
+            pending += 1
+            if pending == accum:
+                torch.nn.utils.clip_grad_norm_(model.parameters(), max_grad_norm)
+                optimizer.step()
+                pending = 0
+        if pending:
+            torch.nn.utils.clip_grad_norm_(model.parameters(), max_grad_norm)
+            optimizer.step()
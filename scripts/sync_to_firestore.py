@@ -181,6 +181,8 @@ def sync_matches(sqlite_conn: sqlite3.Connection, firestore_db: Any, existing_ma
         ensure_highlightly_match_id_column(sqlite_conn)
     except Exception:
         pass
+    from prediction.db import ensure_fixture_key, fixture_key
+    ensure_fixture_key(sqlite_conn)
     
     # Get all matches from SQLite
     cursor.execute("""
@@ -197,6 +199,7 @@ def sync_matches(sqlite_conn: sqlite3.Connection, firestore_db: Any, existing_ma
             e.venue,
             e.status,
             e.highlightly_match_id,
+            e.fixture_key,
             t1.name as home_team_name,
             t2.name as away_team_name
         FROM event e
@@ -247,6 +250,13 @@ def sync_matches(sqlite_conn: sqlite3.Connection, firestore_db: Any, existing_ma
             'venue': match_data.get('venue'),
             'status': match_data.get('status'),
             'highlightly_match_id': match_data.get('highlightly_match_id'),
+            # Canonical fixture identity; the duplicate scanner indexes on it.
+            'fixture_key': match_data.get('fixture_key') or fixture_key(
+                match_data.get('league_id'),
+                match_data.get('date_event'),
+                match_data.get('home_team_id'),
+                match_data.get('away_team_id'),
+            ),
             'synced_at': SERVER_TIMESTAMP if SERVER_TIMESTAMP else datetime.now()
         }
         
@@ -268,14 +278,20 @@ def sync_matches(sqlite_conn: sqlite3.Connection, firestore_db: Any, existing_ma
                     new_home_score = firestore_data.get('home_score')
                     new_away_score = firestore_data.get('away_score')
                     
+                    changes: Dict[str, Any] = {}
                     # Update if we have new scores (game completed)
                     if (new_home_score is not None and new_away_score is not None and
                         (existing_home_score is None or existing_away_score is None)):
-                        batch.update(ref, {
-                            'home_score': new_home_score,
-                            'away_score': new_away_score,
-                            'synced_at': SERVER_TIMESTAMP if SERVER_TIMESTAMP else datetime.now()
-                        })
+                        changes['home_score'] = new_home_score
+                        changes['away_score'] = new_away_score
+                    # Backfill/refresh the fixture key (bumps synced_at so the
+                    # incremental duplicate scan picks the doc up).
+                    new_fixture_key = firestore_data.get('fixture_key')
+                    if new_fixture_key and existing_data.get('fixture_key') != new_fixture_key:
+                        changes['fixture_key'] = new_fixture_key
+                    if changes:
+                        changes['synced_at'] = SERVER_TIMESTAMP if SERVER_TIMESTAMP else datetime.now()
+                        batch.update(ref, changes)
                         updated += 1
                         batch_count += 1
                     else:
@@ -435,6 +451,14 @@ def main():
         logger.info(f"✅ Matches: {results['synced']} new, {results['updated']} updated, {results['skipped']} skipped")
     
     sqlite_conn.close()
+
+    if not args.dry_run:
+        try:
+            from prediction.serving_version import bump_serving_version
+            bump_serving_version(firestore_db, "events")
+            logger.info("✅ Bumped serving version stamp (events)")
+        except Exception as e:
+            logger.warning(f"⚠️  Could not bump serving version stamp: {e}")
     
     duration = (datetime.now() - start_time).total_seconds()
     logger.info("\n" + "="*60)
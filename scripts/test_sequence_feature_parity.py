@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Parity check: training and serving team sequences must be bit-identical.
+
+Builds a synthetic league in an in-memory SQLite DB, runs the training path
+(`maz_boss_maxed_v4.build_temporal_sequences`) and the serving path
+(`V4RuntimePredictor._build_team_histories`) and compares, for every match,
+the window the model is trained on with the one it would be served.
+
+Also checks that the walk-forward prefix cache (`WalkForwardSequences`) slices
+the same normalized tensors and train-only stats as a per-chunk rebuild, and
+that sequences served from the dataset cache are bit-identical to a rebuild.
+
+Run directly or with pytest:
+    python scripts/test_sequence_feature_parity.py
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import random
+import sqlite3
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+RUGBY_PREDICTOR_ROOT = SCRIPT_DIR.parent / "rugby-ai-predictor"
+if str(RUGBY_PREDICTOR_ROOT) not in sys.path:
+    sys.path.insert(0, str(RUGBY_PREDICTOR_ROOT))
+
+from prediction.dataset_cache import DatasetCache  # noqa: E402
+from prediction.sequence_features import project_sequence_features  # noqa: E402
+from prediction.v4_runtime import V4RuntimePredictor  # noqa: E402
+
+LEAGUE_ID = 4446
+SEQ_LEN = 6
+LEAGUE_STATS = {LEAGUE_ID: (22.5, 9.25)}
+LEAGUE_ENV = {LEAGUE_ID: {"home_strength": 1.3, "rating_home_adv": 2.7}}
+
+
+def _load_v4_training():
+    spec = importlib.util.spec_from_file_location("_maz_v4_parity", SCRIPT_DIR / "maz_boss_maxed_v4.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _synthetic_events(n_matches: int = 240, n_teams: int = 12, seed: int = 7):
+    """One match per day-ish with irregular gaps so rest days, wrap-around and ratings all vary."""
+    rng = random.Random(seed)
+    day = date(2023, 1, 7)
+    events = []
+    for event_id in range(1, n_matches + 1):
+        home, away = rng.sample(range(101, 101 + n_teams), 2)
+        events.append(
+            (event_id, day.isoformat(), home, away, float(rng.randint(0, 55)), float(rng.randint(0, 55)))
+        )
+        if rng.random() < 0.4:
+            day += timedelta(days=rng.choice([1, 3, 7, 13, 40, 60]))
+    return events
+
+
+def _serving_predictor() -> V4RuntimePredictor:
+    # Bypass __init__ (checkpoint loading needs torch); only the history state is exercised.
+    predictor = object.__new__(V4RuntimePredictor)
+    predictor.league_id = LEAGUE_ID
+    predictor.seq_len = SEQ_LEN
+    predictor.seq_dim = 11
+    predictor.league_score_stats = dict(LEAGUE_STATS)
+    predictor.league_env_stats = dict(LEAGUE_ENV)
+    predictor.rating_k = 0.06
+    predictor.rating_home_adv = 2.0
+    predictor.rating_scale = 7.0
+    return predictor
+
+
+def test_training_and_serving_sequences_are_bit_identical():
+    v4 = _load_v4_training()
+    events = _synthetic_events()
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE event (id INTEGER PRIMARY KEY, league_id INTEGER, date_event TEXT, "
+        "home_team_id INTEGER, away_team_id INTEGER, home_score REAL, away_score REAL)"
+    )
+    conn.executemany(
+        "INSERT INTO event VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(eid, LEAGUE_ID, d, h, a, hs, aw) for eid, d, h, a, hs, aw in events],
+    )
+
+    df = pd.DataFrame(
+        {
+            "event_id": [e[0] for e in events],
+            "league_id": LEAGUE_ID,
+            "date_event": pd.to_datetime([e[1] for e in events]),
+            "home_team_id": [e[2] for e in events],
+            "away_team_id": [e[3] for e in events],
+            "home_score": [e[4] for e in events],
+            "away_score": [e[5] for e in events],
+        }
+    )
+    home_seq, away_seq = v4.build_temporal_sequences(
+        df,
+        seq_len=SEQ_LEN,
+        league_stats=LEAGUE_STATS,
+        league_env_stats=LEAGUE_ENV,
+    )[:2]
+    predictor = _serving_predictor()
+
+    # Serving only sees matches strictly before the fixture's day, so compare the
+    # first match of every day (later same-day rows also see earlier same-day games).
+    first_row_of_day = {}
+    for row, event in enumerate(events):
+        first_row_of_day.setdefault(event[1], row)
+
+    checked = 0
+    for match_day, row in first_row_of_day.items():
+        state = predictor._build_team_histories(conn, match_day)
+        for team_id, expected in ((events[row][2], home_seq[row]), (events[row][3], away_seq[row])):
+            served, _opp, _filled = state.team_sequence(team_id)
+            assert served.dtype == expected.dtype == np.float32
+            assert served.tobytes() == expected.tobytes(), f"mismatch for team {team_id} on {match_day}"
+            checked += 1
+    assert checked > 40
+
+
+def test_walk_forward_chunks_match_per_split_rebuild():
+    v4 = _load_v4_training()
+    events = _synthetic_events(n_matches=200)
+    # Pool two leagues so windows mix steps scaled by different league stats.
+    df = pd.DataFrame(
+        {
+            "event_id": [e[0] for e in events],
+            "league_id": [LEAGUE_ID if e[0] % 3 else 5069 for e in events],
+            "date_event": pd.to_datetime([e[1] for e in events]),
+            "home_team_id": [e[2] for e in events],
+            "away_team_id": [e[3] for e in events],
+            "home_score": [e[4] for e in events],
+            "away_score": [e[5] for e in events],
+        }
+    )
+    team_to_idx = v4.build_global_team_to_idx(df)
+    league_to_idx = v4.build_global_league_to_idx(df["league_id"].unique())
+    params = dict(seq_len=SEQ_LEN, team_to_idx=team_to_idx, league_to_idx=league_to_idx, rating_k=0.06, rating_home_adv=2.0, rating_scale=7.0)
+    cache = v4.WalkForwardSequences(df, **params)
+
+    for cut in range(60, len(df), 35):
+        nxt = min(len(df), cut + 35)
+        got = cache.chunk(cut, nxt)
+        want = v4.prepare_split_sequences(df.iloc[:cut], df.iloc[cut:nxt], **params)
+        for key in ("home_idx", "away_idx", "home_opp_idx", "away_opp_idx", "league_idx", "y_raw", "league_ids_row"):
+            assert np.array_equal(got[key], want[key]), key
+        for key in ("home_seq", "away_seq"):
+            assert got[key].shape == want[key].shape
+            assert np.allclose(got[key], want[key], atol=1e-4), f"{key} drifted at cut={cut}"
+        assert np.allclose(got["norm_stats"]["mean"], want["norm_stats"]["mean"], atol=1e-5)
+        assert np.allclose(got["norm_stats"]["std"], want["norm_stats"]["std"], atol=1e-5)
+        assert sorted(got["league_stats"]) == sorted(want["league_stats"])
+        for lid, stats in want["league_stats"].items():
+            assert np.allclose(got["league_stats"][lid], stats)
+            assert np.isclose(got["league_env_stats"][lid]["home_strength"], want["league_env_stats"][lid]["home_strength"])
+
+
+def test_cached_sequences_round_trip():
+    v4 = _load_v4_training()
+    events = _synthetic_events(n_matches=120)
+    df = pd.DataFrame(
+        {
+            "event_id": [e[0] for e in events],
+            "league_id": LEAGUE_ID,
+            "date_event": pd.to_datetime([e[1] for e in events]),
+            "home_team_id": [e[2] for e in events],
+            "away_team_id": [e[3] for e in events],
+            "home_score": [e[4] for e in events],
+            "away_score": [e[5] for e in events],
+        }
+    )
+    params = dict(
+        seq_len=SEQ_LEN,
+        team_to_idx=v4.build_global_team_to_idx(df),
+        league_to_idx=v4.build_global_league_to_idx([LEAGUE_ID]),
+        league_stats=LEAGUE_STATS,
+        league_env_stats=LEAGUE_ENV,
+        rating_k=0.06,
+        rating_home_adv=2.0,
+        rating_scale=7.0,
+    )
+    want = v4.build_temporal_sequences(df, **params)
+    with tempfile.TemporaryDirectory() as root:
+        cache = DatasetCache(Path(root))
+        cold = v4.cached_temporal_sequences(df, cache, **params)
+        warm = v4.cached_temporal_sequences(df, cache, **params)
+        assert isinstance(warm[0], np.memmap)
+        for expected, got_cold, got_warm in zip(want[:9], cold[:9], warm[:9]):
+            assert got_cold.dtype == got_warm.dtype == expected.dtype
+            assert got_warm.tobytes() == expected.tobytes() == got_cold.tobytes()
+        # A changed score is a different dataset: new entry, not a stale hit.
+        df.loc[len(df) - 1, "home_score"] += 1.0
+        v4.cached_temporal_sequences(df, cache, **params)
+        assert len(list(Path(cache.root).glob("sequences-*"))) == 2
+
+
+def test_legacy_seq_dim_projection_drops_venue_context():
+    seq = np.arange(2 * 11, dtype=np.float32).reshape(2, 11)
+    assert project_sequence_features(seq, 11) is seq
+    assert project_sequence_features(seq, 10)[0].tolist() == [0, 1, 2, 3, 5, 6, 7, 8, 9, 10]
+    assert project_sequence_features(seq, 7)[1].tolist() == [11, 12, 13, 14, 16, 17, 18]
+
+
+if __name__ == "__main__":
+    test_training_and_serving_sequences_are_bit_identical()
+    test_walk_forward_chunks_match_per_split_rebuild()
+    test_cached_sequences_round_trip()
+    test_legacy_seq_dim_projection_drops_venue_context()
+    print("[OK] training and serving sequence features are bit-identical")
@@ -13,9 +13,11 @@ Usage:
 import sqlite3
 import os
 import sys
+import importlib.util
 import json
 import pickle
 import argparse
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
@@ -30,25 +32,29 @@ if sys.platform == 'win32':
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-try:
-    import xgboost as xgb
-    XGBOOST_AVAILABLE = True
-except ImportError:
-    XGBOOST_AVAILABLE = False
+XGBOOST_AVAILABLE = importlib.util.find_spec("xgboost") is not None
+if not XGBOOST_AVAILABLE:
     print("❌ XGBoost not installed. Install with: pip install xgboost")
     sys.exit(1)
 
 from prediction.config import LEAGUE_MAPPINGS
-from prediction.features import build_feature_table, FeatureConfig
-from sklearn.model_selection import train_test_split, cross_val_score, cross_val_predict
+from prediction.dataset_cache import cached_feature_table, default_dataset_cache
+from prediction.features import FeatureConfig
+from prediction.xgb_training import DEFAULT_TRIPLET_PARAMS, TripletTrainer, map_leagues, train_triplet
+from sklearn.model_selection import train_test_split, KFold, StratifiedKFold
 from sklearn.metrics import accuracy_score, mean_absolute_error, classification_report
 
+# Parallel league jobs (--league-workers) serialise feature loading, so a cold
+# dataset cache is built once, and the read-modify-write of the registry.
+_DATA_LOCK = threading.Lock()
+_REGISTRY_LOCK = threading.Lock()
+
 def load_data(conn: sqlite3.Connection, league_id: int, config: FeatureConfig) -> pd.DataFrame:
     """Load and prepare training data for a league"""
     print(f"📊 Loading data for league {league_id}...")
     
     # Build feature table
-    df = build_feature_table(conn, config)
+    df = cached_feature_table(conn, config, default_dataset_cache())
     
     # Filter by league
     df_league = df[df['league_id'] == league_id].copy()
@@ -98,70 +104,56 @@ def prepare_features_and_targets(df: pd.DataFrame) -> tuple:
 
 def train_xgboost_models(X: np.ndarray, y_winner: np.ndarray, 
                          y_home_score: np.ndarray, y_away_score: np.ndarray,
-                         feature_cols: List[str], use_all_data: bool = True) -> Dict[str, Any]:
+                         feature_cols: List[str], use_all_data: bool = True,
+                         nthread: int = 0) -> Dict[str, Any]:
     """Train XGBoost models for winner prediction and score prediction
     
     Args:
         use_all_data: If True, train on all data and use cross-validation for evaluation.
                      If False, use 80/20 train/test split.
+        nthread: XGBoost threads per model (0 = all cores).
+    
+    Every fit on the same rows shares one training matrix (see prediction.xgb_training).
     """
     print(f"🤖 Training XGBoost models...")
     
     if use_all_data and len(X) >= 50:
         # Use all data for training, evaluate with cross-validation
         print(f"   Using all {len(X)} games for training (cross-validation for evaluation)")
+        trainer = TripletTrainer(X, DEFAULT_TRIPLET_PARAMS, nthread=nthread)
         
         # 1. Winner Classifier (XGBoost)
         print(f"   Training winner classifier...")
-        clf = xgb.XGBClassifier(
-            n_estimators=200,
-            max_depth=6,
-            learning_rate=0.1,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            random_state=42,
-            eval_metric='logloss'
-        )
-        clf.fit(X, y_winner)
+        clf = trainer.winner(y_winner)
         
-        # Evaluate with cross-validation (5-fold)
-        cv_scores = cross_val_score(clf, X, y_winner, cv=5, scoring='accuracy')
+        # Evaluate with cross-validation (5-fold, stratified as in cross_val_score)
+        cv_scores = np.array([
+            accuracy_score(
+                y_winner[test_idx],
+                TripletTrainer(X[train_idx], DEFAULT_TRIPLET_PARAMS, nthread=nthread)
+                .winner(y_winner[train_idx]).predict(X[test_idx]),
+            )
+            for train_idx, test_idx in StratifiedKFold(n_splits=5).split(X, y_winner)
+        ])
         winner_accuracy = cv_scores.mean()
         print(f"   ✅ Winner accuracy (CV): {winner_accuracy:.1%} (±{cv_scores.std():.1%})")
         
-        # 2. Home Score Regressor (XGBoost)
-        print(f"   Training home score regressor...")
-        reg_home = xgb.XGBRegressor(
-            n_estimators=200,
-            max_depth=6,
-            learning_rate=0.1,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            random_state=42,
-            eval_metric='mae'
-        )
-        reg_home.fit(X, y_home_score)
+        # 2./3. Home and Away Score Regressors (XGBoost)
+        print(f"   Training score regressors...")
+        reg_home, reg_away = trainer.scores(y_home_score, y_away_score)
         
-        # Evaluate with cross-validation
-        y_home_pred_cv = cross_val_predict(reg_home, X, y_home_score, cv=5)
+        # Evaluate with cross-validation (5-fold, as in cross_val_predict); both
+        # regressors of a fold share its training matrix.
+        y_home_pred_cv = np.zeros(len(X))
+        y_away_pred_cv = np.zeros(len(X))
+        for train_idx, test_idx in KFold(n_splits=5).split(X):
+            fold_home, fold_away = TripletTrainer(X[train_idx], DEFAULT_TRIPLET_PARAMS, nthread=nthread).scores(
+                y_home_score[train_idx], y_away_score[train_idx]
+            )
+            y_home_pred_cv[test_idx] = fold_home.predict(X[test_idx])
+            y_away_pred_cv[test_idx] = fold_away.predict(X[test_idx])
         home_mae = mean_absolute_error(y_home_score, y_home_pred_cv)
         print(f"   ✅ Home score MAE (CV): {home_mae:.2f} points")
-        
-        # 3. Away Score Regressor (XGBoost)
-        print(f"   Training away score regressor...")
-        reg_away = xgb.XGBRegressor(
-            n_estimators=200,
-            max_depth=6,
-            learning_rate=0.1,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            random_state=42,
-            eval_metric='mae'
-        )
-        reg_away.fit(X, y_away_score)
-        
-        # Evaluate with cross-validation
-        y_away_pred_cv = cross_val_predict(reg_away, X, y_away_score, cv=5)
         away_mae = mean_absolute_error(y_away_score, y_away_pred_cv)
         print(f"   ✅ Away score MAE (CV): {away_mae:.2f} points")
         
@@ -195,55 +187,22 @@ def train_xgboost_models(X: np.ndarray, y_winner: np.ndarray,
         print(f"   Training set: {len(X_train)} games")
         print(f"   Test set: {len(X_test)} games")
         
-        # 1. Winner Classifier (XGBoost)
-        print(f"   Training winner classifier...")
-        clf = xgb.XGBClassifier(
-            n_estimators=200,
-            max_depth=6,
-            learning_rate=0.1,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            random_state=42,
-            eval_metric='logloss'
+        print(f"   Training winner classifier and score regressors...")
+        clf, reg_home, reg_away = train_triplet(
+            X_train, y_winner_train, y_home_train, y_away_train,
+            DEFAULT_TRIPLET_PARAMS, nthread=nthread
         )
-        clf.fit(X_train, y_winner_train)
         
         # Evaluate classifier
         y_winner_pred = clf.predict(X_test)
         winner_accuracy = accuracy_score(y_winner_test, y_winner_pred)
         print(f"   ✅ Winner accuracy: {winner_accuracy:.1%}")
         
-        # 2. Home Score Regressor (XGBoost)
-        print(f"   Training home score regressor...")
-        reg_home = xgb.XGBRegressor(
-            n_estimators=200,
-            max_depth=6,
-            learning_rate=0.1,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            random_state=42,
-            eval_metric='mae'
-        )
-        reg_home.fit(X_train, y_home_train)
-        
         # Evaluate home regressor
         y_home_pred = reg_home.predict(X_test)
         home_mae = mean_absolute_error(y_home_test, y_home_pred)
         print(f"   ✅ Home score MAE: {home_mae:.2f} points")
         
-        # 3. Away Score Regressor (XGBoost)
-        print(f"   Training away score regressor...")
-        reg_away = xgb.XGBRegressor(
-            n_estimators=200,
-            max_depth=6,
-            learning_rate=0.1,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            random_state=42,
-            eval_metric='mae'
-        )
-        reg_away.fit(X_train, y_away_train)
-        
         # Evaluate away regressor
         y_away_pred = reg_away.predict(X_test)
         away_mae = mean_absolute_error(y_away_test, y_away_pred)
@@ -323,7 +282,8 @@ def update_registry(league_id: int, league_name: str, model_data: Dict[str, Any]
     
     print(f"📝 Updated registry: {registry_path}")
 
-def train_league(league_id: int, league_name: str, db_path: str) -> bool:
+def train_league(league_id: int, league_name: str, db_path: str,
+                 nthread: int = 0) -> bool:
     """Train XGBoost models for a single league"""
     print(f"\n{'='*80}")
     print(f"Training XGBoost Model: {league_name} (ID: {league_id})")
@@ -341,7 +301,8 @@ def train_league(league_id: int, league_name: str, db_path: str) -> bool:
         )
         
         # Load data
-        df = load_data(conn, league_id, config)
+        with _DATA_LOCK:
+            df = load_data(conn, league_id, config)
         if df is None:
             conn.close()
             return False
@@ -350,13 +311,15 @@ def train_league(league_id: int, league_name: str, db_path: str) -> bool:
         X, y_winner, y_home_score, y_away_score, feature_cols = prepare_features_and_targets(df)
         
         # Train models (use all data for training when we have enough games)
-        model_data = train_xgboost_models(X, y_winner, y_home_score, y_away_score, feature_cols, use_all_data=True)
+        model_data = train_xgboost_models(X, y_winner, y_home_score, y_away_score, feature_cols, use_all_data=True,
+                                          nthread=nthread)
         
         # Save model
         model_file = save_model(model_data, league_id, league_name)
         
         # Update registry
-        update_registry(league_id, league_name, model_data)
+        with _REGISTRY_LOCK:
+            update_registry(league_id, league_name, model_data)
         
         conn.close()
         
@@ -394,12 +357,18 @@ def main():
     """Main function"""
     parser = argparse.ArgumentParser(description='Train XGBoost models for rugby prediction')
     parser.add_argument('--league-id', type=int, help='Train specific league ID')
+    parser.add_argument('--league-ids', type=str, default='',
+                       help='Comma-separated league IDs to train (e.g. the leagues with new results)')
     parser.add_argument('--all-leagues', action='store_true', help='Train all leagues')
     parser.add_argument('--db-path', type=str, default=None, help='Path to database')
     parser.add_argument('--min-total-games', type=int, default=900, 
                        help='Minimum total games required before training (default: 900)')
     parser.add_argument('--skip-game-check', action='store_true',
                        help='Skip the total games check and train anyway')
+    parser.add_argument('--league-workers', type=int, default=1,
+                       help='Leagues trained concurrently (default: 1)')
+    parser.add_argument('--xgb-threads', type=int, default=0,
+                       help='XGBoost thread budget shared by concurrent leagues (default: 0 = all cores)')
     
     args = parser.parse_args()
     
@@ -433,7 +402,14 @@ def main():
         print(f"   ✅ Total games ({total_games}) meets threshold ({args.min_total_games}+) - proceeding with XGBoost training")
     
     # Determine which leagues to train
-    if args.league_id:
+    if args.league_ids:
+        league_ids = [int(x) for x in args.league_ids.split(',') if x.strip()]
+        unknown = [lid for lid in league_ids if lid not in LEAGUE_MAPPINGS]
+        if unknown:
+            print(f"❌ League IDs {unknown} not found in LEAGUE_MAPPINGS")
+            sys.exit(1)
+        leagues_to_train = [(lid, LEAGUE_MAPPINGS[lid]) for lid in league_ids]
+    elif args.league_id:
         if args.league_id not in LEAGUE_MAPPINGS:
             print(f"❌ League ID {args.league_id} not found in LEAGUE_MAPPINGS")
             sys.exit(1)
@@ -441,7 +417,7 @@ def main():
     elif args.all_leagues:
         leagues_to_train = list(LEAGUE_MAPPINGS.items())
     else:
-        print("❌ Please specify --league-id or --all-leagues")
+        print("❌ Please specify --league-id, --league-ids or --all-leagues")
         parser.print_help()
         sys.exit(1)
     
@@ -449,10 +425,13 @@ def main():
     print(f"\n🚀 Training XGBoost models for {len(leagues_to_train)} league(s)...")
     print(f"   Expected improvement: +3% winner accuracy, -1.5 points margin error")
     
-    success_count = 0
-    for league_id, league_name in leagues_to_train:
-        if train_league(league_id, league_name, str(db_path)):
-            success_count += 1
+    results = map_leagues(
+        lambda league, nthread: train_league(league[0], league[1], str(db_path), nthread=nthread),
+        leagues_to_train,
+        workers=args.league_workers,
+        total_threads=args.xgb_threads,
+    )
+    success_count = sum(1 for ok in results if ok)
     
     print(f"\n{'='*80}")
     print(f"✅ Training complete!")
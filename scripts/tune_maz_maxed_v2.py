@@ -7,27 +7,43 @@ with a win/lose-first objective, and writes:
 
 - artifacts/maz_v2_tuning_results.json   (all attempts)
 - artifacts/maz_v2_best_config.json      (best config per league)
+- artifacts/maz_v2_tuning_attempts.jsonl (per-attempt log; reruns resume from it)
+
+Attempts run concurrently within --cpu-budget, each with its own report path.
+--halving-budgets runs every config on the first few walk-forward chunks and
+only promotes the best 1/eta per league to longer budgets.
 
 Examples:
   python scripts/tune_maz_maxed_v2.py --all-leagues --profile quick
   python scripts/tune_maz_maxed_v2.py --league-id 5069 --profile max
+  python scripts/tune_maz_maxed_v2.py --all-leagues --profile max --cpu-budget 8 --halving-budgets 2,5,0
 """
 
 from __future__ import annotations
 
 import argparse
 import json
-import subprocess
 import sys
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional
 
 
 ROOT = Path(__file__).resolve().parent.parent
 ARTIFACTS_DIR = ROOT / "artifacts"
 V2_SCRIPT = ROOT / "scripts" / "maz_boss_maxed_v2.py"
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from tuning_executor import (  # noqa: E402
+    AttemptJob,
+    AttemptOutcome,
+    ResultsLog,
+    TuningExecutor,
+    make_job,
+    parse_budgets,
+    successive_halving,
+)
 
 
 @dataclass
@@ -49,6 +65,7 @@ class AttemptResult:
     objective_score: float
     report_path: str
     command: str
+    wf_chunks: int = 0
 
 
 def _attempt_from_dict(row: Dict[str, Any]) -> Optional[AttemptResult]:
@@ -71,6 +88,7 @@ def _attempt_from_dict(row: Dict[str, Any]) -> Optional[AttemptResult]:
             objective_score=float(row["objective_score"]),
             report_path=str(row.get("report_path", "")),
             command=str(row.get("command", "")),
+            wf_chunks=int(row.get("wf_chunks", 0)),
         )
     except Exception:
         return None
@@ -114,18 +132,6 @@ def _profiles(profile: str) -> List[Dict[str, Any]]:
     return max_set
 
 
-def _flags_to_cli(flags: Dict[str, Any]) -> List[str]:
-    out: List[str] = []
-    for key, val in flags.items():
-        k = f"--{key}"
-        if isinstance(val, bool):
-            if val:
-                out.append(k)
-        else:
-            out.extend([k, str(val)])
-    return out
-
-
 def _objective_score(current: Dict[str, Any], maz: Dict[str, Any]) -> float:
     winner_gain = float(maz["winner_accuracy"]) - float(current["winner_accuracy"])
     outcome_gain = float(maz["outcome_accuracy"]) - float(current["outcome_accuracy"])
@@ -134,29 +140,37 @@ def _objective_score(current: Dict[str, Any], maz: Dict[str, Any]) -> float:
     return (10000.0 * winner_gain) + (1500.0 * outcome_gain) + (20.0 * mae_reduction)
 
 
-def _load_report(path: Path) -> Dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def _run_single(
-    python_exe: str,
-    league_id: int,
-    base_flags: Dict[str, Any],
-    cfg: Dict[str, Any],
-) -> Tuple[subprocess.CompletedProcess, Path]:
-    cfg_name = str(cfg.get("name", "unnamed"))
-    cfg_flags = {k: v for k, v in cfg.items() if k != "name"}
-    merged = dict(base_flags)
-    merged.update(cfg_flags)
-    merged["league-id"] = league_id
-
-    cmd = [python_exe, str(V2_SCRIPT)] + _flags_to_cli(merged)
-    cp = subprocess.run(cmd, cwd=str(ROOT), capture_output=True, text=True)
+def _parse_attempt(outcome: AttemptOutcome) -> Optional[Dict[str, Any]]:
+    job: AttemptJob = outcome.job
+    league_blob = (outcome.report or {}).get("leagues", {}).get(str(job.league_id))
+    if not isinstance(league_blob, dict) or league_blob.get("status") != "tested":
+        return None
+    current = league_blob.get("current", {})
+    maz = league_blob.get("maz_maxed_v2", {})
+    if not current or not maz:
+        return None
 
-    report_candidates = sorted(ARTIFACTS_DIR.glob("maz_maxed_v2_report_*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
-    if not report_candidates:
-        raise RuntimeError(f"[{cfg_name}] no v2 report file found after run")
-    return cp, report_candidates[0]
+    row = AttemptResult(
+        league_id=job.league_id,
+        league_name=str(league_blob.get("name", f"League {job.league_id}")),
+        config_name=job.config_name,
+        config_flags=job.config_flags,
+        winner=str(league_blob.get("winner", "UNKNOWN")),
+        current_winner_acc=float(current["winner_accuracy"]),
+        maz_winner_acc=float(maz["winner_accuracy"]),
+        current_outcome_acc=float(current["outcome_accuracy"]),
+        maz_outcome_acc=float(maz["outcome_accuracy"]),
+        current_mae=float(current["overall_mae"]),
+        maz_mae=float(maz["overall_mae"]),
+        winner_gain=float(maz["winner_accuracy"]) - float(current["winner_accuracy"]),
+        outcome_gain=float(maz["outcome_accuracy"]) - float(current["outcome_accuracy"]),
+        mae_reduction=float(current["overall_mae"]) - float(maz["overall_mae"]),
+        objective_score=_objective_score(current, maz),
+        report_path=str(job.report_path),
+        command=job.command,
+        wf_chunks=job.budget,
+    )
+    return asdict(row)
 
 
 def _league_ids_from_args(args: argparse.Namespace) -> List[int]:
@@ -178,7 +192,7 @@ def main() -> None:
     parser.add_argument("--max-configs", type=int, default=0, help="Limit number of configs (0 = no limit).")
     parser.add_argument("--start-attempt", type=int, default=1, help="1-based attempt index to start from.")
     parser.add_argument("--python-exe", default=sys.executable, help="Python executable path.")
-    parser.add_argument("--save-models-during-tuning", action="store_true", help="Save v2 model artifacts during every trial.")
+    parser.add_argument("--save-models-during-tuning", action="store_true", help="Save v2 model artifacts during every trial (sequential full runs only).")
     parser.add_argument("--disable-quantum", action="store_true", help="Turn off quantum mode for all attempts.")
 
     # Shared baseline config for every attempt.
@@ -191,6 +205,18 @@ def main() -> None:
     parser.add_argument("--score-density-max", type=int, default=70)
     parser.add_argument("--score-density-sticky-boost", type=float, default=0.35)
 
+    # Executor: concurrency, early stopping and resume.
+    parser.add_argument("--cpu-budget", type=int, default=0, help="Cores shared by concurrent attempts (0 = all).")
+    parser.add_argument("--cpus-per-attempt", type=int, default=1, help="Threads given to each attempt subprocess.")
+    parser.add_argument(
+        "--halving-budgets",
+        default="",
+        help="Successive-halving walk-forward chunk budgets, e.g. '2,5,0' (0 = all chunks). Empty = full runs only.",
+    )
+    parser.add_argument("--halving-eta", type=float, default=2.0, help="Keep the top 1/eta configs per league at each rung.")
+    parser.add_argument("--attempts-log", default=str(ARTIFACTS_DIR / "maz_v2_tuning_attempts.jsonl"), help="Durable per-attempt results log (resume source).")
+    parser.add_argument("--attempt-dir", default=str(ARTIFACTS_DIR / "tuning" / "v2"), help="Per-attempt report/log directory.")
+
     args = parser.parse_args()
 
     ARTIFACTS_DIR.mkdir(exist_ok=True)
@@ -204,102 +230,84 @@ def main() -> None:
     if args.start_attempt < 1:
         raise SystemExit("--start-attempt must be >= 1")
 
+    budgets = parse_budgets(args.halving_budgets)
     results_path = ARTIFACTS_DIR / "maz_v2_tuning_results.json"
-    attempts: List[AttemptResult] = []
-    best_by_league: Dict[int, AttemptResult] = {}
-    if args.start_attempt > 1 and results_path.exists():
-        try:
-            prev_payload = json.loads(results_path.read_text(encoding="utf-8"))
-            prev_attempts = prev_payload.get("attempts", [])
-            for row in prev_attempts:
-                if not isinstance(row, dict):
-                    continue
-                parsed = _attempt_from_dict(row)
-                if parsed is None:
-                    continue
-                attempts.append(parsed)
-                prior = best_by_league.get(parsed.league_id)
-                if prior is None or parsed.objective_score > prior.objective_score:
-                    best_by_league[parsed.league_id] = parsed
-            print(f"Loaded {len(attempts)} prior attempts from {results_path}")
-        except Exception:
-            print(f"Could not parse prior results at {results_path}; continuing without history.")
+    results_log = ResultsLog(Path(args.attempts_log))
+    if len(results_log):
+        print(f"Loaded {len(results_log)} logged attempts from {results_log.path}")
+    executor = TuningExecutor(ROOT, cpu_budget=args.cpu_budget, cpus_per_attempt=args.cpus_per_attempt)
+    if args.save_models_during_tuning and (executor.workers > 1 or any(budgets)):
+        # Concurrent attempts would race on the same artifacts/league_* files, and
+        # halving rungs would overwrite real artifacts with truncated-run models.
+        raise SystemExit(
+            "--save-models-during-tuning needs sequential full runs: "
+            "pass --cpu-budget equal to --cpus-per-attempt and no --halving-budgets"
+        )
+    attempt_dir = Path(args.attempt_dir)
 
     total_runs = len(leagues) * len(configs)
+    candidates: Dict[int, List[Dict[str, Any]]] = {}
+    skipped: Dict[int, List[Dict[str, Any]]] = {}
     run_idx = 0
     for league_id in leagues:
         for cfg in configs:
             run_idx += 1
-            if run_idx < args.start_attempt:
-                continue
-            cfg_name = str(cfg.get("name", "unnamed"))
-            print(f"[{run_idx}/{total_runs}] league={league_id} config={cfg_name}")
-            cp, report_path = _run_single(args.python_exe, league_id, base, cfg)
-            if cp.returncode != 0:
-                print(f"  failed (exit {cp.returncode})")
-                if cp.stderr:
-                    print(f"  stderr: {cp.stderr.strip()[:400]}")
-                continue
-
-            report = _load_report(report_path)
-            league_blob = report.get("leagues", {}).get(str(league_id))
-            if not isinstance(league_blob, dict) or league_blob.get("status") != "tested":
-                print("  skipped in run report")
-                continue
-
-            current = league_blob.get("current", {})
-            maz = league_blob.get("maz_maxed_v2", {})
-            if not current or not maz:
-                print("  missing metric blocks in report")
-                continue
-
-            winner_gain = float(maz["winner_accuracy"]) - float(current["winner_accuracy"])
-            outcome_gain = float(maz["outcome_accuracy"]) - float(current["outcome_accuracy"])
-            mae_reduction = float(current["overall_mae"]) - float(maz["overall_mae"])
-            score = _objective_score(current, maz)
-
-            row = AttemptResult(
-                league_id=league_id,
-                league_name=str(league_blob.get("name", f"League {league_id}")),
-                config_name=cfg_name,
-                config_flags={k: v for k, v in cfg.items() if k != "name"},
-                winner=str(league_blob.get("winner", "UNKNOWN")),
-                current_winner_acc=float(current["winner_accuracy"]),
-                maz_winner_acc=float(maz["winner_accuracy"]),
-                current_outcome_acc=float(current["outcome_accuracy"]),
-                maz_outcome_acc=float(maz["outcome_accuracy"]),
-                current_mae=float(current["overall_mae"]),
-                maz_mae=float(maz["overall_mae"]),
-                winner_gain=winner_gain,
-                outcome_gain=outcome_gain,
-                mae_reduction=mae_reduction,
-                objective_score=score,
-                report_path=str(report_path),
-                command="",
-            )
-            # Keep a readable command with resolved flags for this specific attempt.
-            merged = dict(base)
-            merged.update(row.config_flags)
-            merged["league-id"] = league_id
-            row.command = " ".join([args.python_exe, str(V2_SCRIPT)] + _flags_to_cli(merged))
-
-            attempts.append(row)
-            prev = best_by_league.get(league_id)
-            if prev is None or row.objective_score > prev.objective_score:
-                best_by_league[league_id] = row
-
-            print(
-                "  "
-                f"winner={row.winner} "
-                f"win_gain={row.winner_gain:+.4f} "
-                f"out_gain={row.outcome_gain:+.4f} "
-                f"mae_red={row.mae_reduction:+.4f}"
-            )
+            (skipped if run_idx < args.start_attempt else candidates).setdefault(league_id, []).append(cfg)
+
+    def build_job(league_id: int, cfg: Dict[str, Any], budget: int) -> AttemptJob:
+        cfg_flags = {k: v for k, v in cfg.items() if k != "name"}
+        merged = dict(base)
+        merged.update(cfg_flags)
+        return make_job(args.python_exe, V2_SCRIPT, attempt_dir, league_id, str(cfg.get("name", "unnamed")), cfg_flags, merged, budget)
+
+    done = 0
+
+    def on_outcome(outcome: AttemptOutcome) -> None:
+        nonlocal done
+        done += 1
+        job = outcome.job
+        budget = f" chunks={job.budget}" if job.budget else ""
+        cached = " (logged)" if outcome.cached else ""
+        print(f"[{done}] league={job.league_id} config={job.config_name}{budget}{cached}")
+        if outcome.returncode != 0:
+            print(f"  failed (exit {outcome.returncode})")
+            if outcome.stderr_tail:
+                print(f"  stderr: {outcome.stderr_tail[:400]}")
+            return
+        row = outcome.row
+        if row is None:
+            print("  skipped in run report")
+            return
+        print(
+            "  "
+            f"winner={row['winner']} "
+            f"win_gain={row['winner_gain']:+.4f} "
+            f"out_gain={row['outcome_gain']:+.4f} "
+            f"mae_red={row['mae_reduction']:+.4f}"
+        )
+
+    queued = sum(len(v) for v in candidates.values())
+    print(f"Tuning {queued}/{total_runs} league configs on {executor.workers} worker(s), chunk budgets={budgets}")
+    final_rows = successive_halving(executor, results_log, candidates, budgets, args.halving_eta, build_job, _parse_attempt, on_outcome)
+    # Attempts before --start-attempt are not rerun; reuse their logged full-budget results.
+    for league_id, league_cfgs in skipped.items():
+        for cfg in league_cfgs:
+            rec = results_log.get(build_job(league_id, cfg, budgets[-1]).key)
+            if rec and rec.get("row"):
+                final_rows.append(rec["row"])
+
+    attempts: List[AttemptResult] = [a for a in (_attempt_from_dict(r) for r in final_rows) if a is not None]
+    best_by_league: Dict[int, AttemptResult] = {}
+    for row in attempts:
+        prev = best_by_league.get(row.league_id)
+        if prev is None or row.objective_score > prev.objective_score:
+            best_by_league[row.league_id] = row
 
     results_payload = {
         "generated_at": datetime.utcnow().isoformat() + "Z",
         "profile": args.profile,
         "base_flags": base,
+        "halving_budgets": budgets,
         "league_ids": leagues,
         "attempt_count": len(attempts),
         "attempts": [asdict(a) for a in attempts],
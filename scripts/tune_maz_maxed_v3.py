@@ -3,24 +3,36 @@
 Auto-tune MAZ MAXED V3.
 
 Runs many V3 configs, ranks with win/lose-first objective + tail-aware penalties,
-and writes best config map per league.
+and writes best config map per league. Attempts run concurrently through
+`tuning_executor` (isolated report per attempt, resumable JSONL log); with
+--walk-forward, --halving-budgets drops weak configs after a few chunks.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
-import subprocess
 import sys
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional
 
 
 ROOT = Path(__file__).resolve().parent.parent
 ARTIFACTS = ROOT / "artifacts"
 V3_SCRIPT = ROOT / "scripts" / "maz_boss_maxed_v3.py"
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from tuning_executor import (  # noqa: E402
+    AttemptJob,
+    AttemptOutcome,
+    ResultsLog,
+    TuningExecutor,
+    make_job,
+    parse_budgets,
+    successive_halving,
+)
 
 
 @dataclass
@@ -37,6 +49,7 @@ class Attempt:
     objective_score: float
     report_path: str
     command: str
+    wf_chunks: int = 0
 
 
 def _from_dict(row: Dict[str, Any]) -> Optional[Attempt]:
@@ -54,23 +67,12 @@ def _from_dict(row: Dict[str, Any]) -> Optional[Attempt]:
             objective_score=float(row["objective_score"]),
             report_path=str(row.get("report_path", "")),
             command=str(row.get("command", "")),
+            wf_chunks=int(row.get("wf_chunks", 0)),
         )
     except Exception:
         return None
 
 
-def _flags_to_cli(flags: Dict[str, Any]) -> List[str]:
-    out: List[str] = []
-    for k, v in flags.items():
-        kk = f"--{k}"
-        if isinstance(v, bool):
-            if v:
-                out.append(kk)
-        else:
-            out.extend([kk, str(v)])
-    return out
-
-
 def _profiles(profile: str) -> List[Dict[str, Any]]:
     quick = [
         {"name": "v3_q1_balanced", "alpha-stable": 0.65, "alpha-balanced": 0.55, "alpha-chaotic": 0.40, "residual-shrink-k": 140.0, "rating-k": 0.045, "rating-decay": 0.995},
@@ -88,7 +90,7 @@ def _profiles(profile: str) -> List[Dict[str, Any]]:
 
 
 def _base_flags(args: argparse.Namespace) -> Dict[str, Any]:
-    return {
+    flags: Dict[str, Any] = {
         "holdout-ratio": args.holdout_ratio,
         "min-games": args.min_games,
         "max-score": args.max_score,
@@ -98,6 +100,9 @@ def _base_flags(args: argparse.Namespace) -> Dict[str, Any]:
         "max-brier-worsen": args.max_brier_worsen,
         "save-v3-models": bool(args.save_models_during_tuning),
     }
+    if args.walk_forward:
+        flags.update({"walk-forward": True, "wf-start-train": args.wf_start_train, "wf-step": args.wf_step})
+    return flags
 
 
 def _league_ids(args: argparse.Namespace) -> List[int]:
@@ -115,13 +120,28 @@ def _score(d: Dict[str, Any]) -> float:
     return (10000.0 * float(d["winner_accuracy_gain"])) + (1300.0 * float(d["outcome_accuracy_gain"])) + (25.0 * float(d["overall_mae_reduction"])) + (250.0 * float(d["brier_reduction"]))
 
 
-def _run_once(python_exe: str, league_id: int, flags: Dict[str, Any]) -> Tuple[subprocess.CompletedProcess, Path]:
-    cmd = [python_exe, str(V3_SCRIPT)] + _flags_to_cli(flags) + ["--league-id", str(league_id)]
-    cp = subprocess.run(cmd, cwd=str(ROOT), capture_output=True, text=True)
-    reports = sorted(ARTIFACTS.glob("maz_maxed_v3_report_*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
-    if not reports:
-        raise RuntimeError("No V3 report file produced")
-    return cp, reports[0]
+def _parse_attempt(outcome: AttemptOutcome) -> Optional[Dict[str, Any]]:
+    job: AttemptJob = outcome.job
+    lb = (outcome.report or {}).get("leagues", {}).get(str(job.league_id))
+    if not isinstance(lb, dict) or lb.get("status") != "tested":
+        return None
+    d = lb.get("deltas", {})
+    row = Attempt(
+        league_id=job.league_id,
+        league_name=str(lb.get("name", f"League {job.league_id}")),
+        config_name=job.config_name,
+        config_flags=job.config_flags,
+        winner=str(lb.get("winner", "UNKNOWN")),
+        winner_gain=float(d.get("winner_accuracy_gain", 0.0)),
+        outcome_gain=float(d.get("outcome_accuracy_gain", 0.0)),
+        mae_reduction=float(d.get("overall_mae_reduction", 0.0)),
+        brier_reduction=float(d.get("brier_reduction", 0.0)),
+        objective_score=_score(d),
+        report_path=str(job.report_path),
+        command=job.command,
+        wf_chunks=job.budget,
+    )
+    return asdict(row)
 
 
 def main() -> None:
@@ -140,6 +160,19 @@ def main() -> None:
     parser.add_argument("--min-winner-gain", type=float, default=0.003)
     parser.add_argument("--max-mae-worsen", type=float, default=0.12)
     parser.add_argument("--max-brier-worsen", type=float, default=0.01)
+    parser.add_argument("--walk-forward", action="store_true", help="Tune on walk-forward evaluation instead of one holdout.")
+    parser.add_argument("--wf-start-train", type=int, default=80)
+    parser.add_argument("--wf-step", type=int, default=20)
+    parser.add_argument("--cpu-budget", type=int, default=0, help="Cores shared by concurrent attempts (0 = all).")
+    parser.add_argument("--cpus-per-attempt", type=int, default=1, help="Threads given to each attempt subprocess.")
+    parser.add_argument(
+        "--halving-budgets",
+        default="",
+        help="Successive-halving walk-forward chunk budgets, e.g. '2,4,0' (0 = all chunks). Needs --walk-forward.",
+    )
+    parser.add_argument("--halving-eta", type=float, default=2.0, help="Keep the top 1/eta configs per league at each rung.")
+    parser.add_argument("--attempts-log", default=str(ARTIFACTS / "maz_v3_tuning_attempts.jsonl"), help="Durable per-attempt results log (resume source).")
+    parser.add_argument("--attempt-dir", default=str(ARTIFACTS / "tuning" / "v3"), help="Per-attempt report/log directory.")
     args = parser.parse_args()
 
     ARTIFACTS.mkdir(exist_ok=True)
@@ -150,81 +183,89 @@ def main() -> None:
     if args.start_attempt < 1:
         raise SystemExit("--start-attempt must be >= 1")
 
+    budgets = parse_budgets(args.halving_budgets)
+    if len(budgets) > 1 and not args.walk_forward:
+        raise SystemExit("--halving-budgets needs --walk-forward (budgets are walk-forward chunks)")
+
     results_path = ARTIFACTS / "maz_v3_tuning_results.json"
     best_path = ARTIFACTS / "maz_v3_best_config.json"
-    attempts: List[Attempt] = []
-    best_by_league: Dict[int, Attempt] = {}
-    if args.start_attempt > 1 and results_path.exists():
-        try:
-            prior = json.loads(results_path.read_text(encoding="utf-8")).get("attempts", [])
-            for row in prior:
-                if isinstance(row, dict):
-                    a = _from_dict(row)
-                    if a is None:
-                        continue
-                    attempts.append(a)
-                    b = best_by_league.get(a.league_id)
-                    if b is None or a.objective_score > b.objective_score:
-                        best_by_league[a.league_id] = a
-            print(f"Loaded {len(attempts)} prior attempts from {results_path}")
-        except Exception:
-            print("Could not load prior attempts. Starting fresh.")
+    results_log = ResultsLog(Path(args.attempts_log))
+    if len(results_log):
+        print(f"Loaded {len(results_log)} logged attempts from {results_log.path}")
+    executor = TuningExecutor(ROOT, cpu_budget=args.cpu_budget, cpus_per_attempt=args.cpus_per_attempt)
+    if args.save_models_during_tuning and (executor.workers > 1 or any(budgets)):
+        # Concurrent attempts would race on the same artifacts/league_* files, and
+        # halving rungs would overwrite real artifacts with truncated-run models.
+        raise SystemExit(
+            "--save-models-during-tuning needs sequential full runs: "
+            "pass --cpu-budget equal to --cpus-per-attempt and no --halving-budgets"
+        )
+    attempt_dir = Path(args.attempt_dir)
 
     base = _base_flags(args)
     total = len(leagues) * len(cfgs)
+    candidates: Dict[int, List[Dict[str, Any]]] = {}
+    skipped: Dict[int, List[Dict[str, Any]]] = {}
     idx = 0
     for lid in leagues:
         for cfg in cfgs:
             idx += 1
-            if idx < args.start_attempt:
-                continue
-            cfg_name = str(cfg["name"])
-            flags = dict(base)
-            flags.update({k: v for k, v in cfg.items() if k != "name"})
-            print(f"[{idx}/{total}] league={lid} config={cfg_name}")
-            cp, report_path = _run_once(args.python_exe, lid, flags)
-            if cp.returncode != 0:
-                print(f"  failed exit={cp.returncode}")
-                if cp.stderr:
-                    print(f"  stderr: {cp.stderr.strip()[:300]}")
-                continue
-            rep = json.loads(report_path.read_text(encoding="utf-8"))
-            lb = rep.get("leagues", {}).get(str(lid))
-            if not isinstance(lb, dict) or lb.get("status") != "tested":
-                print("  skipped")
-                continue
-            d = lb.get("deltas", {})
-            score = _score(d)
-            row = Attempt(
-                league_id=lid,
-                league_name=str(lb.get("name", f"League {lid}")),
-                config_name=cfg_name,
-                config_flags={k: v for k, v in cfg.items() if k != "name"},
-                winner=str(lb.get("winner", "UNKNOWN")),
-                winner_gain=float(d.get("winner_accuracy_gain", 0.0)),
-                outcome_gain=float(d.get("outcome_accuracy_gain", 0.0)),
-                mae_reduction=float(d.get("overall_mae_reduction", 0.0)),
-                brier_reduction=float(d.get("brier_reduction", 0.0)),
-                objective_score=score,
-                report_path=str(report_path),
-                command=" ".join([args.python_exe, str(V3_SCRIPT)] + _flags_to_cli(flags) + ["--league-id", str(lid)]),
-            )
-            attempts.append(row)
-            prev = best_by_league.get(lid)
-            if prev is None or row.objective_score > prev.objective_score:
-                best_by_league[lid] = row
-            print(
-                "  "
-                f"winner={row.winner} "
-                f"win_gain={row.winner_gain:+.4f} "
-                f"out_gain={row.outcome_gain:+.4f} "
-                f"mae_red={row.mae_reduction:+.4f} "
-                f"brier_red={row.brier_reduction:+.4f}"
-            )
+            (skipped if idx < args.start_attempt else candidates).setdefault(lid, []).append(cfg)
+
+    def build_job(lid: int, cfg: Dict[str, Any], budget: int) -> AttemptJob:
+        cfg_flags = {k: v for k, v in cfg.items() if k != "name"}
+        flags = dict(base)
+        flags.update(cfg_flags)
+        return make_job(args.python_exe, V3_SCRIPT, attempt_dir, lid, str(cfg["name"]), cfg_flags, flags, budget)
+
+    done = 0
+
+    def on_outcome(outcome: AttemptOutcome) -> None:
+        nonlocal done
+        done += 1
+        job = outcome.job
+        budget = f" chunks={job.budget}" if job.budget else ""
+        cached = " (logged)" if outcome.cached else ""
+        print(f"[{done}] league={job.league_id} config={job.config_name}{budget}{cached}")
+        if outcome.returncode != 0:
+            print(f"  failed exit={outcome.returncode}")
+            if outcome.stderr_tail:
+                print(f"  stderr: {outcome.stderr_tail[:300]}")
+            return
+        row = outcome.row
+        if row is None:
+            print("  skipped")
+            return
+        print(
+            "  "
+            f"winner={row['winner']} "
+            f"win_gain={row['winner_gain']:+.4f} "
+            f"out_gain={row['outcome_gain']:+.4f} "
+            f"mae_red={row['mae_reduction']:+.4f} "
+            f"brier_red={row['brier_reduction']:+.4f}"
+        )
+
+    queued = sum(len(v) for v in candidates.values())
+    print(f"Tuning {queued}/{total} league configs on {executor.workers} worker(s), chunk budgets={budgets}")
+    final_rows = successive_halving(executor, results_log, candidates, budgets, args.halving_eta, build_job, _parse_attempt, on_outcome)
+    # Attempts before --start-attempt are not rerun; reuse their logged full-budget results.
+    for lid, lcfgs in skipped.items():
+        for cfg in lcfgs:
+            rec = results_log.get(build_job(lid, cfg, budgets[-1]).key)
+            if rec and rec.get("row"):
+                final_rows.append(rec["row"])
+
+    attempts: List[Attempt] = [a for a in (_from_dict(r) for r in final_rows) if a is not None]
+    best_by_league: Dict[int, Attempt] = {}
+    for a in attempts:
+        b = best_by_league.get(a.league_id)
+        if b is None or a.objective_score > b.objective_score:
+            best_by_league[a.league_id] = a
 
     results_payload = {
         "generated_at": datetime.utcnow().isoformat() + "Z",
         "profile": args.profile,
+        "halving_budgets": budgets,
         "league_ids": leagues,
         "attempt_count": len(attempts),
         "attempts": [asdict(a) for a in attempts],
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Concurrent attempt executor shared by the MAZ tuning scripts.
+
+Each (league, config) attempt runs as its own subprocess with a unique
+`--report-path` / `--log-file`, so attempts never race on "newest report"
+globs. Attempts run concurrently up to a CPU budget, and every finished
+attempt is appended to a JSONL results log; an interrupted overnight run
+picks up where it stopped. Attempt keys include a per-league fingerprint of
+the completed matches in the DB, so results logged before new data landed
+are re-run instead of replayed.
+
+`successive_halving` evaluates configs on growing walk-forward budgets
+(`--wf-max-chunks`) and only promotes the best fraction of each league's
+configs to the next rung, so weak configs are dropped after a few chunks.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+
+@dataclass
+class AttemptJob:
+    key: str
+    league_id: int
+    config_name: str
+    config_flags: Dict[str, Any]
+    budget: int  # walk-forward chunks (0 = full run)
+    cmd: List[str]
+    report_path: Path
+    log_path: Path
+    command: str = ""
+
+
+@dataclass
+class AttemptOutcome:
+    job: AttemptJob
+    returncode: int
+    stderr_tail: str
+    report: Optional[Dict[str, Any]] = None
+    cached: bool = False
+    row: Optional[Dict[str, Any]] = field(default=None)
+
+
+def flags_to_cli(flags: Dict[str, Any]) -> List[str]:
+    out: List[str] = []
+    for key, val in flags.items():
+        k = f"--{key}"
+        if isinstance(val, bool):
+            if val:
+                out.append(k)
+        else:
+            out.extend([k, str(val)])
+    return out
+
+
+def default_db_path(root: Path) -> Path:
+    """Same auto-detection as the MAZ scripts' own `default_db_path`."""
+    p_main = root / "data.sqlite"
+    p_fn = root / "rugby-ai-predictor" / "data.sqlite"
+    return p_main if p_main.exists() else p_fn
+
+
+def data_fingerprint(db_path: Path, league_id: int) -> Dict[str, Any]:
+    """Completed-match row count, max event id and max date for one league.
+
+    Part of the attempt key, so logged attempts are replayed only while the
+    league's data is unchanged; new results give the attempt a new key.
+    """
+    if not db_path.exists():
+        return {"missing": str(db_path)}
+    conn = sqlite3.connect(f"file:{db_path.resolve()}?mode=ro", uri=True)
+    try:
+        rows, max_id, max_date = conn.execute(
+            """
+            SELECT COUNT(*), MAX(id), MAX(date_event)
+            FROM event
+            WHERE league_id = ? AND home_score IS NOT NULL AND away_score IS NOT NULL
+            """,
+            (int(league_id),),
+        ).fetchone()
+    finally:
+        conn.close()
+    return {"rows": int(rows or 0), "max_event_id": max_id, "max_date": max_date}
+
+
+def attempt_key(
+    script: Path,
+    league_id: int,
+    flags: Dict[str, Any],
+    budget: int,
+    data: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Stable id for one attempt: same script, league, resolved flags, budget and data."""
+    payload = json.dumps(
+        {
+            "script": script.name,
+            "league_id": int(league_id),
+            "flags": flags,
+            "budget": int(budget),
+            "data": data or {},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def make_job(
+    python_exe: str,
+    script: Path,
+    run_dir: Path,
+    league_id: int,
+    config_name: str,
+    config_flags: Dict[str, Any],
+    flags: Dict[str, Any],
+    budget: int,
+) -> AttemptJob:
+    """Build the subprocess command for one attempt with its own report/log paths."""
+    resolved = dict(flags)
+    resolved["league-id"] = int(league_id)
+    if budget > 0:
+        resolved["wf-max-chunks"] = int(budget)
+    root = script.resolve().parent.parent  # attempts run with the repo root as cwd
+    db_flag = resolved.get("db-path")
+    db_path = root / str(db_flag) if db_flag else default_db_path(root)
+    key = attempt_key(script, league_id, resolved, budget, data_fingerprint(db_path, league_id))
+    report_path = run_dir / f"{key}_report.json"
+    log_path = run_dir / f"{key}.log"
+    shown = [python_exe, str(script)] + flags_to_cli(resolved)
+    cmd = shown + ["--report-path", str(report_path), "--log-file", str(log_path)]
+    return AttemptJob(
+        key=key,
+        league_id=int(league_id),
+        config_name=config_name,
+        config_flags=dict(config_flags),
+        budget=int(budget),
+        cmd=cmd,
+        report_path=report_path,
+        log_path=log_path,
+        command=" ".join(shown),
+    )
+
+
+class ResultsLog:
+    """Append-only JSONL log of finished attempts, keyed by `AttemptJob.key`."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._records: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from an interrupted write
+                if isinstance(rec, dict) and rec.get("key"):
+                    self._records[str(rec["key"])] = rec
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._records.get(key)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._records[str(record["key"])] = record
+
+
+class TuningExecutor:
+    """Runs attempt subprocesses concurrently within `cpu_budget` cores."""
+
+    def __init__(self, cwd: Path, cpu_budget: int = 0, cpus_per_attempt: int = 1):
+        self.cwd = cwd
+        self.cpus_per_attempt = max(1, int(cpus_per_attempt))
+        budget = int(cpu_budget) if int(cpu_budget) > 0 else (os.cpu_count() or 1)
+        self.workers = max(1, budget // self.cpus_per_attempt)
+
+    def _env(self) -> Dict[str, str]:
+        env = dict(os.environ)
+        threads = str(self.cpus_per_attempt)
+        for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS"):
+            env[var] = threads
+        return env
+
+    def _run_one(self, job: AttemptJob) -> AttemptOutcome:
+        job.report_path.parent.mkdir(parents=True, exist_ok=True)
+        job.report_path.unlink(missing_ok=True)
+        cp = subprocess.run(job.cmd, cwd=str(self.cwd), capture_output=True, text=True, env=self._env())
+        report = None
+        if cp.returncode == 0 and job.report_path.exists():
+            try:
+                report = json.loads(job.report_path.read_text(encoding="utf-8"))
+            except ValueError:
+                report = None
+        return AttemptOutcome(job=job, returncode=cp.returncode, stderr_tail=(cp.stderr or "").strip()[-400:], report=report)
+
+    def run(self, jobs: Sequence[AttemptJob]) -> Iterator[AttemptOutcome]:
+        """Yield outcomes as attempts finish (completion order, not submission order)."""
+        if not jobs:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+            futures = [pool.submit(self._run_one, job) for job in jobs]
+            for fut in as_completed(futures):
+                yield fut.result()
+
+
+def run_logged(
+    executor: TuningExecutor,
+    results_log: ResultsLog,
+    jobs: Sequence[AttemptJob],
+    parse: Callable[[AttemptOutcome], Optional[Dict[str, Any]]],
+    on_outcome: Optional[Callable[[AttemptOutcome], None]] = None,
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Run the jobs not already in the results log and return key -> parsed row
+    (None for failed/skipped attempts). Logged attempts are replayed, not rerun.
+    """
+    rows: Dict[str, Optional[Dict[str, Any]]] = {}
+    pending: List[AttemptJob] = []
+    for job in jobs:
+        rec = results_log.get(job.key)
+        if rec is None:
+            pending.append(job)
+            continue
+        rows[job.key] = rec.get("row")
+        if on_outcome is not None:
+            on_outcome(AttemptOutcome(job=job, returncode=int(rec.get("returncode", 0)), stderr_tail="", cached=True, row=rec.get("row")))
+    for outcome in executor.run(pending):
+        row = parse(outcome) if outcome.returncode == 0 and outcome.report is not None else None
+        outcome.row = row
+        job = outcome.job
+        results_log.append(
+            {
+                "key": job.key,
+                "league_id": job.league_id,
+                "config_name": job.config_name,
+                "budget": job.budget,
+                "status": "ok" if row is not None else ("failed" if outcome.returncode != 0 else "skipped"),
+                "returncode": outcome.returncode,
+                "row": row,
+                "report_path": str(job.report_path),
+                "finished_at": datetime.utcnow().isoformat() + "Z",
+            }
+        )
+        rows[job.key] = row
+        if on_outcome is not None:
+            on_outcome(outcome)
+    return rows
+
+
+def parse_budgets(text: str) -> List[int]:
+    """`"2,4,0"` -> [2, 4, 0]; 0 means every walk-forward chunk. Empty -> [0]."""
+    out = [int(x) for x in str(text or "").replace(" ", "").split(",") if x != ""]
+    return out or [0]
+
+
+def successive_halving(
+    executor: TuningExecutor,
+    results_log: ResultsLog,
+    candidates: Dict[int, List[Dict[str, Any]]],
+    budgets: Sequence[int],
+    eta: float,
+    build_job: Callable[[int, Dict[str, Any], int], AttemptJob],
+    parse: Callable[[AttemptOutcome], Optional[Dict[str, Any]]],
+    on_outcome: Optional[Callable[[AttemptOutcome], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Successive halving per league over walk-forward chunk budgets.
+
+    Every rung runs all surviving (league, config) attempts at once so leagues
+    share the CPU budget; after each rung but the last, each league keeps its
+    top ceil(n / eta) configs by `objective_score`. Returns the final rung's rows.
+    """
+    survivors = {lid: list(cfgs) for lid, cfgs in candidates.items() if cfgs}
+    final_rows: List[Dict[str, Any]] = []
+    for rung, budget in enumerate(budgets):
+        is_last = rung == len(budgets) - 1
+        jobs_by_league: Dict[int, List[tuple]] = {}
+        all_jobs: List[AttemptJob] = []
+        for lid, cfgs in survivors.items():
+            for cfg in cfgs:
+                job = build_job(lid, cfg, int(budget))
+                jobs_by_league.setdefault(lid, []).append((cfg, job))
+                all_jobs.append(job)
+        rows = run_logged(executor, results_log, all_jobs, parse, on_outcome)
+        next_survivors: Dict[int, List[Dict[str, Any]]] = {}
+        for lid, pairs in jobs_by_league.items():
+            scored = [(rows[job.key], cfg) for cfg, job in pairs if rows.get(job.key) is not None]
+            if is_last:
+                final_rows.extend(row for row, _ in scored)
+                continue
+            scored.sort(key=lambda rc: float(rc[0]["objective_score"]), reverse=True)
+            keep = max(1, int(math.ceil(len(pairs) / max(1.0, float(eta)))))
+            if scored:
+                next_survivors[lid] = [cfg for _, cfg in scored[:keep]]
+        if not is_last:
+            survivors = next_survivors
+    return final_rows
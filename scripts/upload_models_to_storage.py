@@ -7,7 +7,7 @@ import os
 import sys
 from pathlib import Path
 from google.cloud import storage
-from typing import List
+from typing import Iterable, List, Optional
 
 # Add project root to path
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -22,6 +22,7 @@ def upload_models_to_storage(
     dry_run: bool = False,
     only_v4: bool = True,
     family_filter: str = "",
+    league_ids: Optional[Iterable[int]] = None,
 ) -> List[str]:
     """
     Upload all model files to Cloud Storage
@@ -30,6 +31,7 @@ def upload_models_to_storage(
         bucket_name: Name of the Cloud Storage bucket
         models_dir: Directory containing model files
         dry_run: If True, only print what would be uploaded
+        league_ids: If given, only upload per-league artifacts (league_<id>_*) of these leagues
         
     Returns:
         List of uploaded file paths
@@ -38,6 +40,7 @@ def upload_models_to_storage(
         print(f"Error: Models directory not found: {models_dir}")
         return []
     
+    league_prefixes = tuple(f"league_{int(lid)}_" for lid in league_ids) if league_ids is not None else None
     active_family_filter = (family_filter or "").strip().lower()
     if not active_family_filter and only_v4:
         active_family_filter = "v4"
@@ -52,6 +55,8 @@ def upload_models_to_storage(
             full_path = os.path.join(root, file)
             if active_family_filter and active_family_filter not in file.lower():
                 continue
+            if league_prefixes is not None and not file.startswith(league_prefixes):
+                continue
             model_files.append(full_path)
     
     if not model_files:
@@ -108,6 +113,11 @@ def main():
         default='',
         help='Only upload artifacts whose filename contains this family tag (for example: v4 or v5)',
     )
+    parser.add_argument(
+        '--league-ids',
+        default='',
+        help='Comma-separated league IDs: only upload those leagues\' per-league artifacts (for incremental retrains)',
+    )
     parser.add_argument(
         '--include-legacy',
         action='store_true',
@@ -129,6 +139,7 @@ def main():
         dry_run=args.dry_run,
         only_v4=not args.include_legacy,
         family_filter=("" if args.include_legacy else args.family_filter),
+        league_ids=[int(x) for x in args.league_ids.split(',') if x.strip()] if args.league_ids else None,
     )
     
     if not args.dry_run: